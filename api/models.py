@@ -298,6 +298,7 @@ class ResourceSearchRequest(BaseModel):
     competency: Optional[str] = Field(None, description="能力类型")
     difficulty: Optional[str] = Field(None, description="难度级别")
     category: Optional[ResourceCategory] = Field(None, description="资源分类")
+    semantic: bool = Field(False, description="是否使用向量语义检索")
     limit: int = Field(10, description="返回结果数量", ge=1, le=50)
     offset: int = Field(0, description="偏移量", ge=0)
 
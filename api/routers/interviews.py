@@ -25,20 +25,50 @@ from src.workflow import create_interview_workflow
 from src.models.state import create_initial_state, UserInfo
 from src.models.spark_client import create_spark_model
 from src.agents.langgraph_interview_agent import get_langgraph_agent
+from src.nodes.analysis_node import turn_evaluation_key
+from src.config.settings import model_config
 from src.tools.xunfei_rtasr_client import AsyncXunfeiRTASRClient
 from src.tools.audio_processor import AudioProcessor, RealTimeAudioProcessor
 
 # Celery 任务导入
-from src.celery_tasks.interview_tasks import process_interview_analysis, process_interview_report
+from src.celery_tasks.interview_tasks import process_interview_analysis, process_interview_report, process_turn_evaluation
+from src.database.interview_state_store import get_interview_state_store
+from src.tools.single_flight import get_single_flight, celery_task_failed
+from src.tools.radar_chart import RadarChartRenderer, get_radar_renderer, radar_scores
 
 
 router = APIRouter()
 
-# 面试会话存储
-interview_sessions = {}
+# 面试会话和后台任务状态保存在共享存储中（Redis/SQLite），Celery worker可在任意节点读写
+state_store = get_interview_state_store()
 
-# 后台任务状态存储
-task_status = {}
+# 本进程内的面试工作流（面试官Agent持有对话记忆，不跨进程共享，其他进程按需重建）
+session_workflows: Dict[str, Any] = {}
+
+
+def get_session_workflow(session_id: str):
+    """获取会话在本进程中的面试工作流"""
+    workflow = session_workflows.get(session_id)
+    if workflow is None:
+        workflow = create_interview_workflow()
+        session_workflows[session_id] = workflow
+    return workflow
+
+
+def flight_content(session_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """请求合并的内容：只取决定任务结果的字段，按规范JSON计算哈希
+    
+    序列化后的会话状态（pickle）字节不是规范形式，重新加载后相同状态的字节可能不同，不能用来哈希。
+    """
+    history = state.get("conversation_history", [])
+    return {
+        "session_id": session_id,
+        "turns": len(history),
+        "last_turn": turn_evaluation_key(history[-1]) if history else None,
+        "video_path": state.get("video_path"),
+        "audio_path": state.get("audio_path"),
+        "analyzed": bool(state.get("multimodal_analysis"))
+    }
 
 
 def create_user_info(setup_request: InterviewSetupRequest) -> UserInfo:
@@ -85,12 +115,8 @@ async def setup_interview(
             )
         
         # 存储会话状态
-        interview_sessions[session_id] = {
-            "state": setup_state,
-            "workflow": workflow,
-            "created_at": datetime.now(),
-            "user_id": current_user["id"]
-        }
+        state_store.create_session(session_id, setup_state, current_user["id"])
+        session_workflows[session_id] = workflow
         
         # 构建响应
         questions = []
@@ -135,14 +161,13 @@ async def get_interview_question(
     """获取面试问题"""
     session_id = request.session_id
     
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -152,7 +177,7 @@ async def get_interview_question(
     
     try:
         state = session["state"]
-        workflow = session["workflow"]
+        workflow = get_session_workflow(session_id)
         
         # 获取当前问题
         question_data = workflow.interviewer_agent.ask_question(state)
@@ -183,14 +208,13 @@ async def submit_interview_answer(
     """提交面试回答"""
     session_id = answer_request.session_id
     
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -200,7 +224,7 @@ async def submit_interview_answer(
     
     try:
         state = session["state"]
-        workflow = session["workflow"]
+        workflow = get_session_workflow(session_id)
         
         # 构建问题数据
         question_data = {
@@ -217,7 +241,16 @@ async def submit_interview_answer(
         )
         
         # 更新会话状态
-        session["state"] = state
+        state_store.save_state(session_id, state)
+        
+        # 回答已写入对话历史：投递逐轮评估任务到interview队列，结束面试后的分析只需聚合
+        if (result.get("answer_recorded") and state.get("conversation_history")
+                and getattr(model_config, 'INCREMENTAL_EVALUATION_ENABLED', True)):
+            try:
+                process_turn_evaluation.delay(session_id, turn_evaluation_key(state["conversation_history"][-1]))
+            except Exception as e:
+                # 投递失败不影响答题，结束面试时分析任务会补评缺失的轮次
+                print(f"⚠️ 逐轮评估任务投递失败: {e}")
         
         return InterviewAnswerResponse(
             answer_recorded=result["answer_recorded"],
@@ -242,14 +275,13 @@ async def get_interview_status(
     current_user: dict = Depends(get_current_user)
 ):
     """获取面试状态"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -287,14 +319,13 @@ async def start_analysis(
     current_user: dict = Depends(get_current_user)
 ):
     """开始多模态分析"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -302,22 +333,30 @@ async def start_analysis(
             detail="无权访问此面试会话"
         )
     
-    # 创建Celery任务
-    task_id = str(uuid.uuid4())
-    task_status[task_id] = {
-        "status": "running",
-        "message": "正在进行多模态分析...",
-        "created_at": datetime.now()
-    }
+    def launch(flight_key: str) -> Dict[str, Any]:
+        # 创建Celery任务
+        task_id = str(uuid.uuid4())
+        state_store.set_task_status(task_id, {
+            "status": "running",
+            "message": "正在进行多模态分析...",
+            "created_at": datetime.now()
+        })
+        
+        # 使用Celery启动分析任务
+        celery_task = process_interview_analysis.delay(session_id, task_id, flight_key=flight_key)
+        return {"task_id": task_id, "celery_task_id": celery_task.id}
     
-    # 使用Celery启动分析任务
-    celery_task = process_interview_analysis.delay(session_id, task_id)
+    # 会话状态未变化时，重复点击合并到进行中/刚完成的分析任务
+    flight = await get_single_flight().submit(
+        "interview_analysis", session_id, flight_content(session_id, session["state"]), launch, is_stale=celery_task_failed
+    )
     
     return APIResponse(
-        message="分析任务已启动（Celery异步处理）",
+        message="分析任务已启动（Celery异步处理）" if not flight["coalesced"] else "相同的分析任务已存在，已合并到现有任务",
         data={
-            "task_id": task_id,
-            "celery_task_id": celery_task.id
+            "task_id": flight.get("task_id"),
+            "celery_task_id": flight.get("celery_task_id"),
+            "coalesced": flight["coalesced"]
         }
     )
 
@@ -332,14 +371,13 @@ async def get_analysis_result(
     current_user: dict = Depends(get_current_user)
 ):
     """获取多模态分析结果"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -375,14 +413,13 @@ async def generate_report(
     current_user: dict = Depends(get_current_user)
 ):
     """生成面试报告"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -398,22 +435,29 @@ async def generate_report(
             detail="请先完成多模态分析"
         )
     
-    # 创建Celery任务
-    task_id = str(uuid.uuid4())
-    task_status[task_id] = {
-        "status": "running",
-        "message": "正在生成报告...",
-        "created_at": datetime.now()
-    }
+    def launch(flight_key: str) -> Dict[str, Any]:
+        # 创建Celery任务
+        task_id = str(uuid.uuid4())
+        state_store.set_task_status(task_id, {
+            "status": "running",
+            "message": "正在生成报告...",
+            "created_at": datetime.now()
+        })
+        
+        # 使用Celery启动报告生成任务
+        celery_task = process_interview_report.delay(session_id, task_id, flight_key=flight_key)
+        return {"task_id": task_id, "celery_task_id": celery_task.id}
     
-    # 使用Celery启动报告生成任务
-    celery_task = process_interview_report.delay(session_id, task_id)
+    flight = await get_single_flight().submit(
+        "interview_report", session_id, flight_content(session_id, state), launch, is_stale=celery_task_failed
+    )
     
     return APIResponse(
-        message="报告生成任务已启动（Celery异步处理）",
+        message="报告生成任务已启动（Celery异步处理）" if not flight["coalesced"] else "相同的报告生成任务已存在，已合并到现有任务",
         data={
-            "task_id": task_id,
-            "celery_task_id": celery_task.id
+            "task_id": flight.get("task_id"),
+            "celery_task_id": flight.get("celery_task_id"),
+            "coalesced": flight["coalesced"]
         }
     )
 
@@ -429,14 +473,13 @@ async def get_interview_report(
     current_user: dict = Depends(get_current_user)
 ):
     """获取面试报告"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -475,14 +518,13 @@ async def get_learning_path(
     current_user: dict = Depends(get_current_user)
 ):
     """获取学习路径推荐"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -526,11 +568,12 @@ async def get_learning_path(
             description="获取任务的执行状态（兼容本地和Celery任务）")
 async def get_task_status(task_id: str):
     """获取任务状态"""
-    # 首先检查本地任务状态存储
-    if task_id in task_status:
+    # 首先检查共享任务状态存储
+    status = state_store.get_task_status(task_id)
+    if status is not None:
         return APIResponse(
             message="任务状态获取成功",
-            data=task_status[task_id]
+            data=status
         )
     
     # 如果本地没有，尝试作为 Celery 任务 ID 查询
@@ -656,20 +699,20 @@ async def parse_resume(
 @router.get("/radar-chart/{session_id}",
             response_class=FileResponse,
             summary="获取雷达图",
-            description="获取能力评估雷达图文件")
+            description="获取能力评估雷达图文件（format=png 或 svg）")
 async def get_radar_chart(
     session_id: str,
+    format: str = "png",
     current_user: dict = Depends(get_current_user)
 ):
     """获取雷达图文件"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -677,26 +720,45 @@ async def get_radar_chart(
             detail="无权访问此面试会话"
         )
     
+    if format not in RadarChartRenderer.MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="雷达图格式仅支持 png 或 svg"
+        )
+    
     state = session["state"]
     report = state.get("interview_report")
     
-    if not report or not report.radar_chart_path:
+    if not report:
         raise HTTPException(
             status_code=404,
             detail="雷达图不存在"
         )
     
     import os
-    if not os.path.exists(report.radar_chart_path):
-        raise HTTPException(
-            status_code=404,
-            detail="雷达图文件不存在"
-        )
+    chart_path = report.radar_chart_path
+    if not chart_path or not chart_path.endswith(f".{format}") or not os.path.exists(chart_path):
+        # 按报告分数重新渲染（渲染在工作进程中执行，相同分数命中缓存）
+        if not report.detailed_scores:
+            raise HTTPException(
+                status_code=404,
+                detail="雷达图文件不存在"
+            )
+        scores = radar_scores({
+            dimension: {"score": score} for dimension, score in report.detailed_scores.items()
+        })
+        try:
+            chart_path = await get_radar_renderer().arender(scores, format)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"雷达图生成失败: {str(e)}"
+            )
     
     return FileResponse(
-        path=report.radar_chart_path,
-        media_type='image/png',
-        filename=f"radar_chart_{session_id}.png"
+        path=chart_path,
+        media_type=RadarChartRenderer.MEDIA_TYPES[format],
+        filename=f"radar_chart_{session_id}.{format}"
     )
 
 
@@ -709,14 +771,13 @@ async def delete_interview_session(
     current_user: dict = Depends(get_current_user)
 ):
     """删除面试会话"""
-    if session_id not in interview_sessions:
+    session = state_store.get_session(session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="面试会话不存在"
         )
     
-    session = interview_sessions[session_id]
-    
     # 权限检查
     if session["user_id"] != current_user["id"]:
         raise HTTPException(
@@ -725,7 +786,8 @@ async def delete_interview_session(
         )
     
     # 删除会话
-    del interview_sessions[session_id]
+    state_store.delete_session(session_id)
+    session_workflows.pop(session_id, None)
     
     return APIResponse(message="面试会话已删除")
 
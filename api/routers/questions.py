@@ -3,17 +3,24 @@
 题目生成路由 - 支持ChromaDB智能匹配和生成，Redis存储
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Set, Tuple
 import asyncio
 import json
+import math
 from datetime import datetime
 import uuid
 import os
 import redis
 
+from langchain_core.messages import HumanMessage
+
 from src.models.spark_client import create_spark_model
+from src.tools.json_stream import JsonArrayStreamParser
 from src.database.chroma_manager import chroma_manager
+from src.database.question_dedup import normalize_question_title, stable_question_id
+from src.tools.question_pool import get_question_pool, question_pool_key
 
 # Redis配置
 try:
@@ -48,83 +55,268 @@ class QuestionGenerationResponse(BaseModel):
     message: str = ""
     stats: Optional[Dict[str, Any]] = None  # 生成统计信息
 
-@router.post("/generate", response_model=QuestionGenerationResponse)
-async def generate_questions(request: QuestionGenerationRequest):
-    """智能题目生成：先匹配已有题目，不足时调用大模型生成"""
+class ShortfallEstimator:
+    """近期请求中需要大模型补足的题目比例（指数滑动平均），用于推测性生成的题目数量"""
+    
+    def __init__(self, alpha: float = 0.2, initial_ratio: float = 1.0):
+        self.alpha = alpha
+        self.ratio = initial_ratio
+    
+    def estimate(self, question_count: int) -> int:
+        """预计缺口（四舍五入）；题库通常足够时返回0，不做推测性生成"""
+        return max(0, min(question_count, math.floor(question_count * self.ratio + 0.5)))
+    
+    def update(self, needed: int, question_count: int):
+        if question_count > 0:
+            self.ratio = (1 - self.alpha) * self.ratio + self.alpha * (needed / question_count)
+
+shortfall_estimator = ShortfallEstimator()
+
+# 后台入库任务（持有引用，避免任务被回收）
+_background_tasks: Set[asyncio.Task] = set()
+
+async def produce_ai_questions(request: QuestionGenerationRequest, count: int, queue: asyncio.Queue):
+    """流式生成 count 道题目并逐题放入队列，结束时放入 None"""
     try:
-        print(f"🎯 开始智能题目生成...")
-        print(f"📊 需要题目数量: {request.question_count}")
-        print(f"📊 难度等级: {request.difficulty_level}")
-        print(f"📊 选中技能: {request.selected_skills}")
-        print(f"📊 选中项目: {len(request.selected_projects)} 个")
-        
-        # 阶段1: 从ChromaDB搜索匹配的题目
+        adjusted_request = request.copy()
+        adjusted_request.question_count = count
+        prompt = build_question_generation_prompt(adjusted_request)
+        async for question in stream_questions_with_ai(prompt, adjusted_request):
+            await queue.put(question)
+    finally:
+        queue.put_nowait(None)
+
+def question_pool_spec(request: QuestionGenerationRequest) -> Optional[Dict[str, Any]]:
+    """请求对应的题目池组合；项目经验题依赖候选人简历，不使用共享题目池"""
+    question_types = sorted(t for t, enabled in request.question_types.items() if enabled)
+    if not request.selected_skills or not question_types or 'project_experience' in question_types:
+        return None
+    return {
+        "difficulty_level": request.difficulty_level,
+        "selected_skills": sorted(request.selected_skills),
+        "question_types": question_types
+    }
+
+async def take_from_question_pool(request: QuestionGenerationRequest) -> Optional[List[Dict[str, Any]]]:
+    """记录组合请求频率，题目池足够时直接返回池中题目"""
+    pool = get_question_pool()
+    spec = question_pool_spec(request)
+    if not pool.enabled or spec is None:
+        return None
+    
+    key = question_pool_key(spec["difficulty_level"], spec["selected_skills"], spec["question_types"])
+    pool.record_request(key, spec)
+    questions = await asyncio.to_thread(chroma_manager.get_pool_questions, key, request.question_count)
+    pool.record_served(bool(questions))
+    if not questions:
+        return None
+    
+    for question in questions:
+        if not request.include_answer:
+            question["answer"] = ""
+    print(f"🧺 命中题目池: {key} ({len(questions)} 个题目)")
+    return questions
+
+async def refill_question_pool(key: str, spec: Dict[str, Any], count: int) -> int:
+    """为热门组合生成 count 道题目并存入题目池，返回入库题目数"""
+    request = QuestionGenerationRequest(
+        resume_data={},
+        selected_skills=spec["selected_skills"],
+        selected_projects=[],
+        question_types={question_type: True for question_type in spec["question_types"]},
+        question_count=count,
+        difficulty_level=spec["difficulty_level"],
+        include_answer=True,
+        include_points=True
+    )
+    questions = await generate_questions_with_ai(build_question_generation_prompt(request), request)
+    
+    # 校验：只保留大模型生成、题型符合、带考察点和答案的题目（备用题目不进入题目池）
+    vetted = [
+        q for q in questions
+        if q.get('source') == 'generated'
+        and q.get('type') in spec["question_types"]
+        and len(q.get('title', '')) >= 10
+        and q.get('points') and q.get('answer')
+    ]
+    if not vetted:
+        return 0
+    
+    before = await asyncio.to_thread(chroma_manager.count_pool_questions, key)
+    await asyncio.to_thread(chroma_manager.store_questions, vetted, {
+        "selected_skills": spec["selected_skills"],
+        "difficulty_level": spec["difficulty_level"],
+        "question_types": request.question_types,
+        "session_id": key,
+        "pool_key": key
+    })
+    after = await asyncio.to_thread(chroma_manager.count_pool_questions, key)
+    return max(0, after - before)
+
+async def run_question_pool_refill(interval_seconds: int):
+    """后台题目池补充循环（由应用生命周期启动）"""
+    await get_question_pool().run_refill_loop(
+        chroma_manager.count_pool_questions, refill_question_pool, interval_seconds
+    )
+
+async def question_generation_pipeline(request: QuestionGenerationRequest) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """智能题目生成流水线：向量检索与大模型生成重叠执行
+    
+    检索开始的同时按历史缺口比例推测性地启动大模型生成；检索结果足够时取消生成，
+    生成的题目超过缺口时提前结束流式输出。依次产出 ("question", 题目) 和最后的 ("done", 统计信息)。
+    """
+    print(f"🎯 开始智能题目生成...")
+    print(f"📊 需要题目数量: {request.question_count}")
+    print(f"📊 难度等级: {request.difficulty_level}")
+    print(f"📊 选中技能: {request.selected_skills}")
+    print(f"📊 选中项目: {len(request.selected_projects)} 个")
+    
+    # 热门组合直接从预生成的题目池返回
+    pooled_questions = await take_from_question_pool(request)
+    if pooled_questions:
+        for question in pooled_questions:
+            yield "question", question
+        session_id = await store_questions_to_redis(pooled_questions, request)
+        yield "done", {
+            "questions": pooled_questions,
+            "matched_count": len(pooled_questions),
+            "generated_count": 0,
+            "stats": {
+                "total_questions": len(pooled_questions),
+                "matched_from_db": len(pooled_questions),
+                "generated_new": 0,
+                "served_from_pool": True,
+                "session_id": session_id,
+                "redis_stored": len(pooled_questions)
+            }
+        }
+        return
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    speculative_count = shortfall_estimator.estimate(request.question_count)
+    producers = []
+    if speculative_count > 0:
+        producers.append(asyncio.create_task(produce_ai_questions(request, speculative_count, queue)))
+        print(f"🤖 推测性启动大模型生成: {speculative_count} 个题目")
+    
+    try:
+        # 阶段1: 从ChromaDB搜索匹配的题目（与大模型生成并行）
         matched_questions = await search_existing_questions(request)
         matched_count = len(matched_questions)
-        
         print(f"🔍 匹配到 {matched_count} 个已有题目")
+        for question in matched_questions:
+            yield "question", question
         
         # 阶段2: 计算还需要生成的题目数量
         remaining_count = max(0, request.question_count - matched_count)
+        shortfall_estimator.update(remaining_count, request.question_count)
         
         generated_questions = []
-        if remaining_count > 0:
-            print(f"🤖 需要生成 {remaining_count} 个新题目")
-            
-            # 调整请求以生成剩余题目
-            adjusted_request = request.copy()
-            adjusted_request.question_count = remaining_count
-            
-            # 构建prompt
-            prompt = build_question_generation_prompt(adjusted_request)
+        # 补充生成与推测性生成并行，结果可能与已返回的题目或彼此重复，按规范化标题去重
+        seen_titles = {normalize_question_title(q.get("title", "")) for q in matched_questions}
+        if remaining_count == 0:
+            print(f"✅ 已有题目足够，取消推测性生成")
+        else:
+            if remaining_count > speculative_count:
+                # 缺口大于推测值，补充生成差额
+                producers.append(asyncio.create_task(
+                    produce_ai_questions(request, remaining_count - speculative_count, queue)
+                ))
             
-            # 调用大模型生成题目
-            generated_questions = await generate_questions_with_ai(prompt, adjusted_request)
+            active_producers = len(producers)
+            while len(generated_questions) < remaining_count and active_producers:
+                question = await queue.get()
+                if question is None:
+                    active_producers -= 1
+                    continue
+                title_key = normalize_question_title(question.get("title", ""))
+                if title_key in seen_titles:
+                    continue
+                seen_titles.add(title_key)
+                generated_questions.append(question)
+                yield "question", question
             
             print(f"✅ 大模型生成 {len(generated_questions)} 个新题目")
-            
-            # 阶段3: 将新生成的题目存储到ChromaDB
-            if generated_questions:
-                await store_new_questions(generated_questions, request, request.task_id)
-        
-        # 阶段4: 合并结果
-        final_questions = matched_questions + generated_questions
-        
-        # 如果题目数量超过需求，进行筛选
-        if len(final_questions) > request.question_count:
-            # 优先保留匹配度高的题目，然后是新生成的题目
-            final_questions = final_questions[:request.question_count]
-        
-        # 构建统计信息
-        stats = {
+    finally:
+        # 题目已足够或客户端断开：取消仍在进行的生成，不再消耗token
+        for producer in producers:
+            producer.cancel()
+    
+    # 阶段3: 新生成的题目在后台存储到ChromaDB，不阻塞响应
+    if generated_questions:
+        task = asyncio.create_task(store_new_questions(generated_questions, request, request.task_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    
+    # 阶段4: 合并结果
+    final_questions = (matched_questions + generated_questions)[:request.question_count]
+    
+    print(f"✅ 题目生成完成: 总计 {len(final_questions)} 个题目")
+    print(f"   - 匹配题目: {matched_count} 个")
+    print(f"   - 新生成: {len(generated_questions)} 个")
+    
+    # 阶段5: 存储题目到Redis
+    session_id = await store_questions_to_redis(final_questions, request)
+    
+    yield "done", {
+        "questions": final_questions,
+        "matched_count": matched_count,
+        "generated_count": len(generated_questions),
+        "stats": {
             "total_questions": len(final_questions),
             "matched_from_db": matched_count,
             "generated_new": len(generated_questions),
-            "chroma_stats": chroma_manager.get_collection_stats()
+            "speculative_generation": speculative_count,
+            "chroma_stats": chroma_manager.get_collection_stats(),
+            "session_id": session_id,
+            "redis_stored": len(final_questions)
         }
-        
-        print(f"✅ 题目生成完成: 总计 {len(final_questions)} 个题目")
-        print(f"   - 匹配题目: {matched_count} 个")
-        print(f"   - 新生成: {len(generated_questions)} 个")
-        
-        # 阶段5: 存储题目到Redis
-        session_id = await store_questions_to_redis(final_questions, request)
-        
-        return QuestionGenerationResponse(
-            success=True,
-            questions=final_questions,
-            message=f"题目生成成功：匹配 {matched_count} 个，新生成 {len(generated_questions)} 个",
-            stats={
-                **stats,
-                "session_id": session_id,
-                "redis_stored": len(final_questions)
-            }
-        )
+    }
+
+@router.post("/generate", response_model=QuestionGenerationResponse)
+async def generate_questions(request: QuestionGenerationRequest):
+    """智能题目生成：先匹配已有题目，不足时调用大模型生成"""
+    try:
+        async for event, payload in question_generation_pipeline(request):
+            if event == "done":
+                return QuestionGenerationResponse(
+                    success=True,
+                    questions=payload["questions"],
+                    message=f"题目生成成功：匹配 {payload['matched_count']} 个，新生成 {payload['generated_count']} 个",
+                    stats=payload["stats"]
+                )
         
     except Exception as e:
         print(f"❌ 题目生成失败: {e}")
         raise HTTPException(status_code=500, detail=f"题目生成失败: {str(e)}")
 
+@router.post("/generate/stream")
+async def generate_questions_stream(request: QuestionGenerationRequest):
+    """流式题目生成（SSE）：每道题目解析出来后立即推送，首题延迟约等于向量检索延迟"""
+    
+    async def event_stream():
+        try:
+            async for event, payload in question_generation_pipeline(request):
+                if event == "done":
+                    payload = {
+                        "message": f"题目生成成功：匹配 {payload['matched_count']} 个，新生成 {payload['generated_count']} 个",
+                        "stats": payload["stats"]
+                    }
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+        except Exception as e:
+            print(f"❌ 流式题目生成失败: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)}, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 async def search_existing_questions(request: QuestionGenerationRequest) -> List[Dict[str, Any]]:
     """搜索已有的匹配题目"""
     try:
@@ -138,16 +330,17 @@ async def search_existing_questions(request: QuestionGenerationRequest) -> List[
             "resume_data": request.resume_data
         }
         
-        # 搜索匹配题目，获取比需求稍多的结果用于筛选
-        matched_questions = chroma_manager.search_questions(
+        # 搜索匹配题目，获取比需求稍多的结果用于筛选（在线程中执行，不阻塞并行的大模型生成）
+        matched_questions = await asyncio.to_thread(
+            chroma_manager.search_questions,
             search_data, 
             n_results=min(request.question_count * 2, 30)  # 获取2倍数量用于筛选
         )
         
-        # 过滤相似度过低的题目
+        # 过滤相似度过低的题目（标题或考察点完整包含选中技能的关键词命中题目同样保留）
         high_quality_matches = [
             q for q in matched_questions 
-            if q.get("similarity_score", 0) > 0.3  # 相似度阈值
+            if q.get("similarity_score", 0) > 0.3 or q.get("matched_skills")  # 相似度阈值
         ]
         
         return high_quality_matches[:request.question_count]  # 限制数量
@@ -337,58 +530,50 @@ def build_question_generation_prompt(request: QuestionGenerationRequest) -> str:
     
     return prompt
 
-async def generate_questions_with_ai(prompt: str, request: QuestionGenerationRequest) -> List[Dict[str, Any]]:
-    """使用AI生成题目"""
+def process_ai_question(question: Dict[str, Any], request: QuestionGenerationRequest) -> Dict[str, Any]:
+    """统一大模型生成题目的格式"""
+    return {
+        'id': stable_question_id(question.get('title', ''), question.get('type', 'tech_basic')),
+        'type': question.get('type', 'tech_basic'),
+        'title': question.get('title', ''),
+        'points': question.get('points', []),
+        'answer': question.get('answer', '') if request.include_answer else '',
+        'difficulty': request.difficulty_level,
+        'created_at': datetime.now().isoformat(),
+        'source': 'generated'
+    }
+
+async def stream_questions_with_ai(prompt: str, request: QuestionGenerationRequest) -> AsyncIterator[Dict[str, Any]]:
+    """使用AI流式生成题目：从模型输出中每解析出一道完整题目就立即产出"""
+    parser = JsonArrayStreamParser(array_key="questions")
+    produced = 0
     
     try:
-        # 调用Spark Pro生成题目
-        response = spark_client.chat_with_messages(
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        # 解析响应
-        content = response
-        print(f"🤖 AI响应: {content[:200]}...")
-        
-        # 提取JSON部分
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-        
-        if json_start == -1 or json_end == 0:
-            raise Exception("无法从AI响应中提取JSON数据")
-        
-        json_str = content[json_start:json_end]
-        result = json.loads(json_str)
-        
-        questions = result.get('questions', [])
+        async for chunk in spark_client.astream([HumanMessage(content=prompt)]):
+            for question in parser.feed(chunk.content):
+                if not question.get('title'):
+                    continue
+                produced += 1
+                yield process_ai_question(question, request)
         
         # 验证题目数量
-        if len(questions) != request.question_count:
-            print(f"⚠️ 生成的题目数量({len(questions)})与要求({request.question_count})不符")
-        
-        # 处理题目格式
-        processed_questions = []
-        for i, q in enumerate(questions):
-            processed_q = {
-                'id': f"q_{uuid.uuid4().hex[:8]}",
-                'type': q.get('type', 'tech_basic'),
-                'title': q.get('title', ''),
-                'points': q.get('points', []),
-                'answer': q.get('answer', '') if request.include_answer else '',
-                'difficulty': request.difficulty_level,
-                'created_at': datetime.now().isoformat()
-            }
-            processed_questions.append(processed_q)
-        
-        return processed_questions
+        if produced != request.question_count:
+            print(f"⚠️ 生成的题目数量({produced})与要求({request.question_count})不符")
+        if produced == 0:
+            raise Exception("无法从AI响应中提取题目")
         
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON解析失败: {e}")
-        # 如果JSON解析失败，返回默认题目
-        return generate_fallback_questions(request)
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
         print(f"❌ AI生成失败: {e}")
-        return generate_fallback_questions(request)
+        # 尚未产出任何题目时返回默认题目
+        if produced == 0:
+            for question in generate_fallback_questions(request):
+                yield question
+
+async def generate_questions_with_ai(prompt: str, request: QuestionGenerationRequest) -> List[Dict[str, Any]]:
+    """使用AI生成题目"""
+    return [question async for question in stream_questions_with_ai(prompt, request)]
 
 def generate_fallback_questions(request: QuestionGenerationRequest) -> List[Dict[str, Any]]:
     """生成备用题目"""
@@ -433,6 +618,29 @@ async def get_question_stats():
             "stats": {"total_questions": 0}
         }
 
+@router.get("/pool/stats")
+async def get_question_pool_stats():
+    """获取题目池命中率和热门组合"""
+    pool = get_question_pool()
+    hot_combos = await asyncio.to_thread(pool.hot_combos)
+    sizes = await asyncio.gather(*[
+        asyncio.to_thread(chroma_manager.count_pool_questions, key) for key, _, _ in hot_combos
+    ])
+    return {
+        "success": True,
+        "stats": pool.get_stats(),
+        "hot_combos": [
+            {"pool_key": key, "spec": spec, "demand": round(score, 2), "pool_size": size}
+            for (key, spec, score), size in zip(hot_combos, sizes)
+        ]
+    }
+
+@router.post("/pool/refill")
+async def refill_question_pools():
+    """立即补充热门组合的题目池（忽略低峰时段限制）"""
+    refilled = await get_question_pool().refill(chroma_manager.count_pool_questions, refill_question_pool)
+    return {"success": True, "refilled": refilled}
+
 @router.post("/search")
 async def search_questions_endpoint(request: QuestionGenerationRequest):
     """搜索匹配的题目（测试用）"""
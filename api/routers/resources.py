@@ -13,20 +13,23 @@ from api.models import (
     ResourceCategory, APIResponse
 )
 from api.routers.users import get_current_user
+from src.database.resource_store import get_resource_store, resource_stable_id
 
 
 router = APIRouter()
 
-# 学习资源存储
-learning_resources = {}
+# 学习资源存储（SQLite持久化 + 倒排索引）
+resource_store = get_resource_store()
 
 # 初始化一些示例学习资源
 def initialize_sample_resources():
-    """初始化示例学习资源"""
+    """初始化示例学习资源（仅在资源库为空时写入）"""
+    if len(resource_store) > 0:
+        return
+    
     sample_resources = [
         # 技术能力相关
         {
-            "id": str(uuid.uuid4()),
             "title": "Python编程从入门到精通",
             "description": "全面的Python编程教程，涵盖基础语法到高级特性",
             "url": "https://example.com/python-tutorial",
@@ -37,7 +40,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "算法与数据结构实战",
             "description": "通过实际案例学习常用算法和数据结构",
             "url": "https://example.com/algorithm-course",
@@ -48,7 +50,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "系统设计面试指南",
             "description": "如何在系统设计面试中表现出色",
             "url": "https://example.com/system-design-interview",
@@ -61,7 +62,6 @@ def initialize_sample_resources():
         
         # 沟通能力相关
         {
-            "id": str(uuid.uuid4()),
             "title": "有效沟通的艺术",
             "description": "提升职场沟通技巧的实用指南",
             "url": "https://example.com/communication-skills",
@@ -72,7 +72,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "STAR面试回答法则",
             "description": "学会用STAR法则结构化回答面试问题",
             "url": "https://example.com/star-method",
@@ -83,7 +82,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "公众演讲与表达训练",
             "description": "克服紧张，提升演讲和表达能力",
             "url": "https://example.com/public-speaking",
@@ -96,7 +94,6 @@ def initialize_sample_resources():
         
         # 逻辑思维相关
         {
-            "id": str(uuid.uuid4()),
             "title": "结构化思维训练",
             "description": "培养清晰的逻辑思维和分析能力",
             "url": "https://example.com/structured-thinking",
@@ -107,7 +104,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "问题解决方法论",
             "description": "系统性解决复杂问题的思维框架",
             "url": "https://example.com/problem-solving",
@@ -120,7 +116,6 @@ def initialize_sample_resources():
         
         # 学习能力相关
         {
-            "id": str(uuid.uuid4()),
             "title": "高效学习法",
             "description": "科学的学习方法和技巧分享",
             "url": "https://example.com/learning-methods",
@@ -131,7 +126,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "终身学习者的养成",
             "description": "如何保持持续学习的动力和习惯",
             "url": "https://example.com/lifelong-learning",
@@ -144,7 +138,6 @@ def initialize_sample_resources():
         
         # 团队协作相关
         {
-            "id": str(uuid.uuid4()),
             "title": "高效团队协作指南",
             "description": "建设高效团队的方法和实践",
             "url": "https://example.com/teamwork-guide",
@@ -155,7 +148,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "冲突管理与解决",
             "description": "处理团队冲突的策略和技巧",
             "url": "https://example.com/conflict-resolution",
@@ -168,7 +160,6 @@ def initialize_sample_resources():
         
         # 创新思维相关
         {
-            "id": str(uuid.uuid4()),
             "title": "创新思维训练营",
             "description": "激发创新潜能的思维训练方法",
             "url": "https://example.com/innovation-thinking",
@@ -179,7 +170,6 @@ def initialize_sample_resources():
             "created_at": datetime.now()
         },
         {
-            "id": str(uuid.uuid4()),
             "title": "设计思维实战",
             "description": "用设计思维解决复杂问题",
             "url": "https://example.com/design-thinking",
@@ -192,7 +182,8 @@ def initialize_sample_resources():
     ]
     
     for resource in sample_resources:
-        learning_resources[resource["id"]] = resource
+        resource["id"] = resource_stable_id(resource["title"], resource["url"])
+    resource_store.upsert_many(sample_resources)
 
 # 初始化示例资源
 initialize_sample_resources()
@@ -229,7 +220,7 @@ async def create_learning_resource(
             "created_at": datetime.now()
         }
         
-        learning_resources[resource_id] = new_resource
+        new_resource = resource_store.upsert(new_resource)
         
         return LearningResourceResponse(**new_resource)
         
@@ -250,43 +241,36 @@ async def search_learning_resources(
 ):
     """搜索学习资源"""
     try:
-        # 获取所有资源
-        all_resources = list(learning_resources.values())
-        
-        # 应用过滤条件
-        filtered_resources = []
-        
-        for resource in all_resources:
-            # 关键词搜索
-            if search_request.query:
-                query_lower = search_request.query.lower()
-                if not (query_lower in resource["title"].lower() or 
-                       query_lower in resource["description"].lower() or
-                       any(query_lower in tag.lower() for tag in resource["tags"])):
-                    continue
-            
-            # 能力类型过滤
-            if search_request.competency and resource["competency"] != search_request.competency:
-                continue
-            
-            # 难度级别过滤
-            if search_request.difficulty and resource["difficulty"] != search_request.difficulty:
-                continue
-            
-            # 资源分类过滤
-            if search_request.category and resource["category"] != search_request.category:
-                continue
-            
-            filtered_resources.append(resource)
-        
-        # 按创建时间排序（最新在前）
-        filtered_resources.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        # 应用分页
-        total = len(filtered_resources)
         start = search_request.offset
         end = start + search_request.limit
-        paginated_resources = filtered_resources[start:end]
+        
+        # 语义检索（向量库不可用时回退到关键词检索）
+        paginated_resources = None
+        if search_request.semantic and search_request.query:
+            paginated_resources = resource_store.semantic_search(
+                search_request.query,
+                competency=search_request.competency,
+                difficulty=search_request.difficulty,
+                category=search_request.category,
+                limit=search_request.limit,
+                offset=search_request.offset
+            )
+            if paginated_resources is not None:
+                # 语义检索没有确切总数，本页取满视为还有更多
+                total = start + len(paginated_resources)
+                if len(paginated_resources) == search_request.limit:
+                    total += 1
+        
+        if paginated_resources is None:
+            # 倒排索引求交集 + 按创建时间预排序分页（最新在前）
+            paginated_resources, total = resource_store.search(
+                query=search_request.query,
+                competency=search_request.competency,
+                difficulty=search_request.difficulty,
+                category=search_request.category,
+                limit=search_request.limit,
+                offset=search_request.offset
+            )
         
         # 转换为响应格式
         resource_responses = []
@@ -318,29 +302,8 @@ async def get_recommended_resources(
 ):
     """获取推荐的学习资源"""
     try:
-        # 获取所有资源
-        all_resources = list(learning_resources.values())
-        
-        # 简单的推荐逻辑
-        recommended_resources = []
-        
-        # 如果指定了能力和难度，优先推荐匹配的资源
-        if competency or difficulty:
-            for resource in all_resources:
-                if competency and resource["competency"] != competency:
-                    continue
-                if difficulty and resource["difficulty"] != difficulty:
-                    continue
-                recommended_resources.append(resource)
-        
-        # 如果没有足够的匹配资源，添加热门资源
-        if len(recommended_resources) < limit:
-            popular_resources = [r for r in all_resources if r not in recommended_resources]
-            popular_resources.sort(key=lambda x: len(x["tags"]), reverse=True)  # 按标签数量排序
-            recommended_resources.extend(popular_resources)
-        
-        # 限制数量
-        recommended_resources = recommended_resources[:limit]
+        # 优先推荐匹配能力和难度的资源，不足时补充热门资源（按标签数量）
+        recommended_resources = resource_store.recommend(competency=competency, difficulty=difficulty, limit=limit)
         
         # 转换为响应格式
         resource_responses = []
@@ -365,13 +328,13 @@ async def get_learning_resource(
     current_user: dict = Depends(get_current_user)
 ):
     """获取单个学习资源"""
-    if resource_id not in learning_resources:
+    resource = resource_store.get(resource_id)
+    if resource is None:
         raise HTTPException(
             status_code=404,
             detail="学习资源不存在"
         )
     
-    resource = learning_resources[resource_id]
     return LearningResourceResponse(**resource)
 
 
@@ -392,7 +355,8 @@ async def update_learning_resource(
             detail="权限不足，只有管理员可以更新学习资源"
         )
     
-    if resource_id not in learning_resources:
+    resource = resource_store.get(resource_id)
+    if resource is None:
         raise HTTPException(
             status_code=404,
             detail="学习资源不存在"
@@ -400,7 +364,6 @@ async def update_learning_resource(
     
     try:
         # 更新资源
-        resource = learning_resources[resource_id]
         resource.update({
             "title": resource_data.title,
             "description": resource_data.description,
@@ -410,6 +373,7 @@ async def update_learning_resource(
             "difficulty": resource_data.difficulty,
             "tags": resource_data.tags
         })
+        resource = resource_store.upsert(resource)
         
         return LearningResourceResponse(**resource)
         
@@ -436,15 +400,13 @@ async def delete_learning_resource(
             detail="权限不足，只有管理员可以删除学习资源"
         )
     
-    if resource_id not in learning_resources:
+    # 删除资源
+    if not resource_store.delete(resource_id):
         raise HTTPException(
             status_code=404,
             detail="学习资源不存在"
         )
     
-    # 删除资源
-    del learning_resources[resource_id]
-    
     return APIResponse(message="学习资源已删除")
 
 
@@ -489,12 +451,15 @@ async def get_difficulty_levels():
             description="获取学习资源的统计信息")
 async def get_resource_stats(current_user: dict = Depends(get_current_user)):
     """获取资源统计信息"""
-    all_resources = list(learning_resources.values())
+    # 各维度分布直接读取倒排索引大小
+    category_counts = resource_store.distribution("category")
+    competency_counts = resource_store.distribution("competency")
+    difficulty_counts = resource_store.distribution("difficulty")
     
     # 按分类统计
     category_stats = {}
     for category in ResourceCategory:
-        category_stats[category.value] = sum(1 for r in all_resources if r["category"] == category)
+        category_stats[category.value] = category_counts.get(category.value, 0)
     
     # 按能力统计
     competency_stats = {}
@@ -508,19 +473,19 @@ async def get_resource_stats(current_user: dict = Depends(get_current_user)):
     ]
     
     for competency in competencies:
-        competency_stats[competency] = sum(1 for r in all_resources if r["competency"] == competency)
+        competency_stats[competency] = competency_counts.get(competency, 0)
     
     # 按难度统计
     difficulty_stats = {}
     difficulties = ["beginner", "intermediate", "advanced"]
     
     for difficulty in difficulties:
-        difficulty_stats[difficulty] = sum(1 for r in all_resources if r["difficulty"] == difficulty)
+        difficulty_stats[difficulty] = difficulty_counts.get(difficulty, 0)
     
     return {
-        "total_resources": len(all_resources),
+        "total_resources": len(resource_store),
         "category_distribution": category_stats,
         "competency_distribution": competency_stats,
         "difficulty_distribution": difficulty_stats,
-        "latest_resources": sorted(all_resources, key=lambda x: x["created_at"], reverse=True)[:5]
-    } 
\ No newline at end of file
+        "latest_resources": resource_store.latest(5)
+    }
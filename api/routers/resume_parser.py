@@ -16,6 +16,10 @@ from api.routers.users import get_current_user
 
 # 数据访问层
 from src.data.resume_dao import get_resume_dao
+from src.data.resume_sections import compute_section_hashes, diff_section_hashes
+
+# 重复请求合并
+from src.tools.single_flight import get_single_flight, celery_task_failed
 
 # 工作流
 from src.workflows.resume_analysis_workflow import get_resume_analysis_workflow
@@ -118,6 +122,8 @@ class UserProfileResponse(BaseModel):
     success: bool
     message: str
     profile_id: Optional[str] = None
+    celery_task_id: Optional[str] = None
+    coalesced: bool = False  # 是否合并到已有的相同请求
     error: Optional[str] = None
 
 # ==================== 简历CRUD API ====================
@@ -202,9 +208,9 @@ async def update_resume(resume_id: str, request: ResumeCreateRequest, current_us
         # 获取现有简历并检查权限
         existing_resume = dao.get_resume_with_permission_check(resume_id, current_user["id"])
         
-        # 更新版本号
+        # 记录旧版本号和板块哈希（版本号由DAO保存时递增）
         old_version = existing_resume.get("version", "v1")
-        new_version = f"v{int(old_version.replace('v', '')) + 1}" if old_version.startswith('v') else "v2"
+        old_hashes = existing_resume.get("section_hashes") or compute_section_hashes(existing_resume)
         
         # 更新数据
         existing_resume.update({
@@ -215,9 +221,7 @@ async def update_resume(resume_id: str, request: ResumeCreateRequest, current_us
             "education": request.education,
             "projects": request.projects,
             "skills": request.skills,
-            "internship": request.internship,
-            "updated_at": datetime.now().isoformat(),
-            "version": new_version
+            "internship": request.internship
         })
         
         # 1. 立即保存更新后的简历数据
@@ -228,10 +232,31 @@ async def update_resume(resume_id: str, request: ResumeCreateRequest, current_us
         
         logger.info(f"✅ 简历更新成功，立即可查看: {resume_id}")
         
-        # 2. 标记旧版本JD分析为过时，并启动新的并行基础分析
-        dao.mark_jd_analysis_stale(resume_id, old_version)
+        # 2. 对比板块哈希，只有JD匹配依赖的板块变化时才标记旧JD分析过时
+        diff = diff_section_hashes(old_hashes, existing_resume["section_hashes"])
+        logger.info(f"🧩 简历变化板块: {resume_id} {diff['changed_sections']}")
         
-        # 使用Celery启动新的并行基础分析
+        if diff["jd_analysis_stale"]:
+            dao.mark_jd_analysis_stale(resume_id, old_version)
+            jd_analysis_status = "stale_available"  # 有过时的JD分析可用
+        else:
+            dao.carry_forward_jd_analysis(resume_id, old_version, existing_resume["version"])
+            jd_analysis_status = "up_to_date"
+        
+        if not diff["rerun_star"] and not diff["rerun_profile"]:
+            # 分析依赖的板块都未变化，沿用上一版本的分析结果
+            response_data = existing_resume.copy()
+            response_data["jd_analysis_status"] = jd_analysis_status
+            response_data["changed_sections"] = diff["changed_sections"]
+            
+            return ResumeCreateResponse(
+                success=True,
+                message="简历更新成功！分析相关内容未变化，沿用已有分析结果",
+                resume_id=resume_id,
+                data=response_data
+            )
+        
+        # 使用Celery启动增量基础分析（只重新分析变化的板块）
         basic_analysis_id = f"basic_analysis_{resume_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         user_data = {
@@ -245,7 +270,8 @@ async def update_resume(resume_id: str, request: ResumeCreateRequest, current_us
             basic_analysis_id,
             resume_id,
             existing_resume,
-            user_data
+            user_data,
+            incremental=diff
         )
         
         logger.info(f"🚀 [Celery] 简历更新后并行基础分析任务已发送: {basic_analysis_id}, 任务ID: {celery_task.id}")
@@ -255,7 +281,8 @@ async def update_resume(resume_id: str, request: ResumeCreateRequest, current_us
         response_data["basic_analysis_id"] = basic_analysis_id
         response_data["celery_task_id"] = celery_task.id
         response_data["analysis_status"] = "PROCESSING"
-        response_data["jd_analysis_status"] = "stale_available"  # 有过时的JD分析可用
+        response_data["jd_analysis_status"] = jd_analysis_status
+        response_data["changed_sections"] = diff["changed_sections"]
         
         return ResumeCreateResponse(
             success=True,
@@ -399,26 +426,41 @@ async def analyze_resume(
         
         logger.info(f"成功加载简历数据: {resume_data.get('version_name', '未知')}")
         
-        # 生成JD匹配分析任务ID
-        jd_analysis_id = f"jd_analysis_{resume_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        jd_content = request.jd_content.strip()
         
-        # 使用Celery启动JD匹配分析任务 - 不会阻塞主线程
-        celery_task = process_jd_matching_analysis.delay(
-            jd_analysis_id,
+        def launch(flight_key: str) -> Dict:
+            # 生成JD匹配分析任务ID
+            jd_analysis_id = f"jd_analysis_{resume_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            
+            # 使用Celery启动JD匹配分析任务 - 不会阻塞主线程
+            celery_task = process_jd_matching_analysis.delay(
+                jd_analysis_id,
+                resume_id,
+                resume_data,
+                jd_content,
+                flight_key=flight_key
+            )
+            
+            logger.info(f"🚀 [Celery] JD匹配分析任务已发送: {jd_analysis_id}, 任务ID: {celery_task.id}")
+            return {"analysis_id": jd_analysis_id, "celery_task_id": celery_task.id}
+        
+        # 相同简历内容+JD的重复请求合并到进行中/刚完成的任务
+        flight = await get_single_flight().submit(
+            "jd_matching",
             resume_id,
-            resume_data,
-            request.jd_content.strip()
+            {"resume": compute_section_hashes(resume_data), "jd": jd_content},
+            launch,
+            is_stale=celery_task_failed
         )
         
-        logger.info(f"🚀 [Celery] JD匹配分析任务已发送: {jd_analysis_id}, 任务ID: {celery_task.id}")
-        
         return {
             "success": True,
-            "message": "JD智能匹配分析已开始，请稍候",
-            "analysis_id": jd_analysis_id,
-            "celery_task_id": celery_task.id,
+            "message": _flight_message(flight, "JD智能匹配分析已开始，请稍候", "JD匹配分析"),
+            "analysis_id": flight.get("analysis_id"),
+            "celery_task_id": flight.get("celery_task_id"),
             "analysis_type": "jd_matching",
-            "resume_id": resume_id
+            "resume_id": resume_id,
+            "coalesced": flight["coalesced"]
         }
         
     except HTTPException:
@@ -621,28 +663,46 @@ async def generate_user_profile(
         # 验证简历存在且属于当前用户  
         resume_data = dao.get_resume_with_permission_check(request.resume_id, current_user["id"])
         
-        # 生成画像ID
-        profile_id = f"profile_{request.resume_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        logger.info(f"🚀 启动用户画像异步生成: {profile_id}")
-        
-        # 使用Celery启动用户画像生成任务
-        celery_task = process_user_profile_generation.delay(
-            profile_id=profile_id,
-            resume_id=request.resume_id,
-            user_id=current_user["id"],
-            user_name=request.user_name,
-            target_position=request.target_position,
-            target_field=request.target_field,
-            resume_data=resume_data
+        def launch(flight_key: str) -> Dict:
+            # 生成画像ID
+            profile_id = f"profile_{request.resume_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            
+            logger.info(f"🚀 启动用户画像异步生成: {profile_id}")
+            
+            # 使用Celery启动用户画像生成任务
+            celery_task = process_user_profile_generation.delay(
+                profile_id=profile_id,
+                resume_id=request.resume_id,
+                user_id=current_user["id"],
+                user_name=request.user_name,
+                target_position=request.target_position,
+                target_field=request.target_field,
+                resume_data=resume_data,
+                flight_key=flight_key
+            )
+            
+            logger.info(f"🚀 [Celery] 用户画像生成任务已发送: {profile_id}, 任务ID: {celery_task.id}")
+            return {"profile_id": profile_id, "celery_task_id": celery_task.id}
+        
+        flight = await get_single_flight().submit(
+            "generate_profile",
+            request.resume_id,
+            {
+                "resume": compute_section_hashes(resume_data),
+                "user_name": request.user_name,
+                "target_position": request.target_position,
+                "target_field": request.target_field
+            },
+            launch,
+            is_stale=celery_task_failed
         )
         
-        logger.info(f"🚀 [Celery] 用户画像生成任务已发送: {profile_id}, 任务ID: {celery_task.id}")
-        
         return UserProfileResponse(
             success=True,
-            message="用户画像生成已启动，将在后台处理",
-            profile_id=profile_id
+            message=_flight_message(flight, "用户画像生成已启动，将在后台处理", "用户画像生成"),
+            profile_id=flight.get("profile_id"),
+            celery_task_id=flight.get("celery_task_id"),
+            coalesced=flight["coalesced"]
         )
         
     except HTTPException:
@@ -812,6 +872,14 @@ async def celery_health_check():
 
 # ==================== 辅助函数 ====================
 
+def _flight_message(flight: Dict, launched_message: str, name: str) -> str:
+    """请求合并结果对应的提示信息"""
+    if flight["state"] == "in_flight":
+        return f"相同的{name}正在进行中，已合并到现有任务"
+    if flight["state"] == "completed":
+        return f"相同的{name}刚刚完成，直接返回已有结果"
+    return launched_message
+
 def _get_target_field_from_position(position: str) -> str:
     """从目标职位推断目标领域"""
     field_mapping = {
@@ -0,0 +1,117 @@
+"""
+任务进度推送路由
+客户端通过SSE或WebSocket订阅Celery任务进度，代替轮询任务状态接口；
+进度事件来自Redis pub/sub，Redis不可用时由服务端低频查询结果后端。
+"""
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from src.tools.task_progress import TERMINAL_STATES, build_progress_event, get_progress_hub
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15.0
+FALLBACK_POLL_SECONDS = 2.0
+
+
+def _result_backend_event(task_id: str) -> Dict[str, Any]:
+    """从Celery结果后端读取一次任务状态，转换为进度事件"""
+    from src.celery_app import celery_app
+
+    result = celery_app.AsyncResult(task_id)
+    info = result.info
+    if result.state == "SUCCESS":
+        meta = {"progress": 100, "result": info}
+    elif result.state == "FAILURE":
+        meta = {"error": str(info)}
+    else:
+        meta = info if isinstance(info, dict) else {}
+    return build_progress_event(task_id, result.state, meta)
+
+
+async def task_event_stream(task_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """任务进度事件流，直到任务进入终态；产出None表示心跳"""
+    hub = get_progress_hub()
+
+    async with hub.subscribe(task_id) as queue:
+        if not hub.available:
+            # 降级：服务端低频查询结果后端（每个连接一个查询，而非客户端各自轮询）
+            last_state = None
+            while True:
+                event = await asyncio.to_thread(_result_backend_event, task_id)
+                if event["state"] != last_state or event["state"] == "PROGRESS":
+                    last_state = event["state"]
+                    yield event
+                if event["state"] in TERMINAL_STATES:
+                    return
+                await asyncio.sleep(FALLBACK_POLL_SECONDS)
+
+        # 先订阅再读取最近事件，避免两者之间发布的事件丢失
+        last = await hub.get_last_event(task_id)
+        if last is None:
+            last = await asyncio.to_thread(_result_backend_event, task_id)
+        yield last
+        if last["state"] in TERMINAL_STATES:
+            return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            yield event
+            if event["state"] in TERMINAL_STATES:
+                return
+
+
+@router.get("/{task_id}/events",
+            summary="订阅任务进度(SSE)",
+            description="以Server-Sent Events推送Celery任务进度，任务结束后自动关闭")
+async def stream_task_events(task_id: str):
+    """SSE推送任务进度"""
+
+    async def generate():
+        async for event in task_event_stream(task_id):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.websocket("/{task_id}/ws")
+async def task_events_websocket(websocket: WebSocket, task_id: str):
+    """WebSocket推送任务进度"""
+    await websocket.accept()
+    try:
+        async for event in task_event_stream(task_id):
+            if event is None:
+                await websocket.send_json({"type": "heartbeat"})
+            else:
+                await websocket.send_text(json.dumps({"type": "progress", **event}, ensure_ascii=False, default=str))
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"🔌 任务进度订阅断开: {task_id}")
+
+
+@router.get("/events/stats",
+            summary="进度推送统计",
+            description="本进程的进度订阅数和事件分发统计")
+async def task_events_stats():
+    return get_progress_hub().get_stats()
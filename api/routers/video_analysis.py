@@ -35,6 +35,8 @@ logger.setLevel(logging.DEBUG)
 
 # 多模态分析工具
 from src.tools.multimodal_analyzer import create_multimodal_analyzer, VideoAnalyzer, DEEPFACE_AVAILABLE
+from src.tools.visual_timeline import VisualTimeline
+from src.tools.frame_writer import get_frame_writer
 
 # 导入DeepFace用于调试分析
 try:
@@ -54,6 +56,7 @@ class RealTimeAnalysisManager:
         self.video_analyzer = VideoAnalyzer()
         self.frame_buffer = []  # 帧缓存
         self.analysis_results = []  # 分析结果缓存
+        self.timeline = VisualTimeline()  # 整场面试的列式时间线和在线统计
         self.max_buffer_size = 30  # 最多缓存30帧
         self.analysis_interval = 5  # 每5帧分析一次
         self.frame_count = 0
@@ -153,6 +156,7 @@ class RealTimeAnalysisManager:
             if analysis_result:
                 # 更新实时状态
                 self._update_realtime_state(analysis_result)
+                self._record_timeline(latest_frame_data['frame_id'], latest_frame_data['timestamp'], analysis_result)
                 
                 # 缓存结果
                 self.analysis_results.append({
@@ -186,12 +190,11 @@ class RealTimeAnalysisManager:
             if not debug_path:
                 debug_path = f"frame_{self.frame_count}"  # 使用备用标识符
             
-            # MediaPipe面部检测
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mediapipe_results = self.video_analyzer.face_mesh.process(rgb_frame)
+            # MediaPipe关键点检测（按帧缓存，后续体态和手势分析复用同一次推理结果）
+            landmarks = self.video_analyzer.get_frame_landmarks(frame)
             
-            if mediapipe_results.multi_face_landmarks:
-                face_landmarks = mediapipe_results.multi_face_landmarks[0]
+            if landmarks.face is not None:
+                face_landmarks = landmarks.face
                 
                 # 头部姿态分析
                 try:
@@ -258,34 +261,31 @@ class RealTimeAnalysisManager:
             return {}
     
     def _save_debug_frame(self, frame: np.ndarray) -> str:
-        """保存调试帧（循环覆盖模式）"""
+        """保存调试帧（提交到后台写入器，数量和容量由保留策略控制）"""
         if not self.debug_enabled:
             return ""
         
         try:
-            # 创建调试目录
+            writer = get_frame_writer()
             debug_dir = Path("data/debug_frames")
-            debug_dir.mkdir(parents=True, exist_ok=True)
             
             # 清理旧的调试文件（如果是第一次保存）
             if self.debug_frames_saved == 0:
                 self._cleanup_old_debug_files(debug_dir)
             
-            # 生成文件名（使用循环索引）
-            debug_index = self.debug_frames_saved % self.max_debug_frames
+            # 生成文件名
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
             filename = f"debug_frame_{timestamp}_{self.frame_count}.jpg"
-            filepath = debug_dir / filename
             
-            # 保存图像
-            success = cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            # 提交保存任务，队列满时丢弃
+            filepath = writer.submit_image(debug_dir / filename, frame, quality=95)
             
-            if success:
+            if filepath:
                 self.debug_frames_saved += 1
-                logger.debug(f"💾 调试帧已保存: {filepath} (总计: {self.debug_frames_saved})")
-                return str(filepath)
+                logger.debug(f"💾 调试帧已提交保存: {filepath} (总计: {self.debug_frames_saved})")
+                return filepath
             else:
-                logger.warning(f"⚠️ 调试帧保存失败: {filepath}")
+                logger.debug(f"⚠️ 写入队列已满，跳过调试帧: {filename}")
                 return ""
             
         except Exception as e:
@@ -293,13 +293,11 @@ class RealTimeAnalysisManager:
             return ""
     
     def _cleanup_old_debug_files(self, debug_dir: Path):
-        """清理旧的调试文件"""
-        try:
-            for file in debug_dir.glob("debug_frame_*"):
-                file.unlink()
-            logger.info("🧹 已清理旧的调试文件")
-        except Exception as e:
-            logger.warning(f"⚠️ 清理调试文件失败: {e}")
+        """清理旧的调试文件（在后台写入线程中执行）"""
+        if get_frame_writer().submit_cleanup(debug_dir, "debug_frame_*"):
+            logger.info("🧹 已提交旧调试文件清理任务")
+        else:
+            logger.warning("⚠️ 写入队列已满，跳过调试文件清理")
     
     def _analyze_emotion_with_debug(self, frame: np.ndarray, debug_path: str) -> Optional[Dict[str, Any]]:
         """带调试信息的情绪分析"""
@@ -327,25 +325,17 @@ class RealTimeAnalysisManager:
                 frame_for_analysis = cv2.resize(frame_for_analysis, (new_width, new_height))
                 logger.debug(f"🔄 图像缩放: {width}x{height} → {new_width}x{new_height}")
             
-            # 保存处理后的图像用于调试
-            processed_debug_path = debug_path.replace('.jpg', '_processed.jpg')
-            try:
-                # 确保目录存在
-                Path(processed_debug_path).parent.mkdir(parents=True, exist_ok=True)
-                
-                # 使用更稳定的保存方法
-                success = cv2.imwrite(processed_debug_path, frame_for_analysis, 
-                                    [cv2.IMWRITE_JPEG_QUALITY, 95])
-                
-                if success:
-                    logger.debug(f"💾 处理后图像已保存: {processed_debug_path}")
-                else:
-                    logger.warning(f"⚠️ 处理后图像保存失败: {processed_debug_path}")
-                    processed_debug_path = debug_path  # 使用原始路径作为fallback
-                    
-            except Exception as save_error:
-                logger.warning(f"⚠️ 保存处理后图像时出错: {save_error}")
-                processed_debug_path = debug_path  # 使用原始路径作为fallback
+            # 保存处理后的图像用于调试（后台写入，失败不影响分析）
+            processed_debug_path = debug_path
+            if debug_path.endswith(('.jpg', '.webp')):
+                submitted = get_frame_writer().submit_image(
+                    str(Path(debug_path).with_name(Path(debug_path).stem + '_processed.jpg')),
+                    frame_for_analysis,
+                    quality=95
+                )
+                if submitted:
+                    processed_debug_path = submitted
+                    logger.debug(f"💾 处理后图像已提交保存: {processed_debug_path}")
             
             # 使用DeepFace分析 - 尝试不同的检测器  
             current_backend = self.deepface_backends[self.current_backend_index]
@@ -436,30 +426,11 @@ class RealTimeAnalysisManager:
             if len(set(emotions.values())) < 3:
                 debug_result['problem_analysis']['potential_issues'].append("情绪分布单一，可能模型有问题")
             
-            # 保存JSON调试文件（可选，失败不影响分析）
+            # 保存JSON调试文件（后台写入，可选，失败不影响分析）
             if debug_path and debug_path != f"frame_{self.frame_count}":
-                try:
-                    debug_json_path = debug_path.replace('.jpg', '_analysis.json')
-                    
-                    # 使用自定义JSON编码器处理所有numpy类型
-                    class NumpyEncoder(json.JSONEncoder):
-                        def default(self, obj):
-                            if isinstance(obj, np.integer):
-                                return int(obj)
-                            elif isinstance(obj, np.floating):
-                                return float(obj)
-                            elif isinstance(obj, np.ndarray):
-                                return obj.tolist()
-                            elif isinstance(obj, np.bool_):
-                                return bool(obj)
-                            return super(NumpyEncoder, self).default(obj)
-                    
-                    with open(debug_json_path, 'w', encoding='utf-8') as f:
-                        json.dump(debug_result, f, ensure_ascii=False, indent=2, cls=NumpyEncoder)
-                        
-                    logger.debug(f"💾 JSON调试文件已保存: {debug_json_path}")
-                except Exception as json_error:
-                    logger.warning(f"⚠️ JSON调试文件保存失败: {json_error}")
+                debug_json_path = Path(debug_path).with_name(Path(debug_path).stem + '_analysis.json')
+                if get_frame_writer().submit_json(debug_json_path, debug_result):
+                    logger.debug(f"💾 JSON调试文件已提交保存: {debug_json_path}")
             
             logger.info(f"✅ 情绪分析完成: {dominant_emotion[0]} ({dominant_emotion[1]:.1f}%)")
             
@@ -573,6 +544,32 @@ class RealTimeAnalysisManager:
         except Exception as e:
             logger.error(f"❌ 更新实时状态失败: {e}")
     
+    def _record_timeline(self, frame_id: int, timestamp: float, analysis_result: Dict[str, Any]):
+        """将单帧分析结果写入时间线，在线更新整场统计"""
+        try:
+            if analysis_result.get('head_pose'):
+                self.timeline.add_head_pose(frame_id, timestamp, analysis_result['head_pose'])
+            if analysis_result.get('gaze'):
+                self.timeline.add_gaze(frame_id, timestamp, analysis_result['gaze'])
+            if analysis_result.get('emotion'):
+                self.timeline.add_emotion(frame_id, timestamp, analysis_result['emotion'])
+            if analysis_result.get('body_language'):
+                self.timeline.add_body_language(frame_id, timestamp, analysis_result['body_language'])
+            if analysis_result.get('gestures'):
+                self.timeline.add_gesture(frame_id, timestamp, analysis_result['gestures'])
+        except Exception as e:
+            logger.error(f"❌ 写入视觉时间线失败: {e}")
+    
+    def get_session_summary(self) -> Dict[str, Any]:
+        """获取当前面试的视觉统计汇总（基于在线聚合，随时可调用）"""
+        return {
+            'type': 'session_summary',
+            'timestamp': time.time(),
+            'frames_received': self.frame_count,
+            'statistics': self.timeline.summary(),
+            'counts': self.timeline.counts()
+        }
+    
     def _format_realtime_result(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
         """格式化为前端需要的实时结果"""
         return {
@@ -658,6 +655,7 @@ class RealTimeAnalysisManager:
         """重置会话"""
         self.frame_buffer.clear()
         self.analysis_results.clear()
+        self.timeline = VisualTimeline()
         self.frame_count = 0
         self.last_analysis_time = time.time()
         
@@ -864,6 +862,10 @@ async def handle_video_control_message(analyzer: RealTimeAnalysisManager, websoc
             if current_result:
                 await websocket.send_json(current_result)
         
+        elif command == "get_session_summary":
+            # 返回整场面试的视觉统计汇总
+            await websocket.send_json(analyzer.get_session_summary())
+        
         else:
             logger.warning(f"⚠️ 未知视频控制命令: {command}")
             
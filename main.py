@@ -15,7 +15,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # 原有API路由 (保持兼容性)
 from api.routers import users, interviews, assessments, resources, resume_parser
-from api.routers import questions, chat, langgraph_chat, voice_recognition, video_analysis
+from api.routers import questions, chat, langgraph_chat, voice_recognition, video_analysis, task_events
 # from api.websocket_server import websocket_endpoint  # 暂时禁用WebSocket以避免视频分析器问题
 from src.config.settings import system_config
 
@@ -105,15 +105,18 @@ async def lifespan(app: FastAPI):
         data_path = os.environ.get("LEARNING_RESOURCES_JSON", "data/learning_resources/learning_resources.json")
         if AUTO and os.path.exists(data_path):
             from src.tools.vector_search import create_learning_resource_manager
-            import json
             lrm = create_learning_resource_manager()
-            with open(data_path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-                if isinstance(raw, list) and raw:
-                    result = lrm.upsert_resources(raw, source="user_json_v1", version=os.environ.get("RES_VER","startup"), remove_stale=False)
-                    logger.info(f"✅ 学习资源已自动同步到向量库: upsert={result['upserted']}, removed={result['removed']}")
-                else:
-                    logger.info("ℹ️ 学习资源文件为空，跳过同步")
+            # 文件校验和未变化时跳过；否则只编码新增或变化的资源
+            result = lrm.ingest_resources_file(
+                data_path, source="user_json_v1", version=os.environ.get("RES_VER", "startup"), remove_stale=False
+            )
+            if result["skipped"]:
+                logger.info("ℹ️ 学习资源文件未变化，跳过向量库同步")
+            else:
+                logger.info(
+                    f"✅ 学习资源已增量同步到向量库: upsert={result['upserted']}, "
+                    f"unchanged={result['unchanged']}, relabeled={result['relabeled']}, removed={result['removed']}"
+                )
         else:
             logger.info("ℹ️ 跳过自动学习资源入库(配置关闭或文件不存在)")
     except Exception as e:
@@ -129,6 +132,30 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️ 实时多模态分析器初始化失败: {e}")
         app.state.realtime_analysis_available = False
     
+    # 模型预热（可选，MODEL_WARMUP_ON_STARTUP=true 时在后台线程中加载并空跑推理）
+    try:
+        from src.config.settings import model_config
+        if model_config.MODEL_WARMUP_ON_STARTUP:
+            import asyncio
+            from src.tools.model_registry import warm_up_models
+            app.state.model_warmup_task = asyncio.create_task(asyncio.to_thread(warm_up_models))
+            logger.info("🔥 模型预热已在后台启动")
+    except Exception as e:
+        logger.warning(f"⚠️ 启动模型预热失败: {e}")
+    
+    # 热门题目池后台补充（低峰时段执行）
+    app.state.question_pool_task = None
+    try:
+        from src.config.settings import model_config
+        if model_config.QUESTION_POOL_ENABLED:
+            import asyncio
+            app.state.question_pool_task = asyncio.create_task(
+                questions.run_question_pool_refill(model_config.QUESTION_POOL_REFILL_INTERVAL_SECONDS)
+            )
+            logger.info("🧺 题目池补充任务已启动")
+    except Exception as e:
+        logger.warning(f"⚠️ 启动题目池补充任务失败: {e}")
+    
     # 系统启动完成
     features = []
     if app.state.mcp_enabled:
@@ -156,6 +183,17 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠️ 关闭MCP服务器失败: {e}")
     
+    # 停止题目池补充任务
+    if getattr(app.state, 'question_pool_task', None) is not None:
+        app.state.question_pool_task.cancel()
+    
+    # 关闭任务进度订阅
+    try:
+        from src.tools.task_progress import get_progress_hub
+        await get_progress_hub().stop()
+    except Exception as e:
+        logger.warning(f"⚠️ 关闭任务进度订阅失败: {e}")
+    
     # 关闭持久化管理器
     try:
         from src.persistence.optimal_manager import persistence_manager
@@ -323,6 +361,7 @@ app.include_router(chat.router, prefix="/api/v1", tags=["💬 智能聊天 (v1)"
 app.include_router(langgraph_chat.router, prefix="/api/v1", tags=["💬 LangGraph智能体 (v1)"])
 app.include_router(voice_recognition.router, prefix="/api/v1/voice", tags=["🎤 语音识别 (v1)"])
 app.include_router(video_analysis.router, prefix="/api/v1/video", tags=["📹 视频分析 (v1)"])
+app.include_router(task_events.router, prefix="/api/v1/tasks", tags=["📡 任务进度 (v1)"])
 
 logger.info("传统架构路由 (v1) 已注册完成")
 
@@ -360,6 +399,8 @@ async def api_versions():
         },
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
+            "task_events": "/api/v1/tasks/{task_id}/events",
             "architecture": "/api/v1/architecture",
             "mcp_tools": "/api/v1/mcp/tools" if NEW_ARCHITECTURE_AVAILABLE else None,
             "mcp_resources": "/api/v1/mcp/resources" if NEW_ARCHITECTURE_AVAILABLE else None
@@ -441,6 +482,38 @@ async def health_check():
         }
 
 
+# 模型就绪检查接口
+@app.get("/ready", tags=["🔍 系统监控"])
+async def readiness_check():
+    """模型就绪检查 - 已加载模型、加载耗时和进程常驻内存"""
+    from src.config.settings import model_config
+    from src.tools.model_registry import get_model_registry
+    from src.tools.embedding_service import get_embedding_stats
+    from src.tools.llm_cache import get_llm_cache
+    from src.tools.single_flight import get_single_flight
+    from src.tools.question_pool import get_question_pool
+    
+    status = get_model_registry().status()
+    required = model_config.MODEL_WARMUP_MODELS if model_config.MODEL_WARMUP_ON_STARTUP else []
+    states = {name: status["models"].get(name, {}).get("state") for name in required}
+    failed = [name for name, state in states.items() if state == "failed"]
+    pending = [name for name, state in states.items() if state not in ("loaded", "warm", "failed")]
+    warmup_task = getattr(app.state, 'model_warmup_task', None)
+    
+    return {
+        # 必需模型加载失败的副本不可接收流量
+        "ready": not pending and not failed,
+        "warming_up": warmup_task is not None and not warmup_task.done(),
+        "pending_models": pending,
+        "failed_models": failed,
+        **status,
+        "embeddings": get_embedding_stats(),
+        "llm_cache": get_llm_cache().get_stats(),
+        "single_flight": get_single_flight().get_stats(),
+        "question_pool": get_question_pool().get_stats()
+    }
+
+
 # === MCP协议端点 (增强版) ===
 if NEW_ARCHITECTURE_AVAILABLE:
     @app.get("/api/v1/mcp/tools", tags=["🔧 MCP协议"])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+题库检索基准脚本
+
+功能:
+- 把 questions.json 中的题目写入临时目录下的独立 ChromaDB 集合（不影响正式题库）
+- 对 scripts/fixtures/question_retrieval_queries.json 中的查询分别用 vector / keyword / hybrid 模式检索
+- 输出每种模式的 Recall@k、可直接使用的题目数（相似度>0.3 或命中技能词）以及 p50/p95 检索延迟
+
+用法:
+  python scripts/benchmark_question_retrieval.py --k 5
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.chroma_manager import ChromaQuestionManager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT_DIR, "questions.json")
+DEFAULT_FIXTURE = os.path.join(ROOT_DIR, "scripts", "fixtures", "question_retrieval_queries.json")
+
+
+def load_corpus(manager: ChromaQuestionManager, path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    titles = []
+    for domain, positions in corpus.items():
+        for position, items in positions.items():
+            questions = [
+                {"type": "tech_basic", "title": item["question"], "points": [], "answer": item.get("answer", "")}
+                for item in items
+            ]
+            manager.store_questions(questions, {
+                "selected_skills": [], "difficulty_level": 2, "domain": domain, "position": position
+            })
+            titles.extend(question["title"] for question in questions)
+    return titles
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="题库检索召回率与延迟基准")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="题目语料 JSON")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="查询与相关性标注 JSON")
+    parser.add_argument("--k", type=int, default=5, help="检索返回数量")
+    args = parser.parse_args()
+
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        queries = json.load(f)["queries"]
+
+    with tempfile.TemporaryDirectory() as persist_dir:
+        manager = ChromaQuestionManager(persist_directory=persist_dir)
+        titles = load_corpus(manager, args.corpus)
+        manager.search_questions({"selected_skills": ["预热"]}, n_results=1)  # 加载索引和嵌入模型
+
+        report = {"corpus_size": len(titles), "queries": len(queries), "k": args.k, "modes": {}}
+        for mode in ("vector", "keyword", "hybrid"):
+            recalls, usable, latencies = [], [], []
+            for query in queries:
+                terms = [term.lower() for term in query["relevant_terms"]]
+                relevant = {title for title in titles if any(term in title.lower() for term in terms)}
+                start = time.perf_counter()
+                results = manager.search_questions(
+                    {"selected_skills": query["selected_skills"], "question_types": {}},
+                    n_results=args.k, mode=mode
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits = {q["title"] for q in results} & relevant
+                recalls.append(len(hits) / min(len(relevant), args.k) if relevant else 1.0)
+                usable.append(sum(1 for q in results if q.get("similarity_score", 0) > 0.3 or q.get("matched_skills")))
+            report["modes"][mode] = {
+                f"recall@{args.k}": round(statistics.mean(recalls), 3),
+                "avg_usable_results": round(statistics.mean(usable), 2),
+                "latency_p50_ms": round(percentile(latencies, 0.5), 2),
+                "latency_p95_ms": round(percentile(latencies, 0.95), 2)
+            }
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+题库近重复检测校验脚本
+
+功能:
+- 按 scripts/fixtures/question_dedup_pairs.json 校验标题近重复判断：
+  duplicates 中的改写题目必须被判为近重复，distinct 中的不同题目不能被合并
+- 统计 questions.json 语料中被判为近重复的题目对，便于人工复核阈值
+- 可选 --store: 在临时目录的独立 ChromaDB 集合中实际调用 store_questions，
+  校验改写题目复用已有题目的ID而不是重复入库（不影响正式题库）
+
+任一校验失败时以非零状态退出。
+
+用法:
+  python scripts/check_question_dedup.py
+  python scripts/check_question_dedup.py --store
+"""
+import os
+import sys
+import json
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.question_dedup import MinHashIndex, jaccard, title_shingles
+
+try:
+    from src.config.settings import model_config
+except ImportError:
+    model_config = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT_DIR, "questions.json")
+DEFAULT_FIXTURE = os.path.join(ROOT_DIR, "scripts", "fixtures", "question_dedup_pairs.json")
+
+
+def check_pairs(pairs, threshold, expect_duplicate):
+    """逐对检查索引判断，返回失败的题目对"""
+    failures = []
+    for first, second in pairs:
+        index = MinHashIndex(threshold)
+        index.add("first", title_shingles(first))
+        found = index.find_duplicate(title_shingles(second)) == "first"
+        similarity = jaccard(title_shingles(first), title_shingles(second))
+        status = "✅" if found == expect_duplicate else "❌"
+        print(f"{status} J={similarity:.2f} {first} | {second}")
+        if found != expect_duplicate:
+            failures.append([first, second])
+    return failures
+
+
+def corpus_duplicates(path, threshold):
+    """语料中被判为近重复的题目对"""
+    with open(path, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    titles = [item["question"] for positions in corpus.values() for items in positions.values() for item in items]
+    index = MinHashIndex(threshold)
+    pairs = []
+    for i, title in enumerate(titles):
+        duplicate = index.find_duplicate(title_shingles(title))
+        if duplicate is not None:
+            pairs.append([titles[int(duplicate)], title])
+        index.add(str(i), title_shingles(title))
+    return len(titles), pairs
+
+
+def check_store(pairs):
+    """在临时集合中实际入库，改写题目应复用已有题目的ID"""
+    from src.database.chroma_manager import ChromaQuestionManager
+
+    failures = []
+    request = {"selected_skills": [], "difficulty_level": 2}
+    with tempfile.TemporaryDirectory() as persist_dir:
+        manager = ChromaQuestionManager(persist_directory=persist_dir)
+        for first, second in pairs:
+            original = {"type": "tech_basic", "title": first, "points": []}
+            paraphrase = {"type": "tech_basic", "title": second, "points": []}
+            manager.store_questions([original], request)
+            manager.store_questions([paraphrase], request)
+            if paraphrase["id"] != original["id"]:
+                failures.append([first, second])
+        stored = manager.collection.count()
+    print(f"📦 入库校验: {len(pairs)} 对改写题目，集合中 {stored} 条记录，未合并 {len(failures)} 对")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="题库近重复检测校验")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="近重复/不同题目对 JSON")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="统计近重复题目对的语料 JSON")
+    parser.add_argument("--threshold", type=float,
+                        default=getattr(model_config, 'QUESTION_DEDUP_MIN_JACCARD', 0.8), help="Jaccard阈值")
+    parser.add_argument("--store", action="store_true", help="在临时ChromaDB集合中校验 store_questions")
+    args = parser.parse_args()
+
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    print("🔍 改写题目（应判为近重复）:")
+    missed = check_pairs(fixture["duplicates"], args.threshold, expect_duplicate=True)
+    print("🔍 不同题目（不应合并）:")
+    merged = check_pairs(fixture["distinct"], args.threshold, expect_duplicate=False)
+
+    report = {"threshold": args.threshold, "missed_duplicates": missed, "wrongly_merged": merged}
+    if os.path.exists(args.corpus):
+        corpus_size, pairs = corpus_duplicates(args.corpus, args.threshold)
+        report["corpus"] = {"size": corpus_size, "near_duplicate_pairs": pairs}
+    if args.store:
+        report["store_not_merged"] = check_store(fixture["duplicates"])
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if missed or merged or report.get("store_not_merged"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
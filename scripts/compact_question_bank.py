@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+题库压缩脚本
+
+功能:
+- 合并 interview_questions 集合中稳定ID相同或标题近重复(标题特征Jaccard)的题目，每组保留最早创建的一条
+- 保留的题目改用规范化标题生成的稳定ID，之后重复生成的题目会 upsert 到同一条记录
+- 可选: 重建集合，使HNSW索引和 chroma.sqlite3 只包含去重后的题目
+
+用法:
+  python scripts/compact_question_bank.py --dry-run
+  python scripts/compact_question_bank.py --rebuild
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.chroma_manager import chroma_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="题库去重压缩")
+    parser.add_argument("--dry-run", action="store_true", help="只统计重复题目，不修改集合")
+    parser.add_argument("--rebuild", action="store_true", help="重建集合以回收索引和存储空间")
+    args = parser.parse_args()
+
+    stats = chroma_manager.compact_questions(dry_run=args.dry_run, rebuild=args.rebuild)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
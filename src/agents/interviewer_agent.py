@@ -16,6 +16,7 @@ from langchain.schema.output_parser import StrOutputParser
 from ..models.spark_client import create_spark_chat_model
 from ..models.state import InterviewState, InterviewStage, ConversationTurn
 from ..tools.media_recorder import create_media_recorder
+from ..tools.llm_cache import get_llm_cache
 
 
 class InterviewerAgent:
@@ -253,11 +254,26 @@ class InterviewerAgent:
             # 构建上下文
             context = self._build_interview_context(state)
             
-            # 使用LangChain的问题生成链
-            response = self.question_chain.invoke({
+            # 使用LangChain的问题生成链（相同上下文的重复请求命中LLM响应缓存）
+            # 问题措辞按采样温度生成；同一上下文（同一题、同一段对话历史）只会是重试或重复提交，
+            # 回放上次生成的问题与重新采样同样可接受，且保证重试时候选人看到的问题不变
+            chain_input = {
                 "context": context,
                 "current_question": current_question.text
-            })
+            }
+            cache_prompt = self.question_prompt.format(
+                persona=self.interviewer_persona,
+                context=context,
+                current_question=current_question.text
+            )
+            response = get_llm_cache().cached(
+                "interview_question",
+                self.llm.model_name,
+                self.llm.temperature,
+                cache_prompt,
+                lambda: self.question_chain.invoke(chain_input),
+                allow_nonzero_temperature=True
+            )
             
             return {
                 "question": response.strip(),
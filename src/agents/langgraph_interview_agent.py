@@ -74,6 +74,8 @@ from src.tools.chat_message_history_manager import (
     get_conversation_context,
     clear_session_messages
 )
+from src.tools.report_map_reduce import ReportMapReducer, create_report_map_reducer, split_conversation_segments
+from src.config.settings import model_config
 from src.tools.langchain_mcp_tools import (
     EmotionAnalysisTool,
     StructuredInfoExtractionTool,
@@ -380,6 +382,8 @@ class LangGraphInterviewAgent:
             # 使用真实的星火ChatModel，适合面试对话场景
             self.model = create_spark_model(model_type="chat", temperature=0.7)
             self.mcp_tool = MCPIntegrationTool()
+            # 面试报告 Map-Reduce 生成器（每轮回答后在后台评估问答片段）
+            self.report_reducer = create_report_map_reducer(self.model)
             
             logger.info("✅ 真实星火ChatModel初始化成功")
             logger.info(f"✅ Redis缓存管理器初始化: {self.cache_manager.health_check()}")
@@ -907,6 +911,9 @@ class LangGraphInterviewAgent:
                         add_ai_message(session_id, response)
                         logger.debug(f"📝 AI回复已保存到SQLite: {session_id}")
                         
+                        # 刚完成的问答片段提前评估，结束面试时报告只需合并
+                        self._prefetch_report_segments(session_id, user_name, target_position)
+                        
                         return {
                             "success": True,
                             "response": response,
@@ -1515,7 +1522,9 @@ class LangGraphInterviewAgent:
             logger.info(f"📊 开始生成面试报告: {session_id}")
             
             # 1. 获取完整的会话历史
-            conversation_history = get_conversation_context(session_id, max_messages=100)
+            conversation_history = get_conversation_context(
+                session_id, max_messages=getattr(model_config, 'REPORT_MAX_MESSAGES', 400)
+            )
             
             if len(conversation_history) < 2:
                 return {
@@ -1585,152 +1594,49 @@ class LangGraphInterviewAgent:
             return f"感谢{user_name}参加今天的{target_position}面试！您的表现很出色，我们会在3个工作日内给您反馈。祝您求职顺利！"
     
     async def _analyze_conversation_for_report(self, conversation_history: List, user_name: str, target_position: str) -> Dict[str, Any]:
-        """使用大模型分析会话历史生成报告数据"""
+        """Map-Reduce 生成报告数据：逐段评估（面试中已在后台完成的片段直接复用）后合并"""
+        segments = split_conversation_segments(conversation_history)
+        if not segments:
+            return self._generate_fallback_report(user_name, target_position, len(conversation_history))
+        
         try:
-            # 构建分析提示
-            analysis_prompt = f"""你是一名资深的HR专家和面试官，需要基于面试对话生成详细的面试评估报告。
-
-候选人信息：
-- 姓名：{user_name}  
-- 应聘职位：{target_position}
-
-面试对话历史：
-{self._format_conversation_for_analysis(conversation_history)}
-
-**重要要求：**
-1. 请严格基于面试对话内容进行真实评估，不要使用任何预设值
-2. 所有评分必须客观反映候选人的实际表现
-3. 只返回JSON格式数据，不要添加任何解释文字
-4. 如果某项能力在对话中未体现，给予合理的中性评分
-
-请分析面试对话，返回标准JSON格式的评估报告：
-
-{{
-    "basic_info": {{
-        "candidate_name": "候选人姓名",
-        "position": "应聘职位",
-        "interview_time": "面试时间(YYYY-MM-DD HH:MM格式)",
-        "duration_minutes": "面试时长(根据对话轮数估算，一般15-60分钟)",
-        "overall_grade": "综合等级(A优秀/B良好/C中等/D待提升)",
-        "overall_score": "总分(0-100分，基于各项能力综合计算)"
-    }},
-    "core_competencies": {{
-        "overall_score": "总分(与basic_info中的overall_score一致)",
-        "detailed_scores": {{
-            "professional_knowledge": {{
-                "score": "专业知识评分(0-100)",
-                "level": "能力等级(优秀/良好/中等/待提升)",
-                "description": "基于对话内容的具体评价"
-            }},
-            "skill_matching": {{
-                "score": "技能匹配度评分(0-100)",
-                "level": "匹配程度等级",
-                "description": "技能与目标职位的匹配度评价"
-            }},
-            "language_expression": {{
-                "score": "语言表达能力评分(0-100)",
-                "level": "表达能力等级",
-                "description": "语言表达、逻辑性、条理性评价"
-            }},
-            "logical_thinking": {{
-                "score": "逻辑思维能力评分(0-100)",
-                "level": "思维能力等级",
-                "description": "分析问题、逻辑推理能力评价"
-            }},
-            "innovation_ability": {{
-                "score": "创新能力评分(0-100)",
-                "level": "创新能力等级",
-                "description": "创新思维、解决问题能力评价"
-            }},
-            "stress_resistance": {{
-                "score": "应变抗压能力评分(0-100)",
-                "level": "抗压能力等级",
-                "description": "面试表现稳定性、应变能力评价"
-            }}
-        }}
-    }},
-    "strengths_weaknesses": {{
-        "strengths": [
-            {{
-                "title": "优势能力标题",
-                "description": "基于对话内容的详细优势描述"
-            }}
-        ],
-        "weaknesses": [
-            {{
-                "title": "待提升能力标题",
-                "description": "基于对话内容的具体改进建议"
-            }}
-        ]
-    }},
-    "improvement_suggestions": {{
-        "learning_resources": [
-            {{
-                "title": "学习资源标题",
-                "description": "具体的学习资源描述",
-                "type": "资源类型(book/video/course/platform)"
-            }}
-        ],
-        "improvement_methods": [
-            {{
-                "title": "提升方法标题",
-                "description": "具体的能力提升方法建议"
-            }}
-        ],
-        "learning_path": [
-            {{
-                "stage": "学习阶段序号(1,2,3...)",
-                "title": "学习阶段标题",
-                "duration": "建议学习时长(如: 2-4周, 1个月)",
-                "description": "该阶段的具体学习内容和目标"
-            }}
-        ]
-    }},
-    "related_assessments": [
-        {{
-            "title": "相关测评标题",
-            "description": "测评内容描述",
-            "url": "./assessment-options.html",
-            "rating": "推荐星级(1-5)",
-            "duration_minutes": "预计用时(分钟)"
-        }}
-    ]
-}}
-
-**请基于真实面试对话进行客观评估，所有数值和评价都必须有根据。直接返回JSON数据：**"""
-            
-            # 调用大模型分析
-            messages = [SystemMessage(content=analysis_prompt)]
-            chat_result = await self.model._agenerate(messages)
-            analysis_result = chat_result.generations[0].message.content
-            
-            # 调试输出：打印大模型原始返回内容
-            logger.info(f"🔍 大模型原始返回内容:")
-            logger.info("=" * 50)
-            logger.info(analysis_result)
-            logger.info("=" * 50)
-            
-            # 尝试清理和解析JSON
-            try:
-                # 尝试提取JSON部分（可能包含其他文本）
-                cleaned_result = self._extract_json_from_text(analysis_result)
-                if cleaned_result:
-                    report_data = json.loads(cleaned_result)
-                    logger.info("✅ 大模型报告分析成功")
-                    return report_data
-                else:
-                    raise json.JSONDecodeError("无法提取有效JSON", analysis_result, 0)
-                
-            except json.JSONDecodeError as e:
-                logger.warning(f"⚠️ 大模型返回非JSON格式，JSON解析错误: {e}")
-                logger.warning(f"📝 原始返回内容（前200字符）: {analysis_result[:200]}...")
-                # 降级到简化报告
-                return self._generate_fallback_report(user_name, target_position, len(conversation_history))
-                
+            # Map：各问答片段并发评估
+            evaluations = await self.report_reducer.map_segments(segments, user_name, target_position)
+            logger.info(f"🧩 片段评估完成: {sum(1 for e in evaluations if e)}/{len(segments)}")
         except Exception as e:
-            logger.error(f"❌ 大模型分析失败: {e}")
-            # 降级到简化报告
+            logger.error(f"❌ 片段评估失败: {e}")
             return self._generate_fallback_report(user_name, target_position, len(conversation_history))
+        
+        try:
+            # Reduce：聚合评分并撰写报告文字
+            report_data = await self.report_reducer.reduce(
+                segments, evaluations, user_name, target_position, len(conversation_history)
+            )
+            logger.info("✅ 大模型报告分析成功")
+            return report_data
+        except Exception as e:
+            logger.warning(f"⚠️ 报告合并阶段失败，使用片段聚合结果: {e}")
+        
+        # 降级：评分仍来自片段聚合，文字建议使用通用模板
+        aggregated = ReportMapReducer.aggregate(evaluations)
+        fallback_report = self._generate_fallback_report(user_name, target_position, len(conversation_history))
+        if not aggregated["evaluated_segments"]:
+            return fallback_report
+        
+        report_data = ReportMapReducer.compose_report(
+            aggregated, {}, user_name, target_position, len(conversation_history)
+        )
+        report_data["improvement_suggestions"] = fallback_report["improvement_suggestions"]
+        report_data["related_assessments"] = fallback_report["related_assessments"]
+        return report_data
+    
+    def _prefetch_report_segments(self, session_id: str, user_name: str, target_position: str):
+        """每轮回答提交后在后台评估刚完成的问答片段，结束面试时报告只需合并"""
+        try:
+            recent_messages = get_conversation_context(session_id, max_messages=4)
+            self.report_reducer.prefetch(recent_messages, user_name, target_position)
+        except Exception as e:
+            logger.debug(f"片段预评估跳过: {e}")
     
     def _format_conversation_for_summary(self, conversation_history: List) -> str:
         """格式化对话历史用于总结"""
@@ -1743,17 +1649,6 @@ class LangGraphInterviewAgent:
         
         return "\n".join(formatted_lines)
     
-    def _format_conversation_for_analysis(self, conversation_history: List) -> str:
-        """格式化对话历史用于分析"""
-        formatted_lines = []
-        for i, msg in enumerate(conversation_history):
-            if isinstance(msg, HumanMessage):
-                formatted_lines.append(f"Q{(i//2)+1} 候选人回答: {msg.content}")
-            elif isinstance(msg, AIMessage):
-                formatted_lines.append(f"Q{(i//2)+1} 面试官提问: {msg.content}")
-        
-        return "\n".join(formatted_lines)
-    
     def _extract_json_from_text(self, text: str) -> Optional[str]:
         """从文本中提取JSON部分"""
         try:
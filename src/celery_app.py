@@ -3,11 +3,42 @@ Celery应用配置
 解决异步分析任务阻塞主线程的问题
 """
 import os
-from celery import Celery
+import sys
+from celery import Celery, Task
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+
+
+class ProgressTask(Task):
+    """任务基类：update_state 的进度元数据同时发布到Redis pub/sub，API通过SSE/WebSocket推送给客户端；
+    带 flight_key 参数的任务结束时同步更新请求合并状态"""
+
+    def update_state(self, task_id=None, state=None, meta=None, **kwargs):
+        super().update_state(task_id=task_id, state=state, meta=meta, **kwargs)
+        # 终态由 on_success/on_failure 在结果写入后发布
+        if state not in ("SUCCESS", "FAILURE"):
+            from src.tools.task_progress import publish_task_progress
+            publish_task_progress(task_id or self.request.id, state, meta)
+
+    def on_success(self, retval, task_id, args, kwargs):
+        from src.tools.task_progress import publish_task_progress
+        publish_task_progress(task_id, "SUCCESS", {"progress": 100, "result": retval})
+        # 经请求合并投递的任务：保存结果，后续相同请求直接返回
+        if kwargs and kwargs.get("flight_key"):
+            from src.tools.single_flight import get_single_flight
+            get_single_flight().complete(kwargs["flight_key"], retval)
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        from src.tools.task_progress import publish_task_progress
+        publish_task_progress(task_id, "FAILURE", {"error": str(exc)})
+        if kwargs and kwargs.get("flight_key"):
+            from src.tools.single_flight import get_single_flight
+            get_single_flight().release(kwargs["flight_key"])
+
 
 # 创建Celery应用实例
 celery_app = Celery(
     "resume_analysis_worker",
+    task_cls=ProgressTask,
     broker="redis://localhost:6379/0",  # Redis作为消息代理
     backend="redis://localhost:6379/0",  # Redis作为结果后端
     include=[
@@ -32,11 +63,12 @@ celery_app.conf.update(
         "src.celery_tasks.analysis_tasks.process_parallel_basic_analysis": {"queue": "analysis"},
         "src.celery_tasks.profile_tasks.process_user_profile_generation": {"queue": "profile"},
         "src.celery_tasks.interview_tasks.process_interview_analysis": {"queue": "interview"},
-        "src.celery_tasks.interview_tasks.process_interview_report": {"queue": "interview"}
+        "src.celery_tasks.interview_tasks.process_interview_report": {"queue": "interview"},
+        "src.celery_tasks.interview_tasks.process_turn_evaluation": {"queue": "interview"}
     },
     
-    # 并发配置
-    worker_concurrency=2,  # 每个worker进程数
+    # 并发配置（按队列启动worker时由 QUEUE_WORKER_CONFIG 覆盖）
+    worker_concurrency=int(os.getenv("CELERY_WORKER_CONCURRENCY", 2)),  # 每个worker并发数
     worker_prefetch_multiplier=1,  # 预取任务数
     
     # 任务过期配置
@@ -75,11 +107,112 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.info("🚀 Celery应用初始化完成")
 
+# 各队列的worker池类型和并发数
+# analysis/profile 以等待LLM响应为主：线程池中的任务共享进程内常驻事件循环和连接池，可高并发
+# interview 以CPU密集的多模态分析为主：并发较低，模态分析自身在独立进程池中执行
+QUEUE_WORKER_CONFIG = {
+    "analysis": {
+        "pool": os.getenv("CELERY_ANALYSIS_POOL", "threads"),
+        "concurrency": int(os.getenv("CELERY_ANALYSIS_CONCURRENCY", 8))
+    },
+    "profile": {
+        "pool": os.getenv("CELERY_PROFILE_POOL", "threads"),
+        "concurrency": int(os.getenv("CELERY_PROFILE_CONCURRENCY", 4))
+    },
+    "interview": {
+        "pool": os.getenv("CELERY_INTERVIEW_POOL", "threads"),
+        "concurrency": int(os.getenv("CELERY_INTERVIEW_CONCURRENCY", 2))
+    }
+}
+
+
+def start_queue_worker(queue: str, extra_args=None):
+    """按队列配置启动worker（如 python -m src.celery_app analysis）"""
+    config = QUEUE_WORKER_CONFIG[queue]
+    argv = [
+        "worker",
+        "--loglevel=info",
+        f"--queues={queue}",
+        f"--pool={config['pool']}",
+        f"--concurrency={config['concurrency']}",
+        f"--hostname={queue}@%h"
+    ]
+    celery_app.worker_main(argv + list(extra_args or []))
+
+
+def _consumed_queues():
+    """当前worker消费的队列名（未通过 -Q 指定时返回None）"""
+    try:
+        consume_from = celery_app.amqp.queues.consume_from
+        return list(consume_from.keys()) if consume_from else None
+    except Exception:
+        return None
+
+
+def _bootstrap_worker_process():
+    """worker执行进程初始化：预热模型、启动常驻事件循环、创建工作流对象"""
+    from src.config.settings import model_config
+    from src.celery_tasks.worker_runtime import get_worker_loop, warm_up_workflows
+
+    queues = _consumed_queues()
+    # 只有面试队列使用本地模型：仅在显式消费面试队列（-Q interview）时预热，
+    # 未指定 -Q 的通用worker和纯LLM队列的worker不在每个子进程中加载全部模型
+    if getattr(model_config, 'MODEL_WARMUP_IN_WORKER', True) and queues is not None and "interview" in queues:
+        try:
+            from src.tools.model_registry import warm_up_models
+            warm_up_models()
+        except Exception as e:
+            logger.warning(f"⚠️ worker模型预热失败: {e}")
+
+    get_worker_loop()
+    warm_up_workflows(queues)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """prefork池：每个子进程启动时初始化，避免首个任务承担加载耗时"""
+    _bootstrap_worker_process()
+
+
+@worker_init.connect
+def init_worker(sender=None, **kwargs):
+    """threads/solo池：任务在主进程中执行，worker启动时初始化"""
+    pool_cls = getattr(sender, "pool_cls", "")
+    if "prefork" in str(pool_cls) or "processes" in str(pool_cls):
+        return
+    _bootstrap_worker_process()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_runtime(**kwargs):
+    """worker退出时关闭常驻事件循环和异步LLM客户端"""
+    from src.celery_tasks.worker_runtime import shutdown_worker_loop
+    shutdown_worker_loop()
+
+
 # 健康检查任务
 @celery_app.task(name="src.celery_app.health_check")
 def health_check():
     """Celery健康检查任务"""
     return {"status": "healthy", "message": "Celery worker正常运行"}
 
+
+@celery_app.task(name="src.celery_app.model_status")
+def model_status():
+    """查询worker进程内已加载的模型及常驻内存"""
+    from src.tools.model_registry import get_model_registry
+    return get_model_registry().status()
+
+
+@celery_app.task(name="src.celery_app.llm_cache_stats")
+def llm_cache_stats():
+    """查询worker进程内LLM响应缓存的命中统计"""
+    from src.tools.llm_cache import get_llm_cache
+    return get_llm_cache().get_stats()
+
 if __name__ == "__main__":
-    celery_app.start()
+    if len(sys.argv) > 1 and sys.argv[1] in QUEUE_WORKER_CONFIG:
+        start_queue_worker(sys.argv[1], sys.argv[2:])
+    else:
+        celery_app.start()
@@ -4,18 +4,20 @@
 """
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from celery import current_task
 from src.celery_app import celery_app
 from src.data.resume_dao import get_resume_dao
 from src.workflows.resume_analysis_workflow import get_resume_analysis_workflow
+from src.celery_tasks.worker_runtime import run_async
 
 logger = logging.getLogger(__name__)
 
 @celery_app.task(bind=True, name="src.celery_tasks.analysis_tasks.process_jd_matching_analysis")
-def process_jd_matching_analysis(self, jd_analysis_id: str, resume_id: str, resume_data: Dict, jd_content: str):
-    """异步处理JD匹配分析 - Celery任务版本"""
+def process_jd_matching_analysis(self, jd_analysis_id: str, resume_id: str, resume_data: Dict, jd_content: str,
+                                 flight_key: Optional[str] = None):
+    """异步处理JD匹配分析 - Celery任务版本（flight_key 由任务基类用于请求合并）"""
     try:
         logger.info(f"🔍 [Celery] 开始JD匹配分析: {jd_analysis_id}")
         
@@ -28,22 +30,15 @@ def process_jd_matching_analysis(self, jd_analysis_id: str, resume_id: str, resu
         # 使用工作流进行JD匹配分析
         workflow = get_resume_analysis_workflow()
         
-        # 注意：这里需要同步调用，因为Celery任务本身是在独立进程中
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                workflow.analyze_jd_matching(
-                    resume_id=resume_id,
-                    resume_data=resume_data,
-                    jd_content=jd_content,
-                    analysis_id=jd_analysis_id
-                )
+        # 在worker常驻事件循环上执行，复用LLM连接池
+        result = run_async(
+            workflow.analyze_jd_matching(
+                resume_id=resume_id,
+                resume_data=resume_data,
+                jd_content=jd_content,
+                analysis_id=jd_analysis_id
             )
-        finally:
-            loop.close()
+        )
         
         # 更新进度
         self.update_state(
@@ -136,20 +131,14 @@ def process_star_analysis(self, star_analysis_id: str, resume_id: str, resume_da
         # 使用工作流进行STAR分析
         workflow = get_resume_analysis_workflow()
         
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                workflow.analyze_star_principle(
-                    resume_id=resume_id,
-                    resume_data=resume_data,
-                    analysis_id=star_analysis_id
-                )
+        # 在worker常驻事件循环上执行，复用LLM连接池
+        result = run_async(
+            workflow.analyze_star_principle(
+                resume_id=resume_id,
+                resume_data=resume_data,
+                analysis_id=star_analysis_id
             )
-        finally:
-            loop.close()
+        )
         
         # 更新进度
         self.update_state(
@@ -227,8 +216,13 @@ def process_star_analysis(self, star_analysis_id: str, resume_id: str, resume_da
         raise
 
 @celery_app.task(bind=True, name="src.celery_tasks.analysis_tasks.process_parallel_basic_analysis")
-def process_parallel_basic_analysis(self, basic_analysis_id: str, resume_id: str, resume_data: Dict, user_data: Dict):
-    """异步处理并行基础分析 - Celery任务版本"""
+def process_parallel_basic_analysis(self, basic_analysis_id: str, resume_id: str, resume_data: Dict, user_data: Dict,
+                                    incremental: Optional[Dict] = None):
+    """异步处理并行基础分析 - Celery任务版本
+    
+    incremental 为简历更新时的板块差异（diff_section_hashes 的结果），
+    只重新执行受影响的分析，STAR检测按条目合并到上一版本结果。
+    """
     try:
         logger.info(f"🚀 [Celery] 开始并行基础分析: {basic_analysis_id}")
         
@@ -251,20 +245,21 @@ def process_parallel_basic_analysis(self, basic_analysis_id: str, resume_id: str
         # 使用工作流进行并行基础分析
         workflow = get_resume_analysis_workflow()
         
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        previous_star_result = None
+        if incremental and incremental.get("rerun_star"):
+            previous_star_result = dao.get_latest_star_analysis(resume_id)
         
-        try:
-            result = loop.run_until_complete(
-                workflow.analyze_basic_parallel(
-                    resume_id=resume_id,
-                    resume_data=resume_data,
-                    user_data=user_data
-                )
+        # 在worker常驻事件循环上执行，复用LLM连接池
+        result = run_async(
+            workflow.analyze_basic_parallel(
+                resume_id=resume_id,
+                resume_data=resume_data,
+                user_data=user_data,
+                previous_star_result=previous_star_result,
+                rerun_star=incremental.get("rerun_star", True) if incremental else True,
+                rerun_profile=incremental.get("rerun_profile", True) if incremental else True
             )
-        finally:
-            loop.close()
+        )
         
         # 更新进度
         self.update_state(
@@ -278,7 +273,7 @@ def process_parallel_basic_analysis(self, basic_analysis_id: str, resume_id: str
             results = result["results"]
             
             # 保存STAR分析结果
-            if results["star_analysis"]["success"]:
+            if results["star_analysis"]["success"] and not results["star_analysis"].get("skipped"):
                 star_data = {
                     "analysis_id": result.get("star_analysis_id"),
                     "resume_id": resume_id,
@@ -295,7 +290,7 @@ def process_parallel_basic_analysis(self, basic_analysis_id: str, resume_id: str
                 dao.save_analysis(result.get("star_analysis_id"), star_data)
             
             # 保存用户画像结果
-            if results["user_profile"]["success"]:
+            if results["user_profile"]["success"] and not results["user_profile"].get("skipped"):
                 profile_data = results["user_profile"]["result"]
                 profile_data["worker_info"] = {
                     "task_id": self.request.id,
@@ -3,17 +3,36 @@
 包括多模态分析、报告生成等异步任务
 """
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from celery import current_task
 from src.celery_app import celery_app
+from src.database.interview_state_store import get_interview_state_store
 
 logger = logging.getLogger(__name__)
 
+# 分析/报告节点不依赖会话内的对话记忆，每个worker进程共享一个工作流实例
+_workflow = None
+_workflow_lock = threading.Lock()
+
+
+def get_task_workflow():
+    """获取本worker进程的面试工作流"""
+    global _workflow
+
+    if _workflow is None:
+        with _workflow_lock:
+            if _workflow is None:
+                from src.workflow import create_interview_workflow
+                _workflow = create_interview_workflow()
+
+    return _workflow
+
 @celery_app.task(bind=True, name="src.celery_tasks.interview_tasks.process_interview_analysis")
-def process_interview_analysis(self, session_id: str, task_id: str):
-    """异步处理面试分析任务 - Celery版本"""
+def process_interview_analysis(self, session_id: str, task_id: str, flight_key: Optional[str] = None):
+    """异步处理面试分析任务 - Celery版本（flight_key 由任务基类用于请求合并）"""
     try:
         logger.info(f"🔍 [Celery] 开始面试分析: session_id={session_id}, task_id={task_id}")
         
@@ -23,19 +42,16 @@ def process_interview_analysis(self, session_id: str, task_id: str):
             meta={"status": "正在进行多模态分析...", "progress": 10, "task_id": task_id}
         )
         
-        # 导入面试会话存储（需要在这里导入以避免循环依赖）
-        from api.routers.interviews import interview_sessions, task_status
-        
-        if session_id not in interview_sessions:
+        # 从共享存储加载会话状态
+        store = get_interview_state_store()
+        state = store.get_state(session_id)
+        if state is None:
             raise Exception(f"面试会话不存在: {session_id}")
         
-        session = interview_sessions[session_id]
-        state = session["state"]
-        workflow = session["workflow"]
+        workflow = get_task_workflow()
         
-        # 更新任务状态（使用全局状态存储）
-        if task_id in task_status:
-            task_status[task_id]["message"] = "执行分析节点..."
+        # 更新任务状态（使用共享状态存储）
+        store.update_task_status(task_id, message="执行分析节点...")
         
         # 更新Celery任务状态
         self.update_state(
@@ -47,15 +63,15 @@ def process_interview_analysis(self, session_id: str, task_id: str):
         analyzed_state = workflow._analysis_node(state)
         
         # 更新会话状态
-        session["state"] = analyzed_state
+        store.save_state(session_id, analyzed_state)
         
         # 更新任务状态
-        if task_id in task_status:
-            task_status[task_id].update({
-                "status": "completed",
-                "message": "多模态分析完成",
-                "completed_at": datetime.now()
-            })
+        store.update_task_status(
+            task_id,
+            status="completed",
+            message="多模态分析完成",
+            completed_at=datetime.now()
+        )
         
         # 更新Celery任务状态
         self.update_state(
@@ -81,16 +97,14 @@ def process_interview_analysis(self, session_id: str, task_id: str):
     except Exception as e:
         logger.error(f"❌ [Celery] 面试分析失败: session_id={session_id}, 错误: {e}")
         
-        # 导入面试会话存储
         try:
-            from api.routers.interviews import task_status
-            if task_id in task_status:
-                task_status[task_id].update({
-                    "status": "failed",
-                    "message": f"分析失败: {str(e)}",
-                    "completed_at": datetime.now()
-                })
-        except:
+            get_interview_state_store().update_task_status(
+                task_id,
+                status="failed",
+                message=f"分析失败: {str(e)}",
+                completed_at=datetime.now()
+            )
+        except Exception:
             pass
         
         # 更新Celery任务状态
@@ -108,9 +122,33 @@ def process_interview_analysis(self, session_id: str, task_id: str):
         raise
 
 
+@celery_app.task(bind=True, name="src.celery_tasks.interview_tasks.process_turn_evaluation")
+def process_turn_evaluation(self, session_id: str, turn_key: str):
+    """逐轮评估任务：回答提交后评估该轮（STAR/技能匹配/LLM评分）并写入共享状态存储"""
+    try:
+        state = get_interview_state_store().get_state(session_id)
+        if state is None:
+            raise Exception(f"面试会话不存在: {session_id}")
+        
+        evaluation = get_task_workflow().analysis_node.evaluate_session_turn(state, turn_key)
+        errors = list((evaluation or {}).get("errors", {}).values())
+        logger.info(f"✅ [Celery] 逐轮评估完成: session_id={session_id}, turn={turn_key}, 失败步骤={len(errors)}")
+        
+        return {
+            "success": evaluation is not None,
+            "session_id": session_id,
+            "turn_key": turn_key,
+            "errors": errors
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ [Celery] 逐轮评估失败: session_id={session_id}, turn={turn_key}, 错误: {e}")
+        raise
+
+
 @celery_app.task(bind=True, name="src.celery_tasks.interview_tasks.process_interview_report")
-def process_interview_report(self, session_id: str, task_id: str):
-    """异步处理面试报告生成任务 - Celery版本"""
+def process_interview_report(self, session_id: str, task_id: str, flight_key: Optional[str] = None):
+    """异步处理面试报告生成任务 - Celery版本（flight_key 由任务基类用于请求合并）"""
     try:
         logger.info(f"📊 [Celery] 开始生成面试报告: session_id={session_id}, task_id={task_id}")
         
@@ -120,23 +158,20 @@ def process_interview_report(self, session_id: str, task_id: str):
             meta={"status": "正在生成报告...", "progress": 10, "task_id": task_id}
         )
         
-        # 导入面试会话存储（需要在这里导入以避免循环依赖）
-        from api.routers.interviews import interview_sessions, task_status
-        
-        if session_id not in interview_sessions:
+        # 从共享存储加载会话状态
+        store = get_interview_state_store()
+        state = store.get_state(session_id)
+        if state is None:
             raise Exception(f"面试会话不存在: {session_id}")
         
-        session = interview_sessions[session_id]
-        state = session["state"]
-        workflow = session["workflow"]
+        workflow = get_task_workflow()
         
         # 检查是否已完成分析
         if not state.get("multimodal_analysis"):
             raise Exception("请先完成多模态分析")
         
-        # 更新任务状态（使用全局状态存储）
-        if task_id in task_status:
-            task_status[task_id]["message"] = "生成报告和学习路径..."
+        # 更新任务状态（使用共享状态存储）
+        store.update_task_status(task_id, message="生成报告和学习路径...")
         
         # 更新Celery任务状态
         self.update_state(
@@ -157,15 +192,15 @@ def process_interview_report(self, session_id: str, task_id: str):
         final_state = workflow._learning_path_node(report_state)
         
         # 更新会话状态
-        session["state"] = final_state
+        store.save_state(session_id, final_state)
         
         # 更新任务状态
-        if task_id in task_status:
-            task_status[task_id].update({
-                "status": "completed",
-                "message": "报告生成完成",
-                "completed_at": datetime.now()
-            })
+        store.update_task_status(
+            task_id,
+            status="completed",
+            message="报告生成完成",
+            completed_at=datetime.now()
+        )
         
         # 更新Celery任务状态
         self.update_state(
@@ -191,16 +226,14 @@ def process_interview_report(self, session_id: str, task_id: str):
     except Exception as e:
         logger.error(f"❌ [Celery] 面试报告生成失败: session_id={session_id}, 错误: {e}")
         
-        # 导入面试会话存储
         try:
-            from api.routers.interviews import task_status
-            if task_id in task_status:
-                task_status[task_id].update({
-                    "status": "failed",
-                    "message": f"报告生成失败: {str(e)}",
-                    "completed_at": datetime.now()
-                })
-        except:
+            get_interview_state_store().update_task_status(
+                task_id,
+                status="failed",
+                message=f"报告生成失败: {str(e)}",
+                completed_at=datetime.now()
+            )
+        except Exception:
             pass
         
         # 更新Celery任务状态
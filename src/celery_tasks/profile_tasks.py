@@ -3,7 +3,7 @@
 """
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from src.celery_app import celery_app
 from src.data.resume_dao import get_resume_dao
@@ -19,9 +19,10 @@ def process_user_profile_generation(
     user_name: str,
     target_position: str,
     target_field: str,
-    resume_data: Dict
+    resume_data: Dict,
+    flight_key: Optional[str] = None
 ):
-    """异步处理用户画像生成 - Celery任务版本"""
+    """异步处理用户画像生成 - Celery任务版本（flight_key 由任务基类用于请求合并）"""
     try:
         logger.info(f"🧠 [Celery] 开始生成用户画像: {profile_id}")
         
@@ -0,0 +1,103 @@
+"""
+Celery worker运行时
+每个worker进程持有一个常驻事件循环（在后台线程中运行），所有任务的协程都提交到该循环执行：
+异步LLM客户端的连接池和工作流对象在任务之间复用，
+线程池(--pool=threads)下同一进程内的多个LLM任务可以在同一个循环上并发等待网络IO。
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerEventLoop:
+    """常驻事件循环 - 在专用线程中 run_forever，任务线程通过 run() 提交协程并等待结果"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="worker-event-loop", daemon=True)
+        self._thread.start()
+        logger.info(f"✅ worker常驻事件循环已启动 (pid={self.pid})")
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """在常驻循环上执行协程，阻塞当前任务线程直到完成"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    def close(self, timeout: float = 5.0):
+        """关闭异步客户端并停止事件循环"""
+        if self.loop.is_closed():
+            return
+        try:
+            from src.models.spark_client import close_async_spark_client
+            self.run(close_async_spark_client(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ 关闭异步LLM客户端失败: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+        logger.info(f"🛑 worker常驻事件循环已停止 (pid={self.pid})")
+
+
+# 每个进程一个常驻事件循环（fork出的子进程按pid重新创建）
+_worker_loop: Optional[WorkerEventLoop] = None
+_worker_loop_lock = threading.Lock()
+
+
+def get_worker_loop() -> WorkerEventLoop:
+    """获取当前进程的常驻事件循环"""
+    global _worker_loop
+
+    if _worker_loop is None or _worker_loop.pid != os.getpid():
+        with _worker_loop_lock:
+            if _worker_loop is None or _worker_loop.pid != os.getpid():
+                _worker_loop = WorkerEventLoop()
+
+    return _worker_loop
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """在worker常驻事件循环上执行协程（替代每个任务新建/关闭事件循环）"""
+    return get_worker_loop().run(coro, timeout)
+
+
+def shutdown_worker_loop():
+    """worker进程退出时关闭常驻事件循环"""
+    global _worker_loop
+
+    with _worker_loop_lock:
+        if _worker_loop is not None and _worker_loop.pid == os.getpid():
+            _worker_loop.close()
+        _worker_loop = None
+
+
+def warm_up_workflows(queues: Optional[Iterable[str]] = None):
+    """按worker消费的队列预先创建工作流对象，首个任务无需承担初始化开销（未指定队列时全部预热）"""
+    queues = set(queues) if queues else {"analysis", "interview"}
+
+    if "analysis" in queues:
+        try:
+            from src.workflows.resume_analysis_workflow import get_resume_analysis_workflow
+            get_resume_analysis_workflow()
+        except Exception as e:
+            logger.warning(f"⚠️ 简历分析工作流预热失败: {e}")
+
+    if "interview" in queues:
+        try:
+            from src.celery_tasks.interview_tasks import get_task_workflow
+            get_task_workflow()
+        except Exception as e:
+            logger.warning(f"⚠️ 面试工作流预热失败: {e}")
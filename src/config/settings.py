@@ -67,13 +67,131 @@ class ModelConfig:
     MEDIAPIPE_CONFIDENCE = 0.5
     DEEPFACE_BACKEND = "opencv"
     
+    # 离线视频分析采样与并行配置
+    VIDEO_SAMPLE_STRIDE = 1  # 每隔多少帧分析一帧，1为全帧率
+    VIDEO_SAMPLE_FPS = None  # 按时间采样的目标帧率，设置后优先于步长
+    VIDEO_ANALYSIS_WORKERS = max(1, min(4, (os.cpu_count() or 1)))  # 分段并行进程数（进程内共享一个分段进程池）
+    VIDEO_MIN_SEGMENT_SECONDS = 60  # 单个分段的最短时长(秒)，过短的视频不切分
+    VIDEO_SEEK_STRIDE_THRESHOLD = 60  # 步长超过该帧数时使用seek代替逐帧grab
+    VIDEO_USE_HOLISTIC = False  # 使用MediaPipe Holistic单次推理代替FaceMesh/Pose/Hands三个图
+    
+    # 多模态并发分析配置
+    MULTIMODAL_USE_PROCESSES = True  # 视频/音频分析在独立进程中并发执行（守护进程中自动改用线程）
+    MULTIMODAL_PROCESS_WORKERS = 2  # 模态进程池大小（不超过CPU核数；模态子进程内视频分段顺序分析）
+    MULTIMODAL_VIDEO_TIMEOUT = 900  # 视频分析超时(秒)
+    MULTIMODAL_AUDIO_TIMEOUT = 600  # 音频分析超时(秒)
+    TEXT_ANALYSIS_TIMEOUT = 120  # 文本(STAR/技能)分析超时(秒)
+    INCREMENTAL_EVALUATION_ENABLED = os.getenv("INCREMENTAL_EVALUATION_ENABLED", "true").lower() == "true"  # 答题后投递逐轮评估任务（interview队列）
+    TURN_EVALUATION_WORKERS = 2  # 结束面试时补评缺失轮次的线程数
+    
     # 音频分析配置  
     AUDIO_SAMPLE_RATE = 16000
     AUDIO_CHUNK_SIZE = 1024
     
+    # 长音频流式分析配置
+    AUDIO_STREAMING_MIN_DURATION = 300  # 超过该时长(秒)自动启用分块流式分析
+    AUDIO_STREAMING_BLOCK_SECONDS = 30  # 每个分块的时长(秒)
+    AUDIO_STREAMING_WORKERS = max(1, min(4, (os.cpu_count() or 1)))  # 分块并行进程数
+    
+    # 关键帧/调试帧后台写入配置
+    FRAME_WRITER_QUEUE_SIZE = 64  # 写入队列长度，满时丢弃新任务
+    FRAME_WRITER_FORMAT = "jpg"  # 图像编码格式: jpg 或 webp
+    FRAME_WRITER_QUALITY = 85  # 图像编码质量 (0-100)
+    FRAME_WRITER_FLUSH_TIMEOUT = 30  # 返回关键帧路径前等待写盘完成的最长时间(秒)
+    FRAME_RETENTION_MAX_MB = 500  # data/analysis_frames 最大容量
+    FRAME_RETENTION_MAX_FILES = 5000  # data/analysis_frames 最大文件数
+    FRAME_RETENTION_MAX_AGE_HOURS = 24  # 帧文件最长保留时间
+    DEBUG_FRAME_RETENTION_MAX_MB = 100  # data/debug_frames 最大容量
+    DEBUG_FRAME_RETENTION_MAX_FILES = 150  # data/debug_frames 最大文件数
+    
     # 文本分析配置
     MAX_SEQUENCE_LENGTH = 512
     BERT_MODEL_NAME = "bert-base-chinese"
+    
+    # 共享嵌入服务配置
+    EMBEDDING_DEFAULT_MODEL = "all-MiniLM-L6-v2"  # 新建集合默认固定的嵌入模型
+    EMBEDDING_BATCH_SIZE = 64  # 单次推理的最大文本数
+    EMBEDDING_BATCH_WAIT_MS = 5.0  # 合并并发请求的等待窗口(毫秒)
+    EMBEDDING_RESULT_TIMEOUT = 120.0  # 等待批处理线程返回嵌入的最长时间(秒)
+    EMBEDDING_MEMORY_CACHE_SIZE = 10000  # 进程内LRU缓存条目数
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./data/cache/embeddings.sqlite")  # 磁盘缓存
+    
+    # 学习资源入库配置
+    LEARNING_RESOURCE_INGEST_BATCH_SIZE = int(os.getenv("LEARNING_RESOURCE_INGEST_BATCH_SIZE", 64))  # 每批编码并写入的资源数
+    
+    # 雷达图渲染配置（图模板复用 + 进程池 + 分数哈希缓存）
+    RADAR_CHART_FORMAT = os.getenv("RADAR_CHART_FORMAT", "png")  # 报告默认格式: png / svg
+    RADAR_CHART_DPI = 150  # PNG分辨率
+    RADAR_CHART_SIZE_INCHES = 6  # PNG画布边长(英寸)
+    RADAR_CHART_WORKERS = 1  # 渲染进程数
+    RADAR_CHART_CACHE_DIR = "./data/cache/radar_charts"
+    
+    # 模型注册表预热配置
+    MODEL_WARMUP_ON_STARTUP = os.getenv("MODEL_WARMUP_ON_STARTUP", "false").lower() == "true"  # API启动时预热
+    MODEL_WARMUP_IN_WORKER = os.getenv("MODEL_WARMUP_IN_WORKER", "true").lower() == "true"  # 显式消费面试队列(-Q interview)的Celery子进程启动时预热
+    MODEL_WARMUP_MODELS = [
+        name.strip() for name in os.getenv(
+            "MODEL_WARMUP_MODELS",
+            "star_classifier,skill_matcher,sentence_transformer:all-MiniLM-L6-v2,multimodal_analyzer"
+        ).split(",") if name.strip()
+    ]
+
+    # 题库去重配置
+    QUESTION_DEDUP_MIN_JACCARD = 0.8  # 标题特征（去套话后的英文词+中文二元组）Jaccard相似度不低于该值视为近重复
+
+    # 题库混合检索配置（BM25 + 向量检索，倒数排名融合）
+    QUESTION_SEARCH_MODE = os.getenv("QUESTION_SEARCH_MODE", "hybrid")  # hybrid / vector / keyword
+    QUESTION_SEARCH_RRF_K = 60  # RRF平滑常数，越大排名靠后的结果权重越高
+
+    # 热门题目池配置（按 难度+技能+题型 组合预生成题目）
+    QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "true").lower() == "true"
+    QUESTION_POOL_TOP_N = 20  # 维护题目池的热门组合数
+    QUESTION_POOL_TARGET_SIZE = 30  # 每个组合补充到的题目数
+    QUESTION_POOL_LOW_WATERMARK = 10  # 低于该数量时触发补充
+    QUESTION_POOL_REFILL_HOURS = (1, 6)  # 低峰补充时段 [开始小时, 结束小时)
+    QUESTION_POOL_REFILL_INTERVAL_SECONDS = 600  # 补充任务检查间隔
+    QUESTION_POOL_DEMAND_HALF_LIFE_HOURS = 24 * 7  # 请求频率衰减半衰期
+    QUESTION_POOL_LOCAL_REFILL = os.getenv("QUESTION_POOL_LOCAL_REFILL", "false").lower() == "true"  # Redis不可用时仍在本进程补充（仅限单API进程部署）
+
+    # 异步LLM客户端连接池配置（每个事件循环一个连接池）
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))  # 最大并发连接数
+    LLM_REQUEST_TIMEOUT = 120  # 单次请求超时(秒)
+
+    # LLM响应缓存配置（按 模型+温度+提示词哈希 缓存）
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "auto")  # auto / redis / sqlite
+    LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "./data/cache/llm_responses.sqlite")
+    LLM_CACHE_DEFAULT_TTL_HOURS = 24 * 7  # 默认缓存时间
+    LLM_CACHE_TTL_HOURS = {  # 各调用点的缓存时间(小时)
+        "resume_jd_matching": 24 * 7,
+        "resume_star_principle": 24 * 7,
+        "resume_health_scan": 24 * 7,
+        "resume_structure": 24 * 30,
+        "resume_summary": 24 * 30,
+        "interview_question": 1,  # 问题表述依赖对话上下文，只用于重复请求
+        "report_segment": 24,  # 面试报告的单轮问答评估
+        "report_reduce": 24,
+        "interview_turn_rubric": 24  # 单轮回答的分维度评分
+    }
+    
+    # 面试报告 Map-Reduce 配置
+    REPORT_MAX_MESSAGES = 400  # 生成报告时读取的最大消息数
+    REPORT_MAP_CONCURRENCY = 4  # 片段评估并发数
+    REPORT_SEGMENT_MAX_CHARS = 1500  # 单个提问/回答写入提示词的最大字符数
+    REPORT_REDUCE_MAX_SEGMENTS = 12  # 合并阶段提示词中最多引用的片段摘要数
+
+    # 重复请求合并配置（按 操作+资源ID+内容哈希 合并双击/重试产生的重复任务）
+    SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    SINGLE_FLIGHT_BACKEND = os.getenv("SINGLE_FLIGHT_BACKEND", "auto")  # auto(Redis不可用时关闭合并) / redis / memory(仅单进程)
+    SINGLE_FLIGHT_INFLIGHT_TTL_SECONDS = 900  # 进行中锁的最长持有时间（需大于任务硬超时）
+    SINGLE_FLIGHT_RESULT_TTL_SECONDS = 600  # 完成后相同请求直接返回结果的时间窗口
+
+    # 共享面试状态存储配置（API进程与Celery worker共享）
+    INTERVIEW_STATE_BACKEND = os.getenv("INTERVIEW_STATE_BACKEND", "redis")  # redis / sqlite（API与所有worker必须一致，不可用时启动报错）
+    INTERVIEW_STATE_SQLITE_PATH = os.getenv("INTERVIEW_STATE_SQLITE_PATH", "./data/sqlite/interview_state.db")
+    INTERVIEW_SESSION_TTL_HOURS = 8  # 面试会话状态过期时间
+    INTERVIEW_TASK_TTL_HOURS = 24  # 后台任务状态过期时间
+    INTERVIEW_STATE_PURGE_INTERVAL_SECONDS = 600  # SQLite后端清理过期记录的间隔
 
 
 # 全局配置实例
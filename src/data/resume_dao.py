@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from fastapi import HTTPException
 
+from .resume_sections import compute_section_hashes
+
 logger = logging.getLogger(__name__)
 
 class ResumeDAO:
@@ -30,20 +32,24 @@ class ResumeDAO:
     
     # ==================== 简历CRUD操作 ====================
     
-    def save_resume(self, resume_id: str, resume_data: Dict[str, Any]) -> bool:
-        """保存简历数据（支持版本控制）"""
+    def save_resume(self, resume_id: str, resume_data: Dict[str, Any], bump_version: bool = True) -> bool:
+        """保存简历数据（支持版本控制）
+        
+        bump_version=False 用于只更新分析状态等元数据的保存，不产生新版本。
+        """
         try:
             resume_file = self.resume_dir / f"{resume_id}.json"
             
             # 添加版本控制元数据
             current_time = datetime.now().isoformat()
+            previous_updated_at = resume_data.get("updated_at", current_time)
             resume_data["updated_at"] = current_time
             
             if "created_at" not in resume_data:
                 resume_data["created_at"] = current_time
                 resume_data["version"] = "v1"
                 resume_data["version_history"] = []
-            else:
+            elif bump_version:
                 # 更新版本
                 old_version = resume_data.get("version", "v1")
                 new_version_num = int(old_version.replace("v", "")) + 1 if old_version.startswith("v") else 1
@@ -55,12 +61,16 @@ class ResumeDAO:
                 
                 resume_data["version_history"].append({
                     "version": old_version,
-                    "updated_at": resume_data.get("updated_at", current_time),
-                    "change_summary": "简历内容更新"
+                    "updated_at": previous_updated_at,
+                    "change_summary": "简历内容更新",
+                    "section_hashes": resume_data.get("section_hashes")
                 })
                 
                 resume_data["version"] = new_version
             
+            # 记录当前版本各板块的内容哈希，用于后续增量分析
+            resume_data["section_hashes"] = compute_section_hashes(resume_data)
+            
             # 添加分析状态
             if "analysis_status" not in resume_data:
                 resume_data["analysis_status"] = "PROCESSING"
@@ -355,7 +365,7 @@ class ResumeDAO:
             resume_data["analysis_status"] = status
             resume_data["analysis_updated_at"] = datetime.now().isoformat()
             
-            return self.save_resume(resume_id, resume_data)
+            return self.save_resume(resume_id, resume_data, bump_version=False)
             
         except Exception as e:
             logger.error(f"❌ 更新分析状态失败: {resume_id} - {e}")
@@ -390,6 +400,46 @@ class ResumeDAO:
             logger.error(f"❌ 标记JD分析过时失败: {resume_id} - {e}")
             return False
     
+    def carry_forward_jd_analysis(self, resume_id: str, old_version: str, new_version: str) -> bool:
+        """JD匹配依赖的板块未变化时，将旧版本的JD分析关联到新版本继续使用"""
+        try:
+            for analysis_file in self.analysis_dir.glob(f"jd_analysis_{resume_id}_*.json"):
+                with open(analysis_file, 'r', encoding='utf-8') as f:
+                    analysis_data = json.load(f)
+                
+                if analysis_data.get("resume_version", "v1") == old_version:
+                    analysis_data["resume_version"] = new_version
+                    analysis_data["version_id"] = f"{resume_id}_{new_version}"
+                    analysis_data["carried_from_version"] = old_version
+                    
+                    with open(analysis_file, 'w', encoding='utf-8') as f:
+                        json.dump(analysis_data, f, ensure_ascii=False, indent=2)
+            
+            logger.info(f"✅ JD分析沿用至新版本: {resume_id} {old_version} -> {new_version}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ 沿用JD分析失败: {resume_id} - {e}")
+            return False
+    
+    def get_latest_star_analysis(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """获取简历最近一次成功的STAR检测结果"""
+        try:
+            analysis_files = list(self.analysis_dir.glob(f"star_analysis_{resume_id}_*.json"))
+            analysis_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            
+            for analysis_file in analysis_files:
+                with open(analysis_file, 'r', encoding='utf-8') as f:
+                    analysis_data = json.load(f)
+                if analysis_data.get("status") == "completed" and analysis_data.get("star_principle"):
+                    return analysis_data["star_principle"]
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ 读取STAR检测结果失败: {resume_id} - {e}")
+            return None
+    
     # ==================== 辅助方法 ====================
     
     def _has_analysis(self, resume_id: str) -> bool:
@@ -0,0 +1,75 @@
+"""
+简历分段内容哈希
+每个简历版本保存各板块（以及项目/实习条目）的内容哈希，更新简历时对比新旧哈希，
+只对发生变化的板块重新执行分析，未变化部分直接复用上一版本的分析结果。
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Set
+
+# 参与分析的简历板块
+RESUME_SECTIONS = ("basic_info", "education", "projects", "skills", "internship", "target_position")
+
+# 按条目单独分析（STAR检测）的列表板块
+ITEM_SECTIONS = ("projects", "internship")
+
+# 各分析依赖的板块
+STAR_SECTIONS = {"projects", "internship"}
+PROFILE_SECTIONS = {"basic_info", "target_position"}
+JD_MATCH_SECTIONS = {"basic_info", "projects", "skills", "education"}
+
+
+def content_hash(value: Any) -> str:
+    """内容哈希（键排序后序列化，与字段顺序无关）"""
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _section_items(resume_data: Dict[str, Any], section: str) -> List[Any]:
+    items = resume_data.get(section) or []
+    return items if isinstance(items, list) else [items]
+
+
+def star_item_hashes(resume_data: Dict[str, Any]) -> List[str]:
+    """STAR检测条目（项目在前、实习在后）的内容哈希，与star_items顺序一致"""
+    return [
+        content_hash(item)
+        for section in ITEM_SECTIONS
+        for item in _section_items(resume_data, section)
+    ]
+
+
+def compute_section_hashes(resume_data: Dict[str, Any]) -> Dict[str, Any]:
+    """计算简历各板块及列表条目的内容哈希"""
+    return {
+        "sections": {section: content_hash(resume_data.get(section)) for section in RESUME_SECTIONS},
+        "items": {
+            section: [content_hash(item) for item in _section_items(resume_data, section)]
+            for section in ITEM_SECTIONS
+        }
+    }
+
+
+def diff_section_hashes(old_hashes: Dict[str, Any], new_hashes: Dict[str, Any]) -> Dict[str, Any]:
+    """对比两个版本的板块哈希，返回变化的板块和各分析是否需要重新执行"""
+    old_sections = (old_hashes or {}).get("sections", {})
+    new_sections = new_hashes.get("sections", {})
+    changed: Set[str] = {
+        section for section in RESUME_SECTIONS
+        if old_sections.get(section) != new_sections.get(section)
+    }
+
+    old_items = (old_hashes or {}).get("items", {})
+    new_items = new_hashes.get("items", {})
+    changed_items = {
+        section: len(set(new_items.get(section, [])) - set(old_items.get(section, [])))
+        for section in ITEM_SECTIONS
+    }
+
+    return {
+        "changed_sections": sorted(changed),
+        "changed_items": changed_items,
+        "rerun_star": bool(changed & STAR_SECTIONS),
+        "rerun_profile": bool(changed & PROFILE_SECTIONS),
+        "jd_analysis_stale": bool(changed & JD_MATCH_SECTIONS)
+    }
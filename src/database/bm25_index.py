@@ -0,0 +1,153 @@
+"""
+题库关键词检索
+- 题目标题和考察点的本地BM25倒排索引，与ChromaDB写入保持同步
+- 倒数排名融合(RRF)：合并关键词检索与向量检索的排序，精确的技能词（如 Kafka、Transformer）不再被语义相近的文本挤掉
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# 英文/数字词（保留 c++、c#、node.js 这类技能写法）与连续的中文片段
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*|[一-鿿]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """分词：英文数字按词，中文按字符二元组（单字保留单字）"""
+    tokens = []
+    for match in _TOKEN_RE.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if match[0].isascii():
+            tokens.append(match.rstrip("."))
+        elif len(match) == 1:
+            tokens.append(match)
+        else:
+            tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+    return tokens
+
+
+def where_matches(fields: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """按ChromaDB where语法（$and/$or/$eq/$ne/$in）过滤索引条目的字段"""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(where_matches(fields, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(where_matches(fields, sub) for sub in condition):
+                return False
+        else:
+            value = fields.get(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, expected in condition.items():
+                if op == "$eq" and value != expected:
+                    return False
+                if op == "$ne" and value == expected:
+                    return False
+                if op == "$in" and value not in expected:
+                    return False
+                if op == "$nin" and value in expected:
+                    return False
+    return True
+
+
+class BM25Index:
+    """线程安全的内存BM25倒排索引"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, Tuple[Counter, int, Dict[str, Any]]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, text: str, fields: Optional[Dict[str, Any]] = None):
+        """添加或替换一条文档，fields 用于检索时的where过滤"""
+        term_freqs = Counter(tokenize(text))
+        length = sum(term_freqs.values())
+        with self._lock:
+            self._remove_locked(doc_id)
+            self._docs[doc_id] = (term_freqs, length, dict(fields or {}))
+            self._total_length += length
+            for term in term_freqs:
+                self._postings.setdefault(term, set()).add(doc_id)
+
+    def update_fields(self, doc_id: str, fields: Dict[str, Any]):
+        with self._lock:
+            if doc_id in self._docs:
+                self._docs[doc_id][2].update(fields)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: str):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        term_freqs, length, _ = entry
+        self._total_length -= length
+        for term in term_freqs:
+            ids = self._postings.get(term)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._postings[term]
+
+    def search(self, query: str, n_results: int = 10,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        """返回 (文档ID, BM25分数)，按分数降序"""
+        query_terms = set(tokenize(query))
+        with self._lock:
+            total_docs = len(self._docs)
+            if not total_docs or not query_terms:
+                return []
+            avg_length = self._total_length / total_docs
+            scores: Dict[str, float] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id in postings:
+                    term_freqs, length, fields = self._docs[doc_id]
+                    if not where_matches(fields, where):
+                        continue
+                    tf = term_freqs[term]
+                    norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n_results]
+
+    def matched_terms(self, doc_id: str, phrases: Iterable[str]) -> List[str]:
+        """文档中完整出现（全部分词都命中）的短语，如命中的技能名"""
+        entry = self._docs.get(doc_id)
+        if entry is None:
+            return []
+        term_freqs = entry[0]
+        matched = []
+        for phrase in phrases:
+            terms = tokenize(phrase)
+            if terms and all(term in term_freqs for term in terms):
+                matched.append(phrase)
+        return matched
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60,
+                           weights: Optional[Sequence[float]] = None) -> List[Tuple[str, float]]:
+    """倒数排名融合：score(d) = Σ w_i / (k + rank_i(d))"""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -5,46 +5,177 @@ ChromaDB管理器 - 用于题目存储和匹配
 import chromadb
 from chromadb.config import Settings
 import json
-import uuid
+import random
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
+from ..config.settings import model_config
+from ..tools.embedding_service import collection_embedding_metadata, get_collection_embedding_service
+from .bm25_index import BM25Index, reciprocal_rank_fusion
+from .question_dedup import MinHashIndex, normalize_question_title, stable_question_id, title_shingles
+from .question_links import LINK_POOL, LINK_SESSION, LINK_TASK, QuestionLinkStore
+
 logger = logging.getLogger(__name__)
 
 class ChromaQuestionManager:
     """ChromaDB题目管理器"""
     
+    COLLECTION_NAME = "interview_questions"
+    # 压缩重建时的临时集合和原集合备份，重建成功后再切换
+    REBUILD_COLLECTION_NAME = "interview_questions__rebuild"
+    BACKUP_COLLECTION_NAME = "interview_questions__backup"
+    
     def __init__(self, persist_directory: str = "data/chromadb"):
         """初始化ChromaDB客户端"""
         try:
             self.client = chromadb.PersistentClient(path=persist_directory)
+            self._recover_interrupted_rebuild()
             self.collection = self.client.get_or_create_collection(
-                name="interview_questions",
-                metadata={
+                name=self.COLLECTION_NAME,
+                metadata=collection_embedding_metadata({
                     "description": "面试题目集合，支持多维度匹配",
                     "created_at": datetime.now().isoformat()
-                }
+                })
             )
+            # 写入和查询均使用集合固定模型的共享嵌入服务，不依赖Chroma默认嵌入函数
+            self.embedding_service = get_collection_embedding_service(self.collection)
+            # 题目与会话/任务/题目池的多对多关联（复用的题目只追加关联，不改写题目记录）
+            self.links = QuestionLinkStore(f"{persist_directory}/question_links.db")
+            # 标题近重复索引（MinHash + 精确Jaccard，首次写入时从集合加载）
+            self.min_title_similarity = getattr(model_config, 'QUESTION_DEDUP_MIN_JACCARD', 0.8)
+            self._dedup_index: Optional[MinHashIndex] = None
+            self._dedup_lock = threading.Lock()
+            # 标题+考察点BM25索引（首次检索或写入时从集合加载），与向量检索按RRF融合
+            self.search_mode = getattr(model_config, 'QUESTION_SEARCH_MODE', 'hybrid')
+            self.rrf_k = getattr(model_config, 'QUESTION_SEARCH_RRF_K', 60)
+            self._bm25_index: Optional[BM25Index] = None
+            self._bm25_lock = threading.Lock()
             print(f"✅ ChromaDB初始化成功，数据目录: {persist_directory}")
         except Exception as e:
             print(f"❌ ChromaDB初始化失败: {e}")
             raise
     
+    def _get_collection_or_none(self, name: str):
+        try:
+            return self.client.get_collection(name)
+        except Exception:
+            return None
+    
+    def _recover_interrupted_rebuild(self):
+        """上次压缩重建在切换集合时中断：题库集合不存在而备份存在时恢复备份"""
+        backup = self._get_collection_or_none(self.BACKUP_COLLECTION_NAME)
+        if backup is None:
+            return
+        if self._get_collection_or_none(self.COLLECTION_NAME) is None:
+            backup.modify(name=self.COLLECTION_NAME)
+            print("⚠️ 检测到中断的题库重建，已从备份恢复题库集合")
+        else:
+            self.client.delete_collection(self.BACKUP_COLLECTION_NAME)
+    
+    def _iter_collection(self, include: List[str], page_size: int = 500):
+        """分页读取集合全部条目"""
+        offset = 0
+        while True:
+            page = self.collection.get(include=include, limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                return
+            for i, item_id in enumerate(ids):
+                yield {
+                    "id": item_id,
+                    **{field: page[field][i] for field in include if page.get(field) is not None}
+                }
+            offset += len(ids)
+    
+    def _get_dedup_index(self) -> MinHashIndex:
+        """题库标题近重复索引（标题特征按标题现算）"""
+        if self._dedup_index is None:
+            with self._dedup_lock:
+                if self._dedup_index is None:
+                    index = MinHashIndex(self.min_title_similarity)
+                    for item in self._iter_collection(["metadatas"]):
+                        index.add(item["id"], title_shingles((item["metadatas"] or {}).get("title", "")))
+                    self._dedup_index = index
+                    print(f"✅ 题库去重索引已加载: {len(index)} 个题目")
+        return self._dedup_index
+    
+    @staticmethod
+    def _keyword_text(metadata: Dict[str, Any]) -> str:
+        """BM25索引文本：题目标题 + 考察点"""
+        try:
+            points = json.loads(metadata.get("points", "[]"))
+        except (TypeError, ValueError):
+            points = []
+        return " ".join([metadata.get("title", "")] + [str(point) for point in points])
+    
+    @staticmethod
+    def _keyword_fields(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """BM25检索时用于where过滤的字段"""
+        return {field: metadata.get(field) for field in ("difficulty", "type", "has_answer")}
+    
+    def _get_bm25_index(self) -> BM25Index:
+        """题库BM25索引"""
+        if self._bm25_index is None:
+            with self._bm25_lock:
+                if self._bm25_index is None:
+                    index = BM25Index()
+                    for item in self._iter_collection(["metadatas"]):
+                        item_metadata = item["metadatas"] or {}
+                        index.add(item["id"], self._keyword_text(item_metadata), self._keyword_fields(item_metadata))
+                    self._bm25_index = index
+                    print(f"✅ 题库BM25索引已加载: {len(index)} 个题目")
+        return self._bm25_index
+    
     def store_questions(self, questions: List[Dict[str, Any]], metadata: Dict[str, Any]) -> bool:
-        """存储题目到ChromaDB"""
+        """存储题目到ChromaDB
+        
+        题目ID由规范化标题生成，重复题目 upsert 到同一条记录；与已有题目标题近似（标题特征Jaccard不低于阈值）的题目不再入库，
+        并把题目的id改为已有题目的ID，与检索结果保持一致。新入库和复用的题目都追加关联到本次会话/任务。
+        """
         try:
             documents = []
             metadatas = []
             ids = []
+            shingles_list = []
+            skipped = 0
+            
+            index = self._get_dedup_index()
+            batch_index = MinHashIndex(self.min_title_similarity)
+            reused_ids = []
             
             for i, question in enumerate(questions):
+                normalized_title = normalize_question_title(question.get("title", ""))
+                if not normalized_title:
+                    skipped += 1
+                    continue
+                
+                question_id = stable_question_id(question.get("title", ""), question.get("type", "tech_basic"))
+                shingles = title_shingles(question.get("title", ""))
+                
+                # 近重复检测：题库或本批次中已有措辞相近的题目（相同稳定ID的题目直接upsert）
+                duplicate_id = None
+                if question_id in batch_index:
+                    duplicate_id = question_id
+                elif question_id not in index:
+                    duplicate_id = index.find_duplicate(shingles) or batch_index.find_duplicate(shingles)
+                if duplicate_id is not None:
+                    question["id"] = duplicate_id
+                    if duplicate_id not in batch_index:
+                        reused_ids.append(duplicate_id)
+                    skipped += 1
+                    continue
+                batch_index.add(question_id, shingles)
+                
+                question["id"] = question_id
+                
                 # 构建检索文档
                 doc_text = self._build_question_document(question, metadata)
                 
                 # 构建元数据
                 question_metadata = {
-                    "question_id": question.get("id", f"q_{uuid.uuid4().hex[:8]}"),
+                    "question_id": question_id,
                     "type": question.get("type", "tech_basic"),
                     "difficulty": metadata.get("difficulty_level", 2),
                     "skills": json.dumps(metadata.get("selected_skills", [])),
@@ -54,23 +185,38 @@ class ChromaQuestionManager:
                     "created_at": datetime.now().isoformat(),
                     "title": question.get("title", "")[:500],  # 限制长度
                     "points": json.dumps(question.get("points", [])),
-                    "has_answer": "yes" if question.get("answer") else "no",
-                    "session_id": metadata.get("session_id", ""),  # 添加会话ID
-                    "task_id": metadata.get("task_id", "")  # 添加任务ID
+                    "has_answer": "yes" if question.get("answer") else "no"
                 }
+                if metadata.get("pool_key"):
+                    # 题目池题目直接返回给用户，答案随元数据一起保存
+                    question_metadata["answer"] = (question.get("answer") or "")[:4000]
                 
                 documents.append(doc_text)
                 metadatas.append(question_metadata)
-                ids.append(f"q_{uuid.uuid4().hex}")
+                ids.append(question_id)
+                shingles_list.append(shingles)
             
-            # 批量添加到ChromaDB
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            if ids:
+                # 稳定ID + upsert：同一道题只保留一条记录
+                self.collection.upsert(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids,
+                    embeddings=self.embedding_service.embed(documents).tolist()
+                )
+                for question_id, shingles in zip(ids, shingles_list):
+                    index.add(question_id, shingles)
+                bm25_index = self._get_bm25_index()
+                for question_id, question_metadata in zip(ids, metadatas):
+                    bm25_index.add(question_id, self._keyword_text(question_metadata), self._keyword_fields(question_metadata))
+            
+            # 新入库和复用的已有题目都追加关联到本次会话/任务/题目池，先前的关联保持不变
+            reused_ids = list(dict.fromkeys(reused_ids))
+            self.links.link(LINK_SESSION, metadata.get("session_id", ""), ids + reused_ids)
+            self.links.link(LINK_TASK, metadata.get("task_id", ""), ids + reused_ids)
+            self.links.link(LINK_POOL, metadata.get("pool_key", ""), ids + reused_ids)
             
-            print(f"✅ 成功存储 {len(questions)} 个题目到ChromaDB")
+            print(f"✅ 成功存储 {len(ids)} 个题目到ChromaDB（跳过重复 {skipped} 个）")
             return True
             
         except Exception as e:
@@ -78,11 +224,23 @@ class ChromaQuestionManager:
             logger.error(f"存储题目失败: {e}")
             return False
     
-    def search_questions(self, request_data: Dict[str, Any], n_results: int = 10) -> List[Dict[str, Any]]:
-        """根据条件搜索匹配的题目"""
+    def search_questions(self, request_data: Dict[str, Any], n_results: int = 10,
+                         mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        """根据条件搜索匹配的题目
+        
+        mode: hybrid（默认，BM25与向量检索按RRF融合）/ vector / keyword。
+        每道题目附带 similarity_score（向量相似度，仅关键词命中时为0）、bm25_score、
+        rrf_score 和 matched_skills（标题或考察点中完整出现的选中技能）。
+        """
         try:
+            mode = mode or self.search_mode
+            n_results = min(n_results, 50)  # 限制最大结果数
+            # 融合前每一路多取一些候选
+            n_candidates = n_results if mode != "hybrid" else min(max(n_results * 2, 20), 50)
+            
             # 构建查询文本
             query_text = self._build_query_text(request_data)
+            keyword_query = self._build_keyword_query(request_data)
             
             # 构建where条件
             where_conditions = self._build_where_conditions(request_data)
@@ -90,17 +248,49 @@ class ChromaQuestionManager:
             print(f"🔍 搜索条件: {query_text}")
             print(f"🔍 过滤条件: {where_conditions}")
             
-            # 执行搜索
-            results = self.collection.query(
-                query_texts=[query_text],
-                n_results=min(n_results, 50),  # 限制最大结果数
-                where=where_conditions
-            )
+            # 向量检索
+            vector_hits: Dict[str, Dict[str, Any]] = {}
+            if mode in ("hybrid", "vector"):
+                results = self.collection.query(
+                    query_embeddings=[self.embedding_service.embed_one(query_text).tolist()],
+                    n_results=n_candidates,
+                    where=where_conditions or None
+                )
+                ids = (results.get("ids") or [[]])[0]
+                for question_id, question in zip(ids, self._parse_search_results(results)):
+                    vector_hits[question_id] = question
+            
+            # 关键词检索
+            bm25_index = self._get_bm25_index()
+            keyword_hits: Dict[str, float] = {}
+            if mode in ("hybrid", "keyword"):
+                keyword_hits = dict(bm25_index.search(keyword_query, n_candidates, where_conditions))
+            
+            fused = reciprocal_rank_fusion([list(vector_hits), list(keyword_hits)], k=self.rrf_k)[:n_results]
+            
+            # 只被关键词检索命中的题目补取元数据
+            missing_ids = [question_id for question_id, _ in fused if question_id not in vector_hits]
+            if missing_ids:
+                fetched = self.collection.get(ids=missing_ids, include=["documents", "metadatas"])
+                keyword_only = self._parse_search_results({
+                    "documents": [fetched["documents"]],
+                    "metadatas": [fetched["metadatas"]],
+                    "distances": [[1.0] * len(fetched["ids"])]
+                })
+                vector_hits.update(zip(fetched["ids"], keyword_only))
             
-            # 解析结果
-            matched_questions = self._parse_search_results(results)
+            skills = request_data.get("selected_skills", [])
+            matched_questions = []
+            for question_id, rrf_score in fused:
+                question = vector_hits.get(question_id)
+                if question is None:
+                    continue
+                question["bm25_score"] = round(keyword_hits.get(question_id, 0.0), 4)
+                question["rrf_score"] = round(rrf_score, 6)
+                question["matched_skills"] = bm25_index.matched_terms(question_id, skills)
+                matched_questions.append(question)
             
-            print(f"✅ 匹配到 {len(matched_questions)} 个题目")
+            print(f"✅ 匹配到 {len(matched_questions)} 个题目（向量 {len(vector_hits)} / 关键词 {len(keyword_hits)}）")
             return matched_questions
             
         except Exception as e:
@@ -108,6 +298,111 @@ class ChromaQuestionManager:
             logger.error(f"搜索题目失败: {e}")
             return []
     
+    def compact_questions(self, dry_run: bool = False, rebuild: bool = False) -> Dict[str, Any]:
+        """题库压缩：合并稳定ID相同或标题近重复的题目，每组保留最早创建的一条
+        
+        保留的题目改用稳定ID（复用已有嵌入，不重新计算）；rebuild=True 时重建集合，
+        使HNSW索引和存储文件只包含去重后的题目（删除操作不会缩小已有索引文件）。
+        重建先写入临时集合并校验数量，成功后才替换原集合，写入失败时原题库保持不变。
+        被合并题目的会话/任务/题目池关联（包括旧数据保存在元数据中的关联）转移到保留的题目上。
+        """
+        items = sorted(
+            self._iter_collection(["metadatas", "documents", "embeddings"]),
+            key=lambda item: (item["metadatas"] or {}).get("created_at", "")
+        )
+        
+        index = MinHashIndex(self.min_title_similarity)
+        kept: Dict[str, Dict[str, Any]] = {}
+        duplicate_ids = []
+        redirects: Dict[str, str] = {}  # 原题目ID -> 保留的题目ID
+        
+        for item in items:
+            item_metadata = item["metadatas"] or {}
+            title = item_metadata.get("title", "")
+            stable_id = stable_question_id(title, item_metadata.get("type", "tech_basic"))
+            shingles = title_shingles(title)
+            kept_id = stable_id if stable_id in kept else index.find_duplicate(shingles)
+            if kept_id is not None:
+                duplicate_ids.append(item["id"])
+                redirects[item["id"]] = kept_id
+                continue
+            redirects[item["id"]] = stable_id
+            index.add(stable_id, shingles)
+            kept[stable_id] = {
+                **item,
+                # 旧版本写入的simhash字段已不再使用，保留的题目不再携带
+                "metadatas": {
+                    **{key: value for key, value in item_metadata.items() if key != "simhash"},
+                    "question_id": stable_id
+                }
+            }
+        
+        rekeyed = [stable_id for stable_id, item in kept.items() if item["id"] != stable_id]
+        stats = {
+            "before": len(items),
+            "after": len(kept),
+            "removed_duplicates": len(duplicate_ids),
+            "rekeyed": len(rekeyed),
+            "rebuilt": False,
+            "dry_run": dry_run
+        }
+        if dry_run:
+            return stats
+        
+        def write(collection, entries: List[Dict[str, Any]], batch_size: int = 500):
+            for start in range(0, len(entries), batch_size):
+                batch = entries[start:start + batch_size]
+                collection.upsert(
+                    ids=[entry["metadatas"]["question_id"] for entry in batch],
+                    documents=[entry["documents"] for entry in batch],
+                    metadatas=[entry["metadatas"] for entry in batch],
+                    embeddings=[[float(v) for v in entry["embeddings"]] for entry in batch]
+                )
+        
+        with self._dedup_lock:
+            if rebuild:
+                self.collection = self._rebuild_collection(list(kept.values()), write)
+                stats["rebuilt"] = True
+            else:
+                write(self.collection, [kept[stable_id] for stable_id in rekeyed])
+                stale_ids = duplicate_ids + [kept[stable_id]["id"] for stable_id in rekeyed]
+                for start in range(0, len(stale_ids), 500):
+                    self.collection.delete(ids=stale_ids[start:start + 500])
+            self.links.redirect(redirects)
+            for kind, field in ((LINK_SESSION, "session_id"), (LINK_TASK, "task_id"), (LINK_POOL, "pool_key")):
+                for item in items:
+                    value = (item["metadatas"] or {}).get(field)
+                    if value:
+                        self.links.link(kind, value, [redirects[item["id"]]])
+            self._dedup_index = index
+            self._bm25_index = None
+        
+        print(f"✅ 题库压缩完成: {stats['before']} -> {stats['after']} 个题目")
+        return stats
+    
+    def _rebuild_collection(self, entries: List[Dict[str, Any]], write):
+        """写入临时集合并校验后替换题库集合：原集合先改名为备份，切换完成后再删除"""
+        collection_metadata = dict(self.collection.metadata or {})
+        if self._get_collection_or_none(self.REBUILD_COLLECTION_NAME) is not None:
+            self.client.delete_collection(self.REBUILD_COLLECTION_NAME)
+        rebuilt = self.client.create_collection(name=self.REBUILD_COLLECTION_NAME, metadata=collection_metadata)
+        try:
+            write(rebuilt, entries)
+            if rebuilt.count() != len(entries):
+                raise Exception(f"重建集合题目数不一致: {rebuilt.count()} != {len(entries)}")
+        except Exception:
+            self.client.delete_collection(self.REBUILD_COLLECTION_NAME)
+            raise
+        
+        self.collection.modify(name=self.BACKUP_COLLECTION_NAME)
+        try:
+            rebuilt.modify(name=self.COLLECTION_NAME)
+        except Exception:
+            self.collection.modify(name=self.COLLECTION_NAME)
+            raise
+        self.client.delete_collection(self.BACKUP_COLLECTION_NAME)
+        return self.client.get_collection(self.COLLECTION_NAME)
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """获取题目集合统计信息"""
         try:
@@ -201,6 +496,15 @@ class ChromaQuestionManager:
         
         return " | ".join(query_parts) if query_parts else "面试题目"
     
+    def _build_keyword_query(self, request_data: Dict[str, Any]) -> str:
+        """BM25查询：技能、项目名和职位的原始词，不带字段标签"""
+        terms = list(request_data.get("selected_skills", []))
+        terms += [p.get("name", "") for p in request_data.get("selected_projects", []) if p.get("name")]
+        basic_info = request_data.get("resume_data", {}).get("basic_info", {})
+        if basic_info.get("current_position"):
+            terms.append(basic_info["current_position"])
+        return " ".join(terms)
+    
     def _build_where_conditions(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """构建where过滤条件"""
         conditions_list = []
@@ -232,7 +536,7 @@ class ChromaQuestionManager:
         else:
             return {"$and": conditions_list}  # 多个条件用$and包装
     
-    def _parse_search_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _parse_search_results(self, results: Dict[str, Any], source: str = "database") -> List[Dict[str, Any]]:
         """解析搜索结果"""
         questions = []
         
@@ -250,11 +554,11 @@ class ChromaQuestionManager:
                     "type": metadata.get("type", "tech_basic"),
                     "title": metadata.get("title", ""),
                     "points": json.loads(metadata.get("points", "[]")),
-                    "answer": "",  # 实际应用中可能需要单独存储答案
+                    "answer": metadata.get("answer", ""),  # 只有题目池题目保存了答案
                     "difficulty": metadata.get("difficulty", 2),
                     "created_at": metadata.get("created_at", ""),
                     "similarity_score": 1 - distance,  # 转换为相似度分数
-                    "source": "database"  # 标记来源
+                    "source": source  # 标记来源
                 }
                 
                 # 如果需要答案，可以从其他地方获取
@@ -267,31 +571,31 @@ class ChromaQuestionManager:
         return questions
     
     def get_questions_by_session(self, session_id: str = None, task_id: str = None, n_results: int = 50) -> List[Dict[str, Any]]:
-        """根据会话ID或任务ID获取题目"""
+        """根据会话ID或任务ID获取题目（按关联顺序）"""
         try:
             if not session_id and not task_id:
                 print("❌ 必须提供session_id或task_id")
                 return []
             
-            # 构建where条件
-            where_conditions = {}
-            if session_id:
-                where_conditions["session_id"] = {"$eq": session_id}
-            elif task_id:
-                where_conditions["task_id"] = {"$eq": task_id}
-            
-            print(f"🔍 根据{'会话ID' if session_id else '任务ID'}检索题目: {session_id or task_id}")
-            print(f"🔍 检索条件: {where_conditions}")
+            kind, field, value = (LINK_SESSION, "session_id", session_id) if session_id else (LINK_TASK, "task_id", task_id)
+            print(f"🔍 根据{'会话ID' if session_id else '任务ID'}检索题目: {value}")
             
-            # 执行查询
-            results = self.collection.query(
-                query_texts=["题目检索"],  # 占位查询文本
-                n_results=n_results,
-                where=where_conditions
-            )
+            # 关联表中的题目 + 旧数据中题目记录上直接保存的会话/任务ID
+            question_ids = self.links.get_question_ids(kind, value)
+            legacy_ids = self.collection.get(where={field: {"$eq": value}}, include=[])["ids"]
+            question_ids = list(dict.fromkeys(question_ids + legacy_ids))[:n_results]
+            if not question_ids:
+                print("✅ 找到 0 个题目")
+                return []
             
-            # 解析结果
-            questions = self._parse_search_results(results)
+            results = self.collection.get(ids=question_ids, include=["documents", "metadatas"])
+            order = {question_id: i for i, question_id in enumerate(question_ids)}
+            rows = sorted(zip(results["ids"], results["documents"], results["metadatas"]), key=lambda row: order[row[0]])
+            questions = self._parse_search_results({
+                "documents": [[row[1] for row in rows]],
+                "metadatas": [[row[2] for row in rows]],
+                "distances": [[0.0] * len(rows)]
+            })
             
             print(f"✅ 找到 {len(questions)} 个题目")
             return questions
@@ -301,5 +605,37 @@ class ChromaQuestionManager:
             logger.error(f"根据{'会话ID' if session_id else '任务ID'}检索题目失败: {e}")
             return []
 
+    def _pool_question_ids(self, pool_key: str) -> List[str]:
+        """题目池成员：关联表 + 旧数据中题目记录上直接保存的pool_key"""
+        linked_ids = self.links.get_question_ids(LINK_POOL, pool_key)
+        legacy_ids = self.collection.get(where={"pool_key": {"$eq": pool_key}}, include=[])["ids"]
+        return list(dict.fromkeys(linked_ids + legacy_ids))
+    
+    def count_pool_questions(self, pool_key: str) -> int:
+        """题目池中的题目数量"""
+        try:
+            return len(self._pool_question_ids(pool_key))
+        except Exception as e:
+            logger.error(f"统计题目池失败: {e}")
+            return 0
+    
+    def get_pool_questions(self, pool_key: str, count: int) -> List[Dict[str, Any]]:
+        """从题目池随机取出 count 道题目，不足时返回空列表（由调用方回退到按需生成）"""
+        try:
+            question_ids = self._pool_question_ids(pool_key)
+            if len(question_ids) < count:
+                return []
+            results = self.collection.get(ids=random.sample(question_ids, count), include=["documents", "metadatas"])
+            if len(results["ids"]) < count:
+                return []
+            return self._parse_search_results({
+                "documents": [results["documents"]],
+                "metadatas": [results["metadatas"]],
+                "distances": [[0.0] * count]
+            }, source="pool")
+        except Exception as e:
+            logger.error(f"读取题目池失败: {e}")
+            return []
+
 # 全局实例
 chroma_manager = ChromaQuestionManager() 
\ No newline at end of file
@@ -0,0 +1,367 @@
+"""
+共享面试状态存储
+面试会话状态（序列化的InterviewState及会话元数据）和后台任务状态保存在Redis中，
+单机部署可配置为SQLite（WAL模式，同机多进程共享），
+API进程与任意节点上的Celery worker读写同一份状态，分析/报告任务不再依赖API进程内存。
+后端由配置（INTERVIEW_STATE_BACKEND）统一指定，不可用时直接报错，不按进程各自降级，
+避免API与worker落在不同后端上互相看不到对方的状态。
+"""
+import json
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import database_config, model_config
+except ImportError:
+    database_config = None
+    model_config = None
+
+
+def dump_state(state: Any) -> bytes:
+    """紧凑序列化：pickle(最高协议) + zlib压缩，可直接还原dataclass和枚举"""
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+
+def load_state(payload: bytes) -> Any:
+    """还原 dump_state 的结果（仅用于本系统自己写入的可信存储）"""
+    return pickle.loads(zlib.decompress(payload))
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+class InterviewStateStore:
+    """面试会话与任务状态存储 - Redis 或 SQLite（由配置指定）
+
+    会话的状态和元数据分开存放：回答提交、分析和报告任务只重写状态，
+    元数据（user_id、created_at）只在创建会话时写入一次。
+    """
+
+    STATE_PREFIX = "interview:state:"
+    META_PREFIX = "interview:meta:"
+    TASK_PREFIX = "interview:task:"
+    TURN_PREFIX = "interview:turns:"
+    BACKENDS = ("redis", "sqlite")
+
+    def __init__(
+        self,
+        backend: str = "redis",
+        sqlite_path: str = "data/sqlite/interview_state.db",
+        session_ttl: timedelta = timedelta(hours=8),
+        task_ttl: timedelta = timedelta(hours=24),
+        purge_interval: float = 600
+    ):
+        self.session_ttl = session_ttl
+        self.task_ttl = task_ttl
+        self.sqlite_path = sqlite_path
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self.redis_client = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+        if backend not in self.BACKENDS:
+            raise ValueError(f"不支持的面试状态存储后端: {backend}（可选: {', '.join(self.BACKENDS)}）")
+        if backend == "redis":
+            self._init_redis()
+        else:
+            self._init_sqlite()
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self.redis_client is not None else "sqlite"
+
+    def _init_redis(self):
+        try:
+            import redis
+            pool = redis.ConnectionPool(
+                host=getattr(database_config, 'redis_host', 'localhost'),
+                port=getattr(database_config, 'redis_port', 6379),
+                db=getattr(database_config, 'redis_db', 0),
+                max_connections=20,
+                health_check_interval=30
+            )
+            client = redis.Redis(connection_pool=pool)
+            client.ping()
+        except Exception as e:
+            logger.error(f"❌ 面试状态存储连接Redis失败: {e}")
+            raise RuntimeError(
+                f"面试状态存储配置为Redis但无法连接: {e}；"
+                f"单机部署可设置 INTERVIEW_STATE_BACKEND=sqlite"
+            ) from e
+        self.redis_client = client
+        logger.info("✅ 面试状态存储使用Redis")
+
+    def _init_sqlite(self):
+        Path(self.sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.sqlite_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS interview_state (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        self._conn = conn
+        logger.info(f"✅ 面试状态存储使用SQLite: {self.sqlite_path}")
+
+    # ==================== 底层读写 ====================
+
+    def _set(self, key: str, value: bytes, ttl: timedelta):
+        if self.redis_client is not None:
+            self.redis_client.setex(key, int(ttl.total_seconds()), value)
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interview_state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl.total_seconds())
+            )
+            self._conn.commit()
+        self._maybe_purge()
+
+    def _touch(self, key: str, ttl: timedelta):
+        """刷新已有记录的过期时间"""
+        if self.redis_client is not None:
+            self.redis_client.expire(key, int(ttl.total_seconds()))
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE interview_state SET expires_at = ? WHERE key = ? AND expires_at >= ?",
+                (time.time() + ttl.total_seconds(), key, time.time())
+            )
+            self._conn.commit()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        if self.redis_client is not None:
+            return self.redis_client.get(key)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM interview_state WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def _delete(self, *keys: str) -> int:
+        if self.redis_client is not None:
+            return int(self.redis_client.delete(*keys))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM interview_state WHERE key IN ({','.join('?' * len(keys))})", keys
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def _exists(self, key: str) -> bool:
+        if self.redis_client is not None:
+            return bool(self.redis_client.exists(key))
+        return self._get(key) is not None
+
+    # ==================== 面试会话 ====================
+
+    def create_session(self, session_id: str, state: Dict[str, Any], user_id: Any,
+                       created_at: Optional[datetime] = None):
+        """创建会话：写入元数据和初始状态"""
+        meta = {"user_id": user_id, "created_at": created_at or datetime.now()}
+        self._set(f"{self.META_PREFIX}{session_id}", dump_state(meta), self.session_ttl)
+        self.save_state(session_id, state)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """获取会话 {"state", "user_id", "created_at"}，不存在或已过期时返回None"""
+        meta = self._get(f"{self.META_PREFIX}{session_id}")
+        state = self._get(f"{self.STATE_PREFIX}{session_id}")
+        if meta is None or state is None:
+            return None
+        return {**load_state(meta), "state": load_state(state)}
+
+    def has_session(self, session_id: str) -> bool:
+        return self._exists(f"{self.META_PREFIX}{session_id}")
+
+    def get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        payload = self._get(f"{self.STATE_PREFIX}{session_id}")
+        return load_state(payload) if payload is not None else None
+
+    def save_state(self, session_id: str, state: Dict[str, Any]):
+        """保存会话状态（同时刷新会话TTL）"""
+        self._set(f"{self.STATE_PREFIX}{session_id}", dump_state(state), self.session_ttl)
+        # get_session 需要元数据和状态同时存在，两个后端都要同步刷新元数据的TTL
+        self._touch(f"{self.META_PREFIX}{session_id}", self.session_ttl)
+
+    def delete_session(self, session_id: str) -> bool:
+        self.delete_turn_evaluations(session_id)
+        return self._delete(f"{self.META_PREFIX}{session_id}", f"{self.STATE_PREFIX}{session_id}") > 0
+
+    # ==================== 逐轮评估 ====================
+
+    def save_turn_evaluation(self, session_id: str, turn_key: str, evaluation: Dict[str, Any]):
+        """保存单轮回答的评估结果（Redis中同一会话的各轮存在一个哈希里，与会话同TTL）"""
+        payload = dump_state(evaluation)
+        if self.redis_client is not None:
+            key = f"{self.TURN_PREFIX}{session_id}"
+            pipe = self.redis_client.pipeline()
+            pipe.hset(key, turn_key, payload)
+            pipe.expire(key, int(self.session_ttl.total_seconds()))
+            pipe.execute()
+            return
+        self._set(f"{self.TURN_PREFIX}{session_id}:{turn_key}", payload, self.session_ttl)
+
+    def get_turn_evaluations(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """获取会话已完成的逐轮评估 {turn_key: evaluation}"""
+        if self.redis_client is not None:
+            rows = self.redis_client.hgetall(f"{self.TURN_PREFIX}{session_id}")
+            return {
+                (key.decode("utf-8") if isinstance(key, bytes) else key): load_state(value)
+                for key, value in rows.items()
+            }
+        prefix = f"{self.TURN_PREFIX}{session_id}:"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM interview_state WHERE key >= ? AND key < ? AND expires_at >= ?",
+                (prefix, prefix + "\uffff", time.time())
+            ).fetchall()
+        return {key[len(prefix):]: load_state(value) for key, value in rows}
+
+    def delete_turn_evaluations(self, session_id: str) -> int:
+        if self.redis_client is not None:
+            return int(self.redis_client.delete(f"{self.TURN_PREFIX}{session_id}"))
+        prefix = f"{self.TURN_PREFIX}{session_id}:"
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM interview_state WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    # ==================== 任务状态 ====================
+
+    @staticmethod
+    def _encode_task_status(status: Dict[str, Any]) -> bytes:
+        return json.dumps(status, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+    def set_task_status(self, task_id: str, status: Dict[str, Any]):
+        self._set(f"{self.TASK_PREFIX}{task_id}", self._encode_task_status(status), self.task_ttl)
+
+    def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        payload = self._get(f"{self.TASK_PREFIX}{task_id}")
+        return json.loads(payload) if payload is not None else None
+
+    def update_task_status(self, task_id: str, **fields) -> bool:
+        """合并更新任务状态，任务不存在时返回False
+
+        API进程和worker会并发更新同一任务，读-改-写在事务中完成（Redis WATCH/MULTI，SQLite BEGIN IMMEDIATE），
+        避免互相覆盖对方写入的字段。
+        """
+        key = f"{self.TASK_PREFIX}{task_id}"
+        if self.redis_client is not None:
+            import redis
+            with self.redis_client.pipeline() as pipe:
+                while True:
+                    try:
+                        pipe.watch(key)
+                        payload = pipe.get(key)
+                        if payload is None:
+                            pipe.unwatch()
+                            return False
+                        status = json.loads(payload)
+                        status.update(fields)
+                        pipe.multi()
+                        pipe.setex(key, int(self.task_ttl.total_seconds()), self._encode_task_status(status))
+                        pipe.execute()
+                        return True
+                    except redis.WatchError:
+                        continue
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM interview_state WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] < time.time():
+                    self._conn.rollback()
+                    return False
+                status = json.loads(row[0])
+                status.update(fields)
+                self._conn.execute(
+                    "UPDATE interview_state SET value = ?, expires_at = ? WHERE key = ?",
+                    (self._encode_task_status(status), time.time() + self.task_ttl.total_seconds(), key)
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return True
+
+    # ==================== 维护 ====================
+
+    def purge_expired(self) -> int:
+        """清理SQLite中已过期的记录（Redis依靠TTL自动过期）"""
+        if self.redis_client is not None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM interview_state WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def _maybe_purge(self):
+        """SQLite写入时按间隔顺带清理过期记录"""
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+        try:
+            purged = self.purge_expired()
+            if purged:
+                logger.info(f"🧹 清理过期面试状态记录: {purged} 条")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 清理过期面试状态记录失败: {e}")
+
+    def health_check(self) -> Dict[str, Any]:
+        try:
+            if self.redis_client is not None:
+                return {"status": "healthy", "backend": "redis", "ping": self.redis_client.ping()}
+            with self._lock:
+                count = self._conn.execute(
+                    "SELECT COUNT(*) FROM interview_state WHERE key LIKE ? AND expires_at >= ?",
+                    (f"{self.META_PREFIX}%", time.time())
+                ).fetchone()[0]
+            return {"status": "healthy", "backend": "sqlite", "path": self.sqlite_path, "active_sessions": count}
+        except Exception as e:
+            return {"status": "error", "backend": self.backend, "error": str(e)}
+
+
+# 全局面试状态存储
+_interview_state_store = None
+_interview_state_store_lock = threading.Lock()
+
+
+def get_interview_state_store() -> InterviewStateStore:
+    """获取全局面试状态存储实例"""
+    global _interview_state_store
+
+    if _interview_state_store is None:
+        with _interview_state_store_lock:
+            if _interview_state_store is None:
+                _interview_state_store = InterviewStateStore(
+                    backend=getattr(model_config, 'INTERVIEW_STATE_BACKEND', 'redis'),
+                    sqlite_path=getattr(model_config, 'INTERVIEW_STATE_SQLITE_PATH', 'data/sqlite/interview_state.db'),
+                    session_ttl=timedelta(hours=getattr(model_config, 'INTERVIEW_SESSION_TTL_HOURS', 8)),
+                    task_ttl=timedelta(hours=getattr(model_config, 'INTERVIEW_TASK_TTL_HOURS', 24)),
+                    purge_interval=getattr(model_config, 'INTERVIEW_STATE_PURGE_INTERVAL_SECONDS', 600)
+                )
+
+    return _interview_state_store
@@ -0,0 +1,170 @@
+"""
+题库去重工具
+- 题目标题规范化后生成稳定ID，同一道题重复生成时 upsert 到同一条记录
+- 标题特征（去掉提问套话、归一同义措辞后的英文词 + 中文二元组）的Jaccard相似度判断近重复，
+  MinHash分段（LSH）索引只对可能相似的题目计算精确Jaccard，入库前过滤措辞略有差异的题目
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+# MinHash签名 = 16段 x 每段4个哈希：Jaccard 0.8 的两道题至少一段相同的概率 > 99.9%，
+# Jaccard 0.3 的题目成为候选的概率约 12%，候选再按精确Jaccard判断
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+MINHASH_PERMUTATIONS = MINHASH_BANDS * MINHASH_ROWS
+_MINHASH_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_MINHASH_A = _rng.randint(1, _MINHASH_PRIME, size=MINHASH_PERMUTATIONS).astype(np.int64)
+_MINHASH_B = _rng.randint(0, _MINHASH_PRIME, size=MINHASH_PERMUTATIONS).astype(np.int64)
+
+_PUNCTUATION_RE = re.compile(r"[\s\W_]+", re.UNICODE)
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*|[一-鿿]+")
+
+# 同义措辞归一（先于套话去除，按长度优先替换）
+_SYNONYMS = {
+    "工作原理": "原理", "实现原理": "原理", "底层原理": "原理", "机制": "原理",
+    "流程": "过程", "差异": "区别", "不同点": "区别", "不同": "区别", "异同": "区别",
+    "优势": "优点", "好处": "优点", "劣势": "缺点", "不足": "缺点",
+    "使用场景": "场景", "应用场景": "场景",
+}
+# 提问套话，不参与相似度比较
+_FILLER_PHRASES = (
+    "请你", "请", "简要", "简单", "详细", "谈一谈", "谈谈", "说一说", "说说", "讲一讲", "讲讲",
+    "解释一下", "解释", "介绍一下", "介绍", "阐述", "描述", "简述", "说明", "一下", "你对", "你的",
+    "什么是", "是什么", "是怎样的", "是如何", "有什么", "有哪些", "有何", "什么", "如何", "怎么", "怎样", "为什么",
+    "中的", "里的", "之间的", "的", "吗", "呢", "以及", "和", "与", "理解", "实现",
+)
+# 考察点后缀单独成词，避免与主题词拼出跨界二元组（"握手过程" 与 "握手的过程" 特征相同）
+_TOPIC_WORDS = ("原理", "过程", "区别", "优点", "缺点", "作用", "场景")
+_DROPPED_SEGMENTS = {"中", "里"}
+
+_SYNONYM_ORDER = sorted(_SYNONYMS, key=len, reverse=True)
+_FILLER_ORDER = sorted(_FILLER_PHRASES, key=len, reverse=True)
+
+
+def normalize_question_title(title: str) -> str:
+    """标题规范化：全半角统一、小写、去掉空白和标点"""
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    return _PUNCTUATION_RE.sub("", text)
+
+
+def stable_question_id(title: str, question_type: str = "") -> str:
+    """基于规范化标题和题型的稳定题目ID"""
+    base = f"{question_type}|{normalize_question_title(title)}"
+    return f"q_{hashlib.sha1(base.encode('utf-8')).hexdigest()[:24]}"
+
+
+def _bigrams(segment: str) -> Iterable[str]:
+    if len(segment) == 1:
+        return [segment]
+    return (segment[i:i + 2] for i in range(len(segment) - 1))
+
+
+def title_shingles(title: str) -> FrozenSet[str]:
+    """近重复比较用的标题特征：英文/数字按词，中文片段去掉套话后按二元组"""
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    for phrase in _SYNONYM_ORDER:
+        text = text.replace(phrase, _SYNONYMS[phrase])
+
+    shingles: Set[str] = set()
+    for match in _TOKEN_RE.findall(text):
+        if match[0].isascii():
+            shingles.add(match.rstrip("."))
+            continue
+        for phrase in _FILLER_ORDER:
+            match = match.replace(phrase, " ")
+        for word in _TOPIC_WORDS:
+            match = match.replace(word, f" {word} ")
+        for segment in match.split():
+            if segment not in _DROPPED_SEGMENTS:
+                shingles.update(_bigrams(segment))
+
+    if not shingles:
+        # 标题全部由套话组成时退回规范化标题的二元组
+        normalized = normalize_question_title(title)
+        shingles.update(_bigrams(normalized) if normalized else [])
+    return frozenset(shingles)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def minhash_signature(shingles: Iterable[str]) -> np.ndarray:
+    """MinHash签名（64个哈希函数，跨进程稳定）"""
+    hashes = np.array(
+        [int.from_bytes(hashlib.md5(s.encode("utf-8")).digest()[:8], "big") % _MINHASH_PRIME for s in shingles],
+        dtype=np.int64
+    )
+    if hashes.size == 0:
+        return np.full(MINHASH_PERMUTATIONS, _MINHASH_PRIME, dtype=np.int64)
+    return ((_MINHASH_A[:, None] * hashes[None, :] + _MINHASH_B[:, None]) % _MINHASH_PRIME).min(axis=1)
+
+
+class MinHashIndex:
+    """标题近重复索引 - MinHash分段建倒排，查询只对至少一段相同的候选计算精确Jaccard"""
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self._shingles: Dict[str, FrozenSet[str]] = {}
+        self._item_bands: Dict[str, Tuple[Tuple[int, bytes], ...]] = {}
+        self._bands: Dict[Tuple[int, bytes], Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._shingles
+
+    @staticmethod
+    def _band_keys(shingles: FrozenSet[str]) -> Tuple[Tuple[int, bytes], ...]:
+        signature = minhash_signature(shingles)
+        return tuple(
+            (band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS].tobytes())
+            for band in range(MINHASH_BANDS)
+        )
+
+    def add(self, item_id: str, shingles: FrozenSet[str]):
+        keys = self._band_keys(shingles)
+        with self._lock:
+            self.remove(item_id, _locked=True)
+            self._shingles[item_id] = shingles
+            self._item_bands[item_id] = keys
+            for key in keys:
+                self._bands.setdefault(key, set()).add(item_id)
+
+    def remove(self, item_id: str, _locked: bool = False):
+        if not _locked:
+            with self._lock:
+                return self.remove(item_id, _locked=True)
+        if self._shingles.pop(item_id, None) is None:
+            return
+        for key in self._item_bands.pop(item_id, ()):
+            ids = self._bands.get(key)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._bands[key]
+
+    def find_duplicate(self, shingles: FrozenSet[str], exclude_id: Optional[str] = None) -> Optional[str]:
+        """返回Jaccard相似度最高且不低于阈值的已有条目ID"""
+        keys = self._band_keys(shingles)
+        with self._lock:
+            candidates = set()
+            for key in keys:
+                candidates |= self._bands.get(key, set())
+            best_id, best_similarity = None, 0.0
+            for candidate in candidates:
+                if candidate == exclude_id:
+                    continue
+                similarity = jaccard(shingles, self._shingles[candidate])
+                if similarity >= self.threshold and similarity > best_similarity:
+                    best_id, best_similarity = candidate, similarity
+            return best_id
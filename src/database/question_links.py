@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+题目关联存储 - SQLite多对多关系表
+
+题库去重后同一道题目会被多个会话、任务复用，关联关系单独存放并只追加，
+复用已有题目时不再改写题目记录上的会话/任务/题目池字段，先前的会话仍能按ID取回自己的题目，
+一道题目可以同时属于多个题目池。
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# 关联类型
+LINK_SESSION = "session"
+LINK_TASK = "task"
+LINK_POOL = "pool"
+
+
+class QuestionLinkStore:
+    """题目关联表 (类型, 关联值, 题目ID)"""
+
+    def __init__(self, db_path: str = "data/chromadb/question_links.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._init_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取线程安全的数据库连接"""
+        if not hasattr(self._local, "connection"):
+            self._local.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+        return self._local.connection
+
+    @contextmanager
+    def get_db_cursor(self):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"题目关联数据库操作失败: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def _init_database(self):
+        with self.get_db_cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS question_links (
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    question_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (kind, value, question_id)
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_question_links_question ON question_links(question_id)")
+
+    def link(self, kind: str, value: str, question_ids: Iterable[str]) -> int:
+        """追加关联（已存在的关联保持不变），返回新增数量"""
+        question_ids = list(dict.fromkeys(question_ids))
+        if not value or not question_ids:
+            return 0
+        now = time.time()
+        with self.get_db_cursor() as cursor:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO question_links (kind, value, question_id, created_at) VALUES (?, ?, ?, ?)",
+                [(kind, value, question_id, now) for question_id in question_ids]
+            )
+            return cursor.rowcount
+
+    def get_question_ids(self, kind: str, value: str) -> List[str]:
+        """按关联时间顺序返回题目ID"""
+        with self.get_db_cursor() as cursor:
+            cursor.execute(
+                "SELECT question_id FROM question_links WHERE kind = ? AND value = ? ORDER BY created_at, rowid",
+                (kind, value)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, kind: str, value: str) -> int:
+        with self.get_db_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM question_links WHERE kind = ? AND value = ?", (kind, value))
+            return cursor.fetchone()[0]
+
+    def redirect(self, mapping: Dict[str, str]) -> int:
+        """题库压缩后把旧题目ID的关联转移到保留的题目ID上"""
+        moved = 0
+        with self.get_db_cursor() as cursor:
+            for old_id, new_id in mapping.items():
+                if old_id == new_id:
+                    continue
+                cursor.execute(
+                    "INSERT OR IGNORE INTO question_links (kind, value, question_id, created_at) "
+                    "SELECT kind, value, ?, created_at FROM question_links WHERE question_id = ?",
+                    (new_id, old_id)
+                )
+                cursor.execute("DELETE FROM question_links WHERE question_id = ?", (old_id,))
+                moved += cursor.rowcount
+        return moved
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+学习资源存储 - SQLite持久化 + 内存倒排索引
+
+- 资源持久化在 SQLite，进程启动时一次性加载并建立索引
+- 关键词（标题/描述/标签分词）、标签、能力、难度、分类各有倒排索引，检索只访问命中的资源
+- 英文词额外建立前缀倒排，"py"、"docker-comp" 这类不完整的词仍能命中
+- 资源ID按创建时间预排序，分页不再对全部结果排序
+- 可选语义检索：查询已有的 learning_resources 向量集合，按相同条件过滤
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .bm25_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# 资源JSON中的 type 映射到资源分类（article/video/course/book/practice）
+TYPE_TO_CATEGORY = {
+    "article": "article",
+    "website": "article",
+    "video": "video",
+    "course": "course",
+    "book": "book",
+    "practice": "practice",
+    "project": "practice",
+    "tool": "practice",
+}
+
+# 能力维度归一映射（与入库脚本一致）
+COMPETENCY_ALIAS = {
+    "expression_ability": "communication_ability",
+    "stress_resistance": "stress_resilience",
+}
+
+INDEXED_FIELDS = ("competency", "difficulty", "category")
+
+# 英文词前缀索引的最大长度，更长的查询词按完整词匹配
+MAX_PREFIX_LENGTH = 20
+
+
+def resource_stable_id(title: str, url: str) -> str:
+    """与向量库入库相同的稳定ID：title|url 的sha1前缀"""
+    return f"lr_{hashlib.sha1(f'{title}|{url}'.encode('utf-8')).hexdigest()[:24]}"
+
+
+def _value(field_value: Any) -> str:
+    """枚举字段统一为字符串值"""
+    return getattr(field_value, "value", field_value) or ""
+
+
+def _index_tokens(text: str) -> Set[str]:
+    """建索引用的分词：英文按词，中文按单字和二元组（查询单个汉字时也能命中）"""
+    tokens = set(tokenize(text))
+    tokens.update(char for token in list(tokens) if not token.isascii() for char in token)
+    return tokens
+
+
+def _prefix_keys(tokens: Iterable[str]) -> Set[str]:
+    """英文词的全部前缀（包含词本身，最长 MAX_PREFIX_LENGTH）"""
+    return {
+        token[:length]
+        for token in tokens if token.isascii()
+        for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1)
+    }
+
+
+class LearningResourceStore:
+    """学习资源存储与索引"""
+
+    def __init__(self, db_path: str = "data/sqlite/learning_resources.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.RLock()
+
+        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._fields: Dict[str, Dict[str, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        # (-创建时间戳, ID) 升序即创建时间倒序
+        self._order: List[Tuple[float, str]] = []
+        self._popular: Optional[List[str]] = None
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._init_database()
+        self._load()
+
+    # ==================== 持久化 ====================
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取线程安全的数据库连接"""
+        if not hasattr(self._local, "connection"):
+            self._local.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+            self._local.connection.row_factory = sqlite3.Row
+        return self._local.connection
+
+    @contextmanager
+    def get_db_cursor(self):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"学习资源数据库操作失败: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def _init_database(self):
+        with self.get_db_cursor() as cursor:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS learning_resources (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    url TEXT,
+                    category TEXT NOT NULL,
+                    competency TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    field TEXT,
+                    source TEXT,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+
+    def _load(self):
+        with self.get_db_cursor() as cursor:
+            cursor.execute("SELECT * FROM learning_resources")
+            rows = cursor.fetchall()
+        with self._lock:
+            for row in rows:
+                resource = dict(row)
+                resource["tags"] = json.loads(resource["tags"] or "[]")
+                resource["created_at"] = datetime.fromisoformat(resource["created_at"])
+                self._index(resource)
+        logger.info(f"✅ 学习资源索引已加载: {len(self._resources)} 条")
+
+    def _persist(self, resources: List[Dict[str, Any]]):
+        with self.get_db_cursor() as cursor:
+            cursor.executemany('''
+                INSERT OR REPLACE INTO learning_resources
+                (id, title, description, url, category, competency, difficulty, tags, field, source, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                r["id"], r["title"], r.get("description", ""), r.get("url", ""),
+                r["category"], r["competency"], r["difficulty"],
+                json.dumps(r.get("tags", []), ensure_ascii=False),
+                r.get("field", ""), r.get("source", ""), r["created_at"].isoformat()
+            ) for r in resources])
+
+    # ==================== 索引维护 ====================
+
+    @staticmethod
+    def _keyword_tokens(resource: Dict[str, Any]) -> Set[str]:
+        text = " ".join([resource["title"], resource.get("description", "")] + list(resource.get("tags", [])))
+        return _index_tokens(text)
+
+    def _index(self, resource: Dict[str, Any]):
+        resource_id = resource["id"]
+        self._resources[resource_id] = resource
+        tokens = self._keyword_tokens(resource)
+        for token in tokens:
+            self._tokens.setdefault(token, set()).add(resource_id)
+        for prefix in _prefix_keys(tokens):
+            self._prefixes.setdefault(prefix, set()).add(resource_id)
+        for tag in resource.get("tags", []):
+            self._tags.setdefault(tag.lower(), set()).add(resource_id)
+        for field in INDEXED_FIELDS:
+            self._fields[field].setdefault(resource[field], set()).add(resource_id)
+        bisect.insort(self._order, (-resource["created_at"].timestamp(), resource_id))
+        self._popular = None
+
+    def _unindex(self, resource_id: str) -> Optional[Dict[str, Any]]:
+        resource = self._resources.pop(resource_id, None)
+        if resource is None:
+            return None
+
+        def discard(index: Dict[str, Set[str]], key: str):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(resource_id)
+                if not ids:
+                    del index[key]
+
+        tokens = self._keyword_tokens(resource)
+        for token in tokens:
+            discard(self._tokens, token)
+        for prefix in _prefix_keys(tokens):
+            discard(self._prefixes, prefix)
+        for tag in resource.get("tags", []):
+            discard(self._tags, tag.lower())
+        for field in INDEXED_FIELDS:
+            discard(self._fields[field], resource[field])
+        key = (-resource["created_at"].timestamp(), resource_id)
+        position = bisect.bisect_left(self._order, key)
+        if position < len(self._order) and self._order[position] == key:
+            del self._order[position]
+        self._popular = None
+        return resource
+
+    @staticmethod
+    def _normalize(resource: Dict[str, Any]) -> Dict[str, Any]:
+        competency = _value(resource.get("competency")).strip() or "professional_knowledge"
+        created_at = resource.get("created_at") or datetime.now()
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        return {
+            "id": resource["id"],
+            "title": resource.get("title", ""),
+            "description": resource.get("description", "") or "",
+            "url": resource.get("url", "") or "",
+            "category": _value(resource.get("category")) or "article",
+            "competency": COMPETENCY_ALIAS.get(competency, competency),
+            "difficulty": (_value(resource.get("difficulty")) or "beginner").lower(),
+            "tags": [str(tag) for tag in resource.get("tags", []) if str(tag).strip()],
+            "field": resource.get("field", "") or "",
+            "source": resource.get("source", "") or "",
+            "created_at": created_at
+        }
+
+    # ==================== 增删改查 ====================
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __contains__(self, resource_id: str) -> bool:
+        return resource_id in self._resources
+
+    def get(self, resource_id: str) -> Optional[Dict[str, Any]]:
+        resource = self._resources.get(resource_id)
+        return dict(resource) if resource else None
+
+    def upsert_many(self, resources: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """新增或替换资源（同时写入SQLite和索引）"""
+        normalized = [self._normalize(resource) for resource in resources]
+        if not normalized:
+            return []
+        with self._lock:
+            self._persist(normalized)
+            for resource in normalized:
+                self._unindex(resource["id"])
+                self._index(resource)
+        return [dict(resource) for resource in normalized]
+
+    def upsert(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        return self.upsert_many([resource])[0]
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            if self._unindex(resource_id) is None:
+                return False
+            with self.get_db_cursor() as cursor:
+                cursor.execute("DELETE FROM learning_resources WHERE id = ?", (resource_id,))
+        return True
+
+    def import_raw_resources(self, raw_list: List[Dict[str, Any]], source: str = "user_json_v1") -> int:
+        """导入 learning_resources.json 格式的资源（ID与向量库一致，便于语义检索结果回查）"""
+        resources = []
+        for raw in raw_list:
+            keywords = raw.get("keywords", "")
+            if isinstance(keywords, str):
+                keywords = [keyword.strip() for keyword in keywords.split(",")]
+            resource_type = (raw.get("type") or "article").lower()
+            resource_id = str(raw.get("id") or resource_stable_id(raw.get("title", ""), raw.get("url", "")))
+            existing = self._resources.get(resource_id)
+            resources.append({
+                "id": resource_id,
+                "title": raw.get("title", ""),
+                "description": raw.get("description", ""),
+                "url": raw.get("url", ""),
+                "category": TYPE_TO_CATEGORY.get(resource_type, "article"),
+                "competency": raw.get("competency"),
+                "difficulty": raw.get("difficulty"),
+                "tags": keywords,
+                "field": raw.get("field", ""),
+                "source": source,
+                "created_at": existing["created_at"] if existing else None
+            })
+        return len(self.upsert_many(resources))
+
+    # ==================== 检索 ====================
+
+    def _candidates(self, query: Optional[str] = None, tags: Optional[List[str]] = None,
+                    **filters: Optional[str]) -> Optional[Set[str]]:
+        """按倒排索引求交集；没有任何条件时返回 None（表示全部资源）"""
+        sets: List[Set[str]] = []
+        for field, value in filters.items():
+            if value:
+                sets.append(self._fields[field].get(_value(value), set()))
+        for tag in tags or []:
+            sets.append(self._tags.get(tag.lower(), set()))
+        if query:
+            query_tokens = set(tokenize(query)) or _index_tokens(query)
+            for token in query_tokens:
+                # 英文词按前缀匹配（"py" 命中 Python3），中文按单字/二元组匹配
+                if token.isascii() and len(token) <= MAX_PREFIX_LENGTH:
+                    sets.append(self._prefixes.get(token, set()))
+                else:
+                    sets.append(self._tokens.get(token, set()))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def _sorted_page(self, candidates: Optional[Set[str]], offset: int, limit: int) -> List[str]:
+        """按创建时间倒序分页：候选集小时直接排序，候选集大时顺序扫描预排序列表"""
+        if candidates is None:
+            return [resource_id for _, resource_id in self._order[offset:offset + limit]]
+        if len(candidates) * 8 < len(self._order):
+            ordered = sorted(candidates, key=lambda rid: (-self._resources[rid]["created_at"].timestamp(), rid))
+            return ordered[offset:offset + limit]
+        page, skipped = [], 0
+        for _, resource_id in self._order:
+            if resource_id in candidates:
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                page.append(resource_id)
+                if len(page) >= limit:
+                    break
+        return page
+
+    def search(self, query: Optional[str] = None, competency: Optional[str] = None,
+               difficulty: Optional[str] = None, category: Optional[str] = None,
+               tags: Optional[List[str]] = None, limit: int = 10, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """关键词 + 条件检索，返回 (当前页资源, 总数)"""
+        with self._lock:
+            candidates = self._candidates(
+                query=query, tags=tags, competency=competency, difficulty=difficulty, category=category
+            )
+            total = len(self._order) if candidates is None else len(candidates)
+            page = self._sorted_page(candidates, offset, limit)
+            return [dict(self._resources[resource_id]) for resource_id in page], total
+
+    def semantic_search(self, query: str, competency: Optional[str] = None,
+                        difficulty: Optional[str] = None, category: Optional[str] = None,
+                        limit: int = 10, offset: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """通过 learning_resources 向量集合做语义检索；向量库不可用时返回 None"""
+        try:
+            from ..tools.vector_search import create_learning_resource_manager
+            from ..tools.embedding_service import get_collection_embedding_service
+
+            manager = create_learning_resource_manager()
+            collection = manager.vector_tool.client.get_collection(manager.collection_name)
+            conditions = [{"competency": {"$eq": _value(competency)}}] if competency else []
+            if difficulty:
+                conditions.append({"difficulty": {"$eq": _value(difficulty)}})
+            where = None if not conditions else conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+            # 分类由资源类型映射而来，在结果中过滤，因此多取一些候选
+            n_results = min((offset + limit) * (3 if category else 1), 200)
+            results = collection.query(
+                query_embeddings=[get_collection_embedding_service(collection).embed_one(query).tolist()],
+                n_results=n_results,
+                where=where
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 学习资源语义检索不可用，回退到关键词检索: {e}")
+            return None
+
+        matched = []
+        with self._lock:
+            for resource_id in (results.get("ids") or [[]])[0]:
+                resource = self._resources.get(resource_id)
+                if resource is None or (category and resource["category"] != _value(category)):
+                    continue
+                matched.append(dict(resource))
+        return matched[offset:offset + limit]
+
+    def recommend(self, competency: Optional[str] = None, difficulty: Optional[str] = None,
+                  limit: int = 5) -> List[Dict[str, Any]]:
+        """优先返回匹配能力/难度的资源，不足时按标签数量补充热门资源"""
+        with self._lock:
+            recommended: List[str] = []
+            if competency or difficulty:
+                candidates = self._candidates(competency=competency, difficulty=difficulty) or set()
+                recommended = self._sorted_page(candidates, 0, limit)
+            if len(recommended) < limit:
+                if self._popular is None:
+                    self._popular = [
+                        resource_id for _, resource_id in
+                        sorted(self._order, key=lambda item: -len(self._resources[item[1]].get("tags", [])))
+                    ]
+                chosen = set(recommended)
+                for resource_id in self._popular:
+                    if len(recommended) >= limit:
+                        break
+                    if resource_id not in chosen:
+                        recommended.append(resource_id)
+            return [dict(self._resources[resource_id]) for resource_id in recommended[:limit]]
+
+    def latest(self, limit: int = 5) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(self._resources[resource_id]) for _, resource_id in self._order[:limit]]
+
+    def distribution(self, field: str) -> Dict[str, int]:
+        """各字段取值的资源数（直接读取索引大小）"""
+        with self._lock:
+            return {value: len(ids) for value, ids in self._fields[field].items()}
+
+
+# 全局学习资源存储
+_resource_store = None
+_resource_store_lock = threading.Lock()
+
+
+def get_resource_store() -> LearningResourceStore:
+    """获取全局学习资源存储（首次创建且为空时从 learning_resources.json 导入）"""
+    global _resource_store
+
+    if _resource_store is None:
+        with _resource_store_lock:
+            if _resource_store is None:
+                store = LearningResourceStore(
+                    os.environ.get("LEARNING_RESOURCES_DB", "data/sqlite/learning_resources.db")
+                )
+                data_path = os.environ.get("LEARNING_RESOURCES_JSON", "data/learning_resources/learning_resources.json")
+                if len(store) == 0 and os.path.exists(data_path):
+                    try:
+                        with open(data_path, "r", encoding="utf-8") as f:
+                            raw = json.load(f)
+                        if isinstance(raw, list):
+                            imported = store.import_raw_resources(raw)
+                            print(f"✅ 学习资源已导入本地存储: {imported} 条")
+                    except Exception as e:
+                        logger.warning(f"⚠️ 导入学习资源失败: {e}")
+                _resource_store = store
+
+    return _resource_store
@@ -5,16 +5,58 @@
 from typing import Any, Optional, List, AsyncIterator, Dict
 from langchain_core.language_models.llms import LLM
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
-from langchain_core.outputs import ChatResult, ChatGeneration, LLMResult, Generation
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk, LLMResult, Generation
 from langchain_core.callbacks.manager import CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import asyncio
+import httpx
 import logging
+import threading
+import weakref
 
-from ..config.settings import spark_config
+from ..config.settings import spark_config, model_config
 
 logger = logging.getLogger(__name__)
 
+SPARK_BASE_URL = "https://spark-api-open.xf-yun.com/v2/"
+
+# 异步客户端按事件循环缓存：httpx连接池绑定创建它的事件循环，
+# 常驻事件循环（如Celery worker）中的所有任务复用同一个连接池
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def get_async_spark_client() -> AsyncOpenAI:
+    """获取当前事件循环共享的星火异步客户端（带连接池）"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        with _async_clients_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                max_connections = getattr(model_config, 'LLM_MAX_CONNECTIONS', 20)
+                client = AsyncOpenAI(
+                    api_key=f"{spark_config.app_id}:{spark_config.api_secret}",
+                    base_url=SPARK_BASE_URL,
+                    http_client=httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=max_connections,
+                            max_keepalive_connections=max_connections
+                        ),
+                        timeout=getattr(model_config, 'LLM_REQUEST_TIMEOUT', 120)
+                    )
+                )
+                _async_clients[loop] = client
+    return client
+
+
+async def close_async_spark_client():
+    """关闭当前事件循环的星火异步客户端（事件循环关闭前调用）"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
 
 class SparkChatModel(BaseChatModel):
     """
@@ -32,7 +74,7 @@ class SparkChatModel(BaseChatModel):
         
         # 创建OpenAI客户端，使用讯飞API
         api_key = f"{spark_config.app_id}:{spark_config.api_secret}"
-        base_url = "https://spark-api-open.xf-yun.com/v2/"
+        base_url = SPARK_BASE_URL
         
         # 使用私有属性避免Pydantic字段冲突
         object.__setattr__(self, '_client', OpenAI(
@@ -85,7 +127,7 @@ class SparkChatModel(BaseChatModel):
             response = self._client.chat.completions.create(
                 model=self.model_name,
                 messages=api_messages,
-                temperature=self.temperature,
+                temperature=kwargs.pop("temperature", self.temperature),
                 max_tokens=self.max_tokens,
                 stream=False,
                 **kwargs
@@ -116,11 +158,11 @@ class SparkChatModel(BaseChatModel):
             # 转换消息格式
             api_messages = self._convert_messages_to_api_format(messages)
             
-            # 调用星火API (同步调用，因为官方SDK不支持异步)
-            response = self._client.chat.completions.create(
+            # 调用星火API (异步客户端，等待响应期间不阻塞事件循环)
+            response = await get_async_spark_client().chat.completions.create(
                 model=self.model_name,
                 messages=api_messages,
-                temperature=self.temperature,
+                temperature=kwargs.pop("temperature", self.temperature),
                 max_tokens=self.max_tokens,
                 stream=False,
                 **kwargs
@@ -138,6 +180,40 @@ class SparkChatModel(BaseChatModel):
             logger.error(f"星火模型异步调用失败: {e}")
             raise ValueError(f"Spark API异步调用失败: {e}")
     
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """异步流式生成 - 逐段返回模型输出（调用方提前结束迭代时关闭连接，不再消耗token）"""
+        
+        api_messages = self._convert_messages_to_api_format(messages)
+        
+        stream = await get_async_spark_client().chat.completions.create(
+            model=self.model_name,
+            messages=api_messages,
+            temperature=kwargs.pop("temperature", self.temperature),
+            max_tokens=self.max_tokens,
+            stream=True,
+            **kwargs
+        )
+        
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                generation = ChatGenerationChunk(message=AIMessageChunk(content=content))
+                if run_manager:
+                    await run_manager.on_llm_new_token(content, chunk=generation)
+                yield generation
+        finally:
+            await stream.close()
+    
     def _identifying_params(self) -> Dict[str, Any]:
         """返回识别模型的参数"""
         return {
@@ -3,13 +3,52 @@
 处理多模态数据并生成评估结果的确定性节点
 注意：这是简化版本，实际项目中需要集成视觉、听觉分析等组件
 """
+import hashlib
 import json
+import re
+import threading
 import time
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional
 from dataclasses import asdict
 
-from ..models.state import InterviewState, MultimodalAnalysis
+from langchain_core.messages import HumanMessage
+
+from ..models.state import InterviewState, MultimodalAnalysis, ConversationTurn
 from ..models.spark_client import create_spark_model
+from ..tools.llm_cache import DETERMINISTIC_TEMPERATURE, get_llm_cache
+
+try:
+    from ..config.settings import model_config
+except ImportError:
+    model_config = None
+
+
+def turn_evaluation_key(turn: ConversationTurn) -> str:
+    """对话轮次的评估键：问题ID + 问题 + 回答 的哈希，回答内容变化时重新评估"""
+    raw = f"{turn.question_id}\n{turn.question}\n{turn.answer}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# 逐轮评估的步骤，失败的步骤在下次评估时单独重试
+TURN_EVALUATION_STEPS = ("star", "skill", "rubric")
+
+
+# 结束面试时补评缺失轮次的线程池（worker进程内所有会话共享，按需创建）
+_turn_executor = None
+_turn_executor_lock = threading.Lock()
+
+
+def _get_turn_executor() -> ThreadPoolExecutor:
+    global _turn_executor
+
+    with _turn_executor_lock:
+        if _turn_executor is None:
+            _turn_executor = ThreadPoolExecutor(
+                max_workers=getattr(model_config, 'TURN_EVALUATION_WORKERS', 2),
+                thread_name_prefix="turn-evaluation"
+            )
+        return _turn_executor
 
 
 class ComprehensiveAnalysisNode:
@@ -97,116 +136,395 @@ class ComprehensiveAnalysisNode:
         }
     
     def _perform_real_multimodal_analysis(self, state: InterviewState) -> Dict[str, Any]:
-        """执行真实的多模态分析"""
+        """执行真实的多模态分析
+        
+        音视频分析（各自在独立进程中）与STAR结构、技能匹配分析（线程）并发执行，
+        总耗时接近最慢的模态。每个模态独立超时，失败或超时的模态使用备用数据并标记error，
+        其余模态的结果照常保留。
+        """
         
         conversation_history = state.get("conversation_history", [])
         
-        # 尝试进行真实的音视频分析
         try:
-            from ..tools.multimodal_analyzer import create_multimodal_analyzer
-            from ..tools.star_classifier import create_star_classifier
-            from ..tools.skill_matcher import create_skill_matcher
-            
-            multimodal_analyzer = create_multimodal_analyzer()
-            star_classifier = create_star_classifier()
-            skill_matcher = create_skill_matcher()
-            
-            # 检查是否有音视频文件路径
-            video_path = state.get("video_path")
-            audio_path = state.get("audio_path")
-            
-            # 执行音视频分析
-            if video_path or audio_path:
-                media_analysis = multimodal_analyzer.analyze_interview_media(
-                    video_path=video_path,
-                    audio_path=audio_path
-                )
-                visual_analysis = media_analysis.get("visual_analysis", {})
-                audio_analysis = media_analysis.get("audio_analysis", {})
-            else:
-                # 如果没有音视频文件，使用模拟数据
-                visual_analysis = self._get_fallback_visual_analysis()
-                audio_analysis = self._get_fallback_audio_analysis()
-            
-            # 文本分析（增强版）
-            text_analysis = self._analyze_text_content_enhanced(
-                conversation_history, star_classifier, skill_matcher, state
-            )
-            
-            return {
-                "visual_analysis": visual_analysis,
-                "audio_analysis": audio_analysis, 
-                "text_analysis": text_analysis
-            }
-            
+            from ..tools.model_registry import get_model_registry
+            from ..config.settings import model_config
         except ImportError as e:
             print(f"⚠️ 多模态分析模块导入失败: {e}")
             return self._simulate_multimodal_analysis_fallback(state)
-        except Exception as e:
-            print(f"⚠️ 多模态分析执行失败: {e}")
-            return self._simulate_multimodal_analysis_fallback(state)
-    
-    def _analyze_text_content_enhanced(
-        self, 
-        conversation_history: List,
-        star_classifier,
-        skill_matcher,
-        state: InterviewState
-    ) -> Dict[str, Any]:
-        """增强版文本内容分析"""
         
-        # 基础文本分析
-        basic_analysis = self._analyze_text_content(conversation_history)
+        # 模型由进程级注册表共享，不再每次分析重新加载BERT/句向量模型/MediaPipe图
+        registry = get_model_registry()
         
-        # 提取所有回答文本
-        all_answers = []
-        for turn in conversation_history:
-            all_answers.append(turn.answer)
+        # 检查是否有音视频文件路径
+        video_path = state.get("video_path")
+        audio_path = state.get("audio_path")
         
-        combined_text = "\n\n".join(all_answers)
+        start_time = time.time()
+        media_timeout = max(model_config.MULTIMODAL_VIDEO_TIMEOUT, model_config.MULTIMODAL_AUDIO_TIMEOUT) + 30
+        text_timeout = model_config.TEXT_ANALYSIS_TIMEOUT
+        errors = []
         
-        # STAR结构分析
+        # 不使用with语句：超时的任务不应阻塞节点返回
+        executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="analysis-node")
         try:
-            star_analysis = star_classifier.analyze_star_structure(combined_text)
-            basic_analysis["star_structure_analysis"] = star_analysis
-        except Exception as e:
-            print(f"⚠️ STAR结构分析失败: {e}")
-            basic_analysis["star_structure_analysis"] = {
+            media_future = None
+            if video_path or audio_path:
+                media_future = executor.submit(self._run_media_analysis, registry, video_path, audio_path)
+            # STAR、技能匹配和LLM评分按轮次进行：答题时已在后台完成的直接读取，只补评缺失的轮次
+            turns_future = executor.submit(
+                self._collect_turn_evaluations, state, conversation_history, start_time + text_timeout
+            )
+            
+            # 基础文本分析在当前线程中与上述任务并行；失败时与其他模态一样使用备用数据并记录错误
+            try:
+                text_analysis = self._analyze_text_content(conversation_history)
+            except Exception as e:
+                print(f"⚠️ 基础文本分析失败: {e}")
+                errors.append(f"基础文本分析失败: {e}")
+                text_analysis = self._get_fallback_text_analysis()
+                text_analysis["error"] = str(e)
+            
+            turn_evaluations, error = self._wait_for_modality(turns_future, "逐轮评估", start_time + text_timeout)
+            turn_evaluations = turn_evaluations or []
+            errors.extend([error] if error else [])
+            
+            star_analysis, skill_analysis = None, None
+            try:
+                star_analysis, skill_analysis = self._merge_turn_text_analyses(registry, turn_evaluations, state)
+            except Exception as e:
+                errors.append(f"逐轮评估合并失败: {e}")
+            text_analysis["star_structure_analysis"] = star_analysis or {
                 "completeness_score": 0.5,
                 "overall_assessment": "STAR结构分析不可用"
             }
-        
-        # 技能匹配分析
-        try:
-            user_info = state.get("user_info")
-            resume_summary = user_info.resume_summary if user_info else {}
-            
-            # 从简历中提取技能
-            resume_skills = []
-            if "skills" in resume_summary:
-                skills = resume_summary["skills"]
-                for skill_list in skills.values():
-                    if isinstance(skill_list, list):
-                        resume_skills.extend(skill_list)
+            text_analysis["skill_match_analysis"] = skill_analysis or {
+                "overall_skill_score": 0.5,
+                "detailed_analysis": "技能匹配分析不可用"
+            }
+            text_analysis["evaluated_turns"] = sum(1 for evaluation in turn_evaluations if evaluation)
             
-            # 根据目标领域构建岗位要求
-            job_requirements = self._get_job_requirements_by_field(
-                user_info.target_field if user_info else "Backend"
+            media_analysis = None
+            media_errors = []
+            if media_future is not None:
+                media_analysis, error = self._wait_for_modality(media_future, "音视频分析", start_time + media_timeout)
+                media_errors = [error] if error else media_analysis.get("processing_summary", {}).get("errors", [])
+                errors.extend(media_errors)
+        finally:
+            executor.shutdown(wait=False)
+        
+        # 合并部分结果：缺失的模态使用备用数据，提供了文件但分析失败时标记error
+        visual_analysis = (media_analysis or {}).get("visual_analysis")
+        if visual_analysis is None:
+            visual_analysis = self._get_fallback_visual_analysis()
+            if video_path:
+                visual_analysis["error"] = "; ".join(media_errors) or "视频分析失败"
+        
+        audio_analysis = (media_analysis or {}).get("audio_analysis")
+        if audio_analysis is None:
+            audio_analysis = self._get_fallback_audio_analysis()
+            if audio_path:
+                audio_analysis["error"] = "; ".join(media_errors) or "音频分析失败"
+        
+        return {
+            "visual_analysis": visual_analysis,
+            "audio_analysis": audio_analysis, 
+            "text_analysis": text_analysis,
+            "turn_evaluations": turn_evaluations,
+            "processing_summary": {
+                "total_time_seconds": time.time() - start_time,
+                "errors": errors
+            }
+        }
+    
+    def _run_media_analysis(self, registry, video_path: str, audio_path: str) -> Dict[str, Any]:
+        """执行音视频分析（分析器内部按模态并发并分别超时）
+        
+        模态在独立进程中分析时不使用共享分析器实例，不需要持有非线程安全模型的锁；
+        只有退回进程内线程执行时才加锁，避免并发的面试分析被串行化。
+        """
+        from ..tools.multimodal_analyzer import modality_processes_available
+        if modality_processes_available():
+            return registry.get("multimodal_analyzer").analyze_interview_media(
+                video_path=video_path,
+                audio_path=audio_path,
+                use_processes=True
             )
-            
-            skill_analysis = skill_matcher.analyze_skill_match(
-                combined_text, resume_skills, job_requirements
+        with registry.use("multimodal_analyzer") as multimodal_analyzer:
+            return multimodal_analyzer.analyze_interview_media(
+                video_path=video_path,
+                audio_path=audio_path,
+                use_processes=False
             )
-            basic_analysis["skill_match_analysis"] = skill_analysis
-            
+    
+    def _wait_for_modality(self, future, label: str, deadline: float):
+        """等待单个模态的结果，返回 (结果, 错误信息)；超时或失败时结果为None"""
+        try:
+            return future.result(timeout=max(0.0, deadline - time.time())), None
+        except FutureTimeoutError:
+            future.cancel()
+            error = f"{label}超时"
         except Exception as e:
-            print(f"⚠️ 技能匹配分析失败: {e}")
-            basic_analysis["skill_match_analysis"] = {
-                "overall_skill_score": 0.5,
-                "detailed_analysis": "技能匹配分析不可用"
+            error = f"{label}失败: {e}"
+        print(f"⚠️ {error}")
+        return None, error
+    
+    def _analyze_star_structure(self, registry, combined_text: str) -> Dict[str, Any]:
+        """STAR结构分析"""
+        return registry.get("star_classifier").analyze_star_structure(combined_text)
+    
+    def _skill_context(self, state: InterviewState) -> tuple[List[str], List[str]]:
+        """简历技能和目标领域的岗位要求"""
+        
+        user_info = state.get("user_info")
+        resume_summary = user_info.resume_summary if user_info else {}
+        
+        # 从简历中提取技能
+        resume_skills = []
+        if "skills" in resume_summary:
+            skills = resume_summary["skills"]
+            for skill_list in skills.values():
+                if isinstance(skill_list, list):
+                    resume_skills.extend(skill_list)
+        
+        # 根据目标领域构建岗位要求
+        job_requirements = self._get_job_requirements_by_field(
+            user_info.target_field if user_info else "Backend"
+        )
+        
+        return resume_skills, job_requirements
+    
+    # ==================== 逐轮评估 ====================
+    
+    def _turn_context(self, state: InterviewState) -> Dict[str, Any]:
+        """逐轮评估所需的候选人信息"""
+        user_info = state.get("user_info")
+        resume_skills, job_requirements = self._skill_context(state)
+        return {
+            "target_position": user_info.target_position if user_info else "",
+            "target_field": user_info.target_field if user_info else "",
+            "resume_skills": resume_skills,
+            "job_requirements": job_requirements
+        }
+    
+    def evaluate_session_turn(self, state: InterviewState, turn_key: str) -> Optional[Dict[str, Any]]:
+        """逐轮评估任务入口：评估会话中指定的一轮并持久化，已有评估时只重跑失败的步骤
+        
+        回答写入 conversation_history 后由API投递到interview队列，在worker中执行。
+        """
+        session_id = state.get("session_id")
+        turn = next(
+            (turn for turn in state.get("conversation_history", []) if turn_evaluation_key(turn) == turn_key),
+            None
+        )
+        if turn is None:
+            print(f"⚠️ 逐轮评估: 会话 {session_id} 中不存在回答 {turn_key}")
+            return None
+        
+        previous = None
+        if session_id:
+            try:
+                from ..database.interview_state_store import get_interview_state_store
+                previous = get_interview_state_store().get_turn_evaluations(session_id).get(turn_key)
+            except Exception as e:
+                print(f"⚠️ 读取逐轮评估失败: {e}")
+        if previous is not None and all(previous.get(step) is not None for step in TURN_EVALUATION_STEPS):
+            return previous
+        return self._evaluate_and_store_turn(session_id, turn, self._turn_context(state), previous)
+    
+    def _evaluate_and_store_turn(self, session_id: Optional[str], turn: ConversationTurn,
+                                 context: Dict[str, Any],
+                                 previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        evaluation = self.evaluate_turn(turn, context, previous)
+        if session_id:
+            try:
+                from ..database.interview_state_store import get_interview_state_store
+                get_interview_state_store().save_turn_evaluation(
+                    session_id, turn_evaluation_key(turn), evaluation
+                )
+            except Exception as e:
+                print(f"⚠️ 逐轮评估保存失败: {e}")
+        for error in evaluation["errors"].values():
+            print(f"⚠️ [{turn.question_id}] {error}")
+        return evaluation
+    
+    def evaluate_turn(self, turn: ConversationTurn, context: Dict[str, Any],
+                      previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """评估单轮回答：STAR结构、技能匹配、LLM分维度评分，各步骤失败互不影响
+        
+        传入上次的评估结果时只重跑其中失败的步骤。
+        """
+        
+        def registry():
+            from ..tools.model_registry import get_model_registry
+            return get_model_registry()
+        
+        evaluation = {name: None for name in TURN_EVALUATION_STEPS}
+        evaluation.update(previous or {})
+        evaluation.update({"question_id": turn.question_id, "evaluated_at": time.time(), "errors": {}})
+        steps = {
+            "star": ("STAR结构分析", lambda: self._analyze_star_structure(registry(), turn.answer)),
+            "skill": ("技能匹配分析", lambda: registry().get("skill_matcher").analyze_skill_match(
+                turn.answer, context["resume_skills"], context["job_requirements"]
+            )),
+            "rubric": ("LLM评分", lambda: self._score_turn(turn, context))
+        }
+        for name, (label, compute) in steps.items():
+            if evaluation[name] is not None:
+                continue
+            try:
+                evaluation[name] = compute()
+            except Exception as e:
+                evaluation["errors"][name] = f"{label}失败: {e}"
+        return evaluation
+    
+    def _invoke_llm(self, prompt: str, **kwargs) -> str:
+        """调用聊天模型并返回文本内容（kwargs 透传给模型，如 temperature）"""
+        return self.llm.invoke([HumanMessage(content=prompt)], **kwargs).content
+    
+    def _score_turn(self, turn: ConversationTurn, context: Dict[str, Any]) -> Dict[str, Any]:
+        """按评估维度给单轮回答打分（1-10），本轮未体现的维度不打分"""
+        
+        dimensions = "\n".join(
+            f'  "{key}": {{"score": 0, "comment": "{name}的简短评语"}}'
+            for key, name in self.assessment_dimensions.items()
+        )
+        prompt = f"""
+你是一位资深的技术面试官。请只根据下面这一轮问答，对应聘{context["target_position"]}（{context["target_field"]}方向）的候选人打分（1-10分）。
+本轮问答没有体现的能力请将该项设为 null。
+
+- **问题**: {turn.question}
+- **回答**: {turn.answer}
+
+请严格按照以下JSON格式输出，不要添加任何额外的解释或文本：
+{{
+{dimensions}
+}}
+"""
+        response = get_llm_cache().cached(
+            "interview_turn_rubric",
+            getattr(self.llm, "model_name", "ultra"),
+            DETERMINISTIC_TEMPERATURE,
+            prompt,
+            lambda: self._invoke_llm(prompt, temperature=DETERMINISTIC_TEMPERATURE),
+            validate=lambda text: self._parse_turn_scores(text) is not None
+        )
+        scores = self._parse_turn_scores(response)
+        if scores is None:
+            raise ValueError("评分结果无法解析为JSON")
+        return scores
+    
+    def _parse_turn_scores(self, response: str) -> Optional[Dict[str, Any]]:
+        json_match = re.search(r'\{.*\}', response or "", re.DOTALL)
+        if not json_match:
+            return None
+        try:
+            parsed = json.loads(json_match.group())
+        except json.JSONDecodeError:
+            return None
+        
+        scores = {}
+        for dimension in self.assessment_dimensions:
+            item = parsed.get(dimension)
+            if not isinstance(item, dict):
+                continue
+            try:
+                score = min(max(float(item.get("score")), 1.0), 10.0)
+            except (TypeError, ValueError):
+                continue
+            scores[dimension] = {"score": score, "comment": str(item.get("comment", ""))}
+        return scores
+    
+    def _collect_turn_evaluations(self, state: InterviewState, conversation_history: List,
+                                  deadline: float) -> List[Optional[Dict[str, Any]]]:
+        """读取已持久化的逐轮评估，缺失的轮次并发补评、有失败步骤的轮次只重跑该步骤；超时的轮次为None"""
+        
+        session_id = state.get("session_id")
+        stored = {}
+        if session_id:
+            try:
+                from ..database.interview_state_store import get_interview_state_store
+                stored = get_interview_state_store().get_turn_evaluations(session_id)
+            except Exception as e:
+                print(f"⚠️ 读取逐轮评估失败: {e}")
+        
+        context = self._turn_context(state)
+        evaluations, pending = [], {}
+        for index, turn in enumerate(conversation_history):
+            evaluation = stored.get(turn_evaluation_key(turn))
+            if evaluation is None or any(evaluation.get(step) is None for step in TURN_EVALUATION_STEPS):
+                pending[index] = _get_turn_executor().submit(
+                    self._evaluate_and_store_turn, session_id, turn, context, evaluation
+                )
+            evaluations.append(evaluation)
+        
+        if pending:
+            print(f"  🧮 已完成逐轮评估 {len(conversation_history) - len(pending)} 轮，补评 {len(pending)} 轮")
+        for index, future in pending.items():
+            evaluations[index], _ = self._wait_for_modality(future, f"第{index + 1}轮评估", deadline)
+        return evaluations
+    
+    def _merge_turn_text_analyses(self, registry, evaluations: List[Optional[Dict[str, Any]]],
+                                  state: InterviewState):
+        """合并逐轮的STAR与技能匹配结果，返回 (STAR分析, 技能匹配分析)，无可用结果时为None"""
+        
+        available = [evaluation for evaluation in evaluations if evaluation]
+        star_parts = [evaluation["star"] for evaluation in available if evaluation.get("star")]
+        skill_parts = [
+            (evaluation["skill"], len(turn.answer))
+            for evaluation, turn in zip(evaluations, state.get("conversation_history", []))
+            if evaluation and evaluation.get("skill")
+        ]
+        
+        star_analysis = registry.get("star_classifier").merge_star_analyses(star_parts) if star_parts else None
+        skill_analysis = None
+        if skill_parts:
+            resume_skills, job_requirements = self._skill_context(state)
+            skill_analysis = registry.get("skill_matcher").merge_skill_analyses(
+                [part for part, _ in skill_parts],
+                [weight for _, weight in skill_parts],
+                resume_skills,
+                job_requirements
+            )
+        return star_analysis, skill_analysis
+    
+    def _aggregate_turn_scores(
+        self,
+        state: InterviewState,
+        multimodal_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """由逐轮评分聚合综合评估；评分覆盖不足一半轮次时返回None，改用整场LLM评估"""
+        
+        evaluations = multimodal_data.get("turn_evaluations") or []
+        rubrics = [evaluation["rubric"] for evaluation in evaluations if evaluation and evaluation.get("rubric")]
+        if not rubrics or len(rubrics) * 2 < len(state.get("conversation_history", [])):
+            return None
+        
+        assessment = {}
+        for dimension, name in self.assessment_dimensions.items():
+            scored = [rubric[dimension] for rubric in rubrics if dimension in rubric]
+            if not scored:
+                assessment[dimension] = {"score": 5, "comment": f"问答中未明显体现{name}"}
+                continue
+            score = sum(item["score"] for item in scored) / len(scored)
+            lowest = min(scored, key=lambda item: item["score"])
+            highest = max(scored, key=lambda item: item["score"])
+            comments = [highest["comment"], lowest["comment"]]
+            assessment[dimension] = {
+                "score": round(score, 1),
+                "comment": f"综合{len(scored)}轮回答：" + "；".join(dict.fromkeys(c for c in comments if c))
             }
         
-        return basic_analysis
+        # 提供了音视频且分析成功时，用非言语线索微调表达与抗压评分
+        visual = multimodal_data.get("visual_analysis", {})
+        if state.get("video_path") and not visual.get("error") and "emotion_stability" in visual:
+            item = assessment["stress_resilience"]
+            item["score"] = round(item["score"] * 0.8 + visual["emotion_stability"] * 10 * 0.2, 1)
+        audio = multimodal_data.get("audio_analysis", {})
+        if state.get("audio_path") and not audio.get("error") and "clarity_score" in audio:
+            item = assessment["communication_ability"]
+            item["score"] = round(item["score"] * 0.8 + audio["clarity_score"] * 10 * 0.2, 1)
+        
+        return assessment
     
     def _get_job_requirements_by_field(self, field: str) -> List[str]:
         """根据技术领域获取岗位要求"""
@@ -268,6 +586,21 @@ class ComprehensiveAnalysisNode:
             "clarity_score": 0.90
         }
     
+    def _get_fallback_text_analysis(self) -> Dict[str, Any]:
+        """备用基础文本分析结果"""
+        return {
+            "total_words": 0,
+            "total_answers": 0,
+            "avg_answer_length": 0,
+            "detailed_answers": 0,
+            "technical_terms_mentioned": 0,
+            "star_structure_usage": {
+                "usage_by_component": {"situation": 0, "task": 0, "action": 0, "result": 0},
+                "completeness_score": 0.5,
+                "total_star_answers": 0
+            }
+        }
+    
     def _generate_comprehensive_assessment(
         self, 
         state: InterviewState,
@@ -336,7 +669,7 @@ class ComprehensiveAnalysisNode:
         
         try:
             # 调用LLM进行评估
-            response = self.llm(assessment_prompt)
+            response = self._invoke_llm(assessment_prompt)
             
             # 清理响应并解析JSON
             response = response.strip()
@@ -403,11 +736,15 @@ class ComprehensiveAnalysisNode:
             print("  🔍 执行多模态特征提取...")
             multimodal_data = self._perform_real_multimodal_analysis(state)
             
-            # 2. 生成综合评估
+            # 2. 生成综合评估（逐轮评分已覆盖时只做聚合，否则整场调用LLM）
             print("  🧠 生成综合评估...")
-            comprehensive_assessment = self._generate_comprehensive_assessment(
-                state, multimodal_data
-            )
+            comprehensive_assessment = self._aggregate_turn_scores(state, multimodal_data)
+            if comprehensive_assessment is None:
+                comprehensive_assessment = self._generate_comprehensive_assessment(
+                    state, multimodal_data
+                )
+            else:
+                print("  🧮 综合评估由逐轮评分聚合")
             
             # 3. 构建分析结果
             analysis_result = MultimodalAnalysis(
@@ -492,6 +829,13 @@ class ComprehensiveAnalysisNode:
         if "technical_terms_mentioned" in text_analysis:
             print(f"    技术术语: {text_analysis['technical_terms_mentioned']} 次")
         
+        # 并发执行汇总
+        processing_summary = multimodal_data.get("processing_summary")
+        if processing_summary:
+            print(f"  ⏱️ 并发分析耗时: {processing_summary['total_time_seconds']:.2f}秒")
+            for error in processing_summary.get("errors", []):
+                print(f"    ⚠️ {error}")
+        
         print("-" * 40)
 
 
@@ -137,12 +137,20 @@ class LearningPathNode:
     ) -> List[Dict[str, Any]]:
         """为特定能力搜索学习资源"""
         
+        return self._search_resources_for_competencies([competency], count).get(competency, [])
+    
+    def _search_resources_for_competencies(
+        self,
+        competencies: List[str],
+        count: int = 3
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """一次批量检索多个能力的学习资源"""
+        
         try:
-            resources = self.resource_manager.search_resources(competency, count)
-            return resources
+            return self.resource_manager.search_resources_batch(competencies, count)
         except Exception as e:
-            print(f"⚠️ 搜索 {competency} 相关资源失败: {e}")
-            return []
+            print(f"⚠️ 搜索 {', '.join(competencies)} 相关资源失败: {e}")
+            return {}
     
     def _generate_custom_learning_plan(
         self, 
@@ -217,17 +225,18 @@ class LearningPathNode:
             weak_areas = self._identify_weak_areas(assessment)
             
             print(f"  📚 为 {len(weak_areas)} 个领域搜索学习资源...")
-            # 为每个薄弱领域搜索资源
+            # 薄弱领域和通用资源（专业知识）合并为一次批量检索
+            resources_by_competency = self._search_resources_for_competencies(
+                weak_areas + ["professional_knowledge"], 3
+            )
             all_resources = []
             
             for competency in weak_areas:
-                resources = self._search_resources_for_competency(competency, 2)
-                all_resources.extend(resources)
+                all_resources.extend(resources_by_competency.get(competency, [])[:2])
             
             # 如果没有足够的资源，添加通用资源
             if len(all_resources) < 3:
-                general_resources = self._search_resources_for_competency("professional_knowledge", 3)
-                all_resources.extend(general_resources)
+                all_resources.extend(resources_by_competency.get("professional_knowledge", [])[:3])
             
             # 去重并限制数量
             unique_resources = []
@@ -2,16 +2,14 @@
 报告生成节点
 将分析结果转化为用户友好的可视化报告
 """
-import os
 import json
 from typing import Dict, Any, List
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import numpy as np
 from datetime import datetime
 
 from ..models.state import InterviewState, InterviewReport
 from ..models.spark_client import create_spark_model
+from ..tools.radar_chart import get_radar_renderer, radar_scores
+from ..config.settings import model_config
 
 
 class ReportGenerationNode:
@@ -21,79 +19,17 @@ class ReportGenerationNode:
         # 使用Spark Pro模型 - 高性价比的报告生成
         self.llm = create_spark_model("pro")
         
-        # 设置中文字体
-        self._setup_chinese_font()
-        
-    def _setup_chinese_font(self):
-        """设置matplotlib中文字体"""
-        try:
-            # 尝试设置常见的中文字体
-            chinese_fonts = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
-            
-            for font_name in chinese_fonts:
-                try:
-                    plt.rcParams['font.sans-serif'] = [font_name]
-                    plt.rcParams['axes.unicode_minus'] = False
-                    break
-                except:
-                    continue
-        except Exception as e:
-            print(f"⚠️ 中文字体设置失败: {e}")
-    
     def _generate_radar_chart(
         self, 
         assessment: Dict[str, Any], 
         session_id: str
     ) -> str:
-        """生成能力雷达图"""
+        """生成能力雷达图（复用图模板在工作进程中渲染，相同分数直接命中缓存）"""
         
         try:
-            # 准备数据
-            dimensions = {
-                "专业知识": assessment.get("professional_knowledge", {}).get("score", 5),
-                "技能匹配": assessment.get("skill_match", {}).get("score", 5),
-                "语言表达": assessment.get("communication_ability", {}).get("score", 5),
-                "逻辑思维": assessment.get("logical_thinking", {}).get("score", 5),
-                "抗压能力": assessment.get("stress_resilience", {}).get("score", 5)
-            }
-            
-            # 创建雷达图
-            categories = list(dimensions.keys())
-            values = list(dimensions.values())
-            
-            # 为了闭合图形，将第一个值添加到末尾
-            values += values[:1]
-            
-            # 计算角度
-            angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
-            angles += angles[:1]
-            
-            # 创建图形
-            fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
-            
-            # 绘制雷达图
-            ax.plot(angles, values, 'o-', linewidth=2, label='候选人能力', color='#1f77b4')
-            ax.fill(angles, values, alpha=0.25, color='#1f77b4')
-            
-            # 设置刻度和标签
-            ax.set_xticks(angles[:-1])
-            ax.set_xticklabels(categories, fontsize=12)
-            ax.set_ylim(0, 10)
-            ax.set_yticks([2, 4, 6, 8, 10])
-            ax.set_yticklabels(['2', '4', '6', '8', '10'], fontsize=10)
-            ax.grid(True)
-            
-            # 添加标题
-            plt.title('面试能力评估雷达图', fontsize=16, fontweight='bold', pad=20)
-            
-            # 保存图片
-            chart_path = f"./data/cache/radar_chart_{session_id}.png"
-            os.makedirs(os.path.dirname(chart_path), exist_ok=True)
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none')
-            plt.close()
-            
-            return chart_path
+            renderer = get_radar_renderer()
+            fmt = getattr(model_config, 'RADAR_CHART_FORMAT', "png")
+            return renderer.render(radar_scores(assessment), fmt)
             
         except Exception as e:
             print(f"⚠️ 雷达图生成失败: {e}")
@@ -0,0 +1,321 @@
+"""
+共享句向量服务
+所有调用方通过同一服务计算嵌入：并发请求在后台线程中合并为微批次一次推理，
+结果按 (模型, sha1(文本)) 缓存在进程内LRU和磁盘SQLite中，
+重复查询和语料重新入库时几乎不再触发模型推理。
+每个向量集合在元数据中固定所用模型，写入和查询始终使用同一模型。
+批处理线程和SQLite连接不会跨fork继承，进程id变化时重新创建。
+"""
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import model_config
+except ImportError:
+    model_config = None
+
+# 集合元数据中记录嵌入模型的键
+EMBEDDING_MODEL_METADATA_KEY = "embedding_model"
+# Chroma默认嵌入函数同样基于该模型，未标注模型的旧集合按此处理
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """两级嵌入缓存：进程内LRU + 磁盘SQLite（多进程共享）"""
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 10000):
+        self.memory_size = memory_size
+        self.path = path
+        self._memory: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = os.getpid()
+        self._open()
+
+    def _open(self):
+        if self.path:
+            try:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        model TEXT NOT NULL,
+                        text_hash TEXT NOT NULL,
+                        dim INTEGER NOT NULL,
+                        vector BLOB NOT NULL,
+                        created_at REAL NOT NULL,
+                        PRIMARY KEY (model, text_hash)
+                    )
+                """)
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 嵌入磁盘缓存不可用，仅使用内存缓存: {e}")
+
+    def _check_pid(self):
+        """fork出的子进程不能复用父进程的SQLite连接和锁，重新打开"""
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._conn = None
+            self._pid = os.getpid()
+            self._open()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """批量查询，返回命中的 {hash: vector}；磁盘命中会回填内存LRU"""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        self._check_pid()
+        with self._lock:
+            for h in hashes:
+                key = (model, h)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[h] = vector
+                else:
+                    missing.append(h)
+
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT text_hash, dim, vector FROM embeddings "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [model, *chunk]
+                    ).fetchall()
+                    for h, dim, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32, count=dim)
+                        found[h] = vector
+                        self._remember((model, h), vector)
+
+        return found
+
+    def put_many(self, model: str, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        self._check_pid()
+        with self._lock:
+            for h, vector in items.items():
+                self._remember((model, h), vector)
+
+            if self._conn is not None:
+                now = time.time()
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(model, h, int(v.shape[0]), v.astype(np.float32).tobytes(), now)
+                         for h, v in items.items()]
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ 写入嵌入磁盘缓存失败: {e}")
+
+    def _remember(self, key: tuple, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+class EmbeddingService:
+    """单个模型的嵌入服务：缓存查询 + 后台微批次推理"""
+
+    def __init__(
+        self,
+        model_name: str,
+        cache: EmbeddingCache,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        result_timeout: Optional[float] = 120.0
+    ):
+        self.model_name = model_name
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.result_timeout = result_timeout
+        self.dim: Optional[int] = None
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._pid = os.getpid()
+        self.stats = {
+            'requests': 0,
+            'texts': 0,
+            'cache_hits': 0,
+            'encoded': 0,
+            'batches': 0
+        }
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """计算文本嵌入，返回 (n, dim) 的float32矩阵，顺序与输入一致"""
+        texts = [text or "" for text in texts]
+        self.stats['requests'] += 1
+        self.stats['texts'] += len(texts)
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+
+        hashes = [text_hash(text) for text in texts]
+        found = self.cache.get_many(self.model_name, list(dict.fromkeys(hashes)))
+        self.stats['cache_hits'] += sum(1 for h in hashes if h in found)
+
+        missing = {}
+        for text, h in zip(texts, hashes):
+            if h not in found and h not in missing:
+                missing[h] = text
+
+        if missing:
+            future = self._submit(list(missing.values()))
+            vectors = future.result(timeout=self.result_timeout)
+            computed = dict(zip(missing.keys(), vectors))
+            found.update(computed)
+
+        result = np.stack([found[h] for h in hashes]).astype(np.float32, copy=False)
+        self.dim = result.shape[1]
+        return result
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        texts = self.stats['texts']
+        return {
+            'model': self.model_name,
+            **self.stats,
+            'hit_rate': self.stats['cache_hits'] / texts if texts else 0.0,
+            'pending': self._queue.qsize()
+        }
+
+    def _submit(self, texts: List[str]) -> Future:
+        if self._pid != os.getpid():
+            # fork出的子进程继承了队列但没有批处理线程，重建后再提交
+            self._queue = queue.Queue()
+            self._thread = None
+            self._thread_lock = threading.Lock()
+            self._pid = os.getpid()
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name=f"embedding-batcher-{self.model_name}", daemon=True
+                    )
+                    self._thread.start()
+
+        future: Future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+
+            # 等待一个很短的窗口，合并同时到达的其他请求
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[tuple]):
+        unique_texts = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+        try:
+            from .model_registry import get_sentence_transformer
+            model = get_sentence_transformer(self.model_name)
+            vectors = np.asarray(
+                model.encode(unique_texts, batch_size=self.max_batch_size, convert_to_numpy=True),
+                dtype=np.float32
+            )
+        except Exception as e:
+            logger.error(f"❌ 嵌入计算失败 ({self.model_name}): {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.stats['batches'] += 1
+        self.stats['encoded'] += len(unique_texts)
+        by_text = dict(zip(unique_texts, vectors))
+        self.cache.put_many(self.model_name, {text_hash(t): v for t, v in by_text.items()})
+
+        for texts, future in batch:
+            future.set_result([by_text[text] for text in texts])
+
+
+# 全局嵌入服务（每个模型一个实例，共享同一缓存）
+_embedding_cache = None
+_embedding_services: Dict[str, EmbeddingService] = {}
+_embedding_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: Optional[str] = None) -> EmbeddingService:
+    """获取指定模型的共享嵌入服务"""
+    global _embedding_cache
+    model_name = model_name or getattr(model_config, 'EMBEDDING_DEFAULT_MODEL', DEFAULT_EMBEDDING_MODEL)
+
+    service = _embedding_services.get(model_name)
+    if service is None:
+        with _embedding_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    path=getattr(model_config, 'EMBEDDING_CACHE_PATH', "data/cache/embeddings.sqlite"),
+                    memory_size=getattr(model_config, 'EMBEDDING_MEMORY_CACHE_SIZE', 10000)
+                )
+            service = _embedding_services.get(model_name)
+            if service is None:
+                service = EmbeddingService(
+                    model_name,
+                    _embedding_cache,
+                    max_batch_size=getattr(model_config, 'EMBEDDING_BATCH_SIZE', 64),
+                    max_wait_ms=getattr(model_config, 'EMBEDDING_BATCH_WAIT_MS', 5.0),
+                    result_timeout=getattr(model_config, 'EMBEDDING_RESULT_TIMEOUT', 120.0)
+                )
+                _embedding_services[model_name] = service
+    return service
+
+
+def collection_embedding_metadata(
+    metadata: Optional[Dict[str, Any]] = None,
+    model_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """创建集合时使用的元数据，固定该集合的嵌入模型"""
+    model_name = model_name or getattr(model_config, 'EMBEDDING_DEFAULT_MODEL', DEFAULT_EMBEDDING_MODEL)
+    return {**(metadata or {}), EMBEDDING_MODEL_METADATA_KEY: model_name}
+
+
+def get_collection_embedding_service(collection) -> EmbeddingService:
+    """按集合元数据中固定的模型获取嵌入服务（未标注的旧集合使用默认模型）"""
+    metadata = getattr(collection, "metadata", None) or {}
+    return get_embedding_service(metadata.get(EMBEDDING_MODEL_METADATA_KEY) or DEFAULT_EMBEDDING_MODEL)
+
+
+def get_embedding_stats() -> List[Dict[str, Any]]:
+    """各模型嵌入服务的缓存命中和批处理统计"""
+    return [service.get_stats() for service in list(_embedding_services.values())]
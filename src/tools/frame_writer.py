@@ -0,0 +1,308 @@
+"""
+异步关键帧/调试帧写入器
+图像标注、编码和JSON写盘全部在后台线程中完成，分析路径只负责入队；
+队列满时直接丢弃并计数，保证帧分析永远不会等待磁盘。
+同时按目录执行容量/数量/时长保留策略，避免每次写入都遍历目录。
+写入线程不会跨fork继承，全局实例按进程id创建；返回文件路径给调用方之前需先 flush()。
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import model_config
+except ImportError:
+    model_config = None
+
+
+class NumpyJSONEncoder(json.JSONEncoder):
+    """处理numpy类型的JSON编码器"""
+
+    def default(self, obj):
+        if isinstance(obj, np.integer):
+            return int(obj)
+        if isinstance(obj, np.floating):
+            return float(obj)
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.bool_):
+            return bool(obj)
+        return super().default(obj)
+
+
+@dataclass
+class RetentionPolicy:
+    """目录保留策略，任一条件超限即从最旧的文件开始删除"""
+    max_bytes: Optional[int] = None
+    max_files: Optional[int] = None
+    max_age_seconds: Optional[float] = None
+
+
+class _DirectoryIndex:
+    """目录文件索引（按写入时间排序），启动时扫描一次，之后增量维护"""
+
+    def __init__(self, directory: Path, policy: RetentionPolicy):
+        self.directory = directory
+        self.policy = policy
+        self.entries = deque()  # (mtime, path, size)
+        self.total_bytes = 0
+
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = []
+        for path in directory.iterdir():
+            if path.is_file():
+                stat = path.stat()
+                existing.append((stat.st_mtime, path, stat.st_size))
+        for entry in sorted(existing, key=lambda e: e[0]):
+            self.entries.append(entry)
+            self.total_bytes += entry[2]
+
+    def add(self, path: Path, size: int):
+        self.entries.append((time.time(), path, size))
+        self.total_bytes += size
+
+    def remove_matching(self, pattern: str) -> int:
+        """删除匹配通配符的已索引文件"""
+        kept = deque()
+        removed = 0
+        for entry in self.entries:
+            if entry[1].match(pattern):
+                entry[1].unlink(missing_ok=True)
+                self.total_bytes -= entry[2]
+                removed += 1
+            else:
+                kept.append(entry)
+        self.entries = kept
+        return removed
+
+    def enforce(self) -> int:
+        """执行保留策略，返回删除的文件数"""
+        policy = self.policy
+        now = time.time()
+        removed = 0
+
+        while self.entries:
+            mtime, path, size = self.entries[0]
+            over_bytes = policy.max_bytes is not None and self.total_bytes > policy.max_bytes
+            over_files = policy.max_files is not None and len(self.entries) > policy.max_files
+            too_old = policy.max_age_seconds is not None and now - mtime > policy.max_age_seconds
+            if not (over_bytes or over_files or too_old):
+                break
+
+            self.entries.popleft()
+            self.total_bytes -= size
+            try:
+                path.unlink(missing_ok=True)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"⚠️ 删除过期帧文件失败: {path} ({e})")
+
+        return removed
+
+
+class FrameWriter:
+    """后台帧写入器 - 有界队列 + 丢弃策略 + 目录保留策略"""
+
+    def __init__(self, max_queue_size: int = 64, image_format: str = "jpg", quality: int = 85):
+        self.pid = os.getpid()
+        self.image_format = image_format.lower().lstrip(".")
+        self.quality = quality
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._policies: Dict[Path, RetentionPolicy] = {}
+        self._indexes: Dict[Path, _DirectoryIndex] = {}
+        self.stats = {
+            'submitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'failed': 0,
+            'evicted': 0,
+            'bytes_written': 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"✅ 异步帧写入器已启动 (格式: {self.image_format}, 质量: {quality}, 队列: {max_queue_size})")
+
+    def set_retention(self, directory, policy: RetentionPolicy):
+        """为目录设置保留策略"""
+        self._policies[Path(directory).resolve()] = policy
+
+    def image_path(self, path) -> Path:
+        """按当前编码格式调整图像文件扩展名"""
+        return Path(path).with_suffix(f".{self.image_format}")
+
+    def submit_image(
+        self,
+        path,
+        frame: np.ndarray,
+        annotate: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        quality: Optional[int] = None
+    ) -> str:
+        """提交图像写入任务，返回最终文件路径；队列已满时丢弃并返回空字符串
+
+        frame在写入完成前不能被调用方原地修改；annotate在后台线程中对副本执行。
+        """
+        path = self.image_path(path)
+        job = ('image', path, frame, annotate, quality or self.quality)
+        return str(path) if self._enqueue(job) else ""
+
+    def submit_json(self, path, data: Dict[str, Any]) -> bool:
+        """提交JSON写入任务"""
+        return self._enqueue(('json', Path(path), data))
+
+    def submit_cleanup(self, directory, pattern: str) -> bool:
+        """提交目录清理任务（删除匹配的文件）"""
+        return self._enqueue(('cleanup', Path(directory), pattern))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待队列中的任务全部完成"""
+        deadline = time.time() + timeout if timeout is not None else None
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'queue_size': self._queue.qsize()}
+
+    def _enqueue(self, job) -> bool:
+        self.stats['submitted'] += 1
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            self.stats['dropped'] += 1
+            logger.debug(f"⚠️ 帧写入队列已满，丢弃任务: {job[1]}")
+            return False
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                kind = job[0]
+                if kind == 'image':
+                    self._write_image(*job[1:])
+                elif kind == 'json':
+                    self._write_json(*job[1:])
+                elif kind == 'cleanup':
+                    self._cleanup(*job[1:])
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"❌ 后台写入失败: {job[1]} ({e})")
+            finally:
+                self._queue.task_done()
+
+    def _write_image(self, path: Path, frame: np.ndarray, annotate, quality: int):
+        image = annotate(frame.copy()) if annotate else frame
+
+        if self.image_format == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+
+        success, buffer = cv2.imencode(f".{self.image_format}", image, params)
+        if not success:
+            raise Exception("图像编码失败")
+        self._write_bytes(path, buffer.tobytes())
+
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        payload = json.dumps(data, ensure_ascii=False, indent=2, cls=NumpyJSONEncoder)
+        self._write_bytes(path, payload.encode('utf-8'))
+
+    def _write_bytes(self, path: Path, payload: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(payload)
+
+        self.stats['written'] += 1
+        self.stats['bytes_written'] += len(payload)
+
+        index = self._get_index(path.parent)
+        if index is not None:
+            index.add(path, len(payload))
+            self.stats['evicted'] += index.enforce()
+
+    def _cleanup(self, directory: Path, pattern: str):
+        index = self._get_index(directory)
+        if index is not None:
+            removed = index.remove_matching(pattern)
+        else:
+            removed = 0
+            for file in directory.glob(pattern):
+                file.unlink(missing_ok=True)
+                removed += 1
+        logger.info(f"🧹 已清理 {removed} 个旧文件: {directory}/{pattern}")
+
+    def _get_index(self, directory: Path) -> Optional[_DirectoryIndex]:
+        directory = directory.resolve()
+        policy = self._policies.get(directory)
+        if policy is None:
+            return None
+        index = self._indexes.get(directory)
+        if index is None:
+            index = _DirectoryIndex(directory, policy)
+            self._indexes[directory] = index
+            self.stats['evicted'] += index.enforce()
+        return index
+
+
+# 全局帧写入器
+_frame_writer = None
+_frame_writer_lock = threading.Lock()
+
+
+def get_frame_writer() -> FrameWriter:
+    """获取当前进程的帧写入器实例（默认为分析帧和调试帧目录配置保留策略）
+
+    fork出的子进程继承了父进程的实例但没有写入线程，按进程id重新创建。
+    """
+    global _frame_writer
+
+    if _frame_writer is None or _frame_writer.pid != os.getpid():
+        with _frame_writer_lock:
+            if _frame_writer is None or _frame_writer.pid != os.getpid():
+                writer = FrameWriter(
+                    max_queue_size=getattr(model_config, 'FRAME_WRITER_QUEUE_SIZE', 64),
+                    image_format=getattr(model_config, 'FRAME_WRITER_FORMAT', 'jpg'),
+                    quality=getattr(model_config, 'FRAME_WRITER_QUALITY', 85)
+                )
+                max_age = getattr(model_config, 'FRAME_RETENTION_MAX_AGE_HOURS', 24) * 3600
+                writer.set_retention("data/analysis_frames", RetentionPolicy(
+                    max_bytes=getattr(model_config, 'FRAME_RETENTION_MAX_MB', 500) * 1024 * 1024,
+                    max_files=getattr(model_config, 'FRAME_RETENTION_MAX_FILES', 5000),
+                    max_age_seconds=max_age
+                ))
+                writer.set_retention("data/debug_frames", RetentionPolicy(
+                    max_bytes=getattr(model_config, 'DEBUG_FRAME_RETENTION_MAX_MB', 100) * 1024 * 1024,
+                    max_files=getattr(model_config, 'DEBUG_FRAME_RETENTION_MAX_FILES', 150),
+                    max_age_seconds=max_age
+                ))
+                _frame_writer = writer
+
+    return _frame_writer
+
+
+def flush_frame_writer(timeout: Optional[float] = None) -> bool:
+    """等待当前进程已提交的帧写入完成（进程内尚未创建写入器时直接返回）"""
+    writer = _frame_writer
+    if writer is None or writer.pid != os.getpid():
+        return True
+    if timeout is None:
+        timeout = getattr(model_config, 'FRAME_WRITER_FLUSH_TIMEOUT', 30)
+    flushed = writer.flush(timeout)
+    if not flushed:
+        logger.warning(f"⚠️ 帧写入等待超时({timeout}秒)，剩余 {writer.get_stats()['queue_size']} 个任务")
+    return flushed
@@ -0,0 +1,88 @@
+"""
+流式JSON解析
+从LLM逐段输出的文本中增量提取数组里的JSON对象：每个对象的右括号一到达就解析并返回，
+不必等待整个响应结束（如 {"questions": [{...}, {...}]} 中的每道题目）。
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JsonArrayStreamParser:
+    """增量解析 array_key 对应数组中的对象（未指定或找不到键时使用第一个数组）"""
+
+    def __init__(self, array_key: Optional[str] = None):
+        self.array_key = array_key
+        self._buffer = ""
+        self._pos = 0  # 下一个待扫描字符的位置
+        self._in_array = False
+        self._finished = False
+        self._depth = 0
+        self._object_start = -1
+        self._in_string = False
+        self._escaped = False
+
+    def _find_array_start(self) -> bool:
+        if self.array_key:
+            key_pos = self._buffer.find(f'"{self.array_key}"')
+            if key_pos == -1:
+                return False
+            bracket = self._buffer.find("[", key_pos)
+        else:
+            bracket = self._buffer.find("[")
+        if bracket == -1:
+            return False
+        self._pos = bracket + 1
+        self._in_array = True
+        return True
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """追加一段输出，返回本次新解析出的完整对象"""
+        if self._finished or not text:
+            return []
+        self._buffer += text
+        if not self._in_array and not self._find_array_start():
+            return []
+
+        objects = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = i
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        objects.append(json.loads(buffer[self._object_start:i + 1]))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"⚠️ 跳过无法解析的JSON对象: {e}")
+                    self._object_start = -1
+            elif char == "]" and self._depth == 0:
+                self._finished = True
+                i += 1
+                break
+            i += 1
+        self._pos = i
+
+        # 已解析的部分不再保留，避免长输出反复扫描
+        keep_from = self._object_start if self._object_start >= 0 else self._pos
+        self._buffer = buffer[keep_from:]
+        if self._object_start >= 0:
+            self._object_start = 0
+        self._pos -= keep_from
+        return objects
@@ -0,0 +1,298 @@
+"""
+LLM响应缓存
+按 (模型, 温度, sha256(提示词)) 对LLM响应做内容寻址缓存：用户重复保存未修改的简历、重复点击分析时，
+相同的JD匹配/STAR/健康度扫描/简历结构化提示词直接命中缓存，不再调用星火API。
+Redis优先、SQLite降级，值经zlib压缩；各调用点可配置TTL；温度>0的调用默认不缓存，需调用方显式允许。
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import database_config, model_config
+except ImportError:
+    database_config = None
+    model_config = None
+
+
+# 可缓存的结构化调用（抽取、评分）以该温度调用模型，缓存回放与重新调用结果一致
+DETERMINISTIC_TEMPERATURE = 0.0
+
+
+def prompt_cache_key(model: str, temperature: float, prompt: str) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{model}:{temperature:.2f}:{digest}"
+
+
+class _CallSiteStats:
+    """单个调用点的命中统计"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stored = 0
+        self.llm_seconds = 0.0  # 未命中时调用LLM的累计耗时
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        avg_llm_seconds = self.llm_seconds / self.misses if self.misses else 0.0
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypassed': self.bypassed,
+            'stored': self.stored,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'avg_llm_seconds': round(avg_llm_seconds, 3),
+            'estimated_saved_seconds': round(self.hits * avg_llm_seconds, 1)
+        }
+
+
+class LLMResponseCache:
+    """LLM响应缓存 - Redis优先，SQLite降级"""
+
+    KEY_PREFIX = "llm:response:"
+
+    def __init__(
+        self,
+        backend: str = "auto",
+        sqlite_path: str = "data/cache/llm_responses.sqlite",
+        default_ttl_hours: float = 24 * 7,
+        call_site_ttl_hours: Optional[Dict[str, float]] = None,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.default_ttl_hours = default_ttl_hours
+        self.call_site_ttl_hours = dict(call_site_ttl_hours or {})
+        self.sqlite_path = sqlite_path
+        self.redis_client = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _CallSiteStats] = {}
+
+        if not enabled:
+            return
+        if backend in ("auto", "redis"):
+            self._init_redis()
+        if self.redis_client is None:
+            self._init_sqlite()
+
+    @property
+    def backend(self) -> str:
+        if not self.enabled:
+            return "disabled"
+        return "redis" if self.redis_client is not None else "sqlite"
+
+    def _init_redis(self):
+        try:
+            import redis
+            client = redis.Redis(
+                host=getattr(database_config, 'redis_host', 'localhost'),
+                port=getattr(database_config, 'redis_port', 6379),
+                db=getattr(database_config, 'redis_db', 0)
+            )
+            client.ping()
+            self.redis_client = client
+            logger.info("✅ LLM响应缓存使用Redis")
+        except Exception as e:
+            logger.warning(f"⚠️ LLM响应缓存连接Redis失败，使用SQLite: {e}")
+            self.redis_client = None
+
+    def _init_sqlite(self):
+        try:
+            Path(self.sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.sqlite_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+            logger.info(f"✅ LLM响应缓存使用SQLite: {self.sqlite_path}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ LLM响应缓存不可用: {e}")
+            self.enabled = False
+
+    def _site_stats(self, call_site: str) -> _CallSiteStats:
+        stats = self._stats.get(call_site)
+        if stats is None:
+            stats = self._stats.setdefault(call_site, _CallSiteStats())
+        return stats
+
+    def ttl_seconds(self, call_site: str) -> int:
+        return int(self.call_site_ttl_hours.get(call_site, self.default_ttl_hours) * 3600)
+
+    # ==================== 读写 ====================
+
+    def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        key = self.KEY_PREFIX + prompt_cache_key(model, temperature, prompt)
+        try:
+            if self.redis_client is not None:
+                payload = self.redis_client.get(key)
+            else:
+                with self._lock:
+                    row = self._conn.execute(
+                        "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+                    ).fetchone()
+                payload = row[0] if row is not None and row[1] >= time.time() else None
+            return zlib.decompress(payload).decode("utf-8") if payload is not None else None
+        except Exception as e:
+            logger.warning(f"⚠️ 读取LLM响应缓存失败: {e}")
+            return None
+
+    def set(self, model: str, temperature: float, prompt: str, response: str, ttl_seconds: int) -> bool:
+        if not self.enabled:
+            return False
+        key = self.KEY_PREFIX + prompt_cache_key(model, temperature, prompt)
+        payload = zlib.compress(response.encode("utf-8"), 6)
+        try:
+            if self.redis_client is not None:
+                self.redis_client.setex(key, ttl_seconds, payload)
+            else:
+                with self._lock:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_responses (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, payload, time.time() + ttl_seconds)
+                    )
+                    self._conn.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ 写入LLM响应缓存失败: {e}")
+            return False
+
+    # ==================== 调用封装 ====================
+
+    def _should_bypass(self, temperature: float, allow_nonzero_temperature: bool) -> bool:
+        return not self.enabled or (temperature > 0 and not allow_nonzero_temperature)
+
+    def _store(self, call_site: str, model: str, temperature: float, prompt: str, response: Any,
+               validate: Optional[Callable[[str], bool]], ttl_hours: Optional[float]):
+        # 只缓存有效的文本响应，失败/无法解析的结果下次仍会重新请求
+        if not isinstance(response, str) or not response.strip():
+            return
+        if validate is not None and not validate(response):
+            return
+        ttl = int(ttl_hours * 3600) if ttl_hours is not None else self.ttl_seconds(call_site)
+        if self.set(model, temperature, prompt, response, ttl):
+            self._site_stats(call_site).stored += 1
+
+    def cached(
+        self,
+        call_site: str,
+        model: str,
+        temperature: float,
+        prompt: str,
+        compute: Callable[[], str],
+        allow_nonzero_temperature: bool = False,
+        validate: Optional[Callable[[str], bool]] = None,
+        ttl_hours: Optional[float] = None
+    ) -> str:
+        """命中缓存时直接返回，否则调用 compute() 并写入缓存"""
+        stats = self._site_stats(call_site)
+        if self._should_bypass(temperature, allow_nonzero_temperature):
+            stats.bypassed += 1
+            return compute()
+
+        cached = self.get(model, temperature, prompt)
+        if cached is not None:
+            stats.hits += 1
+            logger.info(f"🎯 LLM缓存命中: {call_site}")
+            return cached
+
+        stats.misses += 1
+        start = time.time()
+        response = compute()
+        stats.llm_seconds += time.time() - start
+        self._store(call_site, model, temperature, prompt, response, validate, ttl_hours)
+        return response
+
+    async def acached(
+        self,
+        call_site: str,
+        model: str,
+        temperature: float,
+        prompt: str,
+        compute: Callable[[], Awaitable[str]],
+        allow_nonzero_temperature: bool = False,
+        validate: Optional[Callable[[str], bool]] = None,
+        ttl_hours: Optional[float] = None
+    ) -> str:
+        """cached 的异步版本，缓存读写在线程中执行，不阻塞事件循环"""
+        stats = self._site_stats(call_site)
+        if self._should_bypass(temperature, allow_nonzero_temperature):
+            stats.bypassed += 1
+            return await compute()
+
+        cached = await asyncio.to_thread(self.get, model, temperature, prompt)
+        if cached is not None:
+            stats.hits += 1
+            logger.info(f"🎯 LLM缓存命中: {call_site}")
+            return cached
+
+        stats.misses += 1
+        start = time.time()
+        response = await compute()
+        stats.llm_seconds += time.time() - start
+        await asyncio.to_thread(self._store, call_site, model, temperature, prompt, response, validate, ttl_hours)
+        return response
+
+    # ==================== 维护与统计 ====================
+
+    def purge_expired(self) -> int:
+        """清理SQLite中已过期的条目（Redis依靠TTL自动过期）"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM llm_responses WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        call_sites = {name: stats.as_dict() for name, stats in list(self._stats.items())}
+        hits = sum(s['hits'] for s in call_sites.values())
+        lookups = hits + sum(s['misses'] for s in call_sites.values())
+        return {
+            'backend': self.backend,
+            'hits': hits,
+            'lookups': lookups,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'estimated_saved_seconds': round(sum(s['estimated_saved_seconds'] for s in call_sites.values()), 1),
+            'call_sites': call_sites
+        }
+
+
+# 全局LLM响应缓存
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """获取全局LLM响应缓存实例"""
+    global _llm_cache
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(
+                    backend=getattr(model_config, 'LLM_CACHE_BACKEND', 'auto'),
+                    sqlite_path=getattr(model_config, 'LLM_CACHE_SQLITE_PATH', 'data/cache/llm_responses.sqlite'),
+                    default_ttl_hours=getattr(model_config, 'LLM_CACHE_DEFAULT_TTL_HOURS', 24 * 7),
+                    call_site_ttl_hours=getattr(model_config, 'LLM_CACHE_TTL_HOURS', None),
+                    enabled=getattr(model_config, 'LLM_CACHE_ENABLED', True)
+                )
+
+    return _llm_cache
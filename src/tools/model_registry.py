@@ -0,0 +1,310 @@
+"""
+进程级模型注册表
+BERT/STAR分类器、Sentence-Transformer、技能匹配器和多模态分析器(MediaPipe)
+在每个进程内只加载一次并在调用方之间共享；支持启动时显式预热(空跑推理)，
+并提供已加载模型及常驻内存的就绪状态查询
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import model_config
+except ImportError:
+    model_config = None
+
+
+def get_process_rss_mb() -> float:
+    """当前进程常驻内存(MB)，优先读取 /proc，否则退化为峰值RSS"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 以字节为单位，Linux 以KB为单位
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+    except Exception:
+        return 0.0
+
+
+class _ModelEntry:
+    """单个模型的注册信息与加载状态"""
+
+    def __init__(self, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]], thread_safe: bool):
+        self.loader = loader
+        self.warmup = warmup
+        self.thread_safe = thread_safe
+        self.instance = None
+        self.error: Optional[str] = None
+        self.loaded = False
+        self.warmed = False
+        self.load_seconds = 0.0
+        self.warmup_seconds = 0.0
+        self.rss_delta_mb = 0.0
+        self.loaded_at: Optional[float] = None
+        self.load_lock = threading.Lock()
+        self.use_lock = threading.RLock()
+
+
+class ModelRegistry:
+    """进程级模型注册表
+
+    模型按名称注册加载函数，首次 get() 时加载并缓存；加载失败同样被缓存，
+    避免每次调用都重复尝试下载/加载（可通过 reset() 重新加载）。
+    MediaPipe图等非线程安全的模型通过 use() 串行使用。
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]] = None,
+        thread_safe: bool = True
+    ):
+        """注册模型加载函数（已注册的同名模型保持不变）"""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _ModelEntry(loader, warmup, thread_safe)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._entries
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.loaded and entry.error is None
+
+    def get(self, name: str) -> Any:
+        """获取模型实例，未加载时加载；加载失败时抛出RuntimeError"""
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"模型未注册: {name}")
+
+        if not entry.loaded:
+            with entry.load_lock:
+                if not entry.loaded:
+                    self._load(name, entry)
+
+        if entry.error is not None:
+            raise RuntimeError(f"模型 {name} 不可用: {entry.error}")
+        return entry.instance
+
+    def _load(self, name: str, entry: _ModelEntry):
+        rss_before = get_process_rss_mb()
+        start = time.time()
+        try:
+            entry.instance = entry.loader()
+            entry.error = None
+            logger.info(f"✅ 模型已加载: {name} ({time.time() - start:.2f}秒)")
+        except Exception as e:
+            entry.instance = None
+            entry.error = str(e)
+            logger.warning(f"⚠️ 模型加载失败: {name} ({e})")
+        entry.load_seconds = time.time() - start
+        entry.rss_delta_mb = max(0.0, get_process_rss_mb() - rss_before)
+        entry.loaded_at = time.time()
+        entry.loaded = True
+
+    @contextmanager
+    def use(self, name: str):
+        """独占使用模型（非线程安全的模型在同一进程内串行调用）"""
+        instance = self.get(name)
+        entry = self._entries[name]
+        if entry.thread_safe:
+            yield instance
+        else:
+            with entry.use_lock:
+                yield instance
+
+    def reset(self, name: str):
+        """丢弃已加载的实例（或缓存的失败），下次 get() 时重新加载"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            with entry.load_lock:
+                entry.instance = None
+                entry.error = None
+                entry.loaded = False
+                entry.warmed = False
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """加载并空跑推理预热指定模型（默认全部已注册模型）"""
+        names = list(names) if names is not None else list(self._entries.keys())
+        results = {}
+        total_start = time.time()
+
+        for name in names:
+            if name not in self._entries:
+                results[name] = {'status': 'unknown'}
+                continue
+            entry = self._entries[name]
+            try:
+                with self.use(name) as instance:
+                    if entry.warmup is not None and not entry.warmed:
+                        start = time.time()
+                        entry.warmup(instance)
+                        entry.warmup_seconds = time.time() - start
+                    entry.warmed = True
+                results[name] = {'status': 'ready', 'load_seconds': round(entry.load_seconds, 3),
+                                 'warmup_seconds': round(entry.warmup_seconds, 3)}
+            except Exception as e:
+                logger.warning(f"⚠️ 模型预热失败: {name} ({e})")
+                results[name] = {'status': 'failed', 'error': str(e)}
+
+        ready = sum(1 for r in results.values() if r['status'] == 'ready')
+        logger.info(f"🔥 模型预热完成: {ready}/{len(names)} 就绪, 耗时 {time.time() - total_start:.2f}秒, "
+                    f"RSS {get_process_rss_mb():.0f}MB")
+        return results
+
+    def status(self) -> Dict[str, Any]:
+        """就绪状态：各模型加载情况、加载耗时、加载时RSS增量和进程常驻内存"""
+        models = {}
+        for name, entry in list(self._entries.items()):
+            if not entry.loaded:
+                state = 'registered'
+            elif entry.error is not None:
+                state = 'failed'
+            else:
+                state = 'warm' if entry.warmed else 'loaded'
+            models[name] = {
+                'state': state,
+                'load_seconds': round(entry.load_seconds, 3),
+                'warmup_seconds': round(entry.warmup_seconds, 3),
+                'rss_delta_mb': round(entry.rss_delta_mb, 1),
+                'loaded_at': entry.loaded_at,
+                'error': entry.error
+            }
+
+        return {
+            'pid': os.getpid(),
+            'rss_mb': round(get_process_rss_mb(), 1),
+            'loaded_count': sum(1 for m in models.values() if m['state'] in ('loaded', 'warm')),
+            'models': models
+        }
+
+
+# === 内置模型 ===
+
+SENTENCE_TRANSFORMER_PREFIX = "sentence_transformer:"
+DEFAULT_WARMUP_MODELS = [
+    "star_classifier",
+    "skill_matcher",
+    f"{SENTENCE_TRANSFORMER_PREFIX}all-MiniLM-L6-v2",
+    "multimodal_analyzer"
+]
+
+
+def _load_sentence_transformer(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def _load_star_classifier():
+    from .star_classifier import STARClassifier
+    return STARClassifier()
+
+
+def _load_skill_matcher():
+    from .skill_matcher import SkillMatcher
+    return SkillMatcher()
+
+
+def _load_multimodal_analyzer():
+    from .multimodal_analyzer import MultimodalAnalyzer
+    return MultimodalAnalyzer()
+
+
+def _warmup_multimodal_analyzer(analyzer):
+    """用空白帧跑一遍MediaPipe图，完成图初始化和内存分配"""
+    import numpy as np
+    blank = np.zeros((240, 320, 3), dtype=np.uint8)
+    video_analyzer = analyzer.video_analyzer
+    video_analyzer.face_mesh.process(blank)
+    video_analyzer.pose.process(blank)
+    video_analyzer.hands.process(blank)
+
+
+def _register_builtin_models(registry: ModelRegistry):
+    registry.register(
+        "star_classifier",
+        _load_star_classifier,
+        warmup=lambda m: m.analyze_star_structure("我负责系统性能优化，最终响应时间降低了一半。")
+    )
+    registry.register(
+        "skill_matcher",
+        _load_skill_matcher,
+        warmup=lambda m: m.analyze_skill_match("我使用Python和Redis开发后端服务", ["python"], ["redis"])
+    )
+    registry.register(
+        "multimodal_analyzer",
+        _load_multimodal_analyzer,
+        warmup=_warmup_multimodal_analyzer,
+        thread_safe=False
+    )
+
+
+def _register_sentence_transformer(registry: ModelRegistry, model_name: str) -> str:
+    name = f"{SENTENCE_TRANSFORMER_PREFIX}{model_name}"
+    registry.register(
+        name,
+        lambda: _load_sentence_transformer(model_name),
+        warmup=lambda m: m.encode(["warm up"])
+    )
+    return name
+
+
+# 全局模型注册表
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """获取进程级模型注册表"""
+    global _model_registry
+
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                registry = ModelRegistry()
+                _register_builtin_models(registry)
+                _model_registry = registry
+
+    return _model_registry
+
+
+def get_sentence_transformer(model_name: str = "all-MiniLM-L6-v2"):
+    """获取共享的Sentence-Transformer模型（按模型名称每进程加载一次）"""
+    registry = get_model_registry()
+    return registry.get(_register_sentence_transformer(registry, model_name))
+
+
+def get_shared_model(name: str) -> Any:
+    """获取共享的内置模型实例（star_classifier / skill_matcher / multimodal_analyzer）"""
+    return get_model_registry().get(name)
+
+
+def warm_up_models(names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """预热模型，未指定时使用配置 MODEL_WARMUP_MODELS"""
+    if names is None:
+        names = getattr(model_config, 'MODEL_WARMUP_MODELS', None) or DEFAULT_WARMUP_MODELS
+
+    registry = get_model_registry()
+    for name in names:
+        # 句向量模型按名称动态注册
+        if name.startswith(SENTENCE_TRANSFORMER_PREFIX):
+            _register_sentence_transformer(registry, name[len(SENTENCE_TRANSFORMER_PREFIX):])
+    return registry.warm_up(names)
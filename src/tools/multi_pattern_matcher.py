@@ -0,0 +1,99 @@
+"""
+多模式关键词匹配
+基于Aho-Corasick自动机一次扫描文本即可找出所有关键词，
+并对拉丁字母/数字边界做整词校验（避免 "go" 命中 "google"、"r" 命中 "react"），
+中文等CJK关键词不要求边界，可直接嵌在句子中匹配
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    """拉丁字母和数字视为单词字符；CJK字符、空白和标点都视为边界"""
+    return ch.isascii() and ch.isalnum()
+
+
+class AhoCorasickMatcher:
+    """Aho-Corasick多模式匹配器
+
+    每个模式关联一个值（如规范技能名），匹配结果返回 (起始位置, 结束位置, 模式, 值)。
+    模式首尾为拉丁字母/数字时要求相邻文本字符不是拉丁字母/数字。
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]] = (), case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._patterns: List[List[Tuple[str, Any]]] = [[]]  # 以该状态结尾的模式
+        self._output: List[List[Tuple[str, Any]]] = [[]]  # 含后缀状态的全部输出
+        self._built = False
+        for pattern, value in patterns:
+            self.add(pattern, value)
+        self.build()
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def add(self, pattern: str, value: Any = None):
+        """添加模式（添加后需重新 build）"""
+        pattern = self._normalize(pattern.strip())
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._patterns.append([])
+            state = next_state
+        self._patterns[state].append((pattern, pattern if value is None else value))
+        self._built = False
+
+    def build(self):
+        """广度优先计算失败指针，并合并后缀状态的输出"""
+        self._output = [list(patterns) for patterns in self._patterns]
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """扫描文本，逐个产出满足边界条件的匹配"""
+        if not self._built:
+            self.build()
+
+        normalized = self._normalize(text)
+        length = len(normalized)
+        state = 0
+        for i, ch in enumerate(normalized):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+
+            for pattern, value in self._output[state]:
+                start = i - len(pattern) + 1
+                end = i + 1
+                if _is_word_char(pattern[0]) and start > 0 and _is_word_char(normalized[start - 1]):
+                    continue
+                if _is_word_char(pattern[-1]) and end < length and _is_word_char(normalized[end]):
+                    continue
+                yield start, end, pattern, value
+
+    def find_values(self, text: str) -> List[Any]:
+        """返回文本中命中的值（去重，按首次出现顺序）"""
+        return list(dict.fromkeys(value for _, _, _, value in self.iter_matches(text)))
@@ -14,6 +14,17 @@ import traceback
 from datetime import datetime
 import os
 import json
+import multiprocessing
+import signal
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from .streaming_stats import RunningStats, StreamingHistogram
+from .visual_timeline import VisualTimeline
+from .frame_writer import flush_frame_writer, get_frame_writer
 
 # 配置详细日志
 logging.basicConfig(level=logging.INFO)
@@ -76,13 +87,87 @@ except ImportError:
         MEDIAPIPE_CONFIDENCE = 0.5
         DEEPFACE_BACKEND = 'opencv'
         AUDIO_SAMPLE_RATE = 22050
+        AUDIO_STREAMING_MIN_DURATION = 300
+        AUDIO_STREAMING_BLOCK_SECONDS = 30
+        AUDIO_STREAMING_WORKERS = 2
+        MULTIMODAL_USE_PROCESSES = True
+        MULTIMODAL_PROCESS_WORKERS = 2
+        MULTIMODAL_VIDEO_TIMEOUT = 900
+        MULTIMODAL_AUDIO_TIMEOUT = 600
     model_config = DefaultConfig()
 
 
+class FrameLandmarks:
+    """单帧关键点缓存 - 同一帧只做一次RGB转换，头部姿态、视线、体态、手势共用结果
+
+    Holistic模式下一次推理同时得到面部、姿态和手部关键点；
+    分离模式下FaceMesh立即执行，Pose和Hands在首次访问时执行并缓存。
+    """
+
+    def __init__(self, analyzer: "VideoAnalyzer", rgb_frame: np.ndarray):
+        self._analyzer = analyzer
+        self._rgb_frame = rgb_frame
+        self._face = None
+        self._pose = None
+        self._hands = None
+        self._pose_done = False
+        self._hands_done = False
+        self.mode = 'holistic' if analyzer.use_holistic else 'separate'
+        self.latency_ms = 0.0
+
+        start = time.perf_counter()
+        if analyzer.use_holistic:
+            results = analyzer.holistic.process(rgb_frame)
+            self._face = results.face_landmarks
+            self._pose = results.pose_landmarks
+            self._hands = [
+                hand for hand in (results.left_hand_landmarks, results.right_hand_landmarks)
+                if hand is not None
+            ]
+            self._pose_done = self._hands_done = True
+        else:
+            results = analyzer.face_mesh.process(rgb_frame)
+            if results.multi_face_landmarks:
+                self._face = results.multi_face_landmarks[0]
+        self.latency_ms += (time.perf_counter() - start) * 1000
+
+    @property
+    def face(self):
+        """面部关键点 (NormalizedLandmarkList) 或 None"""
+        return self._face
+
+    @property
+    def pose(self):
+        """身体姿态关键点 (NormalizedLandmarkList) 或 None"""
+        if not self._pose_done:
+            start = time.perf_counter()
+            self._pose = self._analyzer.pose.process(self._rgb_frame).pose_landmarks
+            self.latency_ms += (time.perf_counter() - start) * 1000
+            self._pose_done = True
+        return self._pose
+
+    @property
+    def hands(self) -> List[Any]:
+        """手部关键点列表（可能为空）"""
+        if not self._hands_done:
+            start = time.perf_counter()
+            self._hands = list(self._analyzer.hands.process(self._rgb_frame).multi_hand_landmarks or [])
+            self.latency_ms += (time.perf_counter() - start) * 1000
+            self._hands_done = True
+        return self._hands
+
+
 class VideoAnalyzer:
     """视频分析器 - 处理视觉模态"""
     
-    def __init__(self):
+    def __init__(self, use_holistic: Optional[bool] = None):
+        # 是否使用MediaPipe Holistic单次推理同时获取面部、姿态和手部关键点
+        if use_holistic is None:
+            use_holistic = getattr(model_config, 'VIDEO_USE_HOLISTIC', False)
+        self.use_holistic = use_holistic
+        self._holistic = None
+        self._landmarks_cache = None
+        
         # 初始化MediaPipe Face Mesh
         self.mp_face_mesh = mp.solutions.face_mesh
         self.mp_drawing = mp.solutions.drawing_utils
@@ -139,87 +224,193 @@ class VideoAnalyzer:
         self.save_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"📁 分析帧保存目录: {self.save_dir.absolute()}")
     
+    @property
+    def holistic(self):
+        """按需创建Holistic图，未启用时不占用资源"""
+        if self._holistic is None:
+            self._holistic = mp.solutions.holistic.Holistic(
+                static_image_mode=False,
+                model_complexity=1,
+                refine_face_landmarks=True,  # 包含虹膜关键点，供视线分析使用
+                min_detection_confidence=model_config.MEDIAPIPE_CONFIDENCE,
+                min_tracking_confidence=model_config.MEDIAPIPE_CONFIDENCE
+            )
+        return self._holistic
+    
+    def get_frame_landmarks(self, frame: np.ndarray) -> FrameLandmarks:
+        """获取单帧关键点，同一帧对象的重复调用直接返回缓存"""
+        
+        if self._landmarks_cache is not None:
+            cached_ref, cached = self._landmarks_cache
+            if cached_ref() is frame:
+                return cached
+        
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        landmarks = FrameLandmarks(self, rgb_frame)
+        # 弱引用避免帧被释放后因id复用而误命中
+        self._landmarks_cache = (weakref.ref(frame), landmarks)
+        return landmarks
+    
+    def compare_landmark_latency(self, video_path: str, max_frames: int = 200) -> Dict[str, Any]:
+        """对比分离模式(FaceMesh+Pose+Hands)与Holistic单次推理的逐帧关键点延迟"""
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise Exception(f"无法打开视频文件: {video_path}")
+        
+        frames = []
+        try:
+            while len(frames) < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames.append(frame)
+        finally:
+            cap.release()
+        
+        if not frames:
+            raise Exception("视频中没有可用于对比的帧")
+        
+        original_mode = self.use_holistic
+        report = {'frames': len(frames)}
+        
+        try:
+            for mode, use_holistic in (('separate', False), ('holistic', True)):
+                self.use_holistic = use_holistic
+                self._landmarks_cache = None
+                latencies = []
+                face_hits = 0
+                
+                for frame in frames:
+                    start = time.perf_counter()
+                    landmarks = self.get_frame_landmarks(frame)
+                    # 访问全部模态，确保分离模式也执行了三次推理
+                    if landmarks.face is not None:
+                        face_hits += 1
+                    landmarks.pose
+                    landmarks.hands
+                    latencies.append((time.perf_counter() - start) * 1000)
+                
+                report[mode] = {
+                    'mean_ms': float(np.mean(latencies)),
+                    'p50_ms': float(np.percentile(latencies, 50)),
+                    'p95_ms': float(np.percentile(latencies, 95)),
+                    'face_detection_rate': face_hits / len(frames)
+                }
+        finally:
+            self.use_holistic = original_mode
+            self._landmarks_cache = None
+        
+        report['speedup'] = (report['separate']['mean_ms'] / report['holistic']['mean_ms']
+                             if report['holistic']['mean_ms'] > 0 else None)
+        
+        logger.info(f"📊 关键点延迟对比: 分离模式{report['separate']['mean_ms']:.1f}ms/帧, "
+                    f"Holistic {report['holistic']['mean_ms']:.1f}ms/帧")
+        return report
+    
     def _save_analysis_frame(self, frame: np.ndarray, frame_count: int, timestamp: float, 
                            analysis_result: Dict[str, Any], frame_type: str = "analysis") -> str:
-        """保存分析帧到本地"""
+        """保存分析帧到本地（标注、编码和写盘在后台写入器中完成，队列满时丢弃）"""
         
         try:
+            writer = get_frame_writer()
+            
             # 生成时间戳
             timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
             
             # 构建文件名
             filename = f"{timestamp_str}_frame_{frame_count:06d}_{frame_type}.jpg"
-            filepath = self.save_dir / filename
-            
-            # 在图像上绘制分析结果信息
-            annotated_frame = frame.copy()
-            
-            # 添加文本信息
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.6
-            color = (255, 255, 255)  # 白色
-            thickness = 2
-            
-            # 基本信息
-            y_offset = 30
-            cv2.putText(annotated_frame, f"Frame: {frame_count}", (10, y_offset), 
-                       font, font_scale, color, thickness)
-            y_offset += 25
-            cv2.putText(annotated_frame, f"Time: {timestamp:.2f}s", (10, y_offset), 
-                       font, font_scale, color, thickness)
-            y_offset += 25
-            
-            # 分析结果信息
-            if 'head_pose' in analysis_result:
-                pose = analysis_result['head_pose']
-                cv2.putText(annotated_frame, f"Pitch: {pose.get('pitch', 0):.1f}°", (10, y_offset), 
-                           font, font_scale, color, thickness)
-                y_offset += 25
-                cv2.putText(annotated_frame, f"Yaw: {pose.get('yaw', 0):.1f}°", (10, y_offset), 
-                           font, font_scale, color, thickness)
-                y_offset += 25
-                cv2.putText(annotated_frame, f"Roll: {pose.get('roll', 0):.1f}°", (10, y_offset), 
-                           font, font_scale, color, thickness)
-                y_offset += 25
-            
-            if 'gaze' in analysis_result:
-                gaze = analysis_result['gaze']
-                cv2.putText(annotated_frame, f"Gaze: ({gaze.get('gaze_x', 0):.1f}, {gaze.get('gaze_y', 0):.1f})", 
-                           (10, y_offset), font, font_scale, color, thickness)
-                y_offset += 25
-            
-            if 'emotion' in analysis_result:
-                emotion = analysis_result['emotion']
-                cv2.putText(annotated_frame, f"Emotion: {emotion.get('dominant_emotion', 'Unknown')}", 
-                           (10, y_offset), font, font_scale, color, thickness)
-                y_offset += 25
-                cv2.putText(annotated_frame, f"Score: {emotion.get('dominant_score', 0):.1f}%", 
-                           (10, y_offset), font, font_scale, color, thickness)
-            
-            # 保存图像
-            cv2.imwrite(str(filepath), annotated_frame)
+            filepath = writer.submit_image(
+                self.save_dir / filename,
+                frame,
+                annotate=lambda image: self._annotate_analysis_frame(
+                    image, frame_count, timestamp, analysis_result
+                )
+            )
+            if not filepath:
+                logger.debug(f"⚠️ 写入队列已满，跳过保存分析帧: {filename}")
+                return ""
             
             # 保存分析结果JSON
             json_filename = f"{timestamp_str}_frame_{frame_count:06d}_{frame_type}_analysis.json"
-            json_filepath = self.save_dir / json_filename
-            with open(json_filepath, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'frame_count': frame_count,
-                    'timestamp': timestamp,
-                    'frame_type': frame_type,
-                    'analysis_result': analysis_result,
-                    'saved_at': datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
-            
-            logger.debug(f"💾 保存分析帧: {filename}")
-            return str(filepath)
+            writer.submit_json(self.save_dir / json_filename, {
+                'frame_count': frame_count,
+                'timestamp': timestamp,
+                'frame_type': frame_type,
+                'analysis_result': analysis_result,
+                'saved_at': datetime.now().isoformat()
+            })
+            
+            logger.debug(f"💾 提交分析帧保存: {filepath}")
+            return filepath
             
         except Exception as e:
             logger.error(f"❌ 保存分析帧失败: {str(e)}")
             return ""
     
-    def analyze_video(self, video_path: str) -> Dict[str, Any]:
-        """分析视频文件，提取视觉特征"""
+    def _annotate_analysis_frame(self, annotated_frame: np.ndarray, frame_count: int, timestamp: float,
+                                 analysis_result: Dict[str, Any]) -> np.ndarray:
+        """在图像上绘制分析结果信息（在后台写入线程中执行）"""
+        
+        # 添加文本信息
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 0.6
+        color = (255, 255, 255)  # 白色
+        thickness = 2
+        
+        # 基本信息
+        y_offset = 30
+        cv2.putText(annotated_frame, f"Frame: {frame_count}", (10, y_offset), 
+                   font, font_scale, color, thickness)
+        y_offset += 25
+        cv2.putText(annotated_frame, f"Time: {timestamp:.2f}s", (10, y_offset), 
+                   font, font_scale, color, thickness)
+        y_offset += 25
+        
+        # 分析结果信息
+        if analysis_result.get('head_pose'):
+            pose = analysis_result['head_pose']
+            cv2.putText(annotated_frame, f"Pitch: {pose.get('pitch', 0):.1f}°", (10, y_offset), 
+                       font, font_scale, color, thickness)
+            y_offset += 25
+            cv2.putText(annotated_frame, f"Yaw: {pose.get('yaw', 0):.1f}°", (10, y_offset), 
+                       font, font_scale, color, thickness)
+            y_offset += 25
+            cv2.putText(annotated_frame, f"Roll: {pose.get('roll', 0):.1f}°", (10, y_offset), 
+                       font, font_scale, color, thickness)
+            y_offset += 25
+        
+        if analysis_result.get('gaze'):
+            gaze = analysis_result['gaze']
+            cv2.putText(annotated_frame, f"Gaze: ({gaze.get('gaze_x', 0):.1f}, {gaze.get('gaze_y', 0):.1f})", 
+                       (10, y_offset), font, font_scale, color, thickness)
+            y_offset += 25
+        
+        if analysis_result.get('emotion'):
+            emotion = analysis_result['emotion']
+            cv2.putText(annotated_frame, f"Emotion: {emotion.get('dominant_emotion', 'Unknown')}", 
+                       (10, y_offset), font, font_scale, color, thickness)
+            y_offset += 25
+            cv2.putText(annotated_frame, f"Score: {emotion.get('dominant_score', 0):.1f}%", 
+                       (10, y_offset), font, font_scale, color, thickness)
+        
+        return annotated_frame
+    
+    def analyze_video(
+        self,
+        video_path: str,
+        sample_stride: Optional[int] = None,
+        sample_fps: Optional[float] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """分析视频文件，提取视觉特征
+        
+        Args:
+            video_path: 视频文件路径
+            sample_stride: 采样步长，每隔多少帧分析一帧（1为全帧率）
+            sample_fps: 按时间采样的目标帧率，优先级高于sample_stride
+            workers: 并行分析的进程数，视频按帧区间切分为多个分段
+        """
         
         start_time = datetime.now()
         logger.info(f"🎥 开始视频分析: {video_path}")
@@ -236,84 +427,315 @@ class VideoAnalyzer:
             logger.error(f"❌ {error_msg}")
             raise Exception(error_msg)
         
+        # 获取视频基本信息
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        duration = total_frames / fps if fps > 0 else 0
+        cap.release()
+        
+        logger.info(f"📊 视频信息: {total_frames}帧, {fps:.1f}FPS, {duration:.1f}秒")
+        
         try:
-            # 获取视频基本信息
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            duration = total_frames / fps if fps > 0 else 0
-            
-            logger.info(f"📊 视频信息: {total_frames}帧, {fps:.1f}FPS, {duration:.1f}秒")
-            
-            # 初始化分析结果存储
-            head_poses = []
-            gaze_directions = []
-            body_language_results = []
-            gesture_results = []
-            emotions_timeline = []
+            stride = self._resolve_sample_stride(fps, sample_stride, sample_fps)
+            segments = self._plan_video_segments(total_frames, fps, stride, workers)
+            
+            # 守护进程（如Celery prefork worker）中无法创建子进程，退回进程内顺序分析
+            use_pool = len(segments) > 1 and not multiprocessing.current_process().daemon
+            
+            logger.info(f"🎯 采样步长: {stride}帧, 分段数: {len(segments)}, "
+                        f"{'多进程并行' if use_pool else '进程内顺序'}分析")
+            
+            if use_pool:
+                # 进程内所有并发的视频分析共用一个分段进程池，总进程数不随并发任务数增长
+                executor = _get_segment_executor()
+                futures = [
+                    executor.submit(
+                        _analyze_video_segment_worker,
+                        video_path, seg_start, seg_end, stride, fps, total_frames
+                    )
+                    for seg_start, seg_end in segments
+                ]
+                segment_results = [future.result() for future in futures]
+            else:
+                segment_results = [
+                    self._analyze_video_segment(video_path, seg_start, seg_end, stride, fps, total_frames)
+                    for seg_start, seg_end in segments
+                ]
+            
+            # 按时间顺序合并各分段结果
+            timeline = VisualTimeline(expected_frames=max(1, total_frames // stride))
+            saved_frames = []
             frame_count = 0
+            analyzed_frames = 0
             processed_frames = 0
-            saved_frames = []
             
-            while True:
+            for segment in sorted(segment_results, key=lambda s: s['start_frame']):
+                timeline.extend(segment['timeline'])
+                saved_frames.extend(segment['saved_frames'])
+                frame_count = max(frame_count, segment['last_frame'])
+                analyzed_frames += segment['analyzed_frames']
+                processed_frames += segment['processed_frames']
+            
+            # 检查是否有有效的分析结果
+            if processed_frames == 0:
+                error_msg = "视频中未检测到任何有效的面部数据"
+                logger.error(f"❌ {error_msg}")
+                raise Exception(error_msg)
+            
+            # 分析结果统计
+            processing_time = (datetime.now() - start_time).total_seconds()
+            throughput = analyzed_frames / processing_time if processing_time > 0 else 0.0
+            logger.info(f"📊 视频分析完成:")
+            logger.info(f"   - 总帧数: {frame_count}")
+            logger.info(f"   - 采样分析帧数: {analyzed_frames} (步长{stride})")
+            logger.info(f"   - 检测到人脸的帧数: {processed_frames}")
+            logger.info(f"   - 头部姿态分析: {len(timeline.head_pose)}个有效结果")
+            logger.info(f"   - 视线方向分析: {len(timeline.gaze)}个有效结果")
+            logger.info(f"   - 情绪分析: {len(timeline.emotion)}个有效结果")
+            logger.info(f"   - 体态语言分析: {len(timeline.body_language)}个有效结果")
+            logger.info(f"   - 手势分析: {len(timeline.gesture)}个有效结果")
+            logger.info(f"   - 保存的关键帧: {len(saved_frames)}个")
+            logger.info(f"   - 处理耗时: {processing_time:.2f}秒 ({throughput:.1f}帧/秒)")
+            
+            # 计算统计特征（基于在线聚合量，无需再次遍历逐帧数据）
+            analysis_result = self._summarize_visual_timeline(timeline)
+            
+            # 添加处理统计信息
+            analysis_result.update({
+                'processing_stats': {
+                    'total_frames': frame_count,
+                    'processed_frames': processed_frames,
+                    'processing_time_seconds': processing_time,
+                    **timeline.counts(),
+                    'saved_frames_count': len(saved_frames),
+                    'save_directory': str(self.save_dir.absolute()),
+                    'sample_stride': stride,
+                    'analyzed_frames': analyzed_frames,
+                    'segments_count': len(segments),
+                    'parallel': use_pool,
+                    'throughput_fps': throughput
+                },
+                'saved_frames': saved_frames
+            })
+            
+            logger.info("✅ 视频分析成功完成")
+            return analysis_result
+        
+        except Exception as e:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            logger.error(f"❌ 视频分析失败: {str(e)}")
+            logger.error(f"🔧 错误详情: {traceback.format_exc()}")
+            logger.error(f"⏱️ 失败前处理时间: {processing_time:.2f}秒")
+            raise
+    
+    def benchmark_sampling(
+        self,
+        video_path: str,
+        sample_stride: Optional[int] = None,
+        sample_fps: Optional[float] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """对比采样/并行分析与全帧率顺序分析的吞吐量和指标偏差"""
+        
+        baseline = self.analyze_video(video_path, sample_stride=1, workers=1)
+        sampled = self.analyze_video(
+            video_path, sample_stride=sample_stride, sample_fps=sample_fps, workers=workers
+        )
+        
+        accuracy_deltas = {}
+        for key, full_value in baseline.items():
+            sampled_value = sampled.get(key)
+            if isinstance(full_value, bool) or not isinstance(full_value, (int, float)):
+                continue
+            if not isinstance(sampled_value, (int, float)):
+                continue
+            delta = float(sampled_value) - float(full_value)
+            accuracy_deltas[key] = {
+                'full_rate': float(full_value),
+                'sampled': float(sampled_value),
+                'abs_delta': abs(delta),
+                'rel_delta': abs(delta) / abs(full_value) if full_value else None
+            }
+        
+        for key in ('dominant_emotion', 'dominant_gesture_type'):
+            if key in baseline:
+                accuracy_deltas[key] = {
+                    'full_rate': baseline.get(key),
+                    'sampled': sampled.get(key),
+                    'match': baseline.get(key) == sampled.get(key)
+                }
+        
+        full_stats = baseline['processing_stats']
+        sampled_stats = sampled['processing_stats']
+        full_time = full_stats['processing_time_seconds']
+        sampled_time = sampled_stats['processing_time_seconds']
+        
+        report = {
+            'full_rate': {
+                'processing_time_seconds': full_time,
+                'analyzed_frames': full_stats['analyzed_frames'],
+                'throughput_fps': full_stats['throughput_fps']
+            },
+            'sampled': {
+                'processing_time_seconds': sampled_time,
+                'analyzed_frames': sampled_stats['analyzed_frames'],
+                'throughput_fps': sampled_stats['throughput_fps'],
+                'sample_stride': sampled_stats['sample_stride'],
+                'segments_count': sampled_stats['segments_count']
+            },
+            # 以视频帧计的有效处理速度提升
+            'speedup': full_time / sampled_time if sampled_time > 0 else None,
+            'accuracy_deltas': accuracy_deltas
+        }
+        
+        logger.info(f"📊 采样分析基准: 全帧率{full_time:.2f}秒, 采样{sampled_time:.2f}秒, "
+                    f"加速{report['speedup'] or 0:.1f}倍")
+        return report
+    
+    def _resolve_sample_stride(
+        self, fps: float, sample_stride: Optional[int], sample_fps: Optional[float]
+    ) -> int:
+        """根据步长或目标采样帧率确定实际采样步长"""
+        
+        if sample_fps is None and sample_stride is None:
+            sample_fps = getattr(model_config, 'VIDEO_SAMPLE_FPS', None)
+            sample_stride = getattr(model_config, 'VIDEO_SAMPLE_STRIDE', 1)
+        
+        if sample_fps and fps > 0:
+            return max(1, int(round(fps / sample_fps)))
+        return max(1, int(sample_stride or 1))
+    
+    def _plan_video_segments(
+        self, total_frames: int, fps: float, stride: int, workers: Optional[int]
+    ) -> List[Tuple[int, Optional[int]]]:
+        """将视频切分为按采样步长对齐的帧区间 [start, end)"""
+        
+        if workers is None:
+            workers = getattr(model_config, 'VIDEO_ANALYSIS_WORKERS', 1)
+        min_segment_frames = int(getattr(model_config, 'VIDEO_MIN_SEGMENT_SECONDS', 60) * (fps or 30))
+        
+        # 帧数未知（部分容器格式）或视频过短时不切分
+        if total_frames <= 0 or workers <= 1 or total_frames < min_segment_frames * 2:
+            return [(0, None)]
+        
+        segments_count = min(workers, total_frames // min_segment_frames)
+        segment_size = -(-total_frames // segments_count)
+        segment_size = -(-segment_size // stride) * stride  # 对齐采样网格，避免分段边界重复或遗漏
+        
+        segments = []
+        for seg_start in range(0, total_frames, segment_size):
+            seg_end = min(seg_start + segment_size, total_frames)
+            segments.append((seg_start, seg_end if seg_end < total_frames else None))
+        return segments
+    
+    def _seek_to_frame(self, cap, target_frame: int):
+        """帧精确定位：先按关键帧跳转，再逐帧grab到目标位置"""
+        
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        
+        if position > target_frame or position < 0:
+            # 后端定位越过目标，从头重新解码
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            position = 0
+        
+        while position < target_frame:
+            if not cap.grab():
+                break
+            position += 1
+    
+    def _analyze_video_segment(
+        self,
+        video_path: str,
+        start_frame: int,
+        end_frame: Optional[int],
+        stride: int,
+        fps: float,
+        total_frames: int
+    ) -> Dict[str, Any]:
+        """分析视频的一个帧区间 [start_frame, end_frame)，仅对采样帧执行完整分析"""
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise Exception(f"无法打开视频文件: {video_path}")
+        
+        if end_frame is not None:
+            expected_frames = (end_frame - start_frame) // stride + 1
+        else:
+            expected_frames = max(1, (total_frames - start_frame) // stride + 1)
+        timeline = VisualTimeline(expected_frames=expected_frames)
+        saved_frames = []
+        analyzed_frames = 0
+        processed_frames = 0
+        
+        # 步长超过该阈值时直接seek，否则用grab跳过（grab不做颜色转换和拷贝）
+        seek_threshold = int(getattr(model_config, 'VIDEO_SEEK_STRIDE_THRESHOLD', 60))
+        
+        try:
+            if start_frame > 0:
+                self._seek_to_frame(cap, start_frame)
+            
+            position = start_frame
+            while end_frame is None or position < end_frame:
+                is_sample = (position - start_frame) % stride == 0
+                
+                if not is_sample:
+                    if stride > seek_threshold:
+                        next_sample = position + stride - (position - start_frame) % stride
+                        self._seek_to_frame(cap, next_sample)
+                        position = next_sample
+                    else:
+                        if not cap.grab():
+                            break
+                        position += 1
+                    continue
+                
                 ret, frame = cap.read()
                 if not ret:
                     break
                 
-                frame_count += 1
+                position += 1
+                frame_count = position
                 timestamp = frame_count / fps if fps > 0 else 0
+                analyzed_frames += 1
                 
                 try:
-                    # 转换颜色空间
-                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    # MediaPipe关键点检测（结果按帧缓存，体态和手势分析直接复用）
+                    landmarks = self.get_frame_landmarks(frame)
                     
-                    # MediaPipe面部检测
-                    results = self.face_mesh.process(rgb_frame)
-                    
-                    if results.multi_face_landmarks:
+                    if landmarks.face is not None:
                         processed_frames += 1
-                        face_landmarks = results.multi_face_landmarks[0]
+                        face_landmarks = landmarks.face
                         
                         # 分析头部姿态
                         head_pose = self._analyze_head_pose(face_landmarks, frame.shape)
                         if head_pose:
-                            head_poses.append(head_pose)
+                            timeline.add_head_pose(frame_count, timestamp, head_pose)
                         
                         # 分析视线方向
                         gaze = self._analyze_gaze_direction(face_landmarks, frame.shape)
                         if gaze:
-                            gaze_directions.append(gaze)
+                            timeline.add_gaze(frame_count, timestamp, gaze)
                         
-                        # 情绪分析 (每10帧分析一次以提高效率)
+                        # 情绪分析 (每10帧分析一次以提高效率；采样时按覆盖的帧区间判断)
                         emotion = None
-                        if frame_count % 10 == 0:
+                        if frame_count % 10 < stride:
                             emotion = self._analyze_emotion(frame)
                             if emotion:
-                                emotions_timeline.append({
-                                    'frame': frame_count,
-                                    'timestamp': timestamp,
-                                    **emotion
-                                })
+                                timeline.add_emotion(frame_count, timestamp, emotion)
                         
                         # 体态语言分析
                         body_language = self._analyze_body_language(frame)
                         if body_language:
-                            body_language_results.append({
-                                'frame': frame_count,
-                                'timestamp': timestamp,
-                                **body_language
-                            })
+                            timeline.add_body_language(frame_count, timestamp, body_language)
                         
                         # 手势分析
                         gestures = self._analyze_gestures(frame)
                         if gestures:
-                            gesture_results.append({
-                                'frame': frame_count,
-                                'timestamp': timestamp,
-                                **gestures
-                            })
+                            timeline.add_gesture(frame_count, timestamp, gestures)
                         
                         # 保存关键分析帧 (每30帧保存一次，或者有重要分析结果时)
-                        should_save = (frame_count % 30 == 0 or 
+                        should_save = (frame_count % 30 < stride or
                                      (emotion and emotion.get('dominant_score', 0) > 70) or
                                      (head_pose and abs(head_pose.get('yaw', 0)) > 15))
                         
@@ -337,8 +759,8 @@ class VideoAnalyzer:
                                     'analysis_result': analysis_result
                                 })
                     
-                    # 进度日志 (每100帧报告一次)
-                    if frame_count % 100 == 0:
+                    # 进度日志 (每100个采样帧报告一次)
+                    if analyzed_frames % 100 == 0:
                         progress = (frame_count / total_frames) * 100 if total_frames > 0 else 0
                         logger.debug(f"📈 视频分析进度: {progress:.1f}% ({frame_count}/{total_frames})")
                         
@@ -347,60 +769,22 @@ class VideoAnalyzer:
                     logger.error(f"🔧 错误详情: {traceback.format_exc()}")
                     # 不再使用备用方案，继续处理下一帧
                     continue
-            
+        finally:
             cap.release()
             
-            # 检查是否有有效的分析结果
-            if processed_frames == 0:
-                error_msg = "视频中未检测到任何有效的面部数据"
-                logger.error(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            
-            # 分析结果统计
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"📊 视频分析完成:")
-            logger.info(f"   - 总帧数: {frame_count}")
-            logger.info(f"   - 检测到人脸的帧数: {processed_frames}")
-            logger.info(f"   - 头部姿态分析: {len(head_poses)}个有效结果")
-            logger.info(f"   - 视线方向分析: {len(gaze_directions)}个有效结果") 
-            logger.info(f"   - 情绪分析: {len(emotions_timeline)}个有效结果")
-            logger.info(f"   - 体态语言分析: {len(body_language_results)}个有效结果")
-            logger.info(f"   - 手势分析: {len(gesture_results)}个有效结果")
-            logger.info(f"   - 保存的关键帧: {len(saved_frames)}个")
-            logger.info(f"   - 处理耗时: {processing_time:.2f}秒")
-            
-            # 计算统计特征
-            analysis_result = self._compute_visual_statistics(
-                head_poses, gaze_directions, emotions_timeline, body_language_results, gesture_results
-            )
-            
-            # 添加处理统计信息
-            analysis_result.update({
-                'processing_stats': {
-                    'total_frames': frame_count,
-                    'processed_frames': processed_frames,
-                    'processing_time_seconds': processing_time,
-                    'head_pose_count': len(head_poses),
-                    'gaze_direction_count': len(gaze_directions),
-                    'emotion_analysis_count': len(emotions_timeline),
-                    'body_language_count': len(body_language_results),
-                    'gesture_count': len(gesture_results),
-                    'saved_frames_count': len(saved_frames),
-                    'save_directory': str(self.save_dir.absolute())
-                },
-                'saved_frames': saved_frames
-            })
-            
-            logger.info("✅ 视频分析成功完成")
-            return analysis_result
-            
-        except Exception as e:
-            cap.release()
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ 视频分析失败: {str(e)}")
-            logger.error(f"🔧 错误详情: {traceback.format_exc()}")
-            logger.error(f"⏱️ 失败前处理时间: {processing_time:.2f}秒")
-            raise
+        # 关键帧写入在后台线程中排队，返回路径（或分段子进程结束）前等待写盘完成
+        if saved_frames:
+            flush_frame_writer()
+            saved_frames = [frame for frame in saved_frames if os.path.exists(frame['filepath'])]
+            
+        return {
+            'start_frame': start_frame,
+            'last_frame': position,
+            'analyzed_frames': analyzed_frames,
+            'processed_frames': processed_frames,
+            'timeline': timeline,
+            'saved_frames': saved_frames
+        }
     
     def _analyze_head_pose(self, face_landmarks, frame_shape) -> Optional[Dict[str, float]]:
         """分析头部姿态"""
@@ -572,17 +956,14 @@ class VideoAnalyzer:
     def _analyze_body_language(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
         """分析体态语言 - 使用MediaPipe Pose"""
         try:
-            # 转换为RGB格式
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # 进行姿态检测
-            results = self.pose.process(rgb_frame)
+            # 进行姿态检测（复用帧关键点缓存）
+            pose_landmarks = self.get_frame_landmarks(frame).pose
             
-            if not results.pose_landmarks:
+            if not pose_landmarks:
                 logger.debug("🤷 未检测到身体姿态")
                 return None
             
-            landmarks = results.pose_landmarks.landmark
+            landmarks = pose_landmarks.landmark
             
             # 关键点索引
             LEFT_SHOULDER = self.mp_pose.PoseLandmark.LEFT_SHOULDER.value
@@ -645,13 +1026,10 @@ class VideoAnalyzer:
     def _analyze_gestures(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
         """分析手势 - 使用MediaPipe Hands"""
         try:
-            # 转换为RGB格式
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # 进行手部检测
-            results = self.hands.process(rgb_frame)
+            # 进行手部检测（复用帧关键点缓存）
+            multi_hand_landmarks = self.get_frame_landmarks(frame).hands
             
-            if not results.multi_hand_landmarks:
+            if not multi_hand_landmarks:
                 logger.debug("👋 未检测到手部")
                 return {
                     'hands_detected': 0,
@@ -663,7 +1041,7 @@ class VideoAnalyzer:
             hands_data = []
             total_movement = 0.0
             
-            for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            for idx, hand_landmarks in enumerate(multi_hand_landmarks):
                 landmarks = hand_landmarks.landmark
                 
                 # 关键点索引
@@ -794,100 +1172,44 @@ class VideoAnalyzer:
         body_language_results: List[Dict] = None,
         gesture_results: List[Dict] = None
     ) -> Dict[str, Any]:
-        """计算视觉分析统计特征"""
+        """计算视觉分析统计特征（兼容逐帧字典列表输入）"""
+        
+        timeline = VisualTimeline(expected_frames=max(1, len(head_poses), len(gaze_directions)))
+        for idx, pose in enumerate(head_poses):
+            timeline.add_head_pose(pose.get('frame', idx), pose.get('timestamp', 0.0), pose)
+        for idx, gaze in enumerate(gaze_directions):
+            timeline.add_gaze(gaze.get('frame', idx), gaze.get('timestamp', 0.0), gaze)
+        for idx, emotion in enumerate(emotions_timeline):
+            timeline.add_emotion(emotion.get('frame', idx), emotion.get('timestamp', 0.0), emotion)
+        for idx, body_language in enumerate(body_language_results or []):
+            timeline.add_body_language(
+                body_language.get('frame', idx), body_language.get('timestamp', 0.0), body_language
+            )
+        for idx, gestures in enumerate(gesture_results or []):
+            timeline.add_gesture(gestures.get('frame', idx), gestures.get('timestamp', 0.0), gestures)
         
-        if not head_poses and not gaze_directions and not emotions_timeline:
+        return self._summarize_visual_timeline(timeline)
+    
+    def _summarize_visual_timeline(self, timeline: VisualTimeline) -> Dict[str, Any]:
+        """从视觉时间线的在线聚合量得到统计特征"""
+        
+        if timeline.is_empty:
             error_msg = "所有视觉分析结果均为空，无法计算统计特征"
             logger.error(f"❌ {error_msg}")
             raise Exception(error_msg)
         
-        result = {}
-        
-        if head_poses:
-            # 计算头部姿态稳定性
-            yaw_values = [pose['yaw'] for pose in head_poses]
-            pitch_values = [pose['pitch'] for pose in head_poses]
-            
-            yaw_variance = np.var(yaw_values)
-            pitch_variance = np.var(pitch_values)
-            
-            # 稳定性与方差成反比
-            head_stability = 1.0 / (1.0 + (yaw_variance + pitch_variance) / 100)
-            result['head_pose_stability'] = float(head_stability)
-        else:
+        if not len(timeline.head_pose):
             logger.warning("⚠️ 头部姿态数据为空")
-        
-        if gaze_directions:
-            # 计算视线稳定性
-            gaze_magnitudes = [gaze['gaze_magnitude'] for gaze in gaze_directions]
-            gaze_variance = np.var(gaze_magnitudes)
-            
-            gaze_stability = 1.0 / (1.0 + gaze_variance / 10)
-            result['gaze_stability'] = float(gaze_stability)
-            
-            # 计算眼神接触比例 (视线偏移小于阈值的帧数比例)
-            eye_contact_frames = sum(1 for mag in gaze_magnitudes if mag < 5.0)
-            result['eye_contact_ratio'] = eye_contact_frames / len(gaze_magnitudes)
-        else:
+        if not len(timeline.gaze):
             logger.warning("⚠️ 视线方向数据为空")
-        
-        if emotions_timeline:
-            # 分析情绪分布
-            emotion_counts = {}
-            for emotion_data in emotions_timeline:
-                emotion = emotion_data['dominant_emotion']
-                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
-            
-            # 主导情绪
-            if emotion_counts:
-                result['dominant_emotion'] = max(emotion_counts.items(), key=lambda x: x[1])[0]
-            
-            # 情绪稳定性 (负面情绪占比的倒数)
-            negative_emotions = ['angry', 'disgust', 'fear', 'sad']
-            negative_count = sum(emotion_counts.get(emotion, 0) for emotion in negative_emotions)
-            total_count = sum(emotion_counts.values())
-            
-            if total_count > 0:
-                negative_ratio = negative_count / total_count
-                result['emotion_stability'] = 1.0 - negative_ratio
-        else:
+        if not len(timeline.emotion):
             logger.warning("⚠️ 情绪分析数据为空")
-        
-        # 体态语言分析统计
-        if body_language_results:
-            posture_scores = [bl.get('posture_score', 0) for bl in body_language_results if 'posture_score' in bl]
-            if posture_scores:
-                result['avg_posture_score'] = float(np.mean(posture_scores))
-                result['posture_stability'] = float(1.0 - (np.std(posture_scores) / 100.0))
-            
-            # 身体倾斜度统计
-            body_angles = [bl.get('body_angle', 0) for bl in body_language_results if 'body_angle' in bl]
-            if body_angles:
-                result['avg_body_angle'] = float(np.mean(body_angles))
-                result['body_angle_variance'] = float(np.var(body_angles))
-        else:
+        if not len(timeline.body_language):
             logger.warning("⚠️ 体态语言分析数据为空")
-        
-        # 手势分析统计
-        if gesture_results:
-            gesture_activity = [gr.get('gesture_activity', 0) for gr in gesture_results if 'gesture_activity' in gr]
-            if gesture_activity:
-                result['avg_gesture_activity'] = float(np.mean(gesture_activity))
-                result['gesture_expressiveness'] = float(np.max(gesture_activity))
-            
-            # 手势类型分布
-            gesture_types = {}
-            for gr in gesture_results:
-                gesture_type = gr.get('dominant_gesture', 'unknown')
-                gesture_types[gesture_type] = gesture_types.get(gesture_type, 0) + 1
-            
-            if gesture_types:
-                result['dominant_gesture_type'] = max(gesture_types.items(), key=lambda x: x[1])[0]
-                result['gesture_variety'] = len(gesture_types)
-        else:
+        if not len(timeline.gesture):
             logger.warning("⚠️ 手势分析数据为空")
         
-        return result
+        return timeline.summary()
 
 
 class AudioAnalyzer:
@@ -895,9 +1217,28 @@ class AudioAnalyzer:
     
     def __init__(self):
         self.sample_rate = model_config.AUDIO_SAMPLE_RATE
+        self.streaming_min_duration = getattr(model_config, 'AUDIO_STREAMING_MIN_DURATION', 300)
+        self.streaming_block_seconds = getattr(model_config, 'AUDIO_STREAMING_BLOCK_SECONDS', 30)
+        self.streaming_workers = getattr(model_config, 'AUDIO_STREAMING_WORKERS', 2)
     
-    def analyze_audio(self, audio_path: str) -> Dict[str, Any]:
-        """分析音频文件，提取听觉特征"""
+    def analyze_audio(
+        self,
+        audio_path: str,
+        streaming: Optional[bool] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """分析音频文件，提取听觉特征
+        
+        Args:
+            audio_path: 音频文件路径
+            streaming: 是否使用分块流式分析；None表示按音频时长自动选择
+            workers: 流式分析的分块并行进程数；None使用配置，1为进程内串行
+        """
+        
+        if streaming is None:
+            streaming = self._should_stream(audio_path)
+        if streaming:
+            return self.analyze_audio_streaming(audio_path, workers=workers)
         
         start_time = datetime.now()
         logger.info(f"🎵 开始音频分析: {audio_path}")
@@ -979,6 +1320,137 @@ class AudioAnalyzer:
             logger.error(f"⏱️ 失败前处理时间: {processing_time:.2f}秒")
             raise
     
+    def _should_stream(self, audio_path: str) -> bool:
+        """根据音频时长判断是否启用流式分析（soundfile无法读取的格式退回整体加载）"""
+        
+        try:
+            import soundfile as sf
+            info = sf.info(audio_path)
+            return info.duration >= self.streaming_min_duration
+        except Exception as e:
+            logger.debug(f"⚠️ 无法获取音频时长，使用整体加载模式: {e}")
+            return False
+    
+    def analyze_audio_streaming(self, audio_path: str, workers: Optional[int] = None) -> Dict[str, Any]:
+        """分块流式分析长音频
+        
+        使用soundfile.blocks按块读取，内存占用只与分块大小和并行度相关；
+        各分块在进程池中独立提取特征，再通过可合并统计量汇总。
+        workers 为分块并行进程数（None使用配置，1为进程内串行）。
+        """
+        
+        import soundfile as sf
+        
+        if workers is None:
+            workers = self.streaming_workers
+        
+        start_time = datetime.now()
+        logger.info(f"🎵 开始流式音频分析: {audio_path}")
+        
+        if not Path(audio_path).exists():
+            error_msg = f"音频文件不存在: {audio_path}"
+            logger.error(f"❌ {error_msg}")
+            raise FileNotFoundError(error_msg)
+        
+        file_size = Path(audio_path).stat().st_size
+        if file_size == 0:
+            error_msg = "音频文件为空"
+            logger.error(f"❌ {error_msg}")
+            raise Exception(error_msg)
+        
+        try:
+            info = sf.info(audio_path)
+            native_sr = info.samplerate
+            block_size = int(native_sr * self.streaming_block_seconds)
+            
+            logger.info(f"📊 音频信息: 原始采样率{native_sr}Hz, 时长{info.duration:.2f}秒, "
+                        f"分块{self.streaming_block_seconds}秒, 并行度{workers}")
+            
+            merged = _empty_audio_block_features()
+            blocks_count = 0
+            
+            # Celery prefork等守护进程中无法再创建子进程，退回进程内串行处理
+            use_pool = workers > 1 and not multiprocessing.current_process().daemon
+            executor = _spawn_process_pool(workers) if use_pool else None
+            
+            try:
+                # 限制在途分块数量，保证内存占用恒定
+                max_in_flight = workers * 2
+                pending = deque()
+                
+                for block in sf.blocks(audio_path, blocksize=block_size, dtype='float32', always_2d=True):
+                    if executor is None:
+                        _merge_audio_block_features(
+                            merged, _analyze_audio_block(block, native_sr, self.sample_rate)
+                        )
+                        blocks_count += 1
+                        continue
+                    
+                    pending.append(executor.submit(_analyze_audio_block, block, native_sr, self.sample_rate))
+                    if len(pending) >= max_in_flight:
+                        _merge_audio_block_features(merged, pending.popleft().result())
+                        blocks_count += 1
+                
+                while pending:
+                    _merge_audio_block_features(merged, pending.popleft().result())
+                    blocks_count += 1
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            
+            duration = merged['duration']
+            if duration == 0:
+                error_msg = "音频数据为空"
+                logger.error(f"❌ {error_msg}")
+                raise Exception(error_msg)
+            
+            pitch_stats = merged['pitch']
+            if pitch_stats.count == 0:
+                error_msg = "音高分析失败：未检测到有效的音高值"
+                logger.error(f"❌ {error_msg}")
+                raise Exception(error_msg)
+            
+            volume_stats = merged['volume_db']
+            centroid_stats = merged['spectral_centroid']
+            # 只按成功提取节拍的分块时长加权，静音/噪声分块不拉低语速
+            tempo_duration = merged['tempo_duration']
+            speech_rate = merged['tempo_weighted'] / tempo_duration * 0.6 if tempo_duration > 0 else 0.0  # 经验调整因子，与整体模式一致
+            clarity_score = 1.0 / (1.0 + centroid_stats.variance / 1000000)
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            
+            result = {
+                'speech_rate_bpm': float(speech_rate),
+                'pitch_mean': float(pitch_stats.mean),
+                'pitch_variance': float(pitch_stats.variance),
+                'pitch_range': float(pitch_stats.range),
+                'pitch_median': merged['pitch_histogram'].quantile(0.5),
+                'volume_mean': float(volume_stats.mean),
+                'volume_variance': float(volume_stats.variance),
+                'clarity_score': float(clarity_score),
+                'audio_duration': duration,
+                'processing_stats': {
+                    'processing_time_seconds': processing_time,
+                    'sample_rate': self.sample_rate,
+                    'samples_count': merged['samples'],
+                    'file_size_bytes': file_size,
+                    'mode': 'streaming',
+                    'blocks_count': blocks_count,
+                    'block_seconds': self.streaming_block_seconds,
+                    'workers': workers if use_pool else 1
+                }
+            }
+            
+            logger.info(f"✅ 流式音频分析完成: {blocks_count}个分块 (耗时: {processing_time:.2f}秒)")
+            return result
+            
+        except Exception as e:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            logger.error(f"❌ 流式音频分析失败: {str(e)}")
+            logger.error(f"🔧 错误详情: {traceback.format_exc()}")
+            logger.error(f"⏱️ 失败前处理时间: {processing_time:.2f}秒")
+            raise
+    
     def _analyze_speech_rate(self, y: np.ndarray, sr: int) -> float:
         """分析语速"""
         
@@ -1081,6 +1553,214 @@ class AudioAnalyzer:
             raise
 
 
+# 进程池中每个子进程复用一个VideoAnalyzer，避免每个分段重复构建MediaPipe图
+_segment_worker_analyzer = None
+
+
+def _analyze_video_segment_worker(
+    video_path: str,
+    start_frame: int,
+    end_frame: Optional[int],
+    stride: int,
+    fps: float,
+    total_frames: int
+) -> Dict[str, Any]:
+    """在子进程中分析一个视频分段（必须位于模块顶层以便pickle）"""
+    global _segment_worker_analyzer
+    
+    if _segment_worker_analyzer is None:
+        _segment_worker_analyzer = VideoAnalyzer()
+    return _segment_worker_analyzer._analyze_video_segment(
+        video_path, start_frame, end_frame, stride, fps, total_frames
+    )
+
+
+def _empty_audio_block_features() -> Dict[str, Any]:
+    """创建空的分块特征累加器"""
+    return {
+        'duration': 0.0,
+        'samples': 0,
+        'tempo_weighted': 0.0,
+        'tempo_duration': 0.0,  # 成功提取节拍速度的分块时长，作为语速加权平均的分母
+        'pitch': RunningStats(),
+        'pitch_histogram': StreamingHistogram(
+            librosa.note_to_hz('C2'), librosa.note_to_hz('C7'), bins=128
+        ),
+        'volume_db': RunningStats(),
+        'spectral_centroid': RunningStats()
+    }
+
+
+def _merge_audio_block_features(target: Dict[str, Any], block: Dict[str, Any]) -> Dict[str, Any]:
+    """将单个分块的特征合并到累加器"""
+    target['duration'] += block['duration']
+    target['samples'] += block['samples']
+    target['tempo_weighted'] += block['tempo_weighted']
+    target['tempo_duration'] += block['tempo_duration']
+    for key in ('pitch', 'pitch_histogram', 'volume_db', 'spectral_centroid'):
+        target[key].merge(block[key])
+    return target
+
+
+def _analyze_audio_block(block: np.ndarray, native_sr: int, target_sr: int) -> Dict[str, Any]:
+    """提取单个音频分块的可合并特征（在进程池中执行，必须位于模块顶层）"""
+    
+    features = _empty_audio_block_features()
+    
+    y = block.mean(axis=1) if block.ndim > 1 else block
+    if native_sr != target_sr:
+        y = librosa.resample(y, orig_sr=native_sr, target_sr=target_sr)
+    
+    if len(y) == 0:
+        return features
+    
+    duration = len(y) / target_sr
+    features['duration'] = duration
+    features['samples'] = len(y)
+    
+    # 语速：按分块时长加权合并节拍速度
+    try:
+        tempo, _ = librosa.beat.beat_track(y=y, sr=target_sr)
+        features['tempo_weighted'] = float(np.atleast_1d(tempo)[0]) * duration
+        features['tempo_duration'] = duration
+    except Exception as e:
+        logger.debug(f"⚠️ 分块节拍追踪失败: {e}")
+    
+    # 音高
+    f0, voiced_flag, _ = librosa.pyin(
+        y, fmin=librosa.note_to_hz('C2'), fmax=librosa.note_to_hz('C7'), sr=target_sr
+    )
+    valid_f0 = f0[voiced_flag]
+    features['pitch'].update(valid_f0)
+    features['pitch_histogram'].update(valid_f0)
+    
+    # 音量
+    rms = librosa.feature.rms(y=y)[0]
+    features['volume_db'].update(librosa.amplitude_to_db(rms))
+    
+    # 清晰度（频谱质心）
+    features['spectral_centroid'].update(librosa.feature.spectral_centroid(y=y, sr=target_sr)[0])
+    
+    return features
+
+
+# 模态进程池中每个子进程复用的分析器
+_modality_worker_analyzers: Dict[str, Any] = {}
+
+
+def _analyze_modality_worker(modality: str, path: str) -> Dict[str, Any]:
+    """在模态进程池的子进程中执行视频或音频分析（必须位于模块顶层以便pickle）
+    
+    只保留一层进程池：子进程内视频分段和长音频分块都在进程内顺序分析，不再创建分段/分块进程池，
+    超时终止子进程时也不会留下孤儿进程。
+    """
+    analyzer = _modality_worker_analyzers.get(modality)
+    if analyzer is None:
+        analyzer = VideoAnalyzer() if modality == 'video' else AudioAnalyzer()
+        _modality_worker_analyzers[modality] = analyzer
+    
+    if modality == 'video':
+        return analyzer.analyze_video(path, workers=1)
+    return analyzer.analyze_audio(path, workers=1)
+
+
+def _pool_size(configured: int) -> int:
+    """进程池大小不超过CPU核数"""
+    return max(1, min(int(configured), os.cpu_count() or 1))
+
+
+def _spawn_process_pool(max_workers: int, initializer=None, initargs=()) -> ProcessPoolExecutor:
+    """创建spawn启动的进程池
+    
+    调用方（uvicorn API、threads池Celery worker、分析节点线程池）都是多线程进程，
+    fork可能继承被其他线程持有的锁而死锁；各子进程函数位于模块顶层，可被pickle。
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs
+    )
+
+
+_segment_executor = None
+_segment_executor_pid = None
+_segment_executor_lock = threading.Lock()
+
+
+def _get_segment_executor() -> ProcessPoolExecutor:
+    """获取当前进程共享的视频分段进程池"""
+    global _segment_executor, _segment_executor_pid
+    
+    with _segment_executor_lock:
+        if _segment_executor is None or _segment_executor_pid != os.getpid():
+            _segment_executor = _spawn_process_pool(
+                _pool_size(getattr(model_config, 'VIDEO_ANALYSIS_WORKERS', 1))
+            )
+            _segment_executor_pid = os.getpid()
+        return _segment_executor
+
+
+_modality_executor = None
+_modality_executor_pid = None
+_modality_worker_pids = None  # 模态子进程启动时登记的pid，超时丢弃进程池时据此终止子进程
+_modality_executor_lock = threading.Lock()
+
+
+def _register_modality_worker(pid_queue):
+    """模态子进程初始化：登记自身pid"""
+    pid_queue.put(os.getpid())
+
+
+def modality_processes_available() -> bool:
+    """模态分析能否在独立进程中执行（配置开启且不在守护进程中）"""
+    return (getattr(model_config, 'MULTIMODAL_USE_PROCESSES', True)
+            and not multiprocessing.current_process().daemon)
+
+
+def _get_modality_executor() -> Optional[ProcessPoolExecutor]:
+    """获取当前进程共享的模态进程池；守护进程（如Celery prefork子进程）无法创建子进程，返回None"""
+    global _modality_executor, _modality_executor_pid, _modality_worker_pids
+    
+    if multiprocessing.current_process().daemon:
+        return None
+    
+    with _modality_executor_lock:
+        if _modality_executor is None or _modality_executor_pid != os.getpid():
+            _modality_worker_pids = multiprocessing.get_context("spawn").SimpleQueue()
+            _modality_executor = _spawn_process_pool(
+                _pool_size(getattr(model_config, 'MULTIMODAL_PROCESS_WORKERS', 2)),
+                initializer=_register_modality_worker,
+                initargs=(_modality_worker_pids,)
+            )
+            _modality_executor_pid = os.getpid()
+        return _modality_executor
+
+
+def _discard_modality_executor():
+    """丢弃模态进程池并终止仍在运行的子进程（模态超时后调用，下次使用时重建）"""
+    global _modality_executor, _modality_worker_pids
+    
+    with _modality_executor_lock:
+        executor, _modality_executor = _modality_executor, None
+        pid_queue, _modality_worker_pids = _modality_worker_pids, None
+    if executor is None:
+        return
+    
+    executor.shutdown(wait=False, cancel_futures=True)
+    pids = []
+    while pid_queue is not None and not pid_queue.empty():
+        pids.append(pid_queue.get())
+    terminated = 0
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            terminated += 1
+        except (ProcessLookupError, PermissionError):
+            pass
+    logger.warning(f"⚠️ 已终止模态进程池中的 {terminated} 个子进程")
+
+
 class MultimodalAnalyzer:
     """多模态分析器 - 整合视觉和听觉分析"""
     
@@ -1091,9 +1771,17 @@ class MultimodalAnalyzer:
     def analyze_interview_media(
         self, 
         video_path: Optional[str] = None, 
-        audio_path: Optional[str] = None
+        audio_path: Optional[str] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        use_processes: Optional[bool] = None
     ) -> Dict[str, Any]:
-        """分析面试的音视频数据"""
+        """分析面试的音视频数据
+        
+        视频和音频并发分析：默认在独立进程中执行（use_processes=False 或守护进程中使用线程），
+        timeouts 可按模态指定超时秒数 {'video': ..., 'audio': ...}；
+        某个模态失败或超时时保留其余模态的结果。
+        """
+        timeouts = timeouts or {}
         
         start_time = datetime.now()
         logger.info("🚀 开始多模态面试分析")
@@ -1122,38 +1810,66 @@ class MultimodalAnalyzer:
             logger.error(f"❌ {error_msg}")
             result['processing_summary']['errors'].append(error_msg)
         
-        # 视觉分析
+        # 视觉和听觉分析并发执行，总耗时接近较慢的模态而非两者之和
+        tasks = []
         if video_path:
-            logger.info("=" * 50)
-            logger.info("🎥 开始视觉分析部分")
-            
+            tasks.append(('video', video_path, 'visual_analysis', 'video_success', '视频',
+                          timeouts.get('video', getattr(model_config, 'MULTIMODAL_VIDEO_TIMEOUT', 900))))
+        if audio_path:
+            tasks.append(('audio', audio_path, 'audio_analysis', 'audio_success', '音频',
+                          timeouts.get('audio', getattr(model_config, 'MULTIMODAL_AUDIO_TIMEOUT', 600))))
+        
+        if use_processes is None:
+            use_processes = getattr(model_config, 'MULTIMODAL_USE_PROCESSES', True)
+        process_executor = _get_modality_executor() if use_processes else None
+        thread_executor = None
+        if process_executor is not None:
+            executor, mode = process_executor, 'process'
+        else:
+            thread_executor = ThreadPoolExecutor(max_workers=max(1, len(tasks)), thread_name_prefix="modality")
+            executor, mode = thread_executor, 'thread'
+        result['processing_summary']['execution_mode'] = mode
+        result['processing_summary']['timed_out'] = []
+        logger.info(f"⚡ 并发执行 {len(tasks)} 个模态分析 (模式: {mode})")
+        
+        futures = []
+        for modality, path, _, _, _, _ in tasks:
+            if mode == 'process':
+                futures.append(executor.submit(_analyze_modality_worker, modality, path))
+            elif modality == 'video':
+                futures.append(executor.submit(self.video_analyzer.analyze_video, path))
+            else:
+                futures.append(executor.submit(self.audio_analyzer.analyze_audio, path))
+        
+        timed_out = False
+        for future, (modality, _, result_key, success_key, label, timeout) in zip(futures, tasks):
+            # 各模态同时开始，超时从整体开始时间计算
+            remaining = max(0.0, timeout - (datetime.now() - start_time).total_seconds())
             try:
-                result['visual_analysis'] = self.video_analyzer.analyze_video(video_path)
-                result['processing_summary']['video_success'] = True
-                logger.info("✅ 视频分析部分完成")
-            except Exception as e:
-                error_msg = f"视频分析失败: {str(e)}"
+                result[result_key] = future.result(timeout=remaining)
+                result['processing_summary'][success_key] = True
+                logger.info(f"✅ {label}分析部分完成")
+            except FutureTimeoutError:
+                timed_out = True
+                future.cancel()
+                error_msg = f"{label}分析超时 (>{timeout}秒)"
                 logger.error(f"❌ {error_msg}")
-                logger.error(f"🔧 错误详情: {traceback.format_exc()}")
                 result['processing_summary']['errors'].append(error_msg)
-                # 不再提供备用结果，直接记录错误
-        
-        # 听觉分析
-        if audio_path:
-            logger.info("=" * 50)
-            logger.info("🎵 开始听觉分析部分")
-            
-            try:
-                result['audio_analysis'] = self.audio_analyzer.analyze_audio(audio_path)
-                result['processing_summary']['audio_success'] = True
-                logger.info("✅ 音频分析部分完成")
+                result['processing_summary']['timed_out'].append(modality)
             except Exception as e:
-                error_msg = f"音频分析失败: {str(e)}"
+                error_msg = f"{label}分析失败: {str(e)}"
                 logger.error(f"❌ {error_msg}")
                 logger.error(f"🔧 错误详情: {traceback.format_exc()}")
                 result['processing_summary']['errors'].append(error_msg)
                 # 不再提供备用结果，直接记录错误
         
+        if timed_out and mode == 'process':
+            # 超时的子进程无法单独取消，终止整个模态进程池
+            _discard_modality_executor()
+        if thread_executor is not None:
+            # 线程无法强制终止，超时的模态在后台自然结束
+            thread_executor.shutdown(wait=False)
+        
         # 分析总结
         total_processing_time = (datetime.now() - start_time).total_seconds()
         result['processing_summary']['total_time_seconds'] = total_processing_time
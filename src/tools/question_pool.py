@@ -0,0 +1,231 @@
+"""
+热门题目池
+统计 (难度, 技能, 题型) 组合的请求频率，为最热门的组合在ChromaDB中预先生成一批经过校验的题目；
+/questions/generate 命中题目池时直接返回，不再等待向量检索 + 大模型生成。
+题目池在低峰时段由后台任务补充到目标数量，多个API进程通过Redis锁保证同一时间只有一个进程补充。
+Redis不可用时进程间无法互斥，默认不执行后台补充；单进程部署可开启 QUESTION_POOL_LOCAL_REFILL。
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import database_config, model_config
+except ImportError:
+    database_config = None
+    model_config = None
+
+
+def question_pool_key(difficulty_level: int, skills: Iterable[str], question_types: Iterable[str]) -> str:
+    """题目池键：难度 + 排序后的技能 + 排序后的题型"""
+    normalized_skills = sorted({skill.strip().lower() for skill in skills if skill and skill.strip()})
+    base = f"{difficulty_level}|{','.join(normalized_skills)}|{','.join(sorted(set(question_types)))}"
+    return f"pool_{hashlib.md5(base.encode('utf-8')).hexdigest()[:16]}"
+
+
+class QuestionPoolManager:
+    """题目池需求统计与补充调度 - Redis优先，进程内降级"""
+
+    DEMAND_KEY = "question_pool:demand"
+    SPEC_KEY = "question_pool:specs"
+    DECAY_KEY = "question_pool:last_decay"
+    REFILL_LOCK_KEY = "question_pool:refill_lock"
+
+    def __init__(
+        self,
+        top_n: int = 20,
+        target_size: int = 30,
+        low_watermark: int = 10,
+        refill_hours: Tuple[int, int] = (1, 6),
+        demand_half_life_hours: float = 24 * 7,
+        enabled: bool = True,
+        allow_local_refill: bool = False
+    ):
+        self.top_n = top_n
+        self.target_size = target_size
+        self.low_watermark = low_watermark
+        self.refill_hours = refill_hours
+        self.demand_half_life_hours = demand_half_life_hours
+        self.enabled = enabled
+        self.allow_local_refill = allow_local_refill
+        self.redis_client = None
+        self._lock = threading.Lock()
+        self._demand: Counter = Counter()
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._last_decay = time.time()
+        self.stats = {'requests': 0, 'pool_hits': 0, 'pool_misses': 0, 'refilled_questions': 0, 'refill_runs': 0}
+
+        if enabled:
+            self._init_redis()
+
+    def _init_redis(self):
+        try:
+            import redis
+            client = redis.Redis(
+                host=getattr(database_config, 'redis_host', 'localhost'),
+                port=getattr(database_config, 'redis_port', 6379),
+                db=getattr(database_config, 'redis_db', 0),
+                decode_responses=True
+            )
+            client.ping()
+            self.redis_client = client
+        except Exception as e:
+            logger.warning(f"⚠️ 题目池需求统计连接Redis失败，使用进程内统计: {e}")
+            self.redis_client = None
+
+    # ==================== 需求统计 ====================
+
+    def record_request(self, key: str, spec: Dict[str, Any]):
+        """记录一次组合请求"""
+        self.stats['requests'] += 1
+        try:
+            if self.redis_client is not None:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.zincrby(self.DEMAND_KEY, 1, key)
+                pipe.hset(self.SPEC_KEY, key, json.dumps(spec, ensure_ascii=False))
+                pipe.execute()
+            else:
+                with self._lock:
+                    self._demand[key] += 1
+                    self._specs[key] = spec
+        except Exception as e:
+            logger.debug(f"⚠️ 记录题目池需求失败: {e}")
+
+    def record_served(self, hit: bool):
+        self.stats['pool_hits' if hit else 'pool_misses'] += 1
+
+    def hot_combos(self) -> List[Tuple[str, Dict[str, Any], float]]:
+        """请求频率最高的 top_n 个组合"""
+        if self.redis_client is not None:
+            ranked = self.redis_client.zrevrange(self.DEMAND_KEY, 0, self.top_n - 1, withscores=True)
+            specs = self.redis_client.hmget(self.SPEC_KEY, [key for key, _ in ranked]) if ranked else []
+            return [
+                (key, json.loads(spec), score)
+                for (key, score), spec in zip(ranked, specs) if spec
+            ]
+        with self._lock:
+            return [(key, self._specs[key], score) for key, score in self._demand.most_common(self.top_n)]
+
+    def decay_demand(self):
+        """需求计数按半衰期衰减，过时的热门组合逐渐退出"""
+        now = time.time()
+        half_life = self.demand_half_life_hours * 3600
+        if self.redis_client is not None:
+            last = float(self.redis_client.get(self.DECAY_KEY) or now)
+            factor = 0.5 ** ((now - last) / half_life)
+            if factor < 0.99:
+                self.redis_client.zunionstore(self.DEMAND_KEY, {self.DEMAND_KEY: factor})
+                self.redis_client.zremrangebyscore(self.DEMAND_KEY, 0, 0.5)
+                self.redis_client.set(self.DECAY_KEY, now)
+            elif last == now:
+                self.redis_client.set(self.DECAY_KEY, now)
+            return
+        with self._lock:
+            factor = 0.5 ** ((now - self._last_decay) / half_life)
+            if factor < 0.99:
+                self._demand = Counter({k: v * factor for k, v in self._demand.items() if v * factor > 0.5})
+                self._last_decay = now
+
+    # ==================== 补充调度 ====================
+
+    def in_refill_window(self, now: Optional[datetime] = None) -> bool:
+        """是否处于低峰补充时段（支持跨零点，如 (23, 5)）"""
+        start, end = self.refill_hours
+        hour = (now or datetime.now()).hour
+        return start <= hour < end if start <= end else hour >= start or hour < end
+
+    def acquire_refill_lock(self, ttl_seconds: int) -> bool:
+        """多个API进程中只有一个执行本轮补充
+
+        补充锁需要Redis；进程内统计时每个进程都会拿到锁并同时补充，只在允许本地补充（单进程部署）时执行。
+        """
+        if self.redis_client is None:
+            if not self.allow_local_refill:
+                logger.warning("⚠️ 题目池补充需要Redis锁，Redis不可用时跳过本轮补充")
+            return self.allow_local_refill
+        try:
+            return bool(self.redis_client.set(self.REFILL_LOCK_KEY, str(time.time()), nx=True, ex=ttl_seconds))
+        except Exception:
+            return False
+
+    async def refill(
+        self,
+        count_pool: Callable[[str], int],
+        generate_into_pool: Callable[[str, Dict[str, Any], int], Awaitable[int]]
+    ) -> Dict[str, int]:
+        """把热门组合中低于水位线的题目池补充到目标数量"""
+        self.decay_demand()
+        refilled: Dict[str, int] = {}
+        for key, spec, _score in self.hot_combos():
+            size = await asyncio.to_thread(count_pool, key)
+            if size >= self.low_watermark:
+                continue
+            try:
+                added = await generate_into_pool(key, spec, self.target_size - size)
+            except Exception as e:
+                logger.warning(f"⚠️ 题目池补充失败: {key} ({e})")
+                continue
+            refilled[key] = added
+            self.stats['refilled_questions'] += added
+            logger.info(f"🧺 题目池已补充: {key} {size} -> {size + added}")
+        self.stats['refill_runs'] += 1
+        return refilled
+
+    async def run_refill_loop(
+        self,
+        count_pool: Callable[[str], int],
+        generate_into_pool: Callable[[str, Dict[str, Any], int], Awaitable[int]],
+        interval_seconds: int = 600
+    ):
+        """后台补充循环：只在低峰时段、且抢到Redis锁时执行"""
+        while True:
+            try:
+                if self.in_refill_window() and self.acquire_refill_lock(interval_seconds):
+                    await self.refill(count_pool, generate_into_pool)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ 题目池补充任务异常: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['pool_hits'] + self.stats['pool_misses']
+        return {
+            **self.stats,
+            'hit_rate': round(self.stats['pool_hits'] / lookups, 4) if lookups else 0.0,
+            'backend': 'redis' if self.redis_client is not None else 'memory',
+            'refill_window': list(self.refill_hours)
+        }
+
+
+# 全局题目池管理器
+_question_pool = None
+_question_pool_lock = threading.Lock()
+
+
+def get_question_pool() -> QuestionPoolManager:
+    """获取全局题目池管理器实例"""
+    global _question_pool
+
+    if _question_pool is None:
+        with _question_pool_lock:
+            if _question_pool is None:
+                _question_pool = QuestionPoolManager(
+                    top_n=getattr(model_config, 'QUESTION_POOL_TOP_N', 20),
+                    target_size=getattr(model_config, 'QUESTION_POOL_TARGET_SIZE', 30),
+                    low_watermark=getattr(model_config, 'QUESTION_POOL_LOW_WATERMARK', 10),
+                    refill_hours=getattr(model_config, 'QUESTION_POOL_REFILL_HOURS', (1, 6)),
+                    demand_half_life_hours=getattr(model_config, 'QUESTION_POOL_DEMAND_HALF_LIFE_HOURS', 24 * 7),
+                    enabled=getattr(model_config, 'QUESTION_POOL_ENABLED', True),
+                    allow_local_refill=getattr(model_config, 'QUESTION_POOL_LOCAL_REFILL', False)
+                )
+
+    return _question_pool
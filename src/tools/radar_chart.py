@@ -0,0 +1,273 @@
+"""
+能力雷达图渲染
+- PNG：每个工作进程只构建一次极坐标图模板（网格、刻度、标签、字体），渲染时只更新数据多边形
+- SVG：纯字符串拼接，不依赖matplotlib，体积小、可直接内嵌到前端
+- 渲染在进程池中执行（守护进程中改用单线程），结果按分数向量哈希缓存到磁盘，相同分数不重复渲染
+"""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import model_config
+except ImportError:
+    model_config = None
+
+# 雷达图维度（评估键, 显示名称），顺序即绘制顺序
+RADAR_DIMENSIONS: List[Tuple[str, str]] = [
+    ("professional_knowledge", "专业知识"),
+    ("skill_match", "技能匹配"),
+    ("communication_ability", "语言表达"),
+    ("logical_thinking", "逻辑思维"),
+    ("stress_resilience", "抗压能力"),
+]
+RADAR_TITLE = "面试能力评估雷达图"
+RADAR_COLOR = "#1f77b4"
+MAX_SCORE = 10
+
+
+def radar_scores(assessment: Dict[str, Any]) -> List[float]:
+    """从综合评估中按维度顺序取分数（缺失时为5分），限制在0-10"""
+    scores = []
+    for key, _ in RADAR_DIMENSIONS:
+        data = assessment.get(key, {})
+        score = data.get("score", 5) if isinstance(data, dict) else 5
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            score = 5.0
+        scores.append(min(max(score, 0.0), float(MAX_SCORE)))
+    return scores
+
+
+def scores_hash(scores: Sequence[float], fmt: str, dpi: int = 150, size_inches: float = 6) -> str:
+    """分数向量 + 输出格式 + 渲染参数 的哈希，作为缓存键"""
+    payload = json.dumps({
+        "scores": [round(score, 2) for score in scores],
+        "format": fmt,
+        "dpi": dpi if fmt == "png" else None,
+        "size": size_inches if fmt == "png" else None,
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+# ==================== SVG ====================
+
+def render_radar_svg(scores: Sequence[float], size: int = 480) -> str:
+    """生成雷达图SVG文本"""
+    count = len(RADAR_DIMENSIONS)
+    center = size / 2
+    radius = size * 0.32
+    title_offset = 36
+
+    def point(index: int, value: float) -> Tuple[float, float]:
+        # 第一个维度在正上方，顺时针排列
+        angle = -math.pi / 2 + 2 * math.pi * index / count
+        r = radius * value / MAX_SCORE
+        return center + r * math.cos(angle), center + title_offset / 2 + r * math.sin(angle)
+
+    def polygon(values: Sequence[float]) -> str:
+        return " ".join(f"{x:.1f},{y:.1f}" for x, y in (point(i, v) for i, v in enumerate(values)))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size + title_offset}" '
+        f'viewBox="0 0 {size} {size + title_offset}" font-family="SimHei, Microsoft YaHei, sans-serif">',
+        f'<rect width="100%" height="100%" fill="white"/>',
+        f'<text x="{center}" y="{title_offset - 8}" text-anchor="middle" font-size="18" font-weight="bold">{RADAR_TITLE}</text>',
+    ]
+    for level in (2, 4, 6, 8, 10):
+        parts.append(f'<polygon points="{polygon([level] * count)}" fill="none" stroke="#ccc" stroke-width="1"/>')
+    for i, (_, label) in enumerate(RADAR_DIMENSIONS):
+        x, y = point(i, MAX_SCORE)
+        parts.append(f'<line x1="{center}" y1="{center + title_offset / 2}" x2="{x:.1f}" y2="{y:.1f}" stroke="#ccc" stroke-width="1"/>')
+        lx, ly = point(i, MAX_SCORE * 1.18)
+        parts.append(f'<text x="{lx:.1f}" y="{ly:.1f}" text-anchor="middle" dominant-baseline="middle" font-size="14">{label}</text>')
+    parts.append(
+        f'<polygon points="{polygon(scores)}" fill="{RADAR_COLOR}" fill-opacity="0.25" '
+        f'stroke="{RADAR_COLOR}" stroke-width="2"/>'
+    )
+    for i, score in enumerate(scores):
+        x, y = point(i, score)
+        parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{RADAR_COLOR}"><title>{score:g}</title></circle>')
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+# ==================== PNG（模板复用） ====================
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def _build_template(size_inches: float):
+    """构建极坐标图模板：只创建一次，之后每次渲染只更新数据多边形"""
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib import rcParams
+
+    rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
+    rcParams['axes.unicode_minus'] = False
+
+    labels = [label for _, label in RADAR_DIMENSIONS]
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+    closed_angles = angles + angles[:1]
+
+    fig = Figure(figsize=(size_inches, size_inches), facecolor="white")
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, projection="polar")
+    fig.subplots_adjust(left=0.12, right=0.88, bottom=0.08, top=0.85)
+
+    line, = ax.plot(closed_angles, [0] * len(closed_angles), "o-", linewidth=2, color=RADAR_COLOR)
+    fill, = ax.fill(closed_angles, [0] * len(closed_angles), alpha=0.25, color=RADAR_COLOR)
+
+    ax.set_xticks(angles)
+    ax.set_xticklabels(labels, fontsize=12)
+    ax.set_ylim(0, MAX_SCORE)
+    ax.set_yticks([2, 4, 6, 8, 10])
+    ax.set_yticklabels(["2", "4", "6", "8", "10"], fontsize=10)
+    ax.grid(True)
+    fig.suptitle(RADAR_TITLE, fontsize=16, fontweight="bold")
+
+    return {"fig": fig, "line": line, "fill": fill, "angles": closed_angles, "np": np}
+
+
+def render_radar_png(scores: Sequence[float], dpi: int = 150, size_inches: float = 6) -> bytes:
+    """用模板渲染PNG字节（进程内模板加锁复用）"""
+    global _template
+
+    with _template_lock:
+        if _template is None:
+            _template = _build_template(size_inches)
+        template = _template
+        values = list(scores) + list(scores[:1])
+        template["line"].set_data(template["angles"], values)
+        template["fill"].set_xy(template["np"].column_stack([template["angles"], values]))
+        buffer = io.BytesIO()
+        template["fig"].savefig(buffer, format="png", dpi=dpi, facecolor="white")
+        return buffer.getvalue()
+
+
+def _render_to_file(scores: List[float], fmt: str, path: str, dpi: int, size_inches: float) -> str:
+    """工作进程入口：渲染并原子写入缓存文件"""
+    if fmt == "svg":
+        content = render_radar_svg(scores).encode("utf-8")
+    else:
+        content = render_radar_png(scores, dpi=dpi, size_inches=size_inches)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+
+class RadarChartRenderer:
+    """雷达图渲染器 - 进程池渲染 + 分数哈希磁盘缓存"""
+
+    MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+    def __init__(self, cache_dir: str = "./data/cache/radar_charts", workers: int = 1,
+                 dpi: int = 150, size_inches: float = 6):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.dpi = dpi
+        self.size_inches = size_inches
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._pending_lock = threading.Lock()
+        self.stats = {"cache_hits": 0, "rendered": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_executor(self) -> Executor:
+        """进程池；守护进程（如Celery prefork子进程）无法创建子进程，改用单线程。
+        API进程和threads池worker都是多线程进程，fork可能继承被其他线程持有的锁而死锁，进程池使用spawn启动"""
+        with self._executor_lock:
+            if self._executor is None:
+                if multiprocessing.current_process().daemon:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="radar-chart")
+                else:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+            return self._executor
+
+    def chart_path(self, scores: Sequence[float], fmt: str = "png") -> str:
+        return os.path.join(self.cache_dir, f"radar_{scores_hash(scores, fmt, self.dpi, self.size_inches)}.{fmt}")
+
+    def submit(self, scores: Sequence[float], fmt: str = "png") -> Future:
+        """提交渲染任务；缓存命中或相同分数正在渲染时直接复用"""
+        if fmt not in self.MEDIA_TYPES:
+            raise ValueError(f"不支持的雷达图格式: {fmt}")
+        scores = [float(score) for score in scores]
+        path = self.chart_path(scores, fmt)
+        if os.path.exists(path):
+            self.stats["cache_hits"] += 1
+            future: Future = Future()
+            future.set_result(path)
+            return future
+
+        with self._pending_lock:
+            future = self._pending.get(path)
+            if future is not None:
+                return future
+            if fmt == "svg":
+                # SVG只是字符串拼接，直接在当前线程生成
+                future = Future()
+                future.set_result(_render_to_file(scores, fmt, path, self.dpi, self.size_inches))
+            else:
+                future = self._get_executor().submit(
+                    _render_to_file, scores, fmt, path, self.dpi, self.size_inches
+                )
+                self._pending[path] = future
+                future.add_done_callback(lambda _: self._discard_pending(path))
+            self.stats["rendered"] += 1
+            return future
+
+    def _discard_pending(self, path: str):
+        with self._pending_lock:
+            self._pending.pop(path, None)
+
+    def render(self, scores: Sequence[float], fmt: str = "png", timeout: Optional[float] = 30) -> str:
+        """同步渲染，返回缓存文件路径"""
+        return self.submit(scores, fmt).result(timeout=timeout)
+
+    async def arender(self, scores: Sequence[float], fmt: str = "png") -> str:
+        """异步渲染，不阻塞事件循环"""
+        return await asyncio.wrap_future(self.submit(scores, fmt))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "pending": len(self._pending)}
+
+
+# 全局雷达图渲染器
+_radar_renderer = None
+_radar_renderer_lock = threading.Lock()
+
+
+def get_radar_renderer() -> RadarChartRenderer:
+    """获取全局雷达图渲染器实例"""
+    global _radar_renderer
+
+    if _radar_renderer is None:
+        with _radar_renderer_lock:
+            if _radar_renderer is None:
+                _radar_renderer = RadarChartRenderer(
+                    cache_dir=getattr(model_config, 'RADAR_CHART_CACHE_DIR', "./data/cache/radar_charts"),
+                    workers=getattr(model_config, 'RADAR_CHART_WORKERS', 1),
+                    dpi=getattr(model_config, 'RADAR_CHART_DPI', 150),
+                    size_inches=getattr(model_config, 'RADAR_CHART_SIZE_INCHES', 6)
+                )
+
+    return _radar_renderer
@@ -0,0 +1,388 @@
+"""
+面试报告 Map-Reduce 生成
+- Map：按"面试官提问 + 候选人回答"切分对话片段，每个片段单独调用LLM评估（六项能力评分、亮点、不足、摘要）；
+  面试进行中每轮回答提交后即在后台评估，报告生成时只需等待尚未完成的片段
+- Reduce：数值评分由片段评估直接聚合，LLM只根据聚合结果和有限条片段摘要撰写文字部分，
+  提示词长度与面试轮数无关，长面试不再超出token限制
+片段评估按提示词内容寻址缓存（LLMResponseCache），跨进程/重复生成报告时直接命中
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from .llm_cache import DETERMINISTIC_TEMPERATURE, get_llm_cache
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import model_config
+except ImportError:
+    model_config = None
+
+# 报告中的六项核心能力（键与前端报告页一致）
+COMPETENCY_KEYS = [
+    "professional_knowledge",
+    "skill_matching",
+    "language_expression",
+    "logical_thinking",
+    "innovation_ability",
+    "stress_resistance",
+]
+NEUTRAL_SCORE = 70  # 整场面试都未体现某项能力时的中性评分
+
+
+@dataclass
+class ConversationSegment:
+    """一个问答片段：面试官提问 + 候选人回答"""
+    index: int
+    question: str
+    answer: str
+
+    @property
+    def segment_id(self) -> str:
+        return hashlib.sha1(f"{self.question}\n{self.answer}".encode("utf-8")).hexdigest()[:16]
+
+
+def split_conversation_segments(messages: List[Any]) -> List[ConversationSegment]:
+    """按面试官消息切分对话；没有回答的提问（如最后一条结束语）不计入"""
+    segments: List[ConversationSegment] = []
+    question, answers = "", []
+
+    def flush():
+        if answers:
+            segments.append(ConversationSegment(len(segments), question, "\n".join(answers)))
+
+    for message in messages:
+        if isinstance(message, AIMessage):
+            flush()
+            question, answers = message.content, []
+        elif isinstance(message, HumanMessage):
+            answers.append(message.content)
+    flush()
+    return segments
+
+
+def _contains_json_object(text: str) -> bool:
+    """响应中包含可解析的JSON对象时才写入缓存"""
+    json_match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not json_match:
+        return False
+    try:
+        json.loads(json_match.group())
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def _parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    json_match = re.search(r'\{.*\}', text or "", re.DOTALL)
+    if not json_match:
+        return None
+    try:
+        parsed = json.loads(json_match.group())
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _clamp_score(value: Any) -> Optional[int]:
+    try:
+        return int(min(max(float(value), 0), 100))
+    except (TypeError, ValueError):
+        return None
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def level_by_score(score: float) -> str:
+    """根据分数获取等级"""
+    if score >= 90:
+        return "优秀"
+    elif score >= 80:
+        return "良好"
+    elif score >= 70:
+        return "中等"
+    else:
+        return "待提升"
+
+
+def grade_by_score(score: float) -> str:
+    return "A" if score >= 90 else "B" if score >= 80 else "C" if score >= 70 else "D"
+
+
+class ReportMapReducer:
+    """面试报告 Map-Reduce 生成器"""
+
+    def __init__(self, model, concurrency: int = 4, segment_max_chars: int = 1500,
+                 reduce_max_segments: int = 12, max_tracked_segments: int = 2048):
+        self.model = model
+        self.concurrency = concurrency
+        self.segment_max_chars = segment_max_chars
+        self.reduce_max_segments = reduce_max_segments
+        self.max_tracked_segments = max_tracked_segments
+        # 已提交/已完成的片段评估任务（按片段ID去重，后台预评估与报告生成共享）
+        self._tasks: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        """任务和信号量属于创建它们的事件循环；换了循环（如Celery中每次asyncio.run）时重新创建"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._tasks.clear()
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    # ==================== Map ====================
+
+    def _build_segment_prompt(self, segment: ConversationSegment, user_name: str, target_position: str) -> str:
+        return f"""你是一名资深面试官，请只根据下面这一轮问答评估候选人{user_name}（应聘{target_position}）。
+
+面试官提问：
+{_truncate(segment.question, self.segment_max_chars)}
+
+候选人回答：
+{_truncate(segment.answer, self.segment_max_chars)}
+
+请只返回JSON，不要添加解释文字。评分为0-100的整数；本轮问答中没有体现的能力填 null：
+{{
+    "scores": {{
+        "professional_knowledge": 专业知识评分,
+        "skill_matching": 技能匹配度评分,
+        "language_expression": 语言表达评分,
+        "logical_thinking": 逻辑思维评分,
+        "innovation_ability": 创新能力评分,
+        "stress_resistance": 应变抗压评分
+    }},
+    "strengths": ["本轮体现的亮点（短语）"],
+    "weaknesses": ["本轮暴露的不足（短语）"],
+    "summary": "一句话概括本轮回答表现"
+}}"""
+
+    async def _call_llm(self, call_site: str, prompt: str) -> Optional[Dict[str, Any]]:
+        async def call_llm() -> str:
+            result = await self.model._agenerate([SystemMessage(content=prompt)], temperature=DETERMINISTIC_TEMPERATURE)
+            return result.generations[0].message.content
+
+        response = await get_llm_cache().acached(
+            call_site,
+            self.model.model_name,
+            DETERMINISTIC_TEMPERATURE,
+            prompt,
+            call_llm,
+            validate=_contains_json_object
+        )
+        return _parse_json_object(response)
+
+    async def _evaluate_segment(self, segment: ConversationSegment, user_name: str,
+                                target_position: str) -> Optional[Dict[str, Any]]:
+        prompt = self._build_segment_prompt(segment, user_name, target_position)
+        try:
+            async with self._semaphore:
+                parsed = await self._call_llm("report_segment", prompt)
+        except Exception as e:
+            logger.warning(f"⚠️ 片段评估失败 Q{segment.index + 1}: {e}")
+            return None
+        if parsed is None:
+            logger.warning(f"⚠️ 片段评估返回非JSON Q{segment.index + 1}")
+            return None
+
+        raw_scores = parsed.get("scores") if isinstance(parsed.get("scores"), dict) else {}
+        scores = {}
+        for key in COMPETENCY_KEYS:
+            score = _clamp_score(raw_scores.get(key))
+            if score is not None:
+                scores[key] = score
+        return {
+            "scores": scores,
+            "strengths": [str(s) for s in parsed.get("strengths", []) if s][:3],
+            "weaknesses": [str(w) for w in parsed.get("weaknesses", []) if w][:3],
+            "summary": str(parsed.get("summary", ""))
+        }
+
+    def _submit(self, segment: ConversationSegment, user_name: str, target_position: str) -> asyncio.Task:
+        """提交片段评估；同一片段只评估一次，失败的任务下次重新提交"""
+        self._bind_loop()
+        segment_id = f"{target_position}:{segment.segment_id}"
+        task = self._tasks.get(segment_id)
+        if task is not None and not (task.done() and (task.cancelled() or task.result() is None)):
+            self._tasks.move_to_end(segment_id)
+            return task
+
+        task = asyncio.ensure_future(self._evaluate_segment(segment, user_name, target_position))
+        self._tasks[segment_id] = task
+        while len(self._tasks) > self.max_tracked_segments:
+            self._tasks.popitem(last=False)
+        return task
+
+    def prefetch(self, messages: List[Any], user_name: str, target_position: str) -> int:
+        """面试进行中调用：在后台评估已完成的问答片段，不等待结果"""
+        # 窗口开头被截断、缺少提问的片段不提交（报告生成时会按完整对话重新切分）
+        segments = [segment for segment in split_conversation_segments(messages) if segment.question]
+        for segment in segments:
+            self._submit(segment, user_name, target_position)
+        return len(segments)
+
+    async def map_segments(self, segments: List[ConversationSegment], user_name: str,
+                           target_position: str) -> List[Optional[Dict[str, Any]]]:
+        """并发评估所有片段（已在后台完成的直接复用）"""
+        tasks = [self._submit(segment, user_name, target_position) for segment in segments]
+        return await asyncio.gather(*[asyncio.shield(task) for task in tasks])
+
+    # ==================== Reduce ====================
+
+    @staticmethod
+    def aggregate(evaluations: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """聚合片段评估：各能力取有评分片段的平均分，亮点/不足按出现次数排序"""
+        totals = {key: [] for key in COMPETENCY_KEYS}
+        strengths, weaknesses = Counter(), Counter()
+        for evaluation in evaluations:
+            if not evaluation:
+                continue
+            for key, score in evaluation["scores"].items():
+                totals[key].append(score)
+            strengths.update(evaluation["strengths"])
+            weaknesses.update(evaluation["weaknesses"])
+
+        scores = {
+            key: round(sum(values) / len(values)) if values else NEUTRAL_SCORE
+            for key, values in totals.items()
+        }
+        return {
+            "scores": scores,
+            "evidence_counts": {key: len(values) for key, values in totals.items()},
+            "overall_score": round(sum(scores.values()) / len(scores)),
+            "strengths": [item for item, _ in strengths.most_common(8)],
+            "weaknesses": [item for item, _ in weaknesses.most_common(8)],
+            "evaluated_segments": sum(1 for evaluation in evaluations if evaluation)
+        }
+
+    def _pick_summaries(self, segments: List[ConversationSegment],
+                        evaluations: List[Optional[Dict[str, Any]]]) -> List[str]:
+        """挑选写入Reduce提示词的片段摘要：数量有上限，均匀覆盖整场面试"""
+        summaries = [
+            f"Q{segment.index + 1}: {evaluation['summary']}"
+            for segment, evaluation in zip(segments, evaluations)
+            if evaluation and evaluation["summary"]
+        ]
+        if len(summaries) <= self.reduce_max_segments:
+            return summaries
+        step = len(summaries) / self.reduce_max_segments
+        return [summaries[int(i * step)] for i in range(self.reduce_max_segments)]
+
+    def _build_reduce_prompt(self, aggregated: Dict[str, Any], summaries: List[str],
+                             user_name: str, target_position: str) -> str:
+        return f"""你是一名资深的HR专家，已经逐轮评估了候选人{user_name}（应聘{target_position}）的面试回答。
+请基于下面的聚合评估结果撰写报告的文字部分，不要重新打分。
+
+各项能力评分(0-100)：
+{json.dumps(aggregated["scores"], ensure_ascii=False)}
+
+多轮出现的亮点：{"；".join(aggregated["strengths"]) or "无"}
+多轮出现的不足：{"；".join(aggregated["weaknesses"]) or "无"}
+
+各轮表现摘要：
+{chr(10).join(summaries) or "无"}
+
+请只返回JSON，不要添加解释文字：
+{{
+    "competency_descriptions": {{
+        "professional_knowledge": "专业知识评价",
+        "skill_matching": "技能匹配度评价",
+        "language_expression": "语言表达评价",
+        "logical_thinking": "逻辑思维评价",
+        "innovation_ability": "创新能力评价",
+        "stress_resistance": "应变抗压评价"
+    }},
+    "strengths_weaknesses": {{
+        "strengths": [{{"title": "优势能力标题", "description": "详细优势描述"}}],
+        "weaknesses": [{{"title": "待提升能力标题", "description": "具体改进建议"}}]
+    }},
+    "improvement_suggestions": {{
+        "learning_resources": [{{"title": "学习资源标题", "description": "资源描述", "type": "book/video/course/platform"}}],
+        "improvement_methods": [{{"title": "提升方法标题", "description": "具体方法"}}],
+        "learning_path": [{{"stage": 1, "title": "阶段标题", "duration": "建议时长", "description": "阶段内容"}}]
+    }},
+    "related_assessments": [
+        {{"title": "相关测评标题", "description": "测评内容", "url": "./assessment-options.html", "rating": 4, "duration_minutes": 30}}
+    ]
+}}"""
+
+    async def reduce(self, segments: List[ConversationSegment], evaluations: List[Optional[Dict[str, Any]]],
+                     user_name: str, target_position: str, message_count: int) -> Dict[str, Any]:
+        """合并片段评估为完整报告；文字部分由LLM撰写，失败时抛出异常由调用方降级"""
+        aggregated = self.aggregate(evaluations)
+        if not aggregated["evaluated_segments"]:
+            raise ValueError("没有可用的片段评估结果")
+
+        prompt = self._build_reduce_prompt(
+            aggregated, self._pick_summaries(segments, evaluations), user_name, target_position
+        )
+        narrative = await self._call_llm("report_reduce", prompt)
+        if narrative is None:
+            raise ValueError("Reduce阶段返回非JSON")
+
+        return self.compose_report(aggregated, narrative, user_name, target_position, message_count)
+
+    @staticmethod
+    def compose_report(aggregated: Dict[str, Any], narrative: Dict[str, Any], user_name: str,
+                       target_position: str, message_count: int) -> Dict[str, Any]:
+        """按报告页结构组装：数值来自聚合结果，文字来自Reduce阶段"""
+        descriptions = narrative.get("competency_descriptions") or {}
+        overall_score = aggregated["overall_score"]
+        detailed_scores = {
+            key: {
+                "score": score,
+                "level": level_by_score(score),
+                "description": descriptions.get(key) or (
+                    f"基于{aggregated['evidence_counts'][key]}轮问答的综合评估"
+                    if aggregated["evidence_counts"][key] else "面试中未明显体现，给予中性评分"
+                )
+            }
+            for key, score in aggregated["scores"].items()
+        }
+        strengths_weaknesses = narrative.get("strengths_weaknesses") or {
+            "strengths": [{"title": item, "description": item} for item in aggregated["strengths"][:3]],
+            "weaknesses": [{"title": item, "description": item} for item in aggregated["weaknesses"][:3]]
+        }
+        return {
+            "basic_info": {
+                "candidate_name": user_name,
+                "position": target_position,
+                "interview_time": datetime.now().strftime('%Y-%m-%d %H:%M'),
+                "duration_minutes": max(15, min(60, message_count * 3)),
+                "overall_grade": grade_by_score(overall_score),
+                "overall_score": overall_score
+            },
+            "core_competencies": {
+                "overall_score": overall_score,
+                "detailed_scores": detailed_scores
+            },
+            "strengths_weaknesses": strengths_weaknesses,
+            "improvement_suggestions": narrative.get("improvement_suggestions", {}),
+            "related_assessments": narrative.get("related_assessments", []),
+            "evaluation_meta": {
+                "evaluated_segments": aggregated["evaluated_segments"],
+                "evidence_counts": aggregated["evidence_counts"]
+            }
+        }
+
+
+def create_report_map_reducer(model) -> ReportMapReducer:
+    """创建报告 Map-Reduce 生成器实例"""
+    return ReportMapReducer(
+        model,
+        concurrency=getattr(model_config, 'REPORT_MAP_CONCURRENCY', 4),
+        segment_max_chars=getattr(model_config, 'REPORT_SEGMENT_MAX_CHARS', 1500),
+        reduce_max_segments=getattr(model_config, 'REPORT_REDUCE_MAX_SEGMENTS', 12)
+    )
@@ -12,6 +12,27 @@ from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
 from ..models.spark_client import create_spark_model
+from langchain_core.messages import HumanMessage
+
+from .llm_cache import DETERMINISTIC_TEMPERATURE, get_llm_cache
+
+
+def _strip_json_fence(response: str) -> str:
+    """清理可能的markdown代码块标记"""
+    response = response.strip()
+    if response.startswith("```json"):
+        response = response[7:]
+    if response.endswith("```"):
+        response = response[:-3]
+    return response
+
+
+def _is_json_response(response: str) -> bool:
+    try:
+        json.loads(_strip_json_fence(response))
+        return True
+    except json.JSONDecodeError:
+        return False
 
 
 class ResumeParserInput(BaseModel):
@@ -73,6 +94,19 @@ class ResumeParserTool(BaseTool):
         else:
             raise Exception(f"不支持的文件格式: {file_extension}")
     
+    def _cached_llm_call(self, call_site: str, prompt: str, validate=None) -> str:
+        """以确定性温度调用LLM，相同的 (模型, 提示词) 直接返回缓存的响应"""
+        return get_llm_cache().cached(
+            call_site,
+            self.llm.model_name,
+            DETERMINISTIC_TEMPERATURE,
+            prompt,
+            lambda: self.llm.invoke(
+                [HumanMessage(content=prompt)], temperature=DETERMINISTIC_TEMPERATURE
+            ).content,
+            validate=validate
+        )
+    
     def _structure_resume_content(self, text: str) -> Dict[str, Any]:
         """使用LLM结构化简历内容"""
         
@@ -128,15 +162,9 @@ class ResumeParserTool(BaseTool):
 """
         
         try:
-            response = self.llm(prompt)
-            # 清理可能的markdown标记
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.endswith("```"):
-                response = response[:-3]
-            
-            return json.loads(response)
+            # 同一份简历文本重复解析时命中LLM响应缓存
+            response = self._cached_llm_call("resume_structure", prompt, validate=_is_json_response)
+            return json.loads(_strip_json_fence(response))
         except json.JSONDecodeError as e:
             # 如果JSON解析失败，返回基础格式
             return {
@@ -182,7 +210,7 @@ class ResumeParserTool(BaseTool):
 2. 突出技术技能和项目经验
 3. 适合面试官快速了解候选人
 """
-                summary = self.llm(summary_prompt)
+                summary = self._cached_llm_call("resume_summary", summary_prompt)
                 return summary.strip()
             
             else:
@@ -0,0 +1,281 @@
+"""
+重复请求合并（single-flight）
+按 (操作, 资源ID, 内容哈希) 合并重复的分析请求：双击/重试时，同一份内容的第二个请求不再投递新的Celery任务，
+而是附加到进行中的任务ID上；任务完成后的一段时间内，相同请求直接返回已有结果。
+任务由Celery worker完成并在worker进程中记录结果/释放执行权，合并状态必须放在API与worker共享的Redis中：
+- redis：必须使用Redis，连接失败时报错
+- auto：优先Redis，不可用时关闭合并（直接投递），避免API进程内的占位永远无法被worker清除
+- memory：仅进程内合并，只适用于投递与完成在同一进程的部署（如Celery eager模式），条目按TTL过期清理
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import database_config, model_config
+except ImportError:
+    database_config = None
+    model_config = None
+
+# 占位值：已抢到执行权、任务尚未投递
+PENDING = "__pending__"
+
+
+def flight_key(operation: str, resource_id: str, content: Any) -> str:
+    """合并键：操作 + 资源ID + 请求内容哈希"""
+    if isinstance(content, bytes):
+        payload = content
+    else:
+        payload = json.dumps(content, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return f"{operation}:{resource_id}:{hashlib.sha256(payload).hexdigest()[:16]}"
+
+
+def celery_task_failed(handle: Dict[str, Any]) -> bool:
+    """句柄中的Celery任务已失败/撤销（worker崩溃等未触发释放的情况），用作 is_stale"""
+    task_id = handle.get("celery_task_id")
+    if not task_id:
+        return False
+    try:
+        from src.celery_app import celery_app
+        return celery_app.AsyncResult(task_id).state in ("FAILURE", "REVOKED")
+    except Exception:
+        return False
+
+
+class SingleFlight:
+    """重复请求合并器 - Redis跨进程合并，memory仅限单进程"""
+
+    INFLIGHT_PREFIX = "singleflight:inflight:"
+    RESULT_PREFIX = "singleflight:result:"
+    BACKENDS = ("auto", "redis", "memory")
+
+    def __init__(
+        self,
+        backend: str = "auto",
+        inflight_ttl: int = 900,
+        result_ttl: int = 600,
+        enabled: bool = True,
+        pending_wait_seconds: float = 2.0
+    ):
+        self.enabled = enabled
+        self.inflight_ttl = inflight_ttl
+        self.result_ttl = result_ttl
+        self.pending_wait_seconds = pending_wait_seconds
+        self.redis_client = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Any] = {}  # key -> (handle或PENDING, 过期时间)
+        self._results: Dict[str, Any] = {}   # key -> (结果, 过期时间)
+        self._next_prune = 0.0
+        self.stats = {'launched': 0, 'coalesced_inflight': 0, 'coalesced_completed': 0, 'stale_released': 0}
+
+        if backend not in self.BACKENDS:
+            raise ValueError(f"不支持的请求合并后端: {backend}（可选: {', '.join(self.BACKENDS)}）")
+        if enabled and backend in ("auto", "redis"):
+            self._init_redis(required=backend == "redis")
+            if self.redis_client is None:
+                # 进程内状态无法被worker中的 complete/release 清除，降级为不合并
+                self.enabled = False
+
+    @property
+    def backend(self) -> str:
+        if not self.enabled:
+            return "disabled"
+        return "redis" if self.redis_client is not None else "memory"
+
+    def _init_redis(self, required: bool = False):
+        try:
+            import redis
+            client = redis.Redis(
+                host=getattr(database_config, 'redis_host', 'localhost'),
+                port=getattr(database_config, 'redis_port', 6379),
+                db=getattr(database_config, 'redis_db', 0),
+                decode_responses=True
+            )
+            client.ping()
+            self.redis_client = client
+            logger.info("✅ 请求合并使用Redis")
+        except Exception as e:
+            self.redis_client = None
+            if required:
+                logger.error(f"❌ 请求合并连接Redis失败: {e}")
+                raise RuntimeError(
+                    f"请求合并配置为Redis但无法连接: {e}；"
+                    f"可设置 SINGLE_FLIGHT_ENABLED=false 关闭合并"
+                ) from e
+            logger.warning(f"⚠️ 请求合并连接Redis失败，关闭重复请求合并: {e}")
+
+    def _prune_expired(self, now: float):
+        """清理进程内已过期的占位和结果（调用方持有锁），最多每分钟一次"""
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 60
+        for store in (self._inflight, self._results):
+            expired = [key for key, (_, expires_at) in store.items() if expires_at < now]
+            for key in expired:
+                del store[key]
+
+    # ==================== 存储操作 ====================
+
+    def _acquire(self, key: str) -> bool:
+        """抢占执行权（SET NX），成功者负责投递任务"""
+        if self.redis_client is not None:
+            return bool(self.redis_client.set(self.INFLIGHT_PREFIX + key, PENDING, nx=True, ex=self.inflight_ttl))
+        with self._lock:
+            now = time.time()
+            self._prune_expired(now)
+            entry = self._inflight.get(key)
+            if entry is not None and entry[1] >= now:
+                return False
+            self._inflight[key] = (PENDING, now + self.inflight_ttl)
+            return True
+
+    def _set_handle(self, key: str, handle: Dict[str, Any]):
+        if self.redis_client is not None:
+            self.redis_client.set(self.INFLIGHT_PREFIX + key, json.dumps(handle, default=str), ex=self.inflight_ttl)
+        else:
+            with self._lock:
+                self._inflight[key] = (handle, time.time() + self.inflight_ttl)
+
+    def _get_handle(self, key: str) -> Any:
+        """进行中的任务句柄；PENDING 表示正在投递，None 表示没有进行中的任务"""
+        if self.redis_client is not None:
+            value = self.redis_client.get(self.INFLIGHT_PREFIX + key)
+            return value if value in (None, PENDING) else json.loads(value)
+        with self._lock:
+            entry = self._inflight.get(key)
+            return entry[0] if entry is not None and entry[1] >= time.time() else None
+
+    def _get_result(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.redis_client is not None:
+            value = self.redis_client.get(self.RESULT_PREFIX + key)
+            return json.loads(value) if value else None
+        with self._lock:
+            entry = self._results.get(key)
+            return entry[0] if entry is not None and entry[1] >= time.time() else None
+
+    def complete(self, key: str, result: Any = None):
+        """任务成功完成：保存结果供后续相同请求直接返回，并释放执行权"""
+        if not self.enabled or not key:
+            return
+        try:
+            handle = self._get_handle(key)
+            record = {"handle": handle if isinstance(handle, dict) else {}, "result": result}
+            if self.redis_client is not None:
+                pipe = self.redis_client.pipeline()
+                pipe.set(self.RESULT_PREFIX + key, json.dumps(record, ensure_ascii=False, default=str), ex=self.result_ttl)
+                pipe.delete(self.INFLIGHT_PREFIX + key)
+                pipe.execute()
+            else:
+                with self._lock:
+                    self._results[key] = (record, time.time() + self.result_ttl)
+                    self._inflight.pop(key, None)
+        except Exception as e:
+            logger.warning(f"⚠️ 记录合并结果失败: {key} ({e})")
+
+    def release(self, key: str):
+        """任务失败或已失效：释放执行权，下一个请求重新投递"""
+        if not self.enabled or not key:
+            return
+        try:
+            if self.redis_client is not None:
+                self.redis_client.delete(self.INFLIGHT_PREFIX + key)
+            else:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        except Exception as e:
+            logger.warning(f"⚠️ 释放合并锁失败: {key} ({e})")
+
+    # ==================== 合并入口 ====================
+
+    async def _wait_handle(self, key: str) -> Any:
+        """等待抢到执行权的请求投递完任务"""
+        deadline = time.time() + self.pending_wait_seconds
+        handle = self._get_handle(key)
+        while handle == PENDING and time.time() < deadline:
+            await asyncio.sleep(0.05)
+            handle = self._get_handle(key)
+        return None if handle == PENDING else handle
+
+    async def submit(
+        self,
+        operation: str,
+        resource_id: str,
+        content: Any,
+        launch: Callable[[str], Dict[str, Any]],
+        is_stale: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Dict[str, Any]:
+        """合并执行：launch(flight_key) 投递任务并返回任务句柄（如 analysis_id、celery_task_id）
+
+        返回值为任务句柄，附加 flight_key、coalesced 和 state（launched / in_flight / completed），
+        completed 时 result 为任务的返回值。is_stale(handle) 为True时视为进行中的任务已失效并重新投递。
+        """
+        key = flight_key(operation, resource_id, content)
+        if not self.enabled:
+            return {**launch(key), "flight_key": key, "coalesced": False, "state": "launched"}
+
+        for _ in range(2):
+            try:
+                record = self._get_result(key)
+                if record is not None:
+                    self.stats['coalesced_completed'] += 1
+                    logger.info(f"🔁 相同请求已完成，直接返回结果: {key}")
+                    return {**record["handle"], "flight_key": key, "coalesced": True,
+                            "state": "completed", "result": record["result"]}
+
+                acquired = self._acquire(key)
+            except Exception as e:
+                logger.warning(f"⚠️ 请求合并不可用，直接执行: {e}")
+                return {**launch(key), "flight_key": key, "coalesced": False, "state": "launched"}
+
+            if acquired:
+                try:
+                    handle = launch(key)
+                except Exception:
+                    self.release(key)
+                    raise
+                self._set_handle(key, handle)
+                self.stats['launched'] += 1
+                return {**handle, "flight_key": key, "coalesced": False, "state": "launched"}
+
+            handle = await self._wait_handle(key)
+            if isinstance(handle, dict) and not (is_stale and is_stale(handle)):
+                self.stats['coalesced_inflight'] += 1
+                logger.info(f"🔁 附加到进行中的任务: {key}")
+                return {**handle, "flight_key": key, "coalesced": True, "state": "in_flight"}
+
+            # 投递超时或任务已失效（如worker崩溃未释放），释放后重新抢占一次
+            self.stats['stale_released'] += 1
+            self.release(key)
+
+        return {**launch(key), "flight_key": key, "coalesced": False, "state": "launched"}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'backend': self.backend}
+
+
+# 全局请求合并器
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """获取全局请求合并器实例"""
+    global _single_flight
+
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight(
+                    backend=getattr(model_config, 'SINGLE_FLIGHT_BACKEND', 'auto'),
+                    inflight_ttl=getattr(model_config, 'SINGLE_FLIGHT_INFLIGHT_TTL_SECONDS', 900),
+                    result_ttl=getattr(model_config, 'SINGLE_FLIGHT_RESULT_TTL_SECONDS', 600),
+                    enabled=getattr(model_config, 'SINGLE_FLIGHT_ENABLED', True)
+                )
+
+    return _single_flight
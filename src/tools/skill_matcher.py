@@ -4,17 +4,30 @@
 """
 import numpy as np
 from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
 import logging
 from pathlib import Path
 import re
 
-try:
-    from sklearn.metrics.pairwise import cosine_similarity
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    logging.warning("sklearn not available, using fallback similarity calculation")
+from .model_registry import get_sentence_transformer
+from .embedding_service import get_embedding_service
+from .multi_pattern_matcher import AhoCorasickMatcher
+
+# 一些常见的技能别名
+SKILL_ALIASES = {
+    'javascript': ['js', 'node.js', 'nodejs'],
+    'typescript': ['ts'],
+    'react': ['reactjs', 'react.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'python': ['py'],
+    'postgresql': ['postgres'],
+    'machine learning': ['ml', '机器学习'],
+    'deep learning': ['dl', '深度学习'],
+    'artificial intelligence': ['ai', '人工智能'],
+    'natural language processing': ['nlp', '自然语言处理']
+}
+
+# 语义技能匹配的相似度阈值
+SEMANTIC_SKILL_THRESHOLD = 0.5
 
 
 class SkillMatcher:
@@ -23,6 +36,7 @@ class SkillMatcher:
     def __init__(self):
         # 尝试加载Sentence-Transformer模型
         self.model = None
+        self.model_name = None
         self._load_sentence_transformer()
         
         # 技能关键词库
@@ -55,8 +69,21 @@ class SkillMatcher:
         
         # 展开所有技能关键词
         self.all_skills = []
+        self.skill_category_index = []
         for category, skills in self.skill_categories.items():
             self.all_skills.extend(skills)
+            self.skill_category_index.extend([category] * len(skills))
+        
+        # 技能及别名编译为一个多模式匹配器，每个回答只需扫描一遍
+        self.skill_pattern_matcher = AhoCorasickMatcher(
+            (variation, (category, skill))
+            for category, skills in self.skill_categories.items()
+            for skill in skills
+            for variation in self._get_skill_variations(skill)
+        )
+        
+        # 归一化技能嵌入矩阵，首次语义匹配时计算
+        self._skill_embedding_matrix = None
     
     def _load_sentence_transformer(self):
         """加载Sentence-Transformer模型"""
@@ -70,7 +97,9 @@ class SkillMatcher:
         
         for model_name in model_candidates:
             try:
-                self.model = SentenceTransformer(model_name)
+                # 通过进程级注册表共享模型，同一进程内每个模型只加载一次
+                self.model = get_sentence_transformer(model_name)
+                self.model_name = model_name
                 print(f"✅ 加载Sentence-Transformer模型成功: {model_name}")
                 return
             except Exception as e:
@@ -90,10 +119,18 @@ class SkillMatcher:
         mentioned_skills = self._extract_skills_from_text(answer_text)
         
         # 计算各种匹配度
+        semantic_skill_matches = []
         if self.model is not None:
             semantic_scores = self._calculate_semantic_similarity(
                 answer_text, resume_skills, job_requirements
             )
+            try:
+                answer_embedding = self._normalize_rows(
+                    get_embedding_service(self.model_name).embed([answer_text])
+                )[0]
+                semantic_skill_matches = self._match_skills_semantically(answer_embedding)
+            except Exception as e:
+                logging.warning(f"语义技能匹配失败: {e}")
         else:
             semantic_scores = self._fallback_similarity_calculation(
                 mentioned_skills, resume_skills, job_requirements
@@ -117,6 +154,7 @@ class SkillMatcher:
         return {
             'mentioned_skills': mentioned_skills,
             'semantic_similarity': semantic_scores,
+            'semantic_skill_matches': semantic_skill_matches,
             'skill_consistency': consistency_analysis,
             'job_requirement_match': job_match_analysis,
             'overall_skill_score': overall_score,
@@ -124,55 +162,121 @@ class SkillMatcher:
                 mentioned_skills, resume_skills, job_requirements, overall_score
             )
         }
-    
+
+    def merge_skill_analyses(
+        self,
+        analyses: List[Dict[str, Any]],
+        weights: List[float],
+        resume_skills: List[str],
+        job_requirements: List[str]
+    ) -> Dict[str, Any]:
+        """合并多轮回答各自的技能匹配分析
+
+        提及技能取并集后重新计算一致性和岗位匹配；语义相似度按回答长度加权平均
+        （无模型时由合并后的技能重新计算），语义技能匹配取各技能的最高相似度。
+        """
+
+        mentioned = set()
+        for analysis in analyses:
+            for category, skills in analysis.get('mentioned_skills', {}).items():
+                mentioned.update((category, skill) for skill in skills)
+        mentioned_skills = {}
+        for category, skills in self.skill_categories.items():
+            category_skills = [skill for skill in skills if (category, skill) in mentioned]
+            if category_skills:
+                mentioned_skills[category] = category_skills
+
+        total_weight = sum(weights)
+        if self.model is not None and total_weight > 0:
+            semantic_scores = {
+                key: sum(
+                    analysis.get('semantic_similarity', {}).get(key, 0.0) * weight
+                    for analysis, weight in zip(analyses, weights)
+                ) / total_weight
+                for key in ('resume_similarity', 'job_requirement_similarity')
+            }
+        else:
+            semantic_scores = self._fallback_similarity_calculation(
+                mentioned_skills, resume_skills, job_requirements
+            )
+
+        best_matches = {}
+        for analysis in analyses:
+            for match in analysis.get('semantic_skill_matches', []):
+                current = best_matches.get(match['skill'])
+                if current is None or match['similarity'] > current['similarity']:
+                    best_matches[match['skill']] = match
+        semantic_skill_matches = sorted(
+            best_matches.values(), key=lambda match: match['similarity'], reverse=True
+        )[:5]
+
+        consistency_analysis = self._analyze_skill_consistency(mentioned_skills, resume_skills)
+        job_match_analysis = self._analyze_job_requirement_match(mentioned_skills, job_requirements)
+        overall_score = self._calculate_overall_skill_score(
+            semantic_scores, consistency_analysis, job_match_analysis
+        )
+
+        return {
+            'mentioned_skills': mentioned_skills,
+            'semantic_similarity': semantic_scores,
+            'semantic_skill_matches': semantic_skill_matches,
+            'skill_consistency': consistency_analysis,
+            'job_requirement_match': job_match_analysis,
+            'overall_skill_score': overall_score,
+            'detailed_analysis': self._generate_detailed_skill_analysis(
+                mentioned_skills, resume_skills, job_requirements, overall_score
+            )
+        }
+
     def _extract_skills_from_text(self, text: str) -> Dict[str, List[str]]:
         """从文本中提取技能关键词"""
         
-        text_lower = text.lower()
-        found_skills = {category: [] for category in self.skill_categories.keys()}
+        matched = set(self.skill_pattern_matcher.find_values(text))
         
-        # 关键词匹配
+        # 按技能库中的类别和顺序输出
+        found_skills = {}
         for category, skills in self.skill_categories.items():
-            for skill in skills:
-                # 简单的关键词匹配
-                if skill.lower() in text_lower:
-                    found_skills[category].append(skill)
-                
-                # 处理一些常见的变体
-                skill_variations = self._get_skill_variations(skill)
-                for variation in skill_variations:
-                    if variation.lower() in text_lower:
-                        if skill not in found_skills[category]:
-                            found_skills[category].append(skill)
-        
-        # 过滤空的类别
-        found_skills = {k: v for k, v in found_skills.items() if v}
+            category_skills = [skill for skill in skills if (category, skill) in matched]
+            if category_skills:
+                found_skills[category] = category_skills
         
         return found_skills
     
     def _get_skill_variations(self, skill: str) -> List[str]:
         """获取技能的常见变体"""
         
-        variations = [skill]
-        
-        # 一些常见的技能别名
-        aliases = {
-            'javascript': ['js', 'node.js', 'nodejs'],
-            'typescript': ['ts'],
-            'react': ['reactjs', 'react.js'],
-            'vue': ['vuejs', 'vue.js'],
-            'python': ['py'],
-            'postgresql': ['postgres'],
-            'machine learning': ['ml', '机器学习'],
-            'deep learning': ['dl', '深度学习'],
-            'artificial intelligence': ['ai', '人工智能'],
-            'natural language processing': ['nlp', '自然语言处理']
-        }
-        
-        if skill in aliases:
-            variations.extend(aliases[skill])
-        
-        return variations
+        return [skill] + SKILL_ALIASES.get(skill, [])
+    
+    @property
+    def skill_embedding_matrix(self) -> np.ndarray:
+        """全部技能的归一化嵌入矩阵 (技能数, 维度)，与 all_skills 顺序一致"""
+        if self._skill_embedding_matrix is None:
+            embeddings = get_embedding_service(self.model_name).embed(self.all_skills)
+            self._skill_embedding_matrix = self._normalize_rows(embeddings)
+        return self._skill_embedding_matrix
+    
+    @staticmethod
+    def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+    
+    def _match_skills_semantically(
+        self,
+        text_embedding: np.ndarray,
+        top_k: int = 5,
+        threshold: float = SEMANTIC_SKILL_THRESHOLD
+    ) -> List[Dict[str, Any]]:
+        """一次矩阵乘法计算文本与全部技能的余弦相似度，返回最相近的技能"""
+        similarities = self.skill_embedding_matrix @ text_embedding
+        top_indexes = np.argsort(-similarities)[:top_k]
+        return [
+            {
+                'skill': self.all_skills[i],
+                'category': self.skill_category_index[i],
+                'similarity': float(similarities[i])
+            }
+            for i in top_indexes if similarities[i] >= threshold
+        ]
     
     def _calculate_semantic_similarity(
         self, 
@@ -196,36 +300,15 @@ class SkillMatcher:
             if job_text:
                 texts.append(job_text)
             
-            # 生成嵌入
-            embeddings = self.model.encode(texts)
-            
-            scores = {}
+            # 生成嵌入（共享嵌入服务缓存，简历/岗位要求文本在多次回答间只计算一次）
+            embeddings = self._normalize_rows(get_embedding_service(self.model_name).embed(texts))
             
-            # 计算与简历的相似度
-            if len(embeddings) >= 2 and resume_text:
-                if SKLEARN_AVAILABLE:
-                    similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-                else:
-                    similarity = self._manual_cosine_similarity(embeddings[0], embeddings[1])
-                scores['resume_similarity'] = float(similarity)
-            else:
-                scores['resume_similarity'] = 0.0
-            
-            # 计算与岗位要求的相似度
-            if len(embeddings) >= 3 and job_text:
-                if SKLEARN_AVAILABLE:
-                    similarity = cosine_similarity([embeddings[0]], [embeddings[2]])[0][0]
-                else:
-                    similarity = self._manual_cosine_similarity(embeddings[0], embeddings[2])
-                scores['job_requirement_similarity'] = float(similarity)
-            elif len(embeddings) >= 2 and job_text and not resume_text:
-                if SKLEARN_AVAILABLE:
-                    similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-                else:
-                    similarity = self._manual_cosine_similarity(embeddings[0], embeddings[1])
-                scores['job_requirement_similarity'] = float(similarity)
-            else:
-                scores['job_requirement_similarity'] = 0.0
+            # 归一化后一次矩阵乘法得到回答与其余文本的余弦相似度
+            similarities = embeddings[1:] @ embeddings[0]
+            scores = {
+                'resume_similarity': float(similarities[0]) if resume_text else 0.0,
+                'job_requirement_similarity': float(similarities[-1]) if job_text else 0.0
+            }
             
             return scores
             
@@ -237,21 +320,6 @@ class SkillMatcher:
                 job_requirements
             )
     
-    def _manual_cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """手动计算余弦相似度"""
-        
-        try:
-            dot_product = np.dot(vec1, vec2)
-            norm_a = np.linalg.norm(vec1)
-            norm_b = np.linalg.norm(vec2)
-            
-            if norm_a == 0 or norm_b == 0:
-                return 0.0
-            
-            return dot_product / (norm_a * norm_b)
-        except:
-            return 0.0
-    
     def _fallback_similarity_calculation(
         self, 
         mentioned_skills: Dict[str, List[str]],
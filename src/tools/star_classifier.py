@@ -230,6 +230,23 @@ class STARClassifier:
         # 分类每个句子
         sentence_results = self.predict_sentence_roles(sentences)
         
+        return self._summarize_sentence_results(sentence_results)
+    
+    def merge_star_analyses(self, analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """合并多轮回答各自的STAR分析（句子级分类结果拼接后重新统计，不再重复推理）"""
+        
+        sentence_results = []
+        for analysis in analyses:
+            sentence_results.extend(analysis.get('sentence_classifications', []))
+        
+        if not sentence_results:
+            return self._get_empty_star_analysis()
+        
+        return self._summarize_sentence_results(sentence_results)
+    
+    def _summarize_sentence_results(self, sentence_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """根据句子分类结果统计STAR分布、完整性和顺序"""
+        
         # 统计STAR分布
         label_counts = {}
         for result in sentence_results:
@@ -247,7 +264,7 @@ class STARClassifier:
         
         # 生成总体评估
         overall_assessment = self._generate_star_assessment(
-            label_counts, completeness_score, sequence_analysis, len(sentences)
+            label_counts, completeness_score, sequence_analysis, len(sentence_results)
         )
         
         return {
@@ -257,7 +274,7 @@ class STARClassifier:
             'missing_components': [comp for comp in star_components if comp not in present_components],
             'completeness_score': completeness_score,
             'sequence_analysis': sequence_analysis,
-            'total_sentences': len(sentences),
+            'total_sentences': len(sentence_results),
             'overall_assessment': overall_assessment
         }
     
@@ -0,0 +1,146 @@
+"""
+可合并的流式统计工具
+用于分块/分段分析时增量更新并合并统计量，内存占用与数据长度无关
+"""
+import math
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+
+class RunningStats:
+    """Welford在线均值/方差统计，同时维护最小值和最大值
+
+    两个实例可以通过 merge 合并（Chan并行算法），
+    因此各分块可以独立统计后再汇总，结果与整体计算一致。
+    """
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value: float):
+        """加入单个观测值"""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update(self, values) -> "RunningStats":
+        """批量加入观测值（忽略NaN）"""
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return self
+
+        batch = RunningStats()
+        batch.count = int(arr.size)
+        batch.mean = float(arr.mean())
+        batch.m2 = float(((arr - batch.mean) ** 2).sum())
+        batch.min = float(arr.min())
+        batch.max = float(arr.max())
+        return self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """合并另一个统计量（原地修改并返回自身）"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """总体方差（与 np.var 默认 ddof=0 一致）"""
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def range(self) -> float:
+        return self.max - self.min if self.count > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为可序列化字典"""
+        return {
+            "count": self.count,
+            "mean": float(self.mean),
+            "variance": float(self.variance),
+            "min": float(self.min) if self.count > 0 else None,
+            "max": float(self.max) if self.count > 0 else None
+        }
+
+
+class StreamingHistogram:
+    """固定分箱直方图，分箱一致的实例可直接相加合并"""
+
+    def __init__(self, low: float, high: float, bins: int = 64):
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values) -> "StreamingHistogram":
+        """加入观测值，超出范围的值计入首尾分箱"""
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return self
+        arr = np.clip(arr, self.edges[0], self.edges[-1])
+        counts, _ = np.histogram(arr, bins=self.edges)
+        self.counts += counts
+        return self
+
+    def merge(self, other: "StreamingHistogram") -> "StreamingHistogram":
+        """合并分箱相同的直方图"""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("直方图分箱不一致，无法合并")
+        self.counts += other.counts
+        return self
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def quantile(self, q: float) -> Optional[float]:
+        """按分箱线性插值估算分位数"""
+        total = self.total
+        if total == 0:
+            return None
+
+        target = q * total
+        cumulative = np.cumsum(self.counts)
+        idx = int(np.searchsorted(cumulative, target))
+        idx = min(idx, len(self.counts) - 1)
+
+        prev = cumulative[idx - 1] if idx > 0 else 0
+        in_bin = self.counts[idx]
+        fraction = (target - prev) / in_bin if in_bin > 0 else 0.0
+        return float(self.edges[idx] + fraction * (self.edges[idx + 1] - self.edges[idx]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为可序列化字典"""
+        return {
+            "edges": self.edges.tolist(),
+            "counts": self.counts.tolist()
+        }
@@ -0,0 +1,217 @@
+"""
+任务进度推送
+Celery任务的进度（update_state元数据）发布到Redis pub/sub，并保存最近一次事件；
+API进程内的 TaskProgressHub 只维护一个模式订阅连接，把事件分发给本进程内订阅该任务的客户端（SSE/WebSocket），
+客户端不再轮询Celery结果后端。
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config.settings import database_config
+except ImportError:
+    database_config = None
+
+CHANNEL_PREFIX = "task:progress:"
+LAST_EVENT_PREFIX = "task:last_progress:"
+TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+EVENT_TTL_SECONDS = 3600
+
+
+def _redis_kwargs() -> Dict[str, Any]:
+    return {
+        "host": getattr(database_config, 'redis_host', 'localhost'),
+        "port": getattr(database_config, 'redis_port', 6379),
+        "db": getattr(database_config, 'redis_db', 0),
+        "decode_responses": True
+    }
+
+
+def build_progress_event(task_id: str, state: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "task_id": task_id,
+        "state": state,
+        "meta": meta or {},
+        "timestamp": time.time()
+    }
+
+
+class ProgressPublisher:
+    """同步发布器（Celery worker中使用），Redis不可用时静默跳过，不影响任务执行"""
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+        self.stats = {'published': 0, 'failed': 0}
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import redis
+                    self._client = redis.Redis(**_redis_kwargs())
+        return self._client
+
+    def publish(self, task_id: str, state: str, meta: Optional[Dict[str, Any]] = None) -> bool:
+        if not task_id:
+            return False
+        event = build_progress_event(task_id, state, meta)
+        payload = json.dumps(event, ensure_ascii=False, default=str)
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            pipe.setex(f"{LAST_EVENT_PREFIX}{task_id}", EVENT_TTL_SECONDS, payload)
+            pipe.publish(f"{CHANNEL_PREFIX}{task_id}", payload)
+            pipe.execute()
+            self.stats['published'] += 1
+            return True
+        except Exception as e:
+            self.stats['failed'] += 1
+            logger.debug(f"⚠️ 发布任务进度失败: {task_id} ({e})")
+            return False
+
+
+class TaskProgressHub:
+    """API进程内的进度事件分发中心
+
+    整个进程只持有一个 PSUBSCRIBE task:progress:* 连接，
+    收到的事件按任务ID投递到本进程订阅者的队列中。
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._client = None
+        self._listener: Optional[asyncio.Task] = None
+        self.available = True
+        self.stats = {'received': 0, 'delivered': 0, 'dropped': 0}
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as aioredis
+            self._client = aioredis.Redis(**_redis_kwargs())
+        return self._client
+
+    async def start(self) -> bool:
+        """启动订阅监听（首次订阅时自动调用）；Redis不可用时返回False"""
+        if self._listener is not None and not self._listener.done():
+            return True
+        try:
+            await self._get_client().ping()
+        except Exception as e:
+            logger.warning(f"⚠️ 任务进度订阅不可用，改用结果后端查询: {e}")
+            self.available = False
+            return False
+        self.available = True
+        self._listener = asyncio.create_task(self._listen())
+        logger.info("✅ 任务进度订阅已启动")
+        return True
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _listen(self):
+        while True:
+            pubsub = self._get_client().pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    self.stats['received'] += 1
+                    task_id = message["channel"][len(CHANNEL_PREFIX):]
+                    if task_id in self._subscribers:
+                        self._dispatch(task_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ 任务进度订阅中断，1秒后重连: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    def _dispatch(self, task_id: str, event: Dict[str, Any]):
+        for queue in list(self._subscribers.get(task_id, ())):
+            try:
+                queue.put_nowait(event)
+                self.stats['delivered'] += 1
+            except asyncio.QueueFull:
+                # 慢客户端只丢弃最旧的事件，保证能收到最新进度
+                self.stats['dropped'] += 1
+                queue.get_nowait()
+                queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, task_id: str):
+        """订阅任务进度，返回事件队列"""
+        await self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(task_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[task_id]
+
+    async def get_last_event(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """最近一次进度事件（订阅建立前已发布的进度）"""
+        if not self.available:
+            return None
+        try:
+            payload = await self._get_client().get(f"{LAST_EVENT_PREFIX}{task_id}")
+            return json.loads(payload) if payload else None
+        except Exception:
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'available': self.available,
+            'tasks': len(self._subscribers),
+            'subscribers': sum(len(s) for s in self._subscribers.values())
+        }
+
+
+# 全局实例
+_progress_publisher = None
+_progress_hub = None
+
+
+def get_progress_publisher() -> ProgressPublisher:
+    global _progress_publisher
+    if _progress_publisher is None:
+        _progress_publisher = ProgressPublisher()
+    return _progress_publisher
+
+
+def get_progress_hub() -> TaskProgressHub:
+    global _progress_hub
+    if _progress_hub is None:
+        _progress_hub = TaskProgressHub()
+    return _progress_hub
+
+
+def publish_task_progress(task_id: str, state: str, meta: Optional[Dict[str, Any]] = None) -> bool:
+    """发布任务进度事件"""
+    return get_progress_publisher().publish(task_id, state, meta)
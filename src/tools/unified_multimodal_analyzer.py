@@ -19,6 +19,8 @@ import tempfile
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 
+from .frame_writer import get_frame_writer
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -484,59 +486,69 @@ class UnifiedVideoAnalyzer:
     
     def _save_analysis_frame(self, frame: np.ndarray, frame_count: int, 
                            timestamp: float, analysis_result: Dict[str, Any]) -> str:
-        """保存分析帧"""
+        """保存分析帧（交给后台写入器，分析路径不等待磁盘）"""
         try:
+            writer = get_frame_writer()
             timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
             filename = f"{timestamp_str}_frame_{frame_count:06d}_enhanced.jpg"
-            filepath = self.save_dir / filename
-            
-            # 在图像上绘制详细分析信息
-            annotated_frame = frame.copy()
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.5
-            color = (0, 255, 0)  # 绿色
-            thickness = 1
-            
-            y_offset = 20
-            # 基本信息
-            cv2.putText(annotated_frame, f"Frame: {frame_count}", (10, y_offset), 
-                       font, font_scale, color, thickness)
-            y_offset += 20
-            
-            # 情绪信息
-            if 'dominant_emotion' in analysis_result:
-                emotion = analysis_result['dominant_emotion']
-                confidence = analysis_result.get('emotion_confidence', 0)
-                cv2.putText(annotated_frame, f"Emotion: {emotion} ({confidence:.2f})", 
-                           (10, y_offset), font, font_scale, color, thickness)
-                y_offset += 20
             
-            # 头部姿态
-            if 'pitch' in analysis_result:
-                pitch = analysis_result['pitch']
-                yaw = analysis_result['yaw']
-                roll = analysis_result['roll']
-                cv2.putText(annotated_frame, f"Pose: P{pitch:.1f} Y{yaw:.1f} R{roll:.1f}", 
-                           (10, y_offset), font, font_scale, color, thickness)
-            
-            cv2.imwrite(str(filepath), annotated_frame)
+            # 结果字典会随帧继续更新，提交前先拷贝
+            snapshot = dict(analysis_result)
+            filepath = writer.submit_image(
+                self.save_dir / filename,
+                frame,
+                annotate=lambda image: self._annotate_analysis_frame(image, frame_count, snapshot)
+            )
+            if not filepath:
+                return ""
             
             # 保存JSON数据
-            json_filepath = filepath.with_suffix('.json')
-            with open(json_filepath, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'frame_count': frame_count,
-                    'timestamp': timestamp,
-                    'analysis_result': analysis_result,
-                    'saved_at': datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
+            writer.submit_json(Path(filepath).with_suffix('.json'), {
+                'frame_count': frame_count,
+                'timestamp': timestamp,
+                'analysis_result': snapshot,
+                'saved_at': datetime.now().isoformat()
+            })
             
-            return str(filepath)
+            # 立即返回排队中的路径，不等待写盘；需要文件落盘的调用方在分段/会话结束时统一 flush
+            return filepath
             
         except Exception as e:
             logger.error(f"❌ 保存分析帧失败: {e}")
             return ""
     
+    def _annotate_analysis_frame(self, annotated_frame: np.ndarray, frame_count: int,
+                                 analysis_result: Dict[str, Any]) -> np.ndarray:
+        """在图像上绘制详细分析信息（在后台写入线程中执行）"""
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 0.5
+        color = (0, 255, 0)  # 绿色
+        thickness = 1
+        
+        y_offset = 20
+        # 基本信息
+        cv2.putText(annotated_frame, f"Frame: {frame_count}", (10, y_offset), 
+                   font, font_scale, color, thickness)
+        y_offset += 20
+        
+        # 情绪信息
+        if 'dominant_emotion' in analysis_result:
+            emotion = analysis_result['dominant_emotion']
+            confidence = analysis_result.get('emotion_confidence', 0)
+            cv2.putText(annotated_frame, f"Emotion: {emotion} ({confidence:.2f})", 
+                       (10, y_offset), font, font_scale, color, thickness)
+            y_offset += 20
+        
+        # 头部姿态
+        if 'pitch' in analysis_result:
+            pitch = analysis_result['pitch']
+            yaw = analysis_result['yaw']
+            roll = analysis_result['roll']
+            cv2.putText(annotated_frame, f"Pose: P{pitch:.1f} Y{yaw:.1f} R{roll:.1f}", 
+                       (10, y_offset), font, font_scale, color, thickness)
+        
+        return annotated_frame
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """获取性能统计"""
         if self.stats['processing_times']:
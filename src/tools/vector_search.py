@@ -3,16 +3,22 @@
 支持问题检索和学习资源推荐
 """
 import json
+import os
+import threading
+import time
 import uuid
 from typing import List, Dict, Any, Optional
 import hashlib
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
-from ..config.settings import database_config
+from ..config.settings import database_config, model_config
+from .embedding_service import (
+    collection_embedding_metadata,
+    get_collection_embedding_service
+)
 
 
 class VectorSearchInput(BaseModel):
@@ -36,7 +42,6 @@ class VectorSearchTool(BaseTool):
     """
     args_schema: type = VectorSearchInput
     client: Any = None
-    encoder: Any = None
     
     def __init__(self):
         super().__init__()
@@ -50,8 +55,8 @@ class VectorSearchTool(BaseTool):
             )
         )
         
-        # 初始化句子转换器
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+        # 嵌入由共享嵌入服务按集合固定的模型计算（微批次 + 内容哈希缓存），
+        # 模型在首次缓存未命中时才加载
         
         # 确保集合存在
         self._ensure_collections()
@@ -68,9 +73,13 @@ class VectorSearchTool(BaseTool):
                 # 集合不存在，创建新集合
                 self.client.create_collection(
                     name=collection_name,
-                    metadata={"hnsw:space": "cosine"}
+                    metadata=collection_embedding_metadata({"hnsw:space": "cosine"})
                 )
     
+    def embed_documents(self, collection, documents: List[str]) -> List[List[float]]:
+        """使用集合固定的嵌入模型计算文档向量"""
+        return get_collection_embedding_service(collection).embed(documents).tolist()
+    
     def _run(
         self, 
         query: str, 
@@ -81,41 +90,9 @@ class VectorSearchTool(BaseTool):
         """执行向量搜索"""
         
         try:
-            # 获取集合
-            collection = self.client.get_collection(collection_name)
-            
-            # 生成查询向量
-            query_embedding = self.encoder.encode(query).tolist()
-            
-            # 执行搜索
-            search_kwargs = {
-                "query_embeddings": [query_embedding],
-                "n_results": top_k,
-                "include": ["documents", "metadatas", "distances"]
-            }
-            
-            # 添加过滤条件
-            if filter_metadata:
-                search_kwargs["where"] = filter_metadata
-            
-            results = collection.query(**search_kwargs)
-            
-            # 格式化结果
-            formatted_results = []
-            
-            if results["documents"] and len(results["documents"]) > 0:
-                documents = results["documents"][0]
-                metadatas = results["metadatas"][0] if results["metadatas"] else [{}] * len(documents)
-                distances = results["distances"][0] if results["distances"] else [0.0] * len(documents)
-                
-                for i, (doc, metadata, distance) in enumerate(zip(documents, metadatas, distances)):
-                    formatted_results.append({
-                        "rank": i + 1,
-                        "content": doc,
-                        "metadata": metadata,
-                        "similarity_score": 1 - distance,  # 转换为相似度分数
-                        "distance": distance
-                    })
+            formatted_results = self.search_batch(
+                [query], collection_name, top_k=top_k, filter_metadata=filter_metadata
+            )[0]
             
             result = {
                 "query": query,
@@ -134,6 +111,47 @@ class VectorSearchTool(BaseTool):
                 "collection": collection_name
             }
             return json.dumps(error_result, ensure_ascii=False, indent=2)
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        collection_name: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """批量向量搜索：一次编码全部查询、一次多查询检索，直接返回Python对象（每个查询一个结果列表）"""
+        if not queries:
+            return []
+        
+        collection = self.client.get_collection(collection_name)
+        query_embeddings = get_collection_embedding_service(collection).embed(queries).tolist()
+        
+        search_kwargs = {
+            "query_embeddings": query_embeddings,
+            "n_results": top_k,
+            "include": ["documents", "metadatas", "distances"]
+        }
+        if filter_metadata:
+            search_kwargs["where"] = filter_metadata
+        
+        results = collection.query(**search_kwargs)
+        
+        batch_results = []
+        for row in range(len(queries)):
+            documents = (results.get("documents") or [[]] * len(queries))[row] or []
+            metadatas = (results.get("metadatas") or [[{}] * len(documents)] * len(queries))[row]
+            distances = (results.get("distances") or [[0.0] * len(documents)] * len(queries))[row]
+            batch_results.append([
+                {
+                    "rank": i + 1,
+                    "content": doc,
+                    "metadata": metadata,
+                    "similarity_score": 1 - distance,  # 转换为相似度分数
+                    "distance": distance
+                }
+                for i, (doc, metadata, distance) in enumerate(zip(documents, metadatas, distances))
+            ])
+        return batch_results
 
 
 class QuestionBankManager:
@@ -172,7 +190,7 @@ class QuestionBankManager:
             ids.append(question_id)
         
         # 生成嵌入
-        embeddings = self.vector_tool.encoder.encode(documents).tolist()
+        embeddings = self.vector_tool.embed_documents(collection, documents)
         
         # 添加到数据库
         collection.add(
@@ -218,9 +236,25 @@ class QuestionBankManager:
         return result.get("results", [])
 
 
+# 各能力维度的资源检索查询
+COMPETENCY_QUERIES = {
+    "communication_ability": "沟通表达 演讲技巧",
+    "logical_thinking": "逻辑思维 结构化思考",
+    "professional_knowledge": "专业知识 技术能力",
+    "stress_resilience": "抗压能力 情绪管理",
+    "skill_match": "岗位技能匹配 技术栈 提升 路线"
+}
+
+
 class LearningResourceManager:
     """学习资源管理器"""
     
+    # 能力 -> 资源检索结果缓存，按 (能力, 数量, 资源库版本) 失效；所有实例共享
+    CACHE_TTL_SECONDS = 600
+    _cache: Dict[tuple, tuple] = {}
+    _cache_lock = threading.Lock()
+    _local_version = 0  # 本进程写入资源时递增
+    
     def __init__(self):
         self.vector_tool = VectorSearchTool()
         self.collection_name = "learning_resources"
@@ -264,7 +298,7 @@ class LearningResourceManager:
             ids.append(resource_id)
         
         # 生成嵌入
-        embeddings = self.vector_tool.encoder.encode(documents).tolist()
+        embeddings = self.vector_tool.embed_documents(collection, documents)
         
         # 添加到数据库
         collection.add(
@@ -273,20 +307,25 @@ class LearningResourceManager:
             ids=ids,
             embeddings=embeddings
         )
+        self._bump_corpus_version()
 
     def upsert_resources(
         self,
         resources: List[Dict[str, Any]],
         source: str = "user_json_v1",
         version: str = "v1",
-        remove_stale: bool = False
+        remove_stale: bool = False,
+        batch_size: Optional[int] = None
     ) -> Dict[str, Any]:
-        """批量Upsert学习资源（稳定ID、可选清理未出现旧条目）
+        """增量Upsert学习资源（稳定ID、内容哈希比对、可选清理未出现旧条目）
 
         - 稳定ID优先使用入参的 id；否则以 title|url 计算sha1前缀
-        - metadata 写入 description/field/keywords/image/source/version
+        - metadata 写入 description/field/keywords/image/source/version/content_hash
         - 向量文本: 标题 + 描述 + 关键词
+        - content_hash 覆盖向量文本和元数据（不含 version），未变化的资源不重新编码；
+          内容未变只有 version 变化的资源只更新元数据
         """
+        batch_size = batch_size or getattr(model_config, 'LEARNING_RESOURCE_INGEST_BATCH_SIZE', 64)
 
         collection = self.vector_tool.client.get_collection(self.collection_name)
 
@@ -320,25 +359,51 @@ class LearningResourceManager:
                 "keywords": keywords,
                 "image": resource.get("image") or resource.get("Image") or "",
                 "source": source,
-                "version": version,
             }
+            metadata["content_hash"] = hashlib.sha1(
+                json.dumps([doc_text, metadata], ensure_ascii=False, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            metadata["version"] = version
 
             documents.append(doc_text)
             metadatas.append(metadata)
             ids.append(rid)
 
-        embeddings = self.vector_tool.encoder.encode(documents).tolist()
+        # 与已入库的内容哈希比对，只编码新增或变化的资源
+        existing_hashes: Dict[str, str] = {}
+        existing_versions: Dict[str, str] = {}
+        for start in range(0, len(ids), 500):
+            existing = collection.get(ids=ids[start:start + 500], include=["metadatas"])
+            for rid, meta in zip(existing.get("ids") or [], existing.get("metadatas") or []):
+                existing_hashes[rid] = (meta or {}).get("content_hash", "")
+                existing_versions[rid] = (meta or {}).get("version", "")
 
-        collection.upsert(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids,
-            embeddings=embeddings,
-        )
+        changed = [
+            i for i, (rid, metadata) in enumerate(zip(ids, metadatas))
+            if existing_hashes.get(rid) != metadata["content_hash"]
+        ]
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start:start + batch_size]
+            batch_documents = [documents[i] for i in batch]
+            collection.upsert(
+                documents=batch_documents,
+                metadatas=[metadatas[i] for i in batch],
+                ids=[ids[i] for i in batch],
+                embeddings=self.vector_tool.embed_documents(collection, batch_documents),
+            )
+
+        changed_set = set(changed)
+        relabeled = [
+            i for i, rid in enumerate(ids)
+            if i not in changed_set and existing_versions.get(rid) != version
+        ]
+        for start in range(0, len(relabeled), batch_size):
+            batch = relabeled[start:start + batch_size]
+            collection.update(ids=[ids[i] for i in batch], metadatas=[metadatas[i] for i in batch])
 
         removed = 0
         if remove_stale and source:
-            existing = collection.get(where={"source": {"$eq": source}})
+            existing = collection.get(where={"source": {"$eq": source}}, include=[])
             exist_ids = set(existing.get("ids", []) or [])
             keep_ids = set(ids)
             to_delete = list(exist_ids - keep_ids)
@@ -346,43 +411,153 @@ class LearningResourceManager:
                 collection.delete(ids=to_delete)
                 removed = len(to_delete)
 
-        return {"upserted": len(ids), "removed": removed}
+        if changed or relabeled or removed:
+            self._bump_corpus_version()
+        return {
+            "upserted": len(changed),
+            "unchanged": len(ids) - len(changed) - len(relabeled),
+            "relabeled": len(relabeled),
+            "removed": removed
+        }
+
+    def _ingest_state_path(self) -> str:
+        """入库状态文件与向量库放在同一目录，向量库被清空时一起失效"""
+        return os.path.join(database_config.chroma_persist_dir, f"{self.collection_name}_ingest_state.json")
+
+    def ingest_resources_file(
+        self,
+        path: str,
+        source: str = "user_json_v1",
+        version: str = "v1",
+        remove_stale: bool = False,
+        batch_size: Optional[int] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """从JSON文件增量入库
+
+        文件校验和、source、version 与上次入库一致、集合未被清空且未要求清理旧条目时直接跳过。
+        """
+        with open(path, "rb") as f:
+            raw_bytes = f.read()
+        checksum = hashlib.sha256(raw_bytes).hexdigest()
+
+        state_path = self._ingest_state_path()
+        state: Dict[str, Any] = {}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+
+        collection = self.vector_tool.client.get_collection(self.collection_name)
+        previous = state.get(os.path.abspath(path), {})
+        if (
+            not force
+            and previous.get("checksum") == checksum
+            and previous.get("source") == source
+            and previous.get("version") == version
+            and not remove_stale
+            and collection.count() >= previous.get("count", 0)
+        ):
+            return {"skipped": True, "upserted": 0, "unchanged": previous.get("count", 0), "relabeled": 0, "removed": 0}
+
+        resources = json.loads(raw_bytes.decode("utf-8"))
+        if not isinstance(resources, list):
+            raise ValueError("JSON 格式应为数组(list)")
+        result = self.upsert_resources(
+            resources, source=source, version=version, remove_stale=remove_stale, batch_size=batch_size
+        )
+
+        state[os.path.abspath(path)] = {
+            "checksum": checksum,
+            "source": source,
+            "version": version,
+            "count": collection.count(),
+            "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        return {"skipped": False, **result}
     
-    def search_resources(
-        self, 
-        competency: str, 
+    @classmethod
+    def _bump_corpus_version(cls):
+        with cls._cache_lock:
+            cls._local_version += 1
+            cls._cache.clear()
+    
+    def corpus_version(self, collection=None) -> str:
+        """资源库版本：条目数 + 本进程写入次数（其他进程的改动由缓存TTL兜底）"""
+        collection = collection or self.vector_tool.client.get_collection(self.collection_name)
+        return f"{collection.count()}:{self._local_version}"
+    
+    def search_resources_batch(
+        self,
+        competencies: List[str],
         count: int = 3
-    ) -> List[Dict[str, Any]]:
-        """搜索学习资源"""
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """批量搜索多个能力的学习资源：一次编码、一次多查询检索，结果按 (能力, 资源库版本) 缓存"""
+        competencies = list(dict.fromkeys(competencies))
+        if not competencies:
+            return {}
         
-        # 构建搜索查询
-        competency_map = {
-            "communication_ability": "沟通表达 演讲技巧",
-            "logical_thinking": "逻辑思维 结构化思考",
-            "professional_knowledge": "专业知识 技术能力",
-            "stress_resilience": "抗压能力 情绪管理",
-            "skill_match": "岗位技能匹配 技术栈 提升 路线"
-        }
-        
-        query = competency_map.get(competency, competency)
+        collection = self.vector_tool.client.get_collection(self.collection_name)
+        version = self.corpus_version(collection)
+        now = time.time()
         
-        # 构建过滤条件
-        filter_metadata = {"competency": {"$eq": competency}}
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        with self._cache_lock:
+            for competency in competencies:
+                cached = self._cache.get((competency, count, version))
+                if cached and now - cached[0] < self.CACHE_TTL_SECONDS:
+                    results[competency] = list(cached[1])
+        missing = [competency for competency in competencies if competency not in results]
+        if not missing:
+            return results
         
-        # 执行搜索
-        result_str = self.vector_tool._run(
-            query=query,
-            collection_name=self.collection_name,
-            top_k=count,
-            filter_metadata=filter_metadata
+        # 多查询只能共用一个where条件：按全部能力过滤并多取候选，再按每行对应的能力筛选
+        where = (
+            {"competency": {"$eq": missing[0]}} if len(missing) == 1
+            else {"competency": {"$in": missing}}
+        )
+        n_results = count if len(missing) == 1 else max(min(count * len(missing) * 2, collection.count()), count)
+        rows = self.vector_tool.search_batch(
+            [COMPETENCY_QUERIES.get(competency, competency) for competency in missing],
+            self.collection_name,
+            top_k=n_results,
+            filter_metadata=where
         )
         
-        result = json.loads(result_str)
+        for competency, row in zip(missing, rows):
+            matched = [item for item in row if item["metadata"].get("competency") == competency][:count]
+            if len(matched) < count and len(row) >= n_results:
+                # 候选被其他能力占满时，单独补查该能力
+                matched = self.vector_tool.search_batch(
+                    [COMPETENCY_QUERIES.get(competency, competency)],
+                    self.collection_name,
+                    top_k=count,
+                    filter_metadata={"competency": {"$eq": competency}}
+                )[0]
+            for rank, item in enumerate(matched, start=1):
+                item["rank"] = rank
+            results[competency] = matched
         
-        if result.get("error"):
+        with self._cache_lock:
+            for competency in missing:
+                self._cache[(competency, count, version)] = (now, results[competency])
+        return results
+    
+    def search_resources(
+        self, 
+        competency: str, 
+        count: int = 3
+    ) -> List[Dict[str, Any]]:
+        """搜索学习资源"""
+        try:
+            return self.search_resources_batch([competency], count).get(competency, [])
+        except Exception:
             return []
-        
-        return result.get("results", [])
 
 
 def create_vector_search_tool() -> VectorSearchTool:
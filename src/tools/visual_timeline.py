@@ -0,0 +1,244 @@
+"""
+视觉分析时间线存储
+按指标列式存储逐帧结果（预分配numpy数组），并在写入时在线更新汇总统计，
+面试进行中随时可以获取统计结果而无需重新遍历全部帧
+"""
+from typing import Dict, Any, List
+
+import numpy as np
+
+from .streaming_stats import RunningStats
+
+
+NEGATIVE_EMOTIONS = ('angry', 'disgust', 'fear', 'sad')
+EYE_CONTACT_THRESHOLD = 5.0
+
+
+class ColumnGroup:
+    """共享帧号/时间戳的一组数值列，容量不足时按倍数扩容"""
+
+    def __init__(self, fields: List[str], capacity: int = 1024, dtype=np.float32):
+        self.fields = list(fields)
+        self.size = 0
+        self._capacity = max(1, capacity)
+        self._frames = np.empty(self._capacity, dtype=np.int64)
+        self._timestamps = np.empty(self._capacity, dtype=np.float64)
+        self._columns = {name: np.empty(self._capacity, dtype=dtype) for name in self.fields}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self, min_capacity: int):
+        capacity = self._capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        self._frames = np.resize(self._frames, capacity)
+        self._timestamps = np.resize(self._timestamps, capacity)
+        for name in self.fields:
+            self._columns[name] = np.resize(self._columns[name], capacity)
+        self._capacity = capacity
+
+    def append(self, frame: int, timestamp: float, values: Dict[str, float]):
+        """追加一行，缺失字段记为NaN"""
+        if self.size >= self._capacity:
+            self._grow(self.size + 1)
+        idx = self.size
+        self._frames[idx] = frame
+        self._timestamps[idx] = timestamp
+        for name in self.fields:
+            self._columns[name][idx] = values.get(name, np.nan)
+        self.size += 1
+
+    def extend(self, other: "ColumnGroup"):
+        """追加另一组列的全部数据（字段需一致）"""
+        if other.size == 0:
+            return
+        if self.size + other.size > self._capacity:
+            self._grow(self.size + other.size)
+        end = self.size + other.size
+        self._frames[self.size:end] = other.frames
+        self._timestamps[self.size:end] = other.timestamps
+        for name in self.fields:
+            self._columns[name][self.size:end] = other.column(name)
+        self.size = end
+
+    @property
+    def frames(self) -> np.ndarray:
+        return self._frames[:self.size]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self.size]
+
+    def column(self, name: str) -> np.ndarray:
+        """返回指定列的有效数据视图（不拷贝）"""
+        return self._columns[name][:self.size]
+
+
+class VisualTimeline:
+    """视觉分析时间线：列式存储 + 在线聚合
+
+    替代逐帧字典列表：每个指标一列预分配数组，写入时同步更新Welford统计量和
+    类别计数，summary() 的开销与已分析帧数无关。
+    """
+
+    def __init__(self, expected_frames: int = 1024):
+        self.head_pose = ColumnGroup(['pitch', 'yaw', 'roll'], expected_frames)
+        self.gaze = ColumnGroup(['gaze_x', 'gaze_y', 'gaze_magnitude'], expected_frames)
+        self.emotion = ColumnGroup(['dominant_score'], max(16, expected_frames // 10))
+        self.body_language = ColumnGroup(
+            ['posture_score', 'body_angle', 'tension_level'], expected_frames
+        )
+        self.gesture = ColumnGroup(['gesture_activity', 'hands_detected'], expected_frames)
+
+        # 类别列以编码存储
+        self.emotion_labels: List[str] = []
+        self.gesture_labels: List[str] = []
+        self._emotion_codes = ColumnGroup(['code'], max(16, expected_frames // 10), dtype=np.int16)
+        self._gesture_codes = ColumnGroup(['code'], expected_frames, dtype=np.int16)
+
+        # 在线聚合
+        self.yaw_stats = RunningStats()
+        self.pitch_stats = RunningStats()
+        self.gaze_stats = RunningStats()
+        self.eye_contact_frames = 0
+        self.emotion_counts: Dict[str, int] = {}
+        self.posture_stats = RunningStats()
+        self.body_angle_stats = RunningStats()
+        self.gesture_activity_stats = RunningStats()
+        self.gesture_type_counts: Dict[str, int] = {}
+
+    @staticmethod
+    def _encode(labels: List[str], label: str) -> int:
+        try:
+            return labels.index(label)
+        except ValueError:
+            labels.append(label)
+            return len(labels) - 1
+
+    def add_head_pose(self, frame: int, timestamp: float, head_pose: Dict[str, float]):
+        self.head_pose.append(frame, timestamp, head_pose)
+        self.yaw_stats.push(head_pose['yaw'])
+        self.pitch_stats.push(head_pose['pitch'])
+
+    def add_gaze(self, frame: int, timestamp: float, gaze: Dict[str, float]):
+        self.gaze.append(frame, timestamp, gaze)
+        magnitude = gaze['gaze_magnitude']
+        self.gaze_stats.push(magnitude)
+        if magnitude < EYE_CONTACT_THRESHOLD:
+            self.eye_contact_frames += 1
+
+    def add_emotion(self, frame: int, timestamp: float, emotion: Dict[str, Any]):
+        label = emotion['dominant_emotion']
+        self.emotion.append(frame, timestamp, emotion)
+        self._emotion_codes.append(frame, timestamp, {'code': self._encode(self.emotion_labels, label)})
+        self.emotion_counts[label] = self.emotion_counts.get(label, 0) + 1
+
+    def add_body_language(self, frame: int, timestamp: float, body_language: Dict[str, Any]):
+        self.body_language.append(frame, timestamp, body_language)
+        if 'posture_score' in body_language:
+            self.posture_stats.push(body_language['posture_score'])
+        if 'body_angle' in body_language:
+            self.body_angle_stats.push(body_language['body_angle'])
+
+    def add_gesture(self, frame: int, timestamp: float, gestures: Dict[str, Any]):
+        label = gestures.get('dominant_gesture', 'unknown')
+        self.gesture.append(frame, timestamp, gestures)
+        self._gesture_codes.append(frame, timestamp, {'code': self._encode(self.gesture_labels, label)})
+        if 'gesture_activity' in gestures:
+            self.gesture_activity_stats.push(gestures['gesture_activity'])
+        self.gesture_type_counts[label] = self.gesture_type_counts.get(label, 0) + 1
+
+    def extend(self, other: "VisualTimeline") -> "VisualTimeline":
+        """按顺序拼接另一段时间线（用于合并并行分段的结果）"""
+        self.head_pose.extend(other.head_pose)
+        self.gaze.extend(other.gaze)
+        self.emotion.extend(other.emotion)
+        self.body_language.extend(other.body_language)
+        self.gesture.extend(other.gesture)
+
+        # 类别编码需要映射到本时间线的标签表
+        for codes, labels, other_codes, other_labels in (
+            (self._emotion_codes, self.emotion_labels, other._emotion_codes, other.emotion_labels),
+            (self._gesture_codes, self.gesture_labels, other._gesture_codes, other.gesture_labels),
+        ):
+            if other_codes.size == 0:
+                continue
+            mapping = np.array([self._encode(labels, label) for label in other_labels], dtype=np.int16)
+            remapped = ColumnGroup(['code'], other_codes.size, dtype=np.int16)
+            remapped.size = other_codes.size
+            remapped._frames[:other_codes.size] = other_codes.frames
+            remapped._timestamps[:other_codes.size] = other_codes.timestamps
+            remapped._columns['code'][:other_codes.size] = mapping[other_codes.column('code')]
+            codes.extend(remapped)
+
+        self.yaw_stats.merge(other.yaw_stats)
+        self.pitch_stats.merge(other.pitch_stats)
+        self.gaze_stats.merge(other.gaze_stats)
+        self.eye_contact_frames += other.eye_contact_frames
+        for label, count in other.emotion_counts.items():
+            self.emotion_counts[label] = self.emotion_counts.get(label, 0) + count
+        self.posture_stats.merge(other.posture_stats)
+        self.body_angle_stats.merge(other.body_angle_stats)
+        self.gesture_activity_stats.merge(other.gesture_activity_stats)
+        for label, count in other.gesture_type_counts.items():
+            self.gesture_type_counts[label] = self.gesture_type_counts.get(label, 0) + count
+        return self
+
+    def emotion_series(self) -> Dict[str, np.ndarray]:
+        """情绪时间序列（帧号、时间戳、主导情绪标签、置信度）"""
+        labels = np.array(self.emotion_labels, dtype=object)
+        return {
+            'frames': self._emotion_codes.frames,
+            'timestamps': self._emotion_codes.timestamps,
+            'dominant_emotion': labels[self._emotion_codes.column('code')] if len(labels) else labels,
+            'dominant_score': self.emotion.column('dominant_score')
+        }
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            'head_pose_count': len(self.head_pose),
+            'gaze_direction_count': len(self.gaze),
+            'emotion_analysis_count': len(self.emotion),
+            'body_language_count': len(self.body_language),
+            'gesture_count': len(self.gesture)
+        }
+
+    @property
+    def is_empty(self) -> bool:
+        return not (len(self.head_pose) or len(self.gaze) or len(self.emotion))
+
+    def summary(self) -> Dict[str, Any]:
+        """基于在线聚合量计算视觉统计特征，字段与原逐帧列表统计一致"""
+        result = {}
+
+        if self.yaw_stats.count:
+            # 稳定性与方差成反比
+            head_stability = 1.0 / (1.0 + (self.yaw_stats.variance + self.pitch_stats.variance) / 100)
+            result['head_pose_stability'] = float(head_stability)
+
+        if self.gaze_stats.count:
+            result['gaze_stability'] = float(1.0 / (1.0 + self.gaze_stats.variance / 10))
+            result['eye_contact_ratio'] = self.eye_contact_frames / self.gaze_stats.count
+
+        if self.emotion_counts:
+            result['dominant_emotion'] = max(self.emotion_counts.items(), key=lambda x: x[1])[0]
+            total_count = sum(self.emotion_counts.values())
+            negative_count = sum(self.emotion_counts.get(e, 0) for e in NEGATIVE_EMOTIONS)
+            result['emotion_stability'] = 1.0 - negative_count / total_count
+
+        if self.posture_stats.count:
+            result['avg_posture_score'] = float(self.posture_stats.mean)
+            result['posture_stability'] = float(1.0 - (self.posture_stats.std / 100.0))
+        if self.body_angle_stats.count:
+            result['avg_body_angle'] = float(self.body_angle_stats.mean)
+            result['body_angle_variance'] = float(self.body_angle_stats.variance)
+
+        if self.gesture_activity_stats.count:
+            result['avg_gesture_activity'] = float(self.gesture_activity_stats.mean)
+            result['gesture_expressiveness'] = float(self.gesture_activity_stats.max)
+        if self.gesture_type_counts:
+            result['dominant_gesture_type'] = max(self.gesture_type_counts.items(), key=lambda x: x[1])[0]
+            result['gesture_variety'] = len(self.gesture_type_counts)
+
+        return result
@@ -5,6 +5,7 @@
 import json
 import re
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, Any, List, Optional, TypedDict
 from pathlib import Path
@@ -31,9 +32,33 @@ from langchain_core.messages import SystemMessage
 
 # 本地imports
 from src.models.spark_client import create_spark_model
+from src.tools.llm_cache import DETERMINISTIC_TEMPERATURE, get_llm_cache
+from src.data.resume_sections import ITEM_SECTIONS, star_item_hashes
 
 logger = logging.getLogger(__name__)
 
+# 分析节点对应的LLM响应缓存调用点（提示词只由简历/JD内容决定，未修改的简历重复分析直接命中）
+ANALYSIS_CACHE_CALL_SITES = {
+    "JD匹配": "resume_jd_matching",
+    "STAR原则": "resume_star_principle",
+    "健康度扫描": "resume_health_scan"
+}
+
+# 简历记录中的存储字段（不属于简历内容）
+RESUME_RECORD_FIELDS = {"id", "user_id", "created_at", "updated_at", "status", "version"}
+
+
+def _contains_json_object(text: str) -> bool:
+    """响应中包含可解析的JSON对象时才写入缓存"""
+    json_match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not json_match:
+        return False
+    try:
+        json.loads(json_match.group())
+        return True
+    except json.JSONDecodeError:
+        return False
+
 
 class ResumeAnalysisState(TypedDict):
     """简历AI分析图的状态"""
@@ -113,15 +138,28 @@ class ResumeAnalysisWorkflow:
         try:
             logger.info(f"🤖 执行{node_name}分析...")
             
-            # 1. 调用大模型
-            messages = [SystemMessage(content=prompt)]
-            result = await self.spark_model._agenerate(messages)
-            response = result.generations[0].message.content
+            # 1. 调用大模型（相同提示词命中响应缓存）
+            async def call_llm() -> str:
+                result = await self.spark_model._agenerate(
+                    [SystemMessage(content=prompt)], temperature=DETERMINISTIC_TEMPERATURE
+                )
+                return result.generations[0].message.content
+            
+            response = await get_llm_cache().acached(
+                ANALYSIS_CACHE_CALL_SITES.get(node_name, "resume_analysis"),
+                self.spark_model.model_name,
+                DETERMINISTIC_TEMPERATURE,
+                prompt,
+                call_llm,
+                validate=_contains_json_object
+            )
             
             # 2. 解析JSON
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 parsed_result = json.loads(json_match.group())
+                # 时间戳不放进提示词（否则每次提示词都不同，无法命中缓存），解析后补充
+                parsed_result["analysis_timestamp"] = datetime.now().isoformat()
                 logger.info(f"✅ {node_name}分析成功")
                 return parsed_result
             else:
@@ -384,8 +422,7 @@ class ResumeAnalysisWorkflow:
     "education_match": 教育匹配度分数,
     "strengths": ["优势1", "优势2"],
     "gaps": ["缺口1", "缺口2"],
-    "suggestions": ["建议1", "建议2"],
-    "analysis_timestamp": "{datetime.now().isoformat()}"
+    "suggestions": ["建议1", "建议2"]
 }}"""
         
         return prompt
@@ -442,8 +479,7 @@ STAR原则评分标准：
         "整体优化建议1：如何提升项目描述的STAR完整性",
         "整体优化建议2：如何增强项目成果的量化表达",
         "整体优化建议3：如何突出个人贡献和技术能力"
-    ],
-    "analysis_timestamp": "{datetime.now().isoformat()}"
+    ]
 }}
 
 注意：
@@ -456,10 +492,12 @@ STAR原则评分标准：
     
     def _build_health_scan_prompt(self, resume_data: Dict) -> str:
         """构建健康度扫描提示"""
+        # 去掉ID/时间戳等记录字段：它们与简历质量无关，且每次保存都会变化导致缓存失效
+        content = {k: v for k, v in resume_data.items() if k not in RESUME_RECORD_FIELDS}
         prompt = f"""你是一名简历审查专家，请对简历进行全面的健康度扫描。
 
 简历数据：
-{json.dumps(resume_data, ensure_ascii=False, indent=2)}
+{json.dumps(content, ensure_ascii=False, indent=2)}
 
 请从以下维度评估简历质量(0-100分)：
 1. 格式规范：排版、结构、字体等
@@ -480,8 +518,7 @@ STAR原则评分标准：
             "details": "具体说明",
             "suggestions": ["改进建议"]
         }}
-    ],
-    "analysis_timestamp": "{datetime.now().isoformat()}"
+    ]
 }}"""
         
         return prompt
@@ -573,6 +610,11 @@ STAR原则评分标准：
             # 执行分析
             result = await self._run_analysis_node(prompt, fallback_data, "STAR原则")
             
+            # 记录每个条目的内容哈希，供简历更新后的增量检测复用
+            item_hashes = star_item_hashes(resume_data)
+            if result is not fallback_data and len(result.get("star_items", [])) == len(item_hashes):
+                result["item_hashes"] = item_hashes
+            
             return {
                 "success": True,
                 "result": result
@@ -585,9 +627,69 @@ STAR原则评分标准：
                 "error": str(e)
             }
     
+    async def analyze_star_incremental(self, resume_id: str, resume_data: Dict[str, Any],
+                                       analysis_id: str, previous_result: Dict[str, Any]) -> Dict[str, Any]:
+        """增量STAR检测 - 只分析新增/修改的项目和实习条目，合并到上一版本的检测结果"""
+        previous_hashes = previous_result.get("item_hashes") or []
+        previous_items = previous_result.get("star_items") or []
+        if not previous_hashes or len(previous_hashes) != len(previous_items):
+            # 上一版本没有条目哈希（旧数据或降级结果），无法对齐，执行全量检测
+            return await self.analyze_star_principle(resume_id, resume_data, analysis_id)
+        
+        reusable = dict(zip(previous_hashes, previous_items))
+        item_hashes = star_item_hashes(resume_data)
+        
+        # 按 项目在前、实习在后 的顺序找出需要重新分析的条目
+        changed_resume: Dict[str, List[Any]] = {section: [] for section in ITEM_SECTIONS}
+        index = 0
+        for section in ITEM_SECTIONS:
+            items = resume_data.get(section) or []
+            for item in (items if isinstance(items, list) else [items]):
+                if item_hashes[index] not in reusable:
+                    changed_resume[section].append(item)
+                index += 1
+        analyzed_count = sum(len(items) for items in changed_resume.values())
+        
+        logger.info(f"⭐ 增量STAR检测: {analysis_id} (复用 {len(item_hashes) - analyzed_count} 项, 重新分析 {analyzed_count} 项)")
+        
+        improvement_suggestions = previous_result.get("improvement_suggestions", [])
+        if analyzed_count:
+            partial = await self.analyze_star_principle(resume_id, changed_resume, analysis_id)
+            partial_result = partial.get("result") or {}
+            if not partial.get("success") or "item_hashes" not in partial_result:
+                # 返回条目与输入无法一一对应时退回全量检测
+                return await self.analyze_star_principle(resume_id, resume_data, analysis_id)
+            reusable.update(zip(partial_result["item_hashes"], partial_result["star_items"]))
+            improvement_suggestions = partial_result.get("improvement_suggestions") or improvement_suggestions
+        
+        star_items = [reusable[item_hash] for item_hash in item_hashes]
+        scores = [item.get("overall_score") for item in star_items if isinstance(item.get("overall_score"), (int, float))]
+        
+        return {
+            "success": True,
+            "result": {
+                "overall_score": round(sum(scores) / len(scores)) if scores else 0,
+                "star_items": star_items,
+                "improvement_suggestions": improvement_suggestions,
+                "item_hashes": item_hashes,
+                "incremental": {
+                    "reused_items": len(item_hashes) - analyzed_count,
+                    "analyzed_items": analyzed_count
+                },
+                "analysis_timestamp": datetime.now().isoformat()
+            }
+        }
+    
     async def analyze_basic_parallel(self, resume_id: str, resume_data: Dict[str, Any], 
-                                   user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """并行执行基础分析（STAR检测 + 用户画像生成）"""
+                                   user_data: Dict[str, Any],
+                                   previous_star_result: Optional[Dict[str, Any]] = None,
+                                   rerun_star: bool = True,
+                                   rerun_profile: bool = True) -> Dict[str, Any]:
+        """并行执行基础分析（STAR检测 + 用户画像生成）
+        
+        简历更新时由调用方根据板块哈希差异决定需要重新执行的部分：
+        previous_star_result 不为空时STAR检测按条目增量执行，未变化的部分标记为 skipped。
+        """
         try:
             logger.info(f"🚀 启动并行基础分析: {resume_id}")
             
@@ -598,12 +700,21 @@ STAR原则评分标准：
             # 并行执行STAR检测和用户画像生成
             import asyncio
             
-            star_task = asyncio.create_task(
-                self.analyze_star_principle(resume_id, resume_data, star_analysis_id)
-            )
+            async def skipped() -> Dict[str, Any]:
+                return {"success": True, "skipped": True}
+            
+            if not rerun_star:
+                star_coro = skipped()
+            elif previous_star_result:
+                star_coro = self.analyze_star_incremental(resume_id, resume_data, star_analysis_id, previous_star_result)
+            else:
+                star_coro = self.analyze_star_principle(resume_id, resume_data, star_analysis_id)
+            
+            star_task = asyncio.create_task(star_coro)
             
             profile_task = asyncio.create_task(
                 self._generate_user_profile(profile_id, resume_id, resume_data, user_data)
+                if rerun_profile else skipped()
             )
             
             logger.info(f"⚡ 并行任务已启动: STAR检测 + 用户画像生成")
@@ -627,8 +738,8 @@ STAR原则评分标准：
                 return {
                     "success": True,
                     "results": results,
-                    "star_analysis_id": star_analysis_id,
-                    "profile_id": profile_id
+                    "star_analysis_id": None if star_result.get("skipped") else star_analysis_id,
+                    "profile_id": None if profile_result.get("skipped") else profile_id
                 }
             else:
                 failed_tasks = []
@@ -802,14 +913,17 @@ STAR原则评分标准：
             }
 
 
-# 创建全局工作流实例
+# 创建全局工作流实例（worker线程池中多个任务共享）
 _workflow_instance = None
+_workflow_lock = threading.Lock()
 
 def get_resume_analysis_workflow() -> ResumeAnalysisWorkflow:
     """获取简历分析工作流实例"""
     global _workflow_instance
     
     if _workflow_instance is None:
-        _workflow_instance = ResumeAnalysisWorkflow()
+        with _workflow_lock:
+            if _workflow_instance is None:
+                _workflow_instance = ResumeAnalysisWorkflow()
     
     return _workflow_instance
@@ -2,7 +2,7 @@
 
 # Celery Worker启动脚本
 # 用于解决异步分析任务阻塞主线程的问题
-# 使用方法：在79014382源码目录下运行 ./start_celery_worker.sh
+# 使用方法：在79014382源码目录下运行 ./start_celery_worker.sh [队列...]
 
 echo "🚀 启动Celery Worker服务..."
 
@@ -50,17 +50,20 @@ echo "✅ Redis服务正常"
 export PYTHONPATH="$(pwd):${PYTHONPATH}"
 echo "📦 PYTHONPATH设置为: $PYTHONPATH"
 
-# 启动Celery Worker
+# 启动Celery Worker（每个队列一个worker，池类型和并发数见 src/celery_app.py 中的 QUEUE_WORKER_CONFIG，
+# 可通过 CELERY_<QUEUE>_POOL / CELERY_<QUEUE>_CONCURRENCY 环境变量覆盖）
+QUEUES="${@:-analysis profile interview}"
 echo "🔥 启动Celery Worker..."
-echo "   队列: analysis, profile"
-echo "   并发数: 2"
-echo "   池类型: solo (兼容性更好)"
+echo "   队列: $QUEUES"
 
-celery -A src.celery_app worker \
-    --loglevel=info \
-    --concurrency=2 \
-    --queues=analysis,profile \
-    --pool=solo \
-    --hostname=worker@%h
+PIDS=()
+for QUEUE in $QUEUES; do
+    python -m src.celery_app "$QUEUE" &
+    PIDS+=($!)
+    echo "   ✅ $QUEUE 队列worker已启动 (pid=$!)"
+done
+
+trap 'kill "${PIDS[@]}" 2>/dev/null' INT TERM
+wait
 
 echo "🛑 Celery Worker已停止"